@@ -93,34 +93,95 @@
 
 
 
+import importlib
+import os
 import platform
 import sys
+import time
 from flask import Flask
 from flask_cors import CORS
-import swisseph as swe
 import logging
 
-# Import blueprints (adjust paths as per your project structure)
-from .engine.routes.KpNew import kp
-from .engine.routes.LahairiAyanmasa import bp
-from .engine.routes.RamanAyanmasa import rl
+from .engine.core import swe
+from .engine.core.ResponseCache import init_response_cache
+from .engine.core.Serialization import init_json
+from .engine.core.Warmup import warmup as warmup_engine
+from .engine.routes.LazyBlueprints import LazyBlueprints
+
+# Blueprints by URL prefix: (module, blueprint attribute)
+BLUEPRINTS = {
+    '/kp': ('astro_engine.engine.routes.KpNew', 'kp'),                # KP System routes
+    '/lahiri': ('astro_engine.engine.routes.LahairiAyanmasa', 'bp'),  # Lahiri Ayanamsa routes
+    '/raman': ('astro_engine.engine.routes.RamanAyanmasa', 'rl'),     # Raman Ayanamsa routes
+}
+# Import route and engine modules on the first request to their prefix (set to 0 to load at startup)
+LAZY_BLUEPRINTS = os.environ.get('ASTRO_LAZY_BLUEPRINTS', '1') != '0'
+# Warm up at import, e.g. in the gunicorn master with --preload, before workers fork
+WARMUP_ON_START = os.environ.get('ASTRO_WARMUP', '0') == '1'
+# Refuse to start when Swiss Ephemeris would fall back to Moshier (set to 0 to allow it)
+REQUIRE_EPHE_FILES = os.environ.get('ASTRO_REQUIRE_EPHE_FILES', '1') != '0'
+
+
+def configure_app(flask_app):
+    CORS(flask_app, resources={r"/*": {"origins": "*"}})
+    init_json(flask_app)  # orjson-backed jsonify for every blueprint
+    init_response_cache(flask_app)  # Cache deterministic chart responses, with ETags
+    return flask_app
+
+
+def blueprint_app(blueprint):
+    """A Flask app serving one blueprint, configured like the main app."""
+    flask_app = configure_app(Flask(__name__))
+    flask_app.register_blueprint(blueprint)
+    return flask_app
+
 
 # Initialize Flask app
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
+app = configure_app(Flask(__name__))
 logging.basicConfig(level=logging.DEBUG)
 
 @app.route("/", methods=["GET"])
 def index():
     return {"message": "Astro Engine is running 🚀"}, 200
 
-# Set Swiss Ephemeris path (adjust path as needed)
-swe.set_ephe_path('astro_engine/ephe')
+# engine.core.swe applies the ephemeris path in each thread; check the .se1 files are really read
+if REQUIRE_EPHE_FILES:
+    logging.info("Ephemeris: %s", swe.require_swiss_ephemeris())
 
 # Register blueprints
-app.register_blueprint(kp)  # KP System routes
-app.register_blueprint(bp)  # Lahiri Ayanamsa routes
-app.register_blueprint(rl)  # Raman Ayanamsa routes
+blueprints = None
+if LAZY_BLUEPRINTS:
+    blueprints = app.wsgi_app = LazyBlueprints(app.wsgi_app, BLUEPRINTS, blueprint_app)
+else:
+    for module_name, attribute in BLUEPRINTS.values():
+        app.register_blueprint(getattr(importlib.import_module(module_name), attribute))
+
+
+def warmup(before_fork=False):
+    """Import every blueprint and warm the engine up; returns the time per step in ms."""
+    started = time.perf_counter()
+    if blueprints is not None:
+        blueprints.load_all()
+    timings = {'imports': round((time.perf_counter() - started) * 1000)}
+    timings.update(warmup_engine(before_fork))
+    return timings
+
+
+# App Engine warmup requests, sent before an instance receives traffic
+@app.route("/_ah/warmup", methods=["GET"])
+def warmup_request():
+    return {"status": "warm", "timings_ms": warmup()}, 200
+
+
+# Which ephemeris calculations use: 'swiss' (the .se1 files) or the Moshier fallback
+@app.route("/health/ephemeris", methods=["GET"])
+def ephemeris_health():
+    status = swe.ephemeris_status()
+    return status, 200 if status["mode"] == 'swiss' else 503
+
+
+if WARMUP_ON_START:
+    logging.info("Warmup before serving: %s", warmup(before_fork=True))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--production":
@@ -159,8 +220,11 @@ if __name__ == "__main__":
                 'workers': 2,               # Number of worker processes
                 'worker_class': 'gthread',  # Use threaded workers
                 'threads': 4,               # Number of threads per worker
-                'timeout': 120              # Timeout for long-running requests
+                'timeout': 120,             # Timeout for long-running requests
+                'preload_app': True         # Load and warm the app once, before forking workers
             }
+            if not WARMUP_ON_START:
+                warmup(before_fork=True)
             StandaloneApplication(app, options).run()
     else:
         # Development mode with Flask's built-in server
@@ -1,17 +1,7 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.SiderealKernel import SIGNS, sidereal_ascendant, sidereal_positions, sign_of
 
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
-swe.set_ephe_path("astro_api/ephe")
-swe.set_sid_mode(swe.SIDM_KRISHNAMURTI)  # KP New ayanamsa
-
-SIGNS_kp = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+SIGNS_kp = SIGNS
 ELEMENTS = {
     0: 'fire', 1: 'earth', 2: 'air', 3: 'water',
     4: 'fire', 5: 'earth', 6: 'air', 7: 'water',
@@ -31,37 +21,19 @@ CHARTS_kp = [
     "D45", "D60"
 ]
 
-def local_to_utc_kp(birth_date, birth_time, timezone_offset):
-    dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-    return dt - timedelta(hours=float(timezone_offset))
-
-def julian_day_kp(dt):
-    return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute/60 + dt.second/3600)
-
 def get_sidereal_positions_kp(jd):
     positions = {}
-    for pname, code in PLANETS.items():
-        pos, _ = swe.calc_ut(jd, code, swe.FLG_SWIEPH | swe.FLG_SIDEREAL)
+    for pname, (pos, _) in sidereal_positions(jd, PLANETS.items(), 'kp', swe.FLG_SWIEPH | swe.FLG_SIDEREAL).items():
         lon = pos[0] % 360
-        sign_idx = int(lon // 30)
-        deg_in_sign = lon % 30
-        positions[pname] = (lon, sign_idx, deg_in_sign)
+        positions[pname] = (lon, sign_of(lon), lon % 30)
     # Ketu: always 180° from Rahu
-    positions['Ketu'] = (
-        (positions['Rahu'][0] + 180) % 360,
-        int(((positions['Rahu'][0] + 180) % 360) // 30),
-        (positions['Rahu'][0] + 180) % 30
-    )
+    ketu = (positions['Rahu'][0] + 180) % 360
+    positions['Ketu'] = (ketu, sign_of(ketu), ketu % 30)
     return positions
 
 def get_sidereal_asc_kp(jd, lat, lon):
-    house_cusps, ascmc = swe.houses(jd, lat, lon, b'P')  # Placidus house system
-    ayanamsa = swe.get_ayanamsa_ut(jd)
-    tropical_asc = ascmc[0]
-    sidereal_asc = (tropical_asc - ayanamsa) % 360
-    sign_idx = int(sidereal_asc // 30)
-    deg_in_sign = sidereal_asc % 30
-    return sidereal_asc, sign_idx, deg_in_sign
+    sidereal_asc = sidereal_ascendant(jd, lat, lon, 'kp')
+    return sidereal_asc, sign_of(sidereal_asc), sidereal_asc % 30
 
 def varga_sign_kp(natal_sign, deg_in_sign, chart):
     # Implements exact BPHS/standard rules for all Vargas
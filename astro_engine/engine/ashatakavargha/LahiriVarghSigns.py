@@ -1,10 +1,6 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.SiderealKernel import sidereal_ascendant, sidereal_positions, sign_of
 
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
 PLANETS = {
     'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
     'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN, 'Rahu': swe.MEAN_NODE
@@ -21,36 +17,18 @@ def lahiri_sign_element(sign_idx):
     if sign_idx in [2, 6, 10]:  return 'air'
     if sign_idx in [3, 7, 11]:  return 'water'
 
-def lahiri_sign_local_to_utc(birth_date, birth_time, timezone_offset):
-    dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-    return dt - timedelta(hours=float(timezone_offset))
-
-def lahiri_sign_julian_day(dt):
-    return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute/60 + dt.second/3600)
-
 def lahiri_sign_get_sidereal_positions(jd):
     positions = {}
-    for pname, code in PLANETS.items():
-        swe.set_sid_mode(swe.SIDM_LAHIRI)
-
-        pos, _ = swe.calc_ut(jd, code, swe.FLG_SWIEPH | swe.FLG_SIDEREAL)
+    for pname, (pos, _) in sidereal_positions(jd, PLANETS.items(), 'lahiri', swe.FLG_SWIEPH | swe.FLG_SIDEREAL).items():
         lon = pos[0] % 360
-        sign_idx = int(lon // 30)
-        deg_in_sign = lon % 30
-        positions[pname] = (lon, sign_idx, deg_in_sign)
-    positions['Ketu'] = ((positions['Rahu'][0] + 180) % 360,
-                         int(((positions['Rahu'][0] + 180) % 360) // 30),
-                         (positions['Rahu'][0] + 180) % 30)
+        positions[pname] = (lon, sign_of(lon), lon % 30)
+    ketu = (positions['Rahu'][0] + 180) % 360
+    positions['Ketu'] = (ketu, sign_of(ketu), ketu % 30)
     return positions
 
 def lahiri_sign_get_sidereal_asc(jd, lat, lon):
-    house_cusps, ascmc = swe.houses(jd, lat, lon, b'P')
-    ayanamsa = swe.get_ayanamsa_ut(jd)
-    tropical_asc = ascmc[0]
-    sidereal_asc = (tropical_asc - ayanamsa) % 360
-    sign_idx = int(sidereal_asc // 30)
-    deg_in_sign = sidereal_asc % 30
-    return sidereal_asc, sign_idx, deg_in_sign
+    sidereal_asc = sidereal_ascendant(jd, lat, lon, 'lahiri')
+    return sidereal_asc, sign_of(sidereal_asc), sidereal_asc % 30
 
 def lahiri_sign_varga_sign(p, deg_in_sign, natal_sign_idx, chart, asc=False):
     N = {
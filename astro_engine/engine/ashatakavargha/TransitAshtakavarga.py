@@ -0,0 +1,104 @@
+"""
+Transit ashtakavarga: daily scores of the transiting planets against natal bindus.
+
+The natal Bhinnashtakavarga (BAV) and Sarvashtakavarga (SAV) are computed once with the
+bit-mask engine. Then, for every day of the range, each transiting planet is looked up in
+the shared transit ephemeris and scored with the natal bindus of the sign it occupies:
+
+- ``bav``: the planet's own natal BAV bindus in that sign (0-8),
+- ``sav``: the natal SAV bindus of that sign (0-56),
+- ``total``: the sum of the day's ``bav`` scores.
+
+Positions are taken at 12:00 UT of each day. The series are returned column by column
+(one list per planet and per score, aligned with ``dates``) to keep long ranges compact.
+"""
+from datetime import datetime, timedelta
+
+from astro_engine.engine.core.Ashtakavarga import PLANETS, bhinnashtakavarga, sarvashtakavarga
+from astro_engine.engine.core.ChartSnapshot import ChartSnapshot
+from astro_engine.engine.core.DashaTree import date_to_jd
+from astro_engine.engine.core.Ephemeris import transit_positions
+from astro_engine.engine.natalCharts.TransitCalendar import NATAL_POINTS
+from astro_engine.engine.natalCharts.transit import signs
+
+SAMPLE_HOUR_UT = 12
+MAX_RANGE_DAYS = 10 * 366
+NATAL_BODIES = dict(NATAL_POINTS)
+
+
+def natal_sign_indexes(data):
+    """Sign index of the seven planets and the Ascendant in the Lahiri birth chart."""
+    snapshot = ChartSnapshot.from_birth_data(data, 'lahiri')
+    sign_indexes = {planet: int(snapshot.calc_ut(NATAL_BODIES[planet])[0][0] % 360 // 30)
+                    for planet in PLANETS}
+    sign_indexes['Ascendant'] = int(snapshot.ascendant // 30)
+    return sign_indexes
+
+
+def transit_scores(natal_bav, natal_sav, planets, start_jd, days):
+    """Column-oriented daily scores of ``planets`` for ``days`` days from ``start_jd``."""
+    bav = {planet: [] for planet in planets}
+    sav = {planet: [] for planet in planets}
+    transit_signs = {planet: [] for planet in planets}
+    total = []
+    for day in range(days):
+        positions = transit_positions(start_jd + day + SAMPLE_HOUR_UT / 24)
+        day_total = 0
+        for planet in planets:
+            sign = int(positions[planet][0] // 30) % 12
+            score = natal_bav[planet][sign]
+            bav[planet].append(score)
+            sav[planet].append(natal_sav[sign])
+            transit_signs[planet].append(signs[sign])
+            day_total += score
+        total.append(day_total)
+    return {"total": total, "bav": bav, "sav": sav, "signs": transit_signs}
+
+
+def lahiri_transit_ashtakavarga(data):
+    """Daily transit ashtakavarga scores for the birth chart in ``data`` from ``from`` to ``to``."""
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid latitude or longitude")
+
+    start_jd = date_to_jd(data['from'])
+    days = int(round(date_to_jd(data['to']) - start_jd)) + 1
+    if days < 1:
+        raise ValueError("'to' must not be before 'from'")
+    if days > MAX_RANGE_DAYS:
+        raise ValueError("Date range must be at most 10 years")
+
+    planets = data.get('planets') or PLANETS
+    if not isinstance(planets, list):
+        raise ValueError("planets must be a list of planet names")
+    unknown = [p for p in planets if p not in PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planets: {', '.join(map(str, unknown))}")
+
+    sign_indexes = natal_sign_indexes(data)
+    natal_bav = bhinnashtakavarga(sign_indexes)
+    natal_sav = sarvashtakavarga(sign_indexes)
+
+    start = datetime.strptime(data['from'], '%Y-%m-%d')
+    series = transit_scores(natal_bav, natal_sav, planets, start_jd, days)
+    series["dates"] = [(start + timedelta(days=day)).strftime('%Y-%m-%d') for day in range(days)]
+
+    return {
+        "user_name": data['user_name'],
+        "from": data['from'],
+        "to": data['to'],
+        "planets": list(planets),
+        "natal": {
+            "ascendant": signs[sign_indexes['Ascendant']],
+            "bhinnashtakavarga": {planet: dict(zip(signs, bindus)) for planet, bindus in natal_bav.items()},
+            "sarvashtakavarga": dict(zip(signs, natal_sav)),
+        },
+        "series": series,
+        "notes": {
+            "ayanamsa": "Lahiri",
+            "sample_time": f"{SAMPLE_HOUR_UT:02d}:00 UTC",
+            "scores": "bav: natal bindus of the planet in its transit sign; "
+                      "sav: natal Sarvashtakavarga of that sign; total: sum of bav",
+        }
+    }
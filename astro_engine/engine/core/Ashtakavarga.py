@@ -0,0 +1,172 @@
+"""
+Bit-mask ashtakavarga.
+
+Each row of the bindu rules (the houses, counted from a contributor, in which it gives a
+target planet a bindu) is stored as a 12-bit mask, bit ``h - 1`` for house ``h``. A
+contributor in sign ``s`` then gives bindus to exactly the signs of that mask rotated left
+by ``s``, so one rotation replaces the 12 relative-house tests per contributor.
+
+For the totals every rule row is also kept "spread": one 8-bit lane per sign in a 96-bit
+integer. Rotating a spread row by ``8 * s`` bits and adding the eight rotated rows gives
+all twelve Bhinnashtakavarga totals of a target at once (at most 8 per lane), and adding
+the seven planets' totals gives the Sarvashtakavarga (at most 56 per lane), with no carry
+ever crossing into the next lane.
+
+Positions are given as ``{name: sign_index}`` for the seven planets and the Ascendant.
+"""
+PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+CONTRIBUTORS = PLANETS + ["Ascendant"]
+
+# Bindu allocation rules (1-based house numbers from the contributor) for each target
+BINDU_RULES = {
+    "Sun": {
+        "Saturn": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Jupiter": [5, 6, 9, 11],
+        "Mars": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Sun": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Venus": [6, 7, 12],
+        "Mercury": [3, 5, 6, 9, 10, 11, 12],
+        "Moon": [3, 6, 10, 11],
+        "Ascendant": [3, 4, 6, 10, 11, 12]
+    },
+    "Moon": {
+        "Saturn": [3, 5, 6, 11],
+        "Jupiter": [1, 4, 7, 8, 10, 11, 12],
+        "Mars": [2, 3, 5, 6, 9, 10, 11],
+        "Sun": [3, 6, 7, 8, 10, 11],
+        "Venus": [3, 4, 5, 7, 9, 10, 11],
+        "Mercury": [1, 3, 4, 5, 7, 8, 10, 11],
+        "Moon": [1, 3, 6, 7, 10, 11],
+        "Ascendant": [3, 6, 10, 11]
+    },
+    "Mars": {
+        "Saturn": [1, 4, 7, 8, 9, 10, 11],
+        "Jupiter": [6, 10, 11, 12],
+        "Mars": [1, 2, 4, 7, 8, 10, 11],
+        "Sun": [3, 5, 6, 10, 11],
+        "Venus": [6, 8, 11, 12],
+        "Mercury": [3, 5, 6, 11],
+        "Moon": [3, 6, 11],
+        "Ascendant": [1, 3, 6, 10, 11]
+    },
+    "Mercury": {
+        "Saturn": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Jupiter": [6, 8, 11, 12],
+        "Mars": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Sun": [5, 6, 9, 11, 12],
+        "Venus": [1, 2, 3, 4, 5, 8, 9, 11],
+        "Mercury": [1, 3, 5, 6, 9, 10, 11, 12],
+        "Moon": [2, 4, 6, 8, 10, 11],
+        "Ascendant": [1, 2, 4, 6, 8, 10, 11]
+    },
+    "Venus": {
+        "Saturn": [3, 4, 5, 8, 9, 10, 11],
+        "Jupiter": [5, 8, 9, 10, 11],
+        "Mars": [3, 5, 6, 9, 11, 12],
+        "Sun": [8, 11, 12],
+        "Venus": [1, 2, 3, 4, 5, 8, 9, 10, 11],
+        "Mercury": [3, 5, 6, 9, 11],
+        "Moon": [1, 2, 3, 4, 5, 8, 9, 11, 12],
+        "Ascendant": [1, 2, 3, 4, 5, 8, 9, 11]
+    },
+    "Jupiter": {
+        "Saturn": [3, 5, 6, 12],
+        "Jupiter": [1, 2, 3, 4, 7, 8, 10, 11],
+        "Mars": [1, 2, 4, 7, 8, 10, 11],
+        "Sun": [1, 2, 3, 4, 7, 8, 9, 10, 11],
+        "Venus": [2, 5, 6, 9, 10, 11],
+        "Mercury": [1, 2, 4, 5, 6, 9, 10, 11],
+        "Moon": [2, 5, 7, 9, 11],
+        "Ascendant": [1, 2, 4, 5, 6, 7, 9, 10, 11]
+    },
+    "Saturn": {
+        "Saturn": [3, 5, 6, 11],
+        "Jupiter": [5, 6, 11, 12],
+        "Mars": [3, 5, 6, 10, 11, 12],
+        "Sun": [1, 2, 4, 7, 8, 10, 11],
+        "Venus": [6, 11, 12],
+        "Mercury": [6, 8, 9, 10, 11, 12],
+        "Moon": [3, 6, 11],
+        "Ascendant": [1, 3, 4, 6, 10, 11]
+    },
+    "Ascendant": {
+        "Saturn": [1, 3, 4, 6, 10, 11],
+        "Jupiter": [1, 2, 4, 5, 6, 7, 9, 10, 11],
+        "Mars": [1, 3, 6, 10, 11],
+        "Sun": [3, 4, 6, 10, 11, 12],
+        "Venus": [1, 2, 3, 4, 5, 8, 9],
+        "Mercury": [1, 2, 4, 6, 8, 10, 11],
+        "Moon": [3, 6, 10, 11, 12],
+        "Ascendant": [3, 6, 10, 11]
+    }
+}
+
+SIGN_COUNT = 12
+SIGN_BITS = (1 << SIGN_COUNT) - 1
+LANE_BITS = 8
+LANE_MASK = (1 << LANE_BITS) - 1
+
+
+def house_mask(houses):
+    """12-bit mask with bit ``h - 1`` set for every house ``h``."""
+    mask = 0
+    for house in houses:
+        mask |= 1 << (house - 1)
+    return mask
+
+
+def spread(mask):
+    """``mask`` with every bit moved to the bottom of its own 8-bit lane."""
+    return sum(1 << (LANE_BITS * i) for i in range(SIGN_COUNT) if mask >> i & 1)
+
+
+def rotate(value, signs, lane_bits=1):
+    """Rotate a 12-lane value left by ``signs`` lanes of ``lane_bits`` bits."""
+    width = SIGN_COUNT * lane_bits
+    shift = signs % SIGN_COUNT * lane_bits
+    return ((value << shift) | (value >> (width - shift))) & ((1 << width) - 1)
+
+
+def unpack(lanes):
+    """The twelve per-sign counts held in a spread value."""
+    return [(lanes >> (LANE_BITS * i)) & LANE_MASK for i in range(SIGN_COUNT)]
+
+
+def mask_bits(mask):
+    """The twelve 0 / 1 bindus of a 12-bit mask, Aries first."""
+    return [(mask >> i) & 1 for i in range(SIGN_COUNT)]
+
+
+RULE_MASKS = {target: {contributor: house_mask(houses) for contributor, houses in rules.items()}
+              for target, rules in BINDU_RULES.items()}
+RULE_LANES = {target: {contributor: spread(mask) for contributor, mask in masks.items()}
+              for target, masks in RULE_MASKS.items()}
+
+
+def contribution_masks(target, sign_indexes):
+    """``{contributor: 12-bit mask of the signs where it gives ``target`` a bindu}``."""
+    masks = RULE_MASKS[target]
+    return {contributor: rotate(masks[contributor], sign_indexes[contributor])
+            for contributor in CONTRIBUTORS if contributor in sign_indexes}
+
+
+def bhinnashtakavarga_lanes(target, sign_indexes):
+    """Spread per-sign bindu totals of ``target``'s Bhinnashtakavarga."""
+    lanes = RULE_LANES[target]
+    return sum(rotate(lanes[contributor], sign_indexes[contributor], LANE_BITS)
+               for contributor in CONTRIBUTORS if contributor in sign_indexes)
+
+
+def sarvashtakavarga_lanes(sign_indexes, targets=PLANETS):
+    """Spread per-sign Sarvashtakavarga totals: the sum of the targets' Bhinnashtakavargas."""
+    return sum(bhinnashtakavarga_lanes(target, sign_indexes) for target in targets)
+
+
+def bhinnashtakavarga(sign_indexes, targets=PLANETS):
+    """``{target: [bindus per sign]}`` for every target, Aries first."""
+    return {target: unpack(bhinnashtakavarga_lanes(target, sign_indexes)) for target in targets}
+
+
+def sarvashtakavarga(sign_indexes, targets=PLANETS):
+    """Sarvashtakavarga bindus per sign, Aries first."""
+    return unpack(sarvashtakavarga_lanes(sign_indexes, targets))
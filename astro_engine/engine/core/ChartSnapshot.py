@@ -0,0 +1,138 @@
+"""
+Per-chart ephemeris snapshot shared by the chart engines.
+
+Opening a profile fires twenty-odd endpoints with the same birth data, and every engine
+used to derive the same Julian day, planet positions and houses on its own. A
+``ChartSnapshot`` does that work once for one (birth data, ayanamsa) pair and memoises
+every Swiss Ephemeris result it hands out, so engines that accept a ``snapshot`` argument
+read from it instead of calling into the library again. Snapshots are also kept in an LRU
+(see SnapshotCache) so repeat requests for a saved profile skip the library entirely.
+
+The memoised values are exactly what ``swe.calc_ut`` / ``swe.houses_ex`` return for the
+snapshot's ayanamsa, so each engine keeps its own choice of node, flags and house system.
+"""
+
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.SiderealContext import resolve_ayanamsa_mode
+from astro_engine.engine.core.SnapshotCache import LRUCache
+from astro_engine.engine.core.SiderealKernel import get_julian_day
+
+# Bodies every snapshot computes up front (both node variants are in use across engines).
+SNAPSHOT_BODIES = (
+    swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN,
+    swe.MEAN_NODE, swe.TRUE_NODE,
+)
+SNAPSHOT_FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+# Snapshots shared between requests, keyed by snapshot_key().
+snapshot_cache = LRUCache()
+
+
+def snapshot_key(jd_ut, latitude, longitude, mode, house_system):
+    """Cache key: birth moment to the second, place to ~0.1 m, ayanamsa and house system."""
+    return (round(jd_ut * 86400), round(float(latitude), 6), round(float(longitude), 6), mode, house_system)
+
+
+class ChartSnapshot:
+    """Julian day, ayanamsa, positions and houses for one birth chart and one ayanamsa."""
+
+    def __init__(self, jd_ut, latitude, longitude, ayanamsa='lahiri', house_system=b'W'):
+        self.jd_ut = jd_ut
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.mode = resolve_ayanamsa_mode(ayanamsa)
+        self.house_system = house_system
+
+        self._positions = {}
+        self._houses = {}
+        with swe.sidereal_mode(self.mode):
+            self.ayanamsa_value = swe.get_ayanamsa_ut(self.jd_ut)
+            for body in SNAPSHOT_BODIES:
+                self.calc_ut(body)
+            self.cusps, self.ascmc = self.houses_ex(house_system, swe.FLG_SIDEREAL)
+
+    @classmethod
+    def cached(cls, jd_ut, latitude, longitude, ayanamsa='lahiri', house_system=b'W'):
+        """Return the cached snapshot for this chart, computing and caching it on a miss."""
+        mode = resolve_ayanamsa_mode(ayanamsa)
+        key = snapshot_key(jd_ut, latitude, longitude, mode, house_system)
+        return snapshot_cache.get_or_create(
+            key, lambda: cls(jd_ut, latitude, longitude, mode, house_system))
+
+    @classmethod
+    def from_birth(cls, birth_date, birth_time, latitude, longitude, tz_offset,
+                   ayanamsa='lahiri', house_system=b'W'):
+        """Cached snapshot for a local birth date, time and timezone offset."""
+        jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
+        return cls.cached(jd_ut, latitude, longitude, ayanamsa, house_system)
+
+    @classmethod
+    def from_birth_data(cls, birth_data, ayanamsa='lahiri', house_system=b'W'):
+        """Cached snapshot for a request payload with birth_date/birth_time/latitude/longitude/timezone_offset."""
+        return cls.from_birth(birth_data['birth_date'], birth_data['birth_time'],
+                              birth_data['latitude'], birth_data['longitude'],
+                              birth_data['timezone_offset'], ayanamsa, house_system)
+
+    def check_ayanamsa(self, ayanamsa):
+        """Raise ValueError unless the snapshot was computed with ``ayanamsa``."""
+        mode = resolve_ayanamsa_mode(ayanamsa)
+        if self.mode != mode:
+            raise ValueError(f"Chart snapshot uses sidereal mode {self.mode}, expected {mode}")
+        return self
+
+    def calc_ut(self, planet_id, flags=SNAPSHOT_FLAGS):
+        """Memoised ``swe.calc_ut(self.jd_ut, planet_id, flags)`` in the snapshot's ayanamsa."""
+        # FLG_SWIEPH is the default ephemeris and speeds do not change the position,
+        # so both are normalised away to share one entry per body and frame.
+        key = (planet_id, (flags | swe.FLG_SPEED) & ~swe.FLG_SWIEPH)
+        result = self._positions.get(key)
+        if result is None:
+            with swe.sidereal_mode(self.mode):
+                result = swe.calc_ut(self.jd_ut, planet_id, flags | swe.FLG_SPEED)
+            self._positions[key] = result
+        if not flags & swe.FLG_SPEED:
+            # Without FLG_SPEED the library reports zero speeds; callers may rely on that.
+            pos, ret = result
+            return pos[:3] + (0.0, 0.0, 0.0), ret & ~swe.FLG_SPEED
+        return result
+
+    def houses_ex(self, hsys=b'P', flags=0):
+        """Memoised ``swe.houses_ex`` for the snapshot's place and ayanamsa."""
+        key = (hsys, flags)
+        result = self._houses.get(key)
+        if result is None:
+            with swe.sidereal_mode(self.mode):
+                result = swe.houses_ex(self.jd_ut, self.latitude, self.longitude, hsys, flags=flags)
+            self._houses[key] = result
+        return result
+
+    def get_ayanamsa_ut(self):
+        """Mean ayanamsa at birth, as ``swe.get_ayanamsa_ut``."""
+        return self.ayanamsa_value
+
+    def longitude(self, planet_id):
+        """Sidereal longitude (0-360) of a body."""
+        return self.calc_ut(planet_id)[0][0] % 360
+
+    def speed(self, planet_id):
+        """Longitudinal speed in degrees per day; negative when retrograde."""
+        return self.calc_ut(planet_id)[0][3]
+
+    @property
+    def ascendant(self):
+        """Sidereal ascendant longitude."""
+        return self.ascmc[0] % 360
+
+
+def resolve_snapshot(snapshot, ayanamsa, birth_date, birth_time, latitude, longitude, tz_offset):
+    """
+    Return ``snapshot`` when the caller passed one, otherwise the cached one for the birth data.
+
+    Engines that take a ``snapshot`` argument call this first and read the Julian day,
+    positions and houses from the result, so a caller rendering several charts for one birth
+    record (the profile endpoints) computes them once. Raises ValueError when a snapshot
+    computed with a different ayanamsa is passed in.
+    """
+    if snapshot is None:
+        return ChartSnapshot.from_birth(birth_date, birth_time, latitude, longitude, tz_offset, ayanamsa)
+    return snapshot.check_ayanamsa(ayanamsa)
@@ -0,0 +1,168 @@
+"""
+Implicit Vimshottari dasha tree.
+
+A five-level pran dasha timeline has 9^5 periods, but every one of them follows from its
+parent: the sub-periods of a period start with the period's own lord, run in Vimshottari
+order and split its length in proportion to each lord's years. A ``DashaPeriod`` is just
+(lord, start JD, length in days, level), and ``sub_periods`` derives its children on
+demand, so only the periods a caller actually formats are ever created.
+
+``expand_periods`` materialises the tree down to a given depth, keeping only periods that
+overlap a JD window, and ``find_active_periods`` walks straight down to the periods running
+at one moment. Each dasha module passes its own formatter and child keys, so the
+nodes it produces are the same dicts its eager builders return.
+"""
+from datetime import datetime, timezone
+
+from astro_engine.engine.core import swe
+
+DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+DASHA_YEARS = {
+    'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7,
+    'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
+}
+VIMSHOTTARI_YEARS = 120
+
+LEVEL_NAMES = ('mahadasha', 'antardasha', 'pratyantardasha', 'sookshma_dasha', 'pran_dasha')
+MAX_DEPTH = len(LEVEL_NAMES)
+
+
+def vimshottari_sequence(start_planet):
+    """The nine lords in Vimshottari order, starting from ``start_planet``."""
+    idx = DASHA_SEQUENCE.index(start_planet)
+    return DASHA_SEQUENCE[idx:] + DASHA_SEQUENCE[:idx]
+
+
+class DashaPeriod:
+    """One period of the tree; level 0 is a mahadasha."""
+
+    __slots__ = ('planet', 'start_jd', 'days', 'level')
+
+    def __init__(self, planet, start_jd, days, level=0):
+        self.planet = planet
+        self.start_jd = start_jd
+        self.days = days
+        self.level = level
+
+    @property
+    def end_jd(self):
+        return self.start_jd + self.days
+
+    def sub_periods(self):
+        """Yield the nine sub-periods of this period in order."""
+        current_jd = self.start_jd
+        for planet in vimshottari_sequence(self.planet):
+            days = (DASHA_YEARS[planet] * self.days) / VIMSHOTTARI_YEARS
+            yield DashaPeriod(planet, current_jd, days, self.level + 1)
+            current_jd += days
+
+
+def mahadashas(first_lord, first_start_jd, year_length):
+    """Yield the nine mahadashas of one 120-year cycle, starting with ``first_lord``."""
+    current_jd = first_start_jd
+    for planet in vimshottari_sequence(first_lord):
+        days = DASHA_YEARS[planet] * year_length
+        yield DashaPeriod(planet, current_jd, days)
+        current_jd += days
+
+
+def expand_periods(periods, format_period, child_keys, depth=MAX_DEPTH, start_jd=None, end_jd=None):
+    """
+    Materialise ``periods`` and their descendants as nested dicts.
+
+    ``format_period(period)`` builds the dict for one period and ``child_keys[level]`` is the
+    key its sub-periods go under. Levels below ``depth`` (1 = mahadashas only) are not
+    visited, and only periods overlapping [start_jd, end_jd) are kept when a bound is given.
+    """
+    nodes = []
+    for period in periods:
+        if end_jd is not None and period.start_jd >= end_jd:
+            break
+        if start_jd is not None and period.end_jd <= start_jd:
+            continue
+        node = format_period(period)
+        if period.level + 1 < depth:
+            node[child_keys[period.level]] = expand_periods(
+                period.sub_periods(), format_period, child_keys, depth, start_jd, end_jd)
+        nodes.append(node)
+    return nodes
+
+
+def iter_period_rows(periods, format_period, depth=MAX_DEPTH, start_jd=None, end_jd=None, path=()):
+    """
+    Yield one flat dict per period, depth-first, for streaming a timeline.
+
+    Takes the same filters as ``expand_periods`` but never holds more than one branch of
+    the tree: each row is ``format_period(period)`` plus its ``level`` name and the
+    ``path`` of lords from the mahadasha down to it.
+    """
+    for period in periods:
+        if end_jd is not None and period.start_jd >= end_jd:
+            break
+        if start_jd is not None and period.end_jd <= start_jd:
+            continue
+        row_path = path + (period.planet,)
+        row = format_period(period)
+        row['level'] = LEVEL_NAMES[period.level]
+        row['path'] = list(row_path)
+        yield row
+        if period.level + 1 < depth:
+            yield from iter_period_rows(period.sub_periods(), format_period, depth,
+                                        start_jd, end_jd, row_path)
+
+
+def find_active_periods(periods, jd, depth=MAX_DEPTH):
+    """
+    The chain of periods running at ``jd``, mahadasha first, down to ``depth`` levels.
+
+    Only the nine siblings on the path are generated at each level, so this is
+    O(depth) regardless of how large the full tree would be. Returns an empty list
+    when ``jd`` lies outside ``periods``.
+    """
+    chain = []
+    while len(chain) < depth:
+        for period in periods:
+            if period.start_jd <= jd < period.end_jd:
+                chain.append(period)
+                periods = period.sub_periods()
+                break
+        else:
+            break
+    return chain
+
+
+def date_to_jd(date_str):
+    """Julian Day (UT) at 00:00 of a 'YYYY-MM-DD' date."""
+    date = datetime.strptime(date_str, '%Y-%m-%d')
+    return swe.julday(date.year, date.month, date.day, 0.0, swe.GREG_CAL)
+
+
+def datetime_to_jd(date_str=None):
+    """
+    Julian Day (UT) of a 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' UTC string, or of now.
+    """
+    if not date_str:
+        dt = datetime.now(timezone.utc)
+    elif len(date_str) == 10:
+        dt = datetime.strptime(date_str, '%Y-%m-%d')
+    else:
+        dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+    hour = dt.hour + dt.minute / 60.0 + dt.second / 3600.0
+    return swe.julday(dt.year, dt.month, dt.day, hour, swe.GREG_CAL)
+
+
+def parse_dasha_window(args, default_depth=MAX_DEPTH):
+    """
+    Read the ``from`` / ``to`` dates and ``depth`` of a dasha request.
+
+    ``args`` is any mapping (query arguments or the JSON body). Returns
+    (depth, start_jd, end_jd), with None for a missing bound; raises ValueError on bad input.
+    """
+    depth = int(args.get('depth', default_depth))
+    if not 1 <= depth <= MAX_DEPTH:
+        raise ValueError(f"depth must be between 1 and {MAX_DEPTH}")
+    start_jd = date_to_jd(args['from']) if args.get('from') else None
+    end_jd = date_to_jd(args['to']) if args.get('to') else None
+    if start_jd is not None and end_jd is not None and end_jd <= start_jd:
+        raise ValueError("'to' must be after 'from'")
+    return depth, start_jd, end_jd
@@ -0,0 +1,310 @@
+"""
+Precomputed, memory-mapped transit ephemeris.
+
+Transit charts need the positions of the nine grahas "now", and those are the same for
+every user. This module keeps a binary table of sidereal longitude and speed per body at
+a fixed step, one file per ayanamsa, and answers position queries by cubic Hermite
+interpolation between the two neighbouring rows (using the stored speeds as derivatives).
+At the default daily step the result is within a few arcseconds of Swiss Ephemeris for
+every body.
+
+Tables are written atomically and opened with ``mmap``: every gunicorn worker on the host
+maps the same file, so the pages are shared and a worker starting up does not have to
+recompute anything. A missing table is built in a background thread by one process (the
+first to take its lock file) while requests fall back to Swiss Ephemeris, as they do for
+instants outside the table. ``python -m astro_engine.engine.core.Ephemeris`` builds all
+tables ahead of time, e.g. at image build.
+
+Settings come from the environment:
+ASTRO_EPHEMERIS_DIR (default: a directory under the system temp dir),
+ASTRO_EPHEMERIS_START_YEAR / ASTRO_EPHEMERIS_END_YEAR (default 1975-2075),
+ASTRO_EPHEMERIS_STEP_HOURS (default 24) and ASTRO_EPHEMERIS (set to 0 to disable).
+"""
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.SiderealContext import resolve_ayanamsa_mode
+
+EPHEMERIS_ENABLED = os.environ.get('ASTRO_EPHEMERIS', '1') != '0'
+EPHEMERIS_DIR = os.environ.get('ASTRO_EPHEMERIS_DIR',
+                               os.path.join(tempfile.gettempdir(), 'astro_engine_ephemeris'))
+START_YEAR = int(os.environ.get('ASTRO_EPHEMERIS_START_YEAR', 1975))
+END_YEAR = int(os.environ.get('ASTRO_EPHEMERIS_END_YEAR', 2075))
+STEP_HOURS = float(os.environ.get('ASTRO_EPHEMERIS_STEP_HOURS', 24))
+
+# Bodies stored in the table, in column order; Ketu is derived from Rahu.
+TRANSIT_BODIES = [
+    ('Sun', swe.SUN), ('Moon', swe.MOON), ('Mars', swe.MARS),
+    ('Mercury', swe.MERCURY), ('Jupiter', swe.JUPITER), ('Venus', swe.VENUS),
+    ('Saturn', swe.SATURN), ('Rahu', swe.TRUE_NODE)
+]
+BODY_COLUMNS = {name: i for i, (name, _) in enumerate(TRANSIT_BODIES)}
+EPHEMERIS_FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+# magic, format version, sidereal mode, body count, row count, start JD, step in days
+_HEADER = struct.Struct('<8sIiIIdd')
+_MAGIC = b'ASTROEPH'
+_VERSION = 1
+_HEADER_SIZE = 64
+
+
+def _calc_row(jd, sid_mode, require_files=False):
+    """
+    Longitude and speed of every transit body at ``jd``, flattened.
+
+    With ``require_files`` a body the library did not read from the .se1 files (its
+    Moshier fallback) raises RuntimeError, so no table is ever written from Moshier data.
+    """
+    row = []
+    with swe.sidereal_mode(sid_mode):
+        for name, body in TRANSIT_BODIES:
+            pos, ret = swe.calc_ut(jd, body, EPHEMERIS_FLAGS)
+            if ret < 0:
+                raise ValueError(f"Error calculating {name} at JD {jd}")
+            if require_files and not ret & swe.FLG_SWIEPH:
+                raise RuntimeError(
+                    f"{name} at JD {jd} did not come from the Swiss Ephemeris files "
+                    f"(return flags {ret}); not writing an ephemeris table from Moshier data")
+            row.extend((pos[0] % 360, pos[3]))
+    return row
+
+
+def build_table(path, ayanamsa, start_jd, end_jd, step_days):
+    """Compute a table file for [start_jd, end_jd] and move it into place atomically."""
+    sid_mode = resolve_ayanamsa_mode(ayanamsa)
+    rows = int((end_jd - start_jd) / step_days) + 1
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            header = _HEADER.pack(_MAGIC, _VERSION, sid_mode, len(TRANSIT_BODIES), rows,
+                                  start_jd, step_days)
+            f.write(header.ljust(_HEADER_SIZE, b'\0'))
+            row_struct = struct.Struct('<%dd' % (2 * len(TRANSIT_BODIES)))
+            for i in range(rows):
+                f.write(row_struct.pack(*_calc_row(start_jd + i * step_days, sid_mode, require_files=True)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _interpolate(values, i, width, h, frac):
+    """(longitude, speed) at ``frac`` of the step between row entry ``i`` and the next row."""
+    lon0, v0 = values[i], values[i + 1]
+    lon1, v1 = values[i + width], values[i + width + 1]
+    delta = (lon1 - lon0 + 180) % 360 - 180
+
+    # Cubic Hermite basis on [0, 1]; speeds are per day, so scale them by the step.
+    t, t2 = frac, frac * frac
+    t3 = t2 * t
+    lon = lon0 + (-2 * t3 + 3 * t2) * delta + (t3 - 2 * t2 + t) * h * v0 + (t3 - t2) * h * v1
+    speed = (6 * t - 6 * t2) * delta / h + (3 * t2 - 4 * t + 1) * v0 + (3 * t2 - 2 * t) * v1
+    return lon % 360, speed
+
+
+class EphemerisTable:
+    """Read-only view of one table file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.sid_mode, self.bodies, self.rows, self.start_jd, self.step_days = \
+            _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not an ephemeris table: {path}")
+        self._values = memoryview(self._mmap)[_HEADER_SIZE:].cast('d')
+        self.end_jd = self.start_jd + (self.rows - 1) * self.step_days
+
+    def covers(self, jd):
+        return self.start_jd <= jd < self.end_jd
+
+    def position(self, name, jd):
+        """Interpolated (longitude, speed) of ``name`` at ``jd``; the table must cover ``jd``."""
+        h = self.step_days
+        row, frac = divmod((jd - self.start_jd) / h, 1)
+        width = 2 * self.bodies
+        return _interpolate(self._values, int(row) * width + 2 * BODY_COLUMNS[name], width, h, frac)
+
+    def position_function(self, name):
+        """``position`` for one body as a ``jd -> (longitude, speed)`` closure, for tight loops."""
+        values, h, start_jd, width = self._values, self.step_days, self.start_jd, 2 * self.bodies
+        column = 2 * BODY_COLUMNS[name]
+
+        def position(jd):
+            row, frac = divmod((jd - start_jd) / h, 1)
+            return _interpolate(values, int(row) * width + column, width, h, frac)
+        return position
+
+    def series(self, name, start_jd, step, count):
+        """
+        ``(longitudes, speeds)`` of ``name`` at ``start_jd + k * step`` for k < ``count``.
+
+        The table must cover every instant. When they all fall on table rows the values are
+        one strided slice of the mapped file; otherwise each one is interpolated.
+        """
+        h = self.step_days
+        first, offset = divmod((start_jd - self.start_jd) / h, 1)
+        stride, remainder = divmod(step / h, 1)
+        if offset or remainder or not stride:
+            positions = [self.position(name, start_jd + k * step) for k in range(count)]
+            return [lon for lon, _ in positions], [speed for _, speed in positions]
+        width = 2 * self.bodies
+        i = int(first) * width + 2 * BODY_COLUMNS[name]
+        stride = int(stride) * width
+        # At a row the interpolation reduces to the stored longitude and speed.
+        lons = [lon % 360 for lon in self._values[i:i + count * stride:stride].tolist()]
+        speeds = self._values[i + 1:i + 1 + count * stride:stride].tolist()
+        return lons, speeds
+
+    def close(self):
+        self._values.release()
+        self._mmap.close()
+
+
+_tables = {}
+_building = set()
+_tables_lock = threading.Lock()
+# A lock file older than this is left over from a crashed build and is ignored.
+_STALE_LOCK_SECONDS = 3600
+
+
+def table_path(ayanamsa):
+    return os.path.join(EPHEMERIS_DIR, f"{ayanamsa}_{START_YEAR}_{END_YEAR}_{STEP_HOURS:g}h.eph")
+
+
+def ensure_table(ayanamsa):
+    """Build the table file for ``ayanamsa`` unless it exists or another process is building it."""
+    path = table_path(ayanamsa)
+    if os.path.exists(path):
+        return path
+    os.makedirs(EPHEMERIS_DIR, exist_ok=True)
+    lock_path = path + '.lock'
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        if time.time() - os.path.getmtime(lock_path) < _STALE_LOCK_SECONDS:
+            return None
+        os.unlink(lock_path)
+        return ensure_table(ayanamsa)
+    try:
+        os.close(fd)
+        start_jd = swe.julday(START_YEAR, 1, 1, 0.0)
+        end_jd = swe.julday(END_YEAR, 1, 1, 0.0)
+        build_table(path, ayanamsa, start_jd, end_jd, STEP_HOURS / 24)
+    finally:
+        os.unlink(lock_path)
+    return path
+
+
+def _build_in_background(ayanamsa):
+    try:
+        ensure_table(ayanamsa)
+    finally:
+        with _tables_lock:
+            _building.discard(ayanamsa)
+
+
+def get_table(ayanamsa='lahiri'):
+    """
+    The shared table for ``ayanamsa``, or None while it is not built yet.
+
+    The first call in a process without the table file starts building it in the
+    background.
+    """
+    table = _tables.get(ayanamsa)
+    if table is None:
+        path = table_path(ayanamsa)
+        with _tables_lock:
+            table = _tables.get(ayanamsa)
+            if table is None and os.path.exists(path):
+                table = _tables[ayanamsa] = EphemerisTable(path)
+            elif table is None and ayanamsa not in _building:
+                _building.add(ayanamsa)
+                threading.Thread(target=_build_in_background, args=(ayanamsa,), daemon=True).start()
+    return table
+
+
+def transit_position(name, jd_ut, ayanamsa='lahiri'):
+    """(longitude, speed) of one transit body, Ketu included, as ``transit_positions``."""
+    if name == 'Ketu':
+        rahu_lon, rahu_speed = transit_position('Rahu', jd_ut, ayanamsa)
+        return (rahu_lon + 180) % 360, rahu_speed
+    table = get_table(ayanamsa) if EPHEMERIS_ENABLED else None
+    if table is not None and table.covers(jd_ut):
+        return table.position(name, jd_ut)
+    with swe.sidereal_mode(resolve_ayanamsa_mode(ayanamsa)):
+        pos, ret = swe.calc_ut(jd_ut, TRANSIT_BODIES[BODY_COLUMNS[name]][1], EPHEMERIS_FLAGS)
+    if ret < 0:
+        raise ValueError(f"Error calculating {name} at JD {jd_ut}")
+    return pos[0] % 360, pos[3]
+
+
+def transit_position_function(name, ayanamsa='lahiri'):
+    """
+    ``jd -> transit_position(name, jd, ayanamsa)`` with the table looked up once, for
+    callers that evaluate one body many times.
+    """
+    if name == 'Ketu':
+        rahu_position = transit_position_function('Rahu', ayanamsa)
+
+        def ketu_position(jd):
+            rahu_lon, rahu_speed = rahu_position(jd)
+            return (rahu_lon + 180) % 360, rahu_speed
+        return ketu_position
+    table = get_table(ayanamsa) if EPHEMERIS_ENABLED else None
+    if table is None:
+        return lambda jd: transit_position(name, jd, ayanamsa)
+    from_table = table.position_function(name)
+    start_jd, end_jd = table.start_jd, table.end_jd
+
+    def position(jd):
+        if start_jd <= jd < end_jd:
+            return from_table(jd)
+        return transit_position(name, jd, ayanamsa)
+    return position
+
+
+def transit_series(name, start_jd, step, count, ayanamsa='lahiri'):
+    """
+    ``(longitudes, speeds)`` of one transit body at ``start_jd + k * step`` for k < ``count``,
+    with the same values ``transit_position`` gives for each instant.
+    """
+    if name == 'Ketu':
+        lons, speeds = transit_series('Rahu', start_jd, step, count, ayanamsa)
+        return [(lon + 180) % 360 for lon in lons], speeds
+    table = get_table(ayanamsa) if EPHEMERIS_ENABLED else None
+    if table is not None and count and table.covers(start_jd) and table.covers(start_jd + (count - 1) * step):
+        return table.series(name, start_jd, step, count)
+    positions = [transit_position(name, start_jd + k * step, ayanamsa) for k in range(count)]
+    return [lon for lon, _ in positions], [speed for _, speed in positions]
+
+
+def transit_positions(jd_ut, ayanamsa='lahiri'):
+    """
+    ``{name: (longitude, speed)}`` of the transit bodies at ``jd_ut``, Ketu included.
+
+    Served from the memory-mapped table when it covers ``jd_ut``, from Swiss Ephemeris
+    otherwise.
+    """
+    table = get_table(ayanamsa) if EPHEMERIS_ENABLED else None
+    if table is not None and table.covers(jd_ut):
+        positions = {name: table.position(name, jd_ut) for name, _ in TRANSIT_BODIES}
+    else:
+        row = _calc_row(jd_ut, resolve_ayanamsa_mode(ayanamsa))
+        positions = {name: (row[2 * i], row[2 * i + 1]) for i, (name, _) in enumerate(TRANSIT_BODIES)}
+    rahu_lon, rahu_speed = positions['Rahu']
+    positions['Ketu'] = ((rahu_lon + 180) % 360, rahu_speed)
+    return positions
+
+
+if __name__ == '__main__':
+    from astro_engine.engine.core.SiderealContext import AYANAMSA_MODES
+
+    for name in AYANAMSA_MODES:
+        print(name, ensure_table(name) or 'being built by another process')
@@ -0,0 +1,126 @@
+"""
+Precomputed KP star / sub / sub-sub lord boundaries.
+
+Every nakshatra (13°20') is divided among the nine Vimshottari lords in proportion to
+their dasha years, starting with the nakshatra's own lord; every sub is divided again the
+same way starting with the sub lord. The boundaries never change, so this module builds
+them once, at import, from exact fractions, and a lookup is a single ``bisect`` over a
+sorted list of start longitudes instead of rebuilding rotations and cumulative spans.
+
+Both tables are also split at sign boundaries, so no entry straddles two signs: there are
+249 subs (the KP horary numbers) and 2,193 sub-subs. Each entry is
+``(start, end, sign_index, nakshatra_index, lords)`` with ``lords`` the tuple of star,
+sub (and sub-sub) lords.
+
+The sign-split sub table is also the KP horary table: horary number n (1-249) is the
+ascendant at the start of ``SUB_TABLE[n - 1]``.
+"""
+from bisect import bisect_right
+from fractions import Fraction
+
+from astro_engine.engine.core.DashaTree import DASHA_SEQUENCE, DASHA_YEARS, VIMSHOTTARI_YEARS, vimshottari_sequence
+
+NAKSHATRA_SPAN = Fraction(40, 3)  # 13°20'
+SIGN_SPAN = 30
+
+
+def _divisions(start, span, first_lord):
+    """(lord, start, span) of the nine Vimshottari divisions of [start, start + span)."""
+    for lord in vimshottari_sequence(first_lord):
+        part = span * DASHA_YEARS[lord] / VIMSHOTTARI_YEARS
+        yield lord, start, part
+        start += part
+
+
+def _split_at_signs(divisions):
+    """Table entries for (start, span, nakshatra_index, lords), cut where a sign begins."""
+    entries = []
+    for start, span, nak_index, lords in divisions:
+        end = start + span
+        while start < end:
+            sign = int(start // SIGN_SPAN)
+            piece_end = min(end, (sign + 1) * SIGN_SPAN)
+            entries.append((float(start), float(piece_end), sign, nak_index, lords))
+            start = piece_end
+    return entries
+
+
+def _build_tables():
+    subs, sub_subs = [], []
+    for nak_index in range(27):
+        star = DASHA_SEQUENCE[nak_index % 9]
+        for sub, sub_start, sub_span in _divisions(nak_index * NAKSHATRA_SPAN, NAKSHATRA_SPAN, star):
+            subs.append((sub_start, sub_span, nak_index, (star, sub)))
+            for sub_sub, ss_start, ss_span in _divisions(sub_start, sub_span, sub):
+                sub_subs.append((ss_start, ss_span, nak_index, (star, sub, sub_sub)))
+    return _split_at_signs(subs), _split_at_signs(sub_subs)
+
+
+SUB_TABLE, SUB_SUB_TABLE = _build_tables()
+SUB_STARTS = [entry[0] for entry in SUB_TABLE]
+SUB_SUB_STARTS = [entry[0] for entry in SUB_SUB_TABLE]
+
+
+def sub_index(longitude):
+    """Index into ``SUB_TABLE`` of the sub containing ``longitude``."""
+    return bisect_right(SUB_STARTS, longitude % 360) - 1
+
+
+def sub_sub_index(longitude):
+    """Index into ``SUB_SUB_TABLE`` of the sub-sub containing ``longitude``."""
+    return bisect_right(SUB_SUB_STARTS, longitude % 360) - 1
+
+
+def kp_lords(longitude, levels=3):
+    """
+    The star, sub, sub-sub, ... lords of ``longitude``, as a list of ``levels`` names.
+
+    Up to three levels come straight from the tables; deeper levels keep dividing the
+    sub-sub in Vimshottari proportion.
+    """
+    lon = longitude % 360
+    if levels <= 2:
+        return list(SUB_TABLE[sub_index(lon)][4][:levels])
+
+    index = sub_sub_index(lon)
+    lords = list(SUB_SUB_TABLE[index][4])
+    if levels > 3:
+        # Table entries may be cut at a sign boundary; the undivided sub-sub starts at the
+        # first entry carrying the same lords.
+        while index > 0 and SUB_SUB_TABLE[index - 1][4] == SUB_SUB_TABLE[index][4]:
+            index -= 1
+        start, span = SUB_SUB_TABLE[index][0], _sub_sub_span(lords)
+        while len(lords) < levels:
+            for lord, part_start, part in _divisions(start, span, lords[-1]):
+                if lon < part_start + part:
+                    break
+            lords.append(lord)
+            start, span = part_start, part
+    return lords[:levels]
+
+
+def _sub_sub_span(lords):
+    _, sub, sub_sub = lords
+    return float(NAKSHATRA_SPAN) * DASHA_YEARS[sub] * DASHA_YEARS[sub_sub] / VIMSHOTTARI_YEARS ** 2
+
+
+def star_lord(longitude):
+    return kp_lords(longitude, 1)[0]
+
+
+def sub_lord(longitude):
+    return kp_lords(longitude, 2)[1]
+
+
+def sub_sub_lord(longitude):
+    return kp_lords(longitude, 3)[2]
+
+
+def horary_longitude(horary_number):
+    """Ascendant longitude of a KP horary number; numbers outside 1-249 are clamped."""
+    return SUB_TABLE[min(max(horary_number, 1), len(SUB_TABLE)) - 1][0]
+
+
+def horary_number(longitude):
+    """The KP horary number (1-249) whose sub contains ``longitude``."""
+    return sub_index(longitude) + 1
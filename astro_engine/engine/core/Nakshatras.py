@@ -0,0 +1,82 @@
+"""
+Exact nakshatra / pada / lord lookup.
+
+The zodiac holds 27 nakshatras of 13°20' and 108 padas of 3°20', so both are plain
+arithmetic on the longitude: the absolute pada is ``floor(lon * 108 / 360)`` and the
+nakshatra is that pada divided by four. Deriving the nakshatra from the pada keeps the two
+consistent right at a boundary, where separately rounded spans (13.333, 13.3333, 360 / 27)
+used to disagree by a pada or a nakshatra from one endpoint to the next.
+
+Modules index ``NAKSHATRA_NAMES`` (or their own list where their published spelling differs)
+with ``nakshatra_of``; lords follow the Vimshottari order from Ashwini.
+
+``absolute_padas`` / ``nakshatras_and_padas`` resolve a whole series of longitudes (the
+transit calendar's samples) in one comprehension, with the same arithmetic as the scalar
+functions.
+"""
+from astro_engine.engine.core.DashaTree import DASHA_SEQUENCE
+
+NAKSHATRA_COUNT = 27
+PADA_COUNT = 108
+NAKSHATRA_SPAN = 40 / 3  # 13°20'
+PADA_SPAN = 10 / 3  # 3°20'
+
+NAKSHATRA_NAMES = [
+    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu',
+    'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta',
+    'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 'Purva Ashadha',
+    'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada',
+    'Uttara Bhadrapada', 'Revati'
+]
+NAKSHATRA_LORDS = [DASHA_SEQUENCE[i % len(DASHA_SEQUENCE)] for i in range(NAKSHATRA_COUNT)]
+
+
+def absolute_pada(longitude):
+    """Index (0-107) of the pada containing ``longitude``, counted from 0° Aries."""
+    # lon * 108 / 360 == lon * 3 / 10; ``min`` catches -1e-20 % 360 == 360.0.
+    return min(int(longitude % 360 * 3 // 10), PADA_COUNT - 1)
+
+
+def nakshatra_of(longitude):
+    """Index (0-26) of the nakshatra containing ``longitude``."""
+    return absolute_pada(longitude) // 4
+
+
+def pada_of(longitude):
+    """Pada (1-4) of ``longitude`` within its nakshatra."""
+    return absolute_pada(longitude) % 4 + 1
+
+
+def nakshatra_and_pada(longitude):
+    """``(nakshatra index 0-26, pada 1-4)`` of ``longitude``."""
+    index, quarter = divmod(absolute_pada(longitude), 4)
+    return index, quarter + 1
+
+
+def nakshatra_start(index):
+    """Longitude at which nakshatra ``index`` begins."""
+    return index * NAKSHATRA_SPAN
+
+
+def nakshatra_offset(longitude):
+    """``(nakshatra index, degrees traversed within it)`` of ``longitude``."""
+    index = nakshatra_of(longitude)
+    return index, max(longitude % 360 - nakshatra_start(index), 0.0)
+
+
+def nakshatra_lord(index):
+    """Vimshottari lord of nakshatra ``index``."""
+    return NAKSHATRA_LORDS[index % NAKSHATRA_COUNT]
+
+
+def absolute_padas(longitudes):
+    """``absolute_pada`` of every longitude, as a list."""
+    # Inlined rather than calling absolute_pada, which would double the cost per item.
+    last = PADA_COUNT - 1
+    return [min(int(longitude % 360 * 3 // 10), last) for longitude in longitudes]
+
+
+def nakshatras_and_padas(longitudes):
+    """``(nakshatra indexes, padas)`` of every longitude; see ``nakshatra_and_pada``."""
+    padas = absolute_padas(longitudes)
+    return [pada // 4 for pada in padas], [pada % 4 + 1 for pada in padas]
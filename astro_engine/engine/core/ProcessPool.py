@@ -0,0 +1,141 @@
+"""
+Optional process pool for CPU-bound engine functions.
+
+Sookshma and prana dasha trees are built in pure Python and hold the GIL for the whole
+request, stalling every other thread of a gthread worker. Routes hand those functions to
+``run_in_pool``: with a pool configured they run in a warm worker process and the request
+thread only waits on the result; without one (the default) they run inline as before.
+Batch jobs that keep several calls in flight use ``pool.submit`` directly.
+
+The pool accepts at most ``size + queue_limit`` calls at a time. Further calls raise
+``PoolSaturated`` straight away, which routes turn into a 503 with a Retry-After header
+instead of letting requests pile up behind the workers.
+
+Size, queue limit and Retry-After default to ASTRO_PROCESS_POOL_SIZE (0 = disabled),
+ASTRO_PROCESS_POOL_QUEUE (default twice the size) and ASTRO_PROCESS_POOL_RETRY_AFTER
+(seconds, default 1), and can be changed at runtime with ``configure``.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_POOL_SIZE = int(os.environ.get('ASTRO_PROCESS_POOL_SIZE', 0))
+DEFAULT_QUEUE_LIMIT = os.environ.get('ASTRO_PROCESS_POOL_QUEUE')
+DEFAULT_RETRY_AFTER = int(os.environ.get('ASTRO_PROCESS_POOL_RETRY_AFTER', 1))
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when every worker is busy and the pool's queue is full."""
+
+    def __init__(self, retry_after):
+        super().__init__("Server busy, please retry shortly")
+        self.retry_after = retry_after
+
+
+def _noop():
+    return None
+
+
+class ProcessPool:
+    """Bounded ProcessPoolExecutor that fails fast instead of queueing without limit."""
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, queue_limit=DEFAULT_QUEUE_LIMIT,
+                 retry_after=DEFAULT_RETRY_AFTER):
+        self.size = int(size)
+        self.queue_limit = 2 * self.size if queue_limit is None else int(queue_limit)
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(self.size + self.queue_limit, 1))
+        self._executor = None
+        self.in_flight = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Worker processes must not be forked from a threaded server process.
+                context = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(self.size, mp_context=context)
+            return self._executor
+
+    def warm(self):
+        """Start every worker process now rather than on the first heavy request."""
+        if self.size:
+            executor = self._get_executor()
+            for future in [executor.submit(_noop) for _ in range(self.size)]:
+                future.result()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Start ``fn(*args, **kwargs)`` in a worker process and return its Future.
+
+        The call holds one of the pool's slots until it finishes. Raises PoolSaturated
+        when none is free. Only valid while the pool is enabled.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolSaturated(self.retry_after)
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            # A worker died (e.g. OOM-killed); start a fresh pool for the next call.
+            with self._lock:
+                self._executor = None
+        self._release()
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def run(self, fn, *args, **kwargs):
+        """Return ``fn(*args, **kwargs)``, computed in a worker process when the pool is enabled."""
+        if not self.size:
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+pool = ProcessPool()
+
+
+def configure(size=None, queue_limit=None, retry_after=None):
+    """Replace the shared pool; omitted settings keep their current values."""
+    global pool
+    old = pool
+    size = old.size if size is None else size
+    if queue_limit is None and size == old.size:
+        queue_limit = old.queue_limit
+    pool = ProcessPool(size, queue_limit, old.retry_after if retry_after is None else retry_after)
+    old.shutdown()
+    return pool
+
+
+def run_in_pool(fn, *args, **kwargs):
+    """Run ``fn`` on the shared pool (inline when it is disabled)."""
+    return pool.run(fn, *args, **kwargs)
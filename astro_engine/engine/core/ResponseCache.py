@@ -0,0 +1,327 @@
+"""
+Response cache for the chart endpoints, with ETags and conditional requests.
+
+Every chart endpoint is a pure function of the POSTed birth data, so a response can be
+reused for any later request to the same endpoint with the same body. The cache key is a
+SHA-256 of the endpoint path, the query string, the request body in canonical JSON (sorted
+keys, no whitespace), the negotiated response format and ENGINE_VERSION, so deploying a version that changes results only
+needs a new ASTRO_ENGINE_VERSION.
+
+Successful JSON and MessagePack responses carry an ``ETag`` (a hash of the body) and an ``X-Cache`` header.
+A request whose ``If-None-Match`` matches gets an empty 304. Endpoints that depend on the
+current time are kept only for ``SHORT_TTL_PATHS`` seconds; streamed responses and paths
+in ``EXCLUDED_PATHS`` are never cached.
+
+The backend is chosen by ASTRO_RESPONSE_CACHE: 'memory' (default, a per-process LRU of at
+most ASTRO_RESPONSE_CACHE_SIZE entries and ASTRO_RESPONSE_CACHE_MEMORY_BYTES bytes), 'disk' (files under ASTRO_RESPONSE_CACHE_DIR, shared by
+the workers of one host; expired entries, then the oldest ones beyond
+ASTRO_RESPONSE_CACHE_DISK_BYTES, are deleted by a sweep at most every
+ASTRO_RESPONSE_CACHE_SWEEP_SECONDS), 'redis' (ASTRO_RESPONSE_CACHE_URL, needs the optional ``redis``
+package) or 'off'. ASTRO_RESPONSE_CACHE_TTL sets the default lifetime in seconds (0 keeps
+entries until evicted) and responses larger than ASTRO_RESPONSE_CACHE_MAX_BYTES are not
+stored. Settings can be changed at runtime with ``configure``.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, g, request
+
+from astro_engine.engine.core.Serialization import MSGPACK_MIMETYPES, wants_msgpack
+
+logger = logging.getLogger(__name__)
+
+ENGINE_VERSION = os.environ.get('ASTRO_ENGINE_VERSION', '1')
+
+DEFAULT_BACKEND = os.environ.get('ASTRO_RESPONSE_CACHE', 'memory')
+DEFAULT_SIZE = int(os.environ.get('ASTRO_RESPONSE_CACHE_SIZE', 1024))
+DEFAULT_TTL = float(os.environ.get('ASTRO_RESPONSE_CACHE_TTL', 0))
+DEFAULT_DIR = os.environ.get('ASTRO_RESPONSE_CACHE_DIR',
+                             os.path.join(tempfile.gettempdir(), 'astro_engine_responses'))
+DEFAULT_URL = os.environ.get('ASTRO_RESPONSE_CACHE_URL', 'redis://localhost:6379/0')
+MAX_BODY_BYTES = int(os.environ.get('ASTRO_RESPONSE_CACHE_MAX_BYTES', 1024 * 1024))
+DEFAULT_MEMORY_BYTES = int(os.environ.get('ASTRO_RESPONSE_CACHE_MEMORY_BYTES', 64 * 1024 * 1024))
+DEFAULT_DISK_BYTES = int(os.environ.get('ASTRO_RESPONSE_CACHE_DISK_BYTES', 256 * 1024 * 1024))
+DEFAULT_SWEEP_SECONDS = float(os.environ.get('ASTRO_RESPONSE_CACHE_SWEEP_SECONDS', 60))
+
+# Endpoints whose result depends on the current time, with their lifetime in seconds.
+SHORT_TTL_PATHS = {
+    '/lahiri/transit': 60,
+    '/lahiri/current_dasha': 60,
+    '/raman/current_dasha': 60,
+    '/kp/current_dasha': 60,
+}
+# Bulk jobs: every body is different and responses can be arbitrarily large.
+EXCLUDED_PATHS = {'/lahiri/natal/bulk'}
+CACHEABLE_MIMETYPES = {'application/json', *MSGPACK_MIMETYPES}
+
+
+def _pack(etag, mimetype, expires_at, body):
+    header = json.dumps([etag, mimetype, expires_at]).encode()
+    return header + b'\n' + body
+
+
+def _unpack(blob):
+    header, body = blob.split(b'\n', 1)
+    etag, mimetype, expires_at = json.loads(header)
+    return etag, mimetype, expires_at, body
+
+
+class MemoryBackend:
+    """
+    Per-process LRU bounded by entry count and by the total size of the stored blobs.
+
+    Bodies vary from a few hundred bytes to ``MAX_BODY_BYTES``, so a count alone does not
+    bound the memory a worker holds; the least recently used entries are evicted until both
+    ``size`` and ``max_bytes`` are met.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE, max_bytes=DEFAULT_MEMORY_BYTES):
+        self.size = size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            blob = self._data.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return blob
+
+    def set(self, key, blob, ttl):
+        if self.size <= 0 or len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous)
+            self._data[key] = blob
+            self.bytes += len(blob)
+            while len(self._data) > self.size or self.bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.size,
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class DiskBackend:
+    """
+    One file per entry; files are replaced atomically, expired ones are ignored.
+
+    Writes trigger a ``sweep`` at most every ``sweep_interval`` seconds per process, which
+    keeps the directory within ``max_bytes``.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=DEFAULT_DISK_BYTES,
+                 sweep_interval=DEFAULT_SWEEP_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0
+        self.evicted = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.directory, key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, blob, ttl):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, os.path.join(self.directory, key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if time.time() >= self._next_sweep:
+            self.sweep()
+
+    def _remove(self, path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return  # another worker's sweep got there first
+        self.evicted += 1
+
+    def sweep(self):
+        """Delete expired entries, then the oldest ones until the rest fit in ``max_bytes``."""
+        now = time.time()
+        self._next_sweep = now + self.sweep_interval
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+                if entry.name.endswith('.tmp'):
+                    # Left behind by a worker that died mid-write.
+                    if stat.st_mtime < now - self.sweep_interval:
+                        os.unlink(entry.path)
+                    continue
+                with open(entry.path, 'rb') as f:
+                    expires_at = json.loads(f.readline())[2]
+            except (OSError, ValueError, IndexError):
+                continue
+            if expires_at and expires_at < now:
+                self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def stats(self):
+        return {'directory': self.directory, 'max_bytes': self.max_bytes, 'evicted': self.evicted}
+
+
+class RedisBackend:
+    """Any server speaking the Redis protocol; entries expire server-side."""
+
+    def __init__(self, url=DEFAULT_URL):
+        import redis  # optional dependency, only needed for this backend
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get('astro:response:' + key)
+
+    def set(self, key, blob, ttl):
+        self._client.set('astro:response:' + key, blob, ex=int(ttl) if ttl else None)
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+
+BACKENDS = {'memory': MemoryBackend, 'disk': DiskBackend, 'redis': RedisBackend}
+
+
+def make_backend(name):
+    if name == 'off':
+        return None
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown response cache backend: {name}")
+
+
+backend = make_backend(DEFAULT_BACKEND)
+default_ttl = DEFAULT_TTL
+
+
+def configure(backend_name=None, ttl=None):
+    """Switch backend ('memory', 'disk', 'redis' or 'off') and/or the default TTL."""
+    global backend, default_ttl
+    if backend_name is not None:
+        backend = make_backend(backend_name)
+    if ttl is not None:
+        default_ttl = ttl
+    return backend
+
+
+def cache_key(path, query, body, response_format='json'):
+    """Hex digest identifying one request to one endpoint for the current engine version."""
+    canonical = json.dumps([ENGINE_VERSION, path, sorted(query), body, response_format],
+                           sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _ttl_for(path):
+    return SHORT_TTL_PATHS.get(path, default_ttl)
+
+
+def _not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    return response
+
+
+def serve_cached_response():
+    """``before_request`` hook: answer from the cache when possible."""
+    if backend is None or request.method != 'POST' or request.path in EXCLUDED_PATHS:
+        return None
+    body = request.get_json(silent=True)
+    if body is None:
+        return None
+    response_format = 'msgpack' if wants_msgpack() else 'json'
+    key = cache_key(request.path, request.args.items(multi=True), body, response_format)
+    try:
+        blob = backend.get(key)
+    except Exception:
+        # A cache outage must not take the API down with it.
+        logger.warning("Response cache lookup failed", exc_info=True)
+        blob = None
+    if blob is not None:
+        etag, mimetype, expires_at, data = _unpack(blob)
+        if expires_at and expires_at < time.time():
+            blob = None
+    if blob is None:
+        g.response_cache_key = key
+        return None
+
+    if request.if_none_match.contains(etag):
+        return _not_modified(etag)
+    response = Response(data, mimetype=mimetype)
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    response.headers['X-Cache'] = 'HIT'
+    return response
+
+
+def store_response(response):
+    """``after_request`` hook: cache successful responses and honour If-None-Match."""
+    key = g.pop('response_cache_key', None)
+    if key is None or response.status_code != 200 or response.is_streamed \
+            or response.mimetype not in CACHEABLE_MIMETYPES:
+        return response
+    data = response.get_data()
+    etag = hashlib.sha256(data).hexdigest()[:32]
+    if len(data) <= MAX_BODY_BYTES and backend is not None:
+        ttl = _ttl_for(request.path)
+        expires_at = time.time() + ttl if ttl else 0
+        try:
+            backend.set(key, _pack(etag, response.mimetype, expires_at, data), ttl)
+        except Exception:
+            logger.warning("Response cache store failed", exc_info=True)
+    if request.if_none_match.contains(etag):
+        return _not_modified(etag)
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    response.headers['X-Cache'] = 'MISS'
+    return response
+
+
+def init_response_cache(app):
+    """Install the cache hooks on a Flask app."""
+    app.before_request(serve_cached_response)
+    app.after_request(store_response)
@@ -0,0 +1,189 @@
+"""
+Fast JSON and MessagePack serialization for API responses.
+
+Flask's default provider goes through the stdlib ``json`` module, which is the slowest part
+of serving a large dasha tree or shodasha summary. ``FastJSONProvider`` uses ``orjson``
+when it is installed and the stdlib otherwise; the output is the same JSON document either
+way (sorted keys, compact separators), except that orjson writes non-ASCII characters such
+as ``°`` as UTF-8 instead of ``\\u00b0`` escapes.
+
+Machine clients can ask for decimal degrees with ``?degrees=decimal``: every DMS string
+produced by the engines' ``format_dms`` helpers (``12° 3' 4.56"``) is replaced by the
+float it stands for (12.051267), rounded to ``DECIMAL_PLACES``. All other fields are left
+as they are.
+
+Service-to-service callers can send ``Accept: application/msgpack`` instead and get
+MessagePack in the compact numeric schema of ``numeric_schema``: DMS strings become decimal
+degrees, dicts keyed by planet become arrays in ``PLANET_ORDER`` (None where a planet is
+missing), and the values of known fields are converted: sign and planet names in
+``SIGN_FIELD`` / ``PLANET_FIELD`` fields become their index in ``SIGN_ORDER`` /
+``PLANET_ORDER``, and the start / end of a period (``DATE_FIELD``, the dasha boundaries)
+become Julian Day floats on the same clock as the string. Any other string is passed
+through: a user name that happens to be "Leo", and echoed input such as ``birth_date`` /
+``birth_time``, which stay a readable pair rather than half a JD. This needs the optional
+``msgpack`` package; without it every client gets JSON.
+
+Set ASTRO_JSON=stdlib to keep using the stdlib serializer even when orjson is available.
+"""
+import json
+import os
+import re
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+from astro_engine.engine.core import swe
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+USE_ORJSON = orjson is not None and os.environ.get('ASTRO_JSON', 'orjson') != 'stdlib'
+
+DECIMAL_PLACES = 6
+# Every DMS format used by the engines: with or without spaces, integer or decimal seconds.
+DMS_PATTERN = re.compile(r'^\s*(-?)(\d+)°\s*(\d+)\'\s*(\d+(?:\.\d+)?)"\s*$')
+
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+PLANET_ORDER = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu',
+                'Ascendant', 'Uranus', 'Neptune', 'Pluto']
+SIGN_ORDER = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+              'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+PLANET_INDEX = {name: i for i, name in enumerate(PLANET_ORDER)}
+SIGN_INDEX = {name: i for i, name in enumerate(SIGN_ORDER)}
+DATE_PATTERN = re.compile(r'^(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2})(?::(\d{2}(?:\.\d+)?))?)?(?: UTC)?$')
+# Response fields (dict keys; list items take their list's key) whose values numeric_schema converts.
+SIGN_FIELD = re.compile(r'^(sign|Sign|\w+_sign|D\d+|arudha_lagna|karkamsha_ascendant)$')
+PLANET_FIELD = re.compile(r'^(planets?|lord|\w+_lord|occupants|contributor|atmakaraka|nakshatra_planets'
+                          r'|ruling_planets|nakshatra_ruler|NL|RL|SL|SS|[ABCD])$')
+DATE_FIELD = re.compile(r'^(start|end|start_date|end_date)$')
+
+if orjson is not None:
+    # Dates keep going through ``default`` so they are formatted as Flask would.
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dms_to_decimal(text):
+    """The degrees a DMS string stands for, or None when ``text`` is not a DMS string."""
+    match = DMS_PATTERN.match(text)
+    if match is None:
+        return None
+    sign, d, m, s = match.groups()
+    value = round(int(d) + int(m) / 60 + float(s) / 3600, DECIMAL_PLACES)
+    return -value if sign else value
+
+
+def decimal_degrees(obj):
+    """Copy of ``obj`` with every DMS string replaced by decimal degrees."""
+    if isinstance(obj, dict):
+        return {key: decimal_degrees(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [decimal_degrees(value) for value in obj]
+    if isinstance(obj, str) and '°' in obj:
+        value = dms_to_decimal(obj)
+        return obj if value is None else value
+    return obj
+
+
+def date_to_jd(text):
+    """Julian Day of a 'YYYY-MM-DD[ HH:MM[:SS]][ UTC]' string, or None for anything else."""
+    match = DATE_PATTERN.match(text)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second = match.groups()
+    hours = int(hour or 0) + int(minute or 0) / 60 + float(second or 0) / 3600
+    return swe.julday(int(year), int(month), int(day), hours, swe.GREG_CAL)
+
+
+def _numeric_string(text, field):
+    if '°' in text:
+        value = dms_to_decimal(text)
+    elif not isinstance(field, str):
+        value = None
+    elif SIGN_FIELD.match(field):
+        value = SIGN_INDEX.get(text)
+    elif PLANET_FIELD.match(field):
+        value = PLANET_INDEX.get(text)
+    elif DATE_FIELD.match(field):
+        value = date_to_jd(text)
+    else:
+        value = None
+    return text if value is None else value
+
+
+def numeric_schema(obj, field=None):
+    """Copy of ``obj`` in the compact numeric schema described in the module docstring."""
+    if isinstance(obj, dict):
+        if obj and all(key in PLANET_INDEX for key in obj):
+            values = [None] * (max(PLANET_INDEX[key] for key in obj) + 1)
+            for key, value in obj.items():
+                values[PLANET_INDEX[key]] = numeric_schema(value, key)
+            return values
+        return {key: numeric_schema(value, key) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [numeric_schema(value, field) for value in obj]
+    if isinstance(obj, str):
+        return _numeric_string(obj, field)
+    return obj
+
+
+def wants_msgpack():
+    """True when the current request prefers MessagePack and it can be produced."""
+    if msgpack is None or not has_request_context():
+        return False
+    accept = request.accept_mimetypes
+    best = accept.best_match(('application/json',) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES and accept[best] > accept['application/json']
+
+
+def wants_decimal_degrees():
+    """True when the current request asked for decimal degrees (?degrees=decimal)."""
+    return has_request_context() and request.args.get('degrees') == 'decimal'
+
+
+def dumps(obj, default=None):
+    """Serialize ``obj`` to a compact JSON string with sorted keys."""
+    if USE_ORJSON:
+        try:
+            return orjson.dumps(obj, default=default, option=ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the stdlib have a go
+    return json.dumps(obj, default=default, sort_keys=True, separators=(',', ':'))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes with ``dumps`` and honours ?degrees=decimal and msgpack."""
+
+    def dumps(self, obj, **kwargs):
+        # Pretty-printing or other stdlib options (debug mode, explicit calls) keep the
+        # stdlib path; plain compact output takes the fast one.
+        if kwargs.keys() <= {'separators'}:
+            return dumps(obj, default=self.default)
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if wants_msgpack():
+            obj = numeric_schema(self._prepare_response_obj(args, kwargs))
+            response = self._app.response_class(
+                msgpack.packb(obj, default=self.default), mimetype=MSGPACK_MIMETYPES[0])
+            response.vary.add('Accept')
+            return response
+        if wants_decimal_degrees():
+            args = tuple(decimal_degrees(arg) for arg in args)
+            kwargs = decimal_degrees(kwargs)
+        response = super().response(*args, **kwargs)
+        if msgpack is not None:
+            response.vary.add('Accept')
+        return response
+
+
+def init_json(app):
+    """Serialize every ``jsonify`` / dict response of ``app`` with ``FastJSONProvider``."""
+    app.json = FastJSONProvider(app)
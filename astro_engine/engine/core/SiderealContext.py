@@ -0,0 +1,23 @@
+"""
+Ayanamsa names understood by the engines.
+
+Callers name an ayanamsa ('lahiri', 'raman', 'kp') or pass a ``swe.SIDM_*`` constant;
+``resolve_ayanamsa_mode`` turns either into the mode ``swe.sidereal_mode`` switches to.
+"""
+from astro_engine.engine.core import swe
+
+AYANAMSA_MODES = {
+    'lahiri': swe.SIDM_LAHIRI,
+    'raman': swe.SIDM_RAMAN,
+    'kp': swe.SIDM_KRISHNAMURTI,
+}
+
+
+def resolve_ayanamsa_mode(ayanamsa):
+    """Accept either a name from AYANAMSA_MODES or a swe.SIDM_* constant."""
+    if isinstance(ayanamsa, str):
+        try:
+            return AYANAMSA_MODES[ayanamsa.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown ayanamsa: {ayanamsa}")
+    return int(ayanamsa)
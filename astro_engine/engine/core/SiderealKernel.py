@@ -0,0 +1,141 @@
+"""
+Sidereal kernel: the helpers every engine module needs, in one place.
+
+Birth-time to Julian Day conversion, sign / house arithmetic, DMS formatting and batched
+sidereal positions used to be copy-pasted into nearly every engine module, each copy
+with its own rounding. They live here now, next to the pieces core already shares:
+
+- ``get_julian_day`` parses a local birth date / time once per distinct input (the same
+  profile is converted by twenty-odd endpoints) and ``local_to_utc`` / ``utc_to_jd``
+  cover callers that need the UTC datetime in between.
+- ``sign_of`` / ``get_sign`` / ``longitude_to_sign`` and the whole-sign ``get_house``
+  normalise the longitude first, so 360° is Aries rather than an IndexError.
+- ``dms`` splits an angle into degrees, minutes and seconds from one integer count of
+  the requested precision, so seconds never print as 60; ``format_dms`` is the common
+  ``12° 3' 4.56"`` form and modules with another published format build theirs on ``dms``.
+- ``sidereal_positions`` / ``sidereal_ascendant`` compute a set of bodies for one
+  ayanamsa under a single ``swe.sidereal_mode`` block.
+
+Nakshatra tables and lookups live in ``Nakshatras``, ayanamsa names in
+``SiderealContext`` and per-chart memoised positions in ``ChartSnapshot``. Only the
+nakshatra names and lords are re-exported here, for the engines that import them with
+the sign helpers; ``__all__`` lists what engines import from this module.
+"""
+import math
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import NAKSHATRA_LORDS, NAKSHATRA_NAMES
+from astro_engine.engine.core.SiderealContext import resolve_ayanamsa_mode
+
+__all__ = [
+    'SIGNS', 'NAKSHATRA_NAMES', 'NAKSHATRA_LORDS',
+    'local_to_utc', 'utc_to_jd', 'get_julian_day',
+    'sign_of', 'get_sign', 'longitude_to_sign', 'whole_sign_house', 'house_of_sign', 'get_house',
+    'dms', 'format_dms', 'sidereal_positions', 'sidereal_ascendant',
+]
+
+SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+SIGN_INDEX = {name: i for i, name in enumerate(SIGNS)}
+
+BIRTH_FORMAT = '%Y-%m-%d %H:%M:%S'
+POSITION_FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+
+# --- Julian Day -------------------------------------------------------------------------
+
+def local_to_utc(birth_date, birth_time, tz_offset):
+    """UTC datetime of a local 'YYYY-MM-DD' date and 'HH:MM:SS' time at ``tz_offset`` hours."""
+    local_dt = datetime.strptime(f"{birth_date} {birth_time}", BIRTH_FORMAT)
+    return local_dt - timedelta(hours=float(tz_offset))
+
+
+def utc_to_jd(ut_dt):
+    """Julian Day (UT, Gregorian calendar) of a UTC datetime."""
+    hour_decimal = ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0
+    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
+
+
+@lru_cache(maxsize=4096)
+def _julian_day(birth_date, birth_time, tz_offset):
+    return utc_to_jd(local_to_utc(birth_date, birth_time, tz_offset))
+
+
+def get_julian_day(birth_date, birth_time, tz_offset):
+    """Julian Day (UT) of a local birth date ('YYYY-MM-DD') and time ('HH:MM:SS')."""
+    return _julian_day(birth_date, birth_time, float(tz_offset))
+
+
+# --- Signs and houses -------------------------------------------------------------------
+
+def sign_of(longitude):
+    """Sign index (0 = Aries ... 11 = Pisces) of ``longitude``."""
+    return int(longitude % 360 // 30) % 12
+
+
+def get_sign(longitude):
+    """Sign name of ``longitude``."""
+    return SIGNS[sign_of(longitude)]
+
+
+def longitude_to_sign(longitude):
+    """``(sign name, degrees within the sign)`` of ``longitude``."""
+    return SIGNS[sign_of(longitude)], longitude % 30
+
+
+def whole_sign_house(sign_index, asc_sign_index):
+    """Whole-sign house (1-12) of a sign counted from the ascendant's sign."""
+    return (sign_index - asc_sign_index) % 12 + 1
+
+
+def house_of_sign(sign, asc_sign):
+    """``whole_sign_house`` for sign names."""
+    return whole_sign_house(SIGN_INDEX[sign], SIGN_INDEX[asc_sign])
+
+
+def get_house(longitude, asc_sign_index, orientation_shift=0):
+    """Whole-sign house (1-12) of ``longitude`` for an ascendant in sign ``asc_sign_index``."""
+    return whole_sign_house(sign_of(longitude) + orientation_shift, asc_sign_index)
+
+
+# --- Formatting -------------------------------------------------------------------------
+
+def dms(degrees, places=2, truncate=False):
+    """
+    ``(degrees, minutes, seconds)`` of ``abs(degrees)``, seconds rounded to ``places``
+    decimals (or truncated), carrying into minutes and degrees instead of showing 60.
+    Seconds are an int when ``places`` is 0.
+    """
+    scale = 10 ** places
+    units = abs(degrees) * 3600 * scale
+    units = math.floor(units) if truncate else round(units)
+    d, rest = divmod(units, 3600 * scale)
+    m, s = divmod(rest, 60 * scale)
+    return int(d), int(m), (s if places == 0 else s / scale)
+
+
+def format_dms(degrees, places=2, separator=' ', truncate=False):
+    """``degrees`` as ``12° 3' 4.56"``; ``separator`` goes between the three parts."""
+    d, m, s = dms(degrees, places, truncate)
+    sign = '-' if degrees < 0 and (d or m or s) else ''
+    return f"{sign}{d}°{separator}{m}'{separator}{s:.{places}f}\""
+
+
+# --- Positions --------------------------------------------------------------------------
+
+def sidereal_positions(jd_ut, bodies, ayanamsa='lahiri', flags=POSITION_FLAGS):
+    """
+    ``{name: swe.calc_ut result}`` for every ``(name, body id)`` in ``bodies``, computed
+    with ``flags`` in one ayanamsa. Add FLG_SIDEREAL to ``flags`` for sidereal output.
+    """
+    with swe.sidereal_mode(resolve_ayanamsa_mode(ayanamsa)):
+        return {name: swe.calc_ut(jd_ut, body, flags) for name, body in bodies}
+
+
+def sidereal_ascendant(jd_ut, latitude, longitude, ayanamsa='lahiri', hsys=b'P'):
+    """Sidereal ascendant: the tropical ascendant of ``hsys`` less the mean ayanamsa."""
+    with swe.sidereal_mode(resolve_ayanamsa_mode(ayanamsa)):
+        _, ascmc = swe.houses(jd_ut, latitude, longitude, hsys)
+        return (ascmc[0] - swe.get_ayanamsa_ut(jd_ut)) % 360
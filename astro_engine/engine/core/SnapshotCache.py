@@ -0,0 +1,100 @@
+"""
+Bounded in-process cache of ChartSnapshot objects.
+
+Saved profiles are re-fetched on every screen of the app, so the same birth moment and
+place is charted over and over. Snapshots are kept in a thread-safe LRU with an optional
+time-to-live and served from memory on repeat requests.
+
+Size and TTL default to ASTRO_SNAPSHOT_CACHE_SIZE / ASTRO_SNAPSHOT_CACHE_TTL from the
+environment and can be changed at runtime with ``configure``.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = int(os.environ.get('ASTRO_SNAPSHOT_CACHE_SIZE', 2048))
+# Seconds; 0 keeps entries until they are evicted by size.
+DEFAULT_TTL = float(os.environ.get('ASTRO_SNAPSHOT_CACHE_TTL', 0))
+
+
+class LRUCache:
+    """Least-recently-used mapping with optional expiry and hit/miss counters."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None, refreshing its recency."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self.ttl or time.monotonic() - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting the least recently used entries."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for ``key``, building and storing it with ``factory()`` on a miss."""
+        value = self.get(key)
+        if value is None:
+            # Built outside the lock: two threads missing on the same key both compute,
+            # which is cheaper than serialising every miss behind one lock.
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def configure(self, maxsize=None, ttl=None):
+        """Change size and/or TTL; shrinking evicts the oldest entries immediately."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            while len(self._data) > max(self.maxsize, 0):
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Counters and occupancy as a JSON-serialisable dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
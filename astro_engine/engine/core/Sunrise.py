@@ -0,0 +1,86 @@
+"""
+Cached sunrise / sunset times.
+
+``swe.rise_trans`` is one of the most expensive Swiss Ephemeris calls, and the hora and
+bhava lagna engines need a sunrise for every chart. Sunrise only depends on the day and
+the place, so results are kept in an LRU keyed by (local date, latitude and longitude
+rounded to 0.01°, rise/set flags). 0.01° moves a sunrise by a few seconds at most, and
+the times are always computed for the rounded place so a cached value does not depend on
+which request filled it.
+
+The local date is the mean solar date at the place, so no timezone is needed. The
+cache size defaults to ASTRO_SUNRISE_CACHE_SIZE; ``precompute`` fills it for a list of
+places, e.g. the cities most users are born in.
+"""
+import os
+from datetime import date, timedelta
+
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.SnapshotCache import LRUCache
+
+DEFAULT_CACHE_SIZE = int(os.environ.get('ASTRO_SUNRISE_CACHE_SIZE', 65536))
+COORDINATE_PRECISION = 2
+
+# Hindu sunrise: the centre of the disc on the true horizon, without refraction.
+RISE_FLAGS = swe.CALC_RISE | swe.BIT_DISC_CENTER | swe.BIT_NO_REFRACTION
+SET_FLAGS = swe.CALC_SET | swe.BIT_DISC_CENTER | swe.BIT_NO_REFRACTION
+
+sunrise_cache = LRUCache(DEFAULT_CACHE_SIZE, 0)
+
+
+def local_date(jd_ut, longitude):
+    """Mean solar calendar date at ``longitude`` for a UT Julian Day."""
+    year, month, day, _ = swe.revjul(jd_ut + longitude / 360.0, swe.GREG_CAL)
+    return date(year, month, day)
+
+
+def _solar_event(day, latitude, longitude, rsmi):
+    """First Sun event of kind ``rsmi`` after local mean midnight of ``day``, or None."""
+    lat = round(float(latitude), COORDINATE_PRECISION)
+    lon = round(float(longitude), COORDINATE_PRECISION)
+    key = (day.toordinal(), lat, lon, rsmi)
+    cached = sunrise_cache.get(key)
+    if cached is None:
+        midnight = swe.julday(day.year, day.month, day.day, 0.0, swe.GREG_CAL) - lon / 360.0
+        ret, tret = swe.rise_trans(midnight, swe.SUN, rsmi, (lon, lat, 0.0))
+        # ret is -2 when the Sun does not rise or set that day (polar day / night).
+        event_jd = tret[0] if ret == 0 and tret[0] - midnight < 1.0 else None
+        cached = (event_jd,)
+        sunrise_cache.put(key, cached)
+    return cached[0]
+
+
+def sunrise(day, latitude, longitude, flags=RISE_FLAGS):
+    """Julian Day (UT) of sunrise on local date ``day``, or None if the Sun does not rise."""
+    return _solar_event(day, latitude, longitude, flags)
+
+
+def sunset(day, latitude, longitude, flags=SET_FLAGS):
+    """Julian Day (UT) of sunset on local date ``day``, or None if the Sun does not set."""
+    return _solar_event(day, latitude, longitude, flags)
+
+
+def sunrise_before(jd_ut, latitude, longitude, flags=RISE_FLAGS):
+    """
+    The last sunrise at or before ``jd_ut``: that day's, or the previous day's for a
+    moment before sunrise. None when neither day has one.
+    """
+    day = local_date(jd_ut, longitude)
+    rise_jd = sunrise(day, latitude, longitude, flags)
+    if rise_jd is None or rise_jd > jd_ut:
+        rise_jd = sunrise(day - timedelta(days=1), latitude, longitude, flags)
+    return rise_jd
+
+
+def precompute(places, start, days, flags=(RISE_FLAGS, SET_FLAGS)):
+    """
+    Fill the cache for ``days`` local dates from ``start`` at every (latitude, longitude)
+    in ``places``. Returns the number of entries computed or refreshed.
+    """
+    count = 0
+    for latitude, longitude in places:
+        for offset in range(days):
+            for rsmi in flags:
+                _solar_event(start + timedelta(days=offset), latitude, longitude, rsmi)
+                count += 1
+    return count
@@ -0,0 +1,125 @@
+"""
+Table-driven shodasha varga engine (D1-D60).
+
+The varga rules in LahiriVarghSigns / RamanVarghaSigns / KpShodashVargha are if-chains
+evaluated per planet per chart. Every rule only depends on the natal sign and on which
+part of that sign the longitude falls into, so this module expands them once, at import,
+into lookup tables ``VARGA_TABLES[scheme][chart][sign][part]``. A whole summary is then one
+index computation and one table read per (planet, chart) pair.
+
+D30 is the only varga with unequal parts; all of its boundaries fall on whole degrees, so
+its table is indexed by degree (30 parts) instead of by trimshamsha.
+
+Schemes follow the modules they replace: 'lahiri' starts water signs at Cancer in D20,
+'raman' and 'kp' start them at Gemini.
+"""
+
+SHODASHA_VARGAS = [
+    ("D1", 1), ("D2", 2), ("D3", 3), ("D4", 4), ("D7", 7), ("D9", 9), ("D10", 10),
+    ("D12", 12), ("D16", 16), ("D20", 20), ("D24", 24), ("D27", 27), ("D30", 30), ("D40", 40),
+    ("D45", 45), ("D60", 60)
+]
+
+# Start sign per element (fire, earth, air, water); element of a sign is sign % 4.
+_D9_STARTS = (0, 9, 6, 3)
+_D27_STARTS = (0, 3, 6, 9)
+_D20_STARTS = {
+    'lahiri': (0, 8, 4, 3),
+    'raman': (0, 8, 4, 2),
+    'kp': (0, 8, 4, 2),
+}
+
+# D30 rulers by whole degree: (upper bound, sign) for odd and even signs.
+_D30_ODD = ((5, 0), (10, 10), (18, 2), (25, 6), (30, 8))
+_D30_EVEN = ((5, 1), (12, 5), (20, 11), (25, 9), (30, 7))
+
+
+def _varga_sign(chart, sign, part, d20_starts):
+    """Varga sign for ``part`` (0-based) of natal ``sign``; parts for D30 are whole degrees."""
+    odd = sign % 2 == 0  # Aries (index 0) is an odd sign
+    if chart == "D1":
+        return sign
+    if chart == "D2":
+        return (4 if part == 0 else 3) if odd else (3 if part == 0 else 4)
+    if chart == "D3":
+        return (sign + 4 * part) % 12
+    if chart == "D4":
+        return (sign + 3 * part) % 12
+    if chart == "D7":
+        start = sign if odd else (sign + 6) % 12
+    elif chart == "D9":
+        start = _D9_STARTS[sign % 4]
+    elif chart == "D10":
+        start = sign if odd else (sign + 8) % 12
+    elif chart in ("D12", "D60"):
+        start = sign
+    elif chart == "D16":
+        start = (0, 4, 8)[sign % 3]
+    elif chart == "D20":
+        start = d20_starts[sign % 4]
+    elif chart == "D24":
+        start = 4 if odd else 3
+    elif chart == "D27":
+        start = _D27_STARTS[sign % 4]
+    elif chart == "D30":
+        for bound, ruler in (_D30_ODD if odd else _D30_EVEN):
+            if part < bound:
+                return ruler
+    elif chart == "D40":
+        start = 0 if odd else 6
+    elif chart == "D45":
+        start = 0 if odd else 8
+    else:
+        raise ValueError("Unknown Varga chart: %s" % chart)
+    return (start + part) % 12
+
+
+def _build_tables(d20_starts):
+    return {
+        chart: tuple(
+            tuple(_varga_sign(chart, sign, part, d20_starts) for part in range(divisions))
+            for sign in range(12)
+        )
+        for chart, divisions in SHODASHA_VARGAS
+    }
+
+
+VARGA_TABLES = {scheme: _build_tables(starts) for scheme, starts in _D20_STARTS.items()}
+
+
+def varga_matrix(longitudes, scheme='lahiri', charts=SHODASHA_VARGAS):
+    """
+    Varga signs and degrees for several sidereal longitudes at once.
+
+    Returns one row per longitude and one ``(sign_index, degrees_in_sign)`` pair per chart
+    in ``charts`` (a list of (name, divisions) pairs). Degrees are the longitude in the
+    varga's own zodiac, ``(deg_in_sign * divisions) % 30``.
+    """
+    try:
+        tables = VARGA_TABLES[scheme]
+    except KeyError:
+        raise ValueError(f"Unknown varga scheme: {scheme}")
+    columns = [(tables[chart], divisions) for chart, divisions in charts]
+
+    matrix = []
+    for lon in longitudes:
+        lon %= 360
+        sign = int(lon // 30)
+        deg_in_sign = lon - sign * 30
+        row = []
+        for table, divisions in columns:
+            scaled = deg_in_sign * divisions
+            part = int(deg_in_sign) if divisions == 30 else int(scaled // 30)
+            row.append((table[sign][part], scaled % 30))
+        matrix.append(row)
+    return matrix
+
+
+def varga_sign_summary(positions, scheme='lahiri', charts=SHODASHA_VARGAS):
+    """``{name: {chart: sign_index}}`` for a ``{name: sidereal_longitude}`` mapping."""
+    names = list(positions)
+    matrix = varga_matrix([positions[name] for name in names], scheme, charts)
+    return {
+        name: {chart: sign for (chart, _), (sign, _) in zip(charts, row)}
+        for name, row in zip(names, matrix)
+    }
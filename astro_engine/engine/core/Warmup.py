@@ -0,0 +1,86 @@
+"""
+Warm a process up before it serves requests.
+
+A fresh worker pays on its first requests for reading the Swiss Ephemeris files, mapping
+the transit ephemeris table and building constant tables. ``warmup`` does all of that up
+front. Run in the gunicorn master before it forks (``--preload`` with ASTRO_WARMUP=1), the
+imported modules and tables end up in memory pages every worker shares copy-on-write, and
+the ephemeris files are in the page cache.
+
+Swiss Ephemeris keeps its files open with a shared file offset, which forked workers must
+not inherit, so ``warmup`` closes them again once read (``swe.close`` keeps the configured
+path); each worker reopens them on its first calculation, straight from the page cache.
+
+ASTRO_WARMUP_TABLES lists the ayanamsas whose transit table is built and mapped (default
+'lahiri', the one the transit endpoints use).
+"""
+import gc
+import os
+import time
+
+from astro_engine.engine.core import Ephemeris, swe
+from astro_engine.engine.core.Ephemeris import EPHEMERIS_ENABLED, END_YEAR, START_YEAR
+
+WARMUP_TABLES = [name for name in os.environ.get('ASTRO_WARMUP_TABLES', 'lahiri').split(',') if name]
+WARMUP_BODIES = [swe.SUN, swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS, swe.JUPITER, swe.SATURN,
+                 swe.URANUS, swe.NEPTUNE, swe.PLUTO, swe.MEAN_NODE, swe.TRUE_NODE]
+# Each planet / moon file spans 600 years; sampling every 10 years touches every file in
+# range, and each file's index, without reading all of it.
+WARMUP_STEP_YEARS = 10
+
+
+def touch_ephemeris(start_year=START_YEAR, end_year=END_YEAR, step_years=WARMUP_STEP_YEARS):
+    """
+    Read every ephemeris file covering [start_year, end_year]; returns the calls made.
+
+    Raises RuntimeError when a body was not read from the files, so a warmup in a thread
+    that would fall back to Moshier fails instead of reporting the instance warm.
+    """
+    calls = 0
+    for year in range(start_year, end_year + 1, step_years):
+        jd = swe.julday(year, 1, 1, 0.0)
+        for body in WARMUP_BODIES:
+            _, ret = swe.calc_ut(jd, body, swe.FLG_SWIEPH | swe.FLG_SPEED)
+            if not ret & swe.FLG_SWIEPH:
+                raise RuntimeError(
+                    f"Body {body} at JD {jd} did not come from the Swiss Ephemeris files "
+                    f"(return flags {ret})")
+            calls += 1
+    return calls
+
+
+def map_tables(ayanamsas=WARMUP_TABLES):
+    """Build (if missing) and map the transit ephemeris table of every ayanamsa."""
+    if not EPHEMERIS_ENABLED:
+        return []
+    mapped = []
+    for ayanamsa in ayanamsas:
+        Ephemeris.ensure_table(ayanamsa)
+        if Ephemeris.get_table(ayanamsa) is not None:
+            mapped.append(ayanamsa)
+    return mapped
+
+
+def warmup(before_fork=False):
+    """
+    Touch the ephemeris files and map the transit tables. With
+    ``before_fork`` the ephemeris files are closed afterwards and the garbage collector
+    is frozen, so the forked workers share the warmed pages.
+
+    Returns the time spent in each step, in milliseconds.
+    """
+    timings = {}
+    started = time.perf_counter()
+    touch_ephemeris()
+    timings['ephemeris_files'] = round((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    map_tables()
+    timings['transit_tables'] = round((time.perf_counter() - started) * 1000)
+
+    if before_fork:
+        swe.close()
+        # Keep the collector from touching, and so copying, every object built so far.
+        gc.collect()
+        gc.freeze()
+    return timings
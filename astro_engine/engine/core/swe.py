@@ -0,0 +1,198 @@
+"""
+Thread-safe stand-in for the ``swisseph`` module.
+
+Swiss Ephemeris keeps the sidereal mode in process-global C state, so with threaded
+workers a Raman request can call ``set_sid_mode`` between a Lahiri request's own
+``set_sid_mode`` and ``calc_ut`` and the Lahiri chart comes out with the Raman ayanamsa.
+
+Depending on how pyswisseph was compiled that C state is either shared by the whole
+process or kept per OS thread, and neither matches how the engine uses it (a mode set at
+import time only reaches the importing thread in the latter case).
+
+Engine modules import this module as ``swe`` instead of ``swisseph``. Everything is
+re-exported unchanged, except that ``set_sid_mode`` only records the mode for the calling
+thread and every mode- or ephemeris-dependent call applies that thread's mode under
+``SWE_LOCK`` before it runs. The ephemeris path is C state of the same kind, so the same
+step also points a thread that has not done so yet at the configured path.
+
+This module is also the one place the ephemeris path is configured: importing it points the
+library at ``EPHE_PATH`` (ASTRO_EPHE_PATH, else the package's ``ephe`` directory, resolved
+independently of the working directory). A wrong path does not raise; Swiss Ephemeris
+quietly falls back to the lower-precision Moshier model and only the flags returned by
+``calc_ut`` tell. ``ephemeris_status`` probes those flags and lists the files opened, and
+``require_swiss_ephemeris`` refuses to carry on without the files.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+import swisseph as _swe
+from swisseph import *  # noqa: F401,F403 - constants and mode-independent functions
+
+# Serializes every Swiss Ephemeris call that depends on the global sidereal mode.
+SWE_LOCK = threading.RLock()
+
+# Swiss Ephemeris starts out in Fagan/Bradley mode until set_sid_mode is called.
+DEFAULT_SID_MODE = (_swe.SIDM_FAGAN_BRADLEY, 0.0, 0.0)
+
+_thread_state = threading.local()
+# (thread ident, sid mode) of the last set_sid_mode pushed into the library.
+_applied_sid_mode = None
+
+# Directory holding the .se1 files. Shadows swisseph.EPHE_PATH, the library's compiled-in
+# default search path.
+EPHE_PATH = os.environ.get('ASTRO_EPHE_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'ephe')
+# Bodies whose calc_ut return flags show which ephemeris answered, and the epoch they are
+# probed at (J2000, inside the sepl_18 / semo_18 files).
+PROBE_BODIES = (('Sun', _swe.SUN), ('Moon', _swe.MOON))
+PROBE_JD = 2451545.0
+# Slots of swe_get_current_file_data.
+EPHE_FILE_SLOTS = ('planets', 'moon', 'main_asteroids', 'asteroid', 'stars')
+
+# Path every thread applies before its first calculation; see set_ephe_path.
+_ephe_path = EPHE_PATH
+
+
+def set_sid_mode(mode, t0=0.0, ayan_t0=0.0):
+    """Select the sidereal mode for the calling thread only."""
+    _thread_state.sid_mode = (mode, t0, ayan_t0)
+
+
+def get_sid_mode():
+    """Return the (mode, t0, ayan_t0) tuple selected by the calling thread."""
+    return getattr(_thread_state, 'sid_mode', DEFAULT_SID_MODE)
+
+
+def _apply_ephe_path():
+    """Point the calling thread at the configured ephemeris path. Caller must hold SWE_LOCK."""
+    global _applied_sid_mode
+    if getattr(_thread_state, 'ephe_path', None) != _ephe_path:
+        _swe.set_ephe_path(_ephe_path)
+        _thread_state.ephe_path = _ephe_path
+        # Setting the path resets the library's sidereal mode along with its file state.
+        _applied_sid_mode = None
+
+
+def _apply_sid_mode(sid_mode):
+    """Push a sidereal mode into the library. Caller must hold SWE_LOCK."""
+    global _applied_sid_mode
+    applied = (threading.get_ident(), sid_mode)
+    if _applied_sid_mode != applied:
+        _swe.set_sid_mode(*sid_mode)
+        _applied_sid_mode = applied
+
+
+@contextmanager
+def sidereal_mode(mode, t0=0.0, ayan_t0=0.0):
+    """
+    Hold the library in one sidereal mode for a block of calls.
+
+    Calls made through this module inside the block use ``mode`` regardless of the
+    calling thread's own ``set_sid_mode`` selection.
+    """
+    with SWE_LOCK:
+        previous = getattr(_thread_state, 'sid_mode', None)
+        _thread_state.sid_mode = (mode, t0, ayan_t0)
+        try:
+            _apply_ephe_path()
+            _apply_sid_mode(_thread_state.sid_mode)
+            yield
+        finally:
+            if previous is None:
+                del _thread_state.sid_mode
+            else:
+                _thread_state.sid_mode = previous
+
+
+def _with_thread_sid_mode(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with SWE_LOCK:
+            _apply_ephe_path()
+            _apply_sid_mode(get_sid_mode())
+            return func(*args, **kwargs)
+    return wrapper
+
+
+calc = _with_thread_sid_mode(_swe.calc)
+calc_ut = _with_thread_sid_mode(_swe.calc_ut)
+houses_ex = _with_thread_sid_mode(_swe.houses_ex)
+houses_ex2 = _with_thread_sid_mode(_swe.houses_ex2)
+get_ayanamsa = _with_thread_sid_mode(_swe.get_ayanamsa)
+get_ayanamsa_ut = _with_thread_sid_mode(_swe.get_ayanamsa_ut)
+get_ayanamsa_ex = _with_thread_sid_mode(_swe.get_ayanamsa_ex)
+get_ayanamsa_ex_ut = _with_thread_sid_mode(_swe.get_ayanamsa_ex_ut)
+fixstar_ut = _with_thread_sid_mode(_swe.fixstar_ut)
+fixstar2_ut = _with_thread_sid_mode(_swe.fixstar2_ut)
+nod_aps_ut = _with_thread_sid_mode(_swe.nod_aps_ut)
+rise_trans = _with_thread_sid_mode(_swe.rise_trans)
+rise_trans_true_hor = _with_thread_sid_mode(_swe.rise_trans_true_hor)
+pheno_ut = _with_thread_sid_mode(_swe.pheno_ut)
+
+
+def set_ephe_path(path=EPHE_PATH):
+    """
+    Point the library at the .se1 files in ``path``. Applied to the calling thread now and
+    to every other thread before its next calculation.
+    """
+    global _ephe_path
+    with SWE_LOCK:
+        _ephe_path = path
+        _apply_ephe_path()
+
+
+def close():
+    """
+    Close the ephemeris files and reset the library, e.g. before forking workers that must
+    not share open file offsets. The ephemeris path is set again straight away.
+    """
+    global _applied_sid_mode
+    with SWE_LOCK:
+        _swe.close()
+        # swe_close also resets the sidereal mode and the path inside the library.
+        _applied_sid_mode = None
+        _thread_state.ephe_path = None
+        _apply_ephe_path()
+
+
+def ephemeris_status(jd_ut=PROBE_JD):
+    """
+    Which ephemeris ``calc_ut`` actually uses: ``mode`` is 'swiss' when every probe body
+    was read from the .se1 files, 'moshier' when none was and 'mixed' otherwise. ``files``
+    lists the files the library has open after the probe. The probe runs in the calling
+    thread after the same path step as every wrapped calculation, so it reports what that
+    thread's calculations read.
+    """
+    with SWE_LOCK:
+        _apply_ephe_path()
+        flags = {name: _swe.calc_ut(jd_ut, body, _swe.FLG_SWIEPH)[1] for name, body in PROBE_BODIES}
+        files = {}
+        for slot, kind in enumerate(EPHE_FILE_SLOTS):
+            path, start, end, denum = _swe.get_current_file_data(slot)
+            if path and denum:
+                files[kind] = {"path": path, "start_jd": start, "end_jd": end, "de_number": denum}
+    swiss = [name for name, flag in flags.items() if flag & _swe.FLG_SWIEPH]
+    mode = 'swiss' if len(swiss) == len(flags) else ('mixed' if swiss else 'moshier')
+    return {
+        "mode": mode,
+        "path": _ephe_path,
+        "return_flags": flags,
+        "files": files,
+    }
+
+
+def require_swiss_ephemeris():
+    """``ephemeris_status``, raising RuntimeError unless every probe body came from the files."""
+    status = ephemeris_status()
+    if status["mode"] != 'swiss':
+        raise RuntimeError(
+            f"Swiss Ephemeris files are not being read from {status['path']!r} "
+            f"(mode {status['mode']}, flags {status['return_flags']}); "
+            "calculations would silently fall back to Moshier"
+        )
+    return status
+
+
+set_ephe_path()
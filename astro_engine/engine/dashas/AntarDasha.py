@@ -1,6 +1,7 @@
-import swisseph as swe
+from astro_engine.engine.core import swe
 from datetime import datetime, timedelta
 from math import floor
+from astro_engine.engine.core.Nakshatras import NAKSHATRA_SPAN, nakshatra_of, nakshatra_start
 
 # Nakshatra details: name, start degree, ruling planet
 NAKSHATRAS = [
@@ -24,13 +25,6 @@ PLANET_DURATIONS = {
 # Fixed order of planets for Mahadasha and Antardasha sequence
 PLANET_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
 
-def get_julian_dasha_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in Universal Time (UT)."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
 def calculate_moon_sidereal_antar_position(jd):
     """Calculate the Moon's sidereal longitude using Lahiri Ayanamsa."""
     swe.set_sid_mode(swe.SIDM_LAHIRI)  # Set Lahiri Ayanamsa
@@ -41,21 +35,16 @@ def calculate_moon_sidereal_antar_position(jd):
 
 def get_nakshatra_and_antar_lord(moon_longitude):
     """Determine the nakshatra, its ruling planet, and start longitude."""
-    for nakshatra, start, lord in NAKSHATRAS:
-        if start <= moon_longitude < start + 13.333:
-            return nakshatra, lord, start
-    # Handle edge case for Revati or longitude wrap-around
-    if moon_longitude >= 346.666 or moon_longitude < 0:
-        return "Revati", "Mercury", 346.666
-    return None, None, None
+    index = nakshatra_of(moon_longitude)
+    nakshatra, _, lord = NAKSHATRAS[index]
+    return nakshatra, lord, nakshatra_start(index)
 
 def calculate_dasha_antar_balance(moon_longitude, nakshatra_start, lord):
     """Calculate the remaining balance and elapsed time of the starting Mahadasha."""
-    nakshatra_span = 13.333  # Each nakshatra spans 13°20' (13.333 degrees)
     degrees_in_nakshatra = moon_longitude - nakshatra_start
     if degrees_in_nakshatra < 0:
         degrees_in_nakshatra += 360  # Handle wrap-around
-    fraction_elapsed = degrees_in_nakshatra / nakshatra_span
+    fraction_elapsed = degrees_in_nakshatra / NAKSHATRA_SPAN
     mahadasha_duration = PLANET_DURATIONS[lord]
     elapsed_time = mahadasha_duration * fraction_elapsed
     remaining_time = mahadasha_duration - elapsed_time
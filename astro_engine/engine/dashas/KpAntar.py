@@ -1,36 +1,17 @@
+from astro_engine.engine.core import swe
+from datetime import timedelta
+from astro_engine.engine.core.Nakshatras import nakshatra_offset
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, local_to_utc, utc_to_jd
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import swisseph as swe
-from datetime import datetime, timedelta
-
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
-
-swe.set_ephe_path('astro_api/ephe')
 
 DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
 DASHA_YEARS = {
     'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7,
     'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
 }
-NAKSHATRAS = [
-    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu",
-    "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta",
-    "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha", "Mula", "Purva Ashadha",
-    "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
-    "Uttara Bhadrapada", "Revati"
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 NAKSHATRA_RULERS = DASHA_SEQUENCE * 3
 
-def local_to_utc(birth_date, birth_time, timezone_offset):
-    local_dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-    utc_dt = local_dt - timedelta(hours=float(timezone_offset))
-    return utc_dt
-
-def get_julian_day(dt):
-    return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0 + dt.second / 3600.0)
-
 def calculate_kp_ayanamsa(jd):
     base_ayanamsa = 22 + 22/60 + 43.86/3600  # for 1900 Jan 1
     base_jd = 2415020.5
@@ -46,12 +27,8 @@ def calculate_moon_longitude(jd):
     return moon_sidereal
 
 def get_nakshatra_details(moon_longitude):
-    nakshatra_size = 360 / 27
-    nakshatra_index = int(moon_longitude / nakshatra_size)
-    deg_in_nakshatra = moon_longitude % nakshatra_size
-    nakshatra_name = NAKSHATRAS[nakshatra_index]
-    ruler = NAKSHATRA_RULERS[nakshatra_index]
-    return nakshatra_name, ruler, deg_in_nakshatra, nakshatra_index
+    nakshatra_index, deg_in_nakshatra = nakshatra_offset(moon_longitude)
+    return NAKSHATRAS[nakshatra_index], NAKSHATRA_RULERS[nakshatra_index], deg_in_nakshatra, nakshatra_index
 
 def add_years_to_date(start_date, years):
     total_days = years * 365.2425
@@ -68,7 +45,7 @@ def calculate_maha_antar_dasha(user_input):
     birth_time = user_input['birth_time']
     timezone_offset = float(user_input['timezone_offset'])
     utc_dt = local_to_utc(birth_date, birth_time, timezone_offset)
-    jd = get_julian_day(utc_dt)
+    jd = utc_to_jd(utc_dt)
     current_date = utc_dt
     moon_longitude = calculate_moon_longitude(jd)
     nakshatra_name, ruler, deg_in_nakshatra, nakshatra_index = get_nakshatra_details(moon_longitude)
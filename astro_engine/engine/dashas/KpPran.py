@@ -1,16 +1,12 @@
-
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from datetime import datetime
 import pytz
+from astro_engine.engine.core.DashaTree import LEVEL_NAMES, MAX_DEPTH, expand_periods, find_active_periods, iter_period_rows, mahadashas
+import itertools
 import math
+from astro_engine.engine.core.Nakshatras import nakshatra_offset
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, local_to_utc, utc_to_jd
 
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
-
-# Set Swiss Ephemeris path (adjust as needed)
-swe.set_ephe_path('astro_api/ephe')
 
 # Constants
 DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
@@ -18,26 +14,10 @@ DASHA_YEARS = {
     'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7,
     'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
 }
-NAKSHATRAS = [
-    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu",
-    "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta",
-    "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha", "Mula", "Purva Ashadha",
-    "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
-    "Uttara Bhadrapada", "Revati"
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 NAKSHATRA_RULERS = DASHA_SEQUENCE * 3
 YEAR_LENGTH = 365.2425  # Tropical year length
 
-def local_to_utc(birth_date, birth_time, timezone_offset):
-    """Convert local birth time to UTC."""
-    local_dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-    utc_dt = local_dt - timedelta(hours=float(timezone_offset))
-    return utc_dt
-
-def get_julian_day(dt):
-    """Calculate Julian Day from UTC datetime."""
-    return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0 + dt.second / 3600.0)
-
 def jd_to_datetime(jd):
     """Convert Julian Day to Gregorian datetime."""
     year, month, day, hour = swe.revjul(jd, swe.GREG_CAL)
@@ -64,128 +44,102 @@ def calculate_moon_longitude(jd):
 
 def get_nakshatra_details(moon_longitude):
     """Determine Nakshatra, ruler, and degrees traversed."""
-    nakshatra_size = 360 / 27  # 13.3333 degrees
-    nakshatra_index = int(moon_longitude / nakshatra_size)
-    deg_in_nakshatra = moon_longitude % nakshatra_size
-    nakshatra_name = NAKSHATRAS[nakshatra_index]
-    ruler = NAKSHATRA_RULERS[nakshatra_index]
-    return nakshatra_name, ruler, deg_in_nakshatra, nakshatra_index
+    nakshatra_index, deg_in_nakshatra = nakshatra_offset(moon_longitude)
+    return NAKSHATRAS[nakshatra_index], NAKSHATRA_RULERS[nakshatra_index], deg_in_nakshatra, nakshatra_index
 
 def get_vimshottari_sequence(start_planet):
     """Get the Vimshottari sequence starting from the given planet."""
     idx = DASHA_SEQUENCE.index(start_planet)
     return DASHA_SEQUENCE[idx:] + DASHA_SEQUENCE[:idx]
 
-def calculate_pran_dasha(sookshma_planet, sookshma_start_jd, sookshma_days, birth_jd):
-    """Calculate Pran Dasha periods within a Sookshma Dasha with high precision."""
-    pran_sequence = get_vimshottari_sequence(sookshma_planet)
-    total_vimshottari_years = 120.0
-    pran_timeline = []
-    pran_current_jd = sookshma_start_jd
-
-    for pran_planet in pran_sequence:
-        pran_days = (DASHA_YEARS[pran_planet] / total_vimshottari_years) * sookshma_days
-        pran_end_jd = pran_current_jd + pran_days
-        pran_timeline.append({
-            'planet': pran_planet,
-            'start': jd_to_datetime(pran_current_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'end': jd_to_datetime(pran_end_jd).strftime('%Y-%m-%d %H:%M:%S')
-        })
-        pran_current_jd = pran_end_jd
-    return pran_timeline
-
-def calculate_sookshma_dasha(pratyantar_planet, pratyantar_start_jd, pratyantar_days, birth_jd):
-    """Calculate Sookshma Dasha periods within a Pratyantardasha, including Pran Dasha."""
-    sookshma_sequence = get_vimshottari_sequence(pratyantar_planet)
-    total_vimshottari_years = 120.0
-    sookshma_timeline = []
-    sookshma_current_jd = pratyantar_start_jd
-
-    for sookshma_planet in sookshma_sequence:
-        sookshma_days = (DASHA_YEARS[sookshma_planet] / total_vimshottari_years) * pratyantar_days
-        sookshma_end_jd = sookshma_current_jd + sookshma_days
-        pran_timeline = calculate_pran_dasha(sookshma_planet, sookshma_current_jd, sookshma_days, birth_jd)
-        sookshma_timeline.append({
-            'planet': sookshma_planet,
-            'start': jd_to_datetime(sookshma_current_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'end': jd_to_datetime(sookshma_end_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'pran_dasha': pran_timeline
-        })
-        sookshma_current_jd = sookshma_end_jd
-    return sookshma_timeline
-
-def calculate_pratyantardashas(antar_planet, antar_start_jd, antar_days, birth_jd):
-    """Calculate Pratyantardasha periods within an Antar Dasha."""
-    pratyantar_sequence = get_vimshottari_sequence(antar_planet)
-    total_vimshottari_years = 120.0
-    pratyantar_timeline = []
-    pratyantar_current_jd = antar_start_jd
-
-    for pratyantar_planet in pratyantar_sequence:
-        pratyantar_days = (DASHA_YEARS[pratyantar_planet] / total_vimshottari_years) * antar_days
-        pratyantar_end_jd = pratyantar_current_jd + pratyantar_days
-        sookshma_timeline = calculate_sookshma_dasha(pratyantar_planet, pratyantar_current_jd, pratyantar_days, birth_jd)
-        pratyantar_timeline.append({
-            'planet': pratyantar_planet,
-            'start': jd_to_datetime(pratyantar_current_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'end': jd_to_datetime(pratyantar_end_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'sookshma_dasha': sookshma_timeline
-        })
-        pratyantar_current_jd = pratyantar_end_jd
-    return pratyantar_timeline
-
-def calculate_maha_antar_pratyantar_pran_dasha(user_input):
-    """Calculate Vimshottari Dasha periods including Sookshma and Pran Dasha."""
+# Key each level's sub-periods go under: maha -> antar -> pratyantar -> sookshma -> pran.
+CHILD_KEYS = ('antardashas', 'pratyantardashas', 'sookshma_dasha', 'pran_dasha')
+
+def format_dasha_period(period, birth_jd):
+    """Format one dasha period; the first Mahadasha is shown as starting at birth."""
+    start_jd = max(period.start_jd, birth_jd) if period.level == 0 else period.start_jd
+    return {
+        'planet': period.planet,
+        'start': jd_to_datetime(start_jd).strftime('%Y-%m-%d %H:%M:%S'),
+        'end': jd_to_datetime(period.end_jd).strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def calculate_birth_dasha(user_input):
+    """Birth JD, Moon nakshatra and start of the first Mahadasha for a birth record."""
     birth_date = user_input['birth_date']
     birth_time = user_input['birth_time']
     timezone_offset = float(user_input['timezone_offset'])
     utc_dt = local_to_utc(birth_date, birth_time, timezone_offset)
-    birth_jd = get_julian_day(utc_dt)
+    birth_jd = utc_to_jd(utc_dt)
     moon_longitude = calculate_moon_longitude(birth_jd)
     nakshatra_name, ruler, deg_in_nakshatra, _ = get_nakshatra_details(moon_longitude)
 
     nakshatra_size = 360 / 27
     portion_traversed = deg_in_nakshatra / nakshatra_size
-    maha_years = DASHA_YEARS[ruler]
-    elapsed_years = maha_years * portion_traversed
-    balance_years = maha_years - elapsed_years
-    maha_start_jd = birth_jd - (elapsed_years * YEAR_LENGTH)
-    maha_sequence = get_vimshottari_sequence(ruler)
-    dasha_timeline = []
-    current_jd = maha_start_jd
-
-    for i, maha_planet in enumerate(maha_sequence):
-        maha_days = DASHA_YEARS[maha_planet] * YEAR_LENGTH
-        maha_end_jd = current_jd + maha_days
-        antar_sequence = get_vimshottari_sequence(maha_planet)
-        antar_timeline = []
-        antar_current_jd = current_jd
-
-        for antar_planet in antar_sequence:
-            antar_days = (DASHA_YEARS[antar_planet] / 120.0) * DASHA_YEARS[maha_planet] * YEAR_LENGTH
-            antar_end_jd = antar_current_jd + antar_days
-            pratyantar_timeline = calculate_pratyantardashas(antar_planet, antar_current_jd, antar_days, birth_jd)
-            antar_timeline.append({
-                'planet': antar_planet,
-                'start': jd_to_datetime(antar_current_jd).strftime('%Y-%m-%d %H:%M:%S'),
-                'end': jd_to_datetime(antar_end_jd).strftime('%Y-%m-%d %H:%M:%S'),
-                'pratyantardashas': pratyantar_timeline
-            })
-            antar_current_jd = antar_end_jd
-
-        dasha_timeline.append({
-            'planet': maha_planet,
-            'start': jd_to_datetime(current_jd if i > 0 else birth_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'end': jd_to_datetime(maha_end_jd).strftime('%Y-%m-%d %H:%M:%S'),
-            'antardashas': antar_timeline
-        })
-        current_jd = maha_end_jd
-
+    elapsed_years = DASHA_YEARS[ruler] * portion_traversed
     return {
-        'user_name': user_input['user_name'],
+        'birth_jd': birth_jd,
         'nakshatra_at_birth': nakshatra_name,
         'nakshatra_ruler': ruler,
-        'moon_longitude': round(moon_longitude, 6),
-        'deg_in_nakshatra': round(deg_in_nakshatra, 6),
+        'moon_longitude': moon_longitude,
+        'deg_in_nakshatra': deg_in_nakshatra,
+        'maha_start_jd': birth_jd - (elapsed_years * YEAR_LENGTH)
+    }
+
+def calculate_maha_antar_pratyantar_pran_dasha(user_input, depth=MAX_DEPTH, start_jd=None, end_jd=None):
+    """
+    Calculate Vimshottari Dasha periods including Sookshma and Pran Dasha.
+
+    Sub-periods are nested down to ``depth`` levels (5 = pran dasha) and, when
+    ``start_jd`` / ``end_jd`` are given, only periods overlapping that window are returned.
+    """
+    birth = calculate_birth_dasha(user_input)
+    birth_jd = birth['birth_jd']
+    periods = mahadashas(birth['nakshatra_ruler'], birth['maha_start_jd'], YEAR_LENGTH)
+    dasha_timeline = expand_periods(periods, lambda period: format_dasha_period(period, birth_jd),
+                                    CHILD_KEYS, depth, start_jd, end_jd)
+
+    return {
+        'user_name': user_input['user_name'],
+        'nakshatra_at_birth': birth['nakshatra_at_birth'],
+        'nakshatra_ruler': birth['nakshatra_ruler'],
+        'moon_longitude': round(birth['moon_longitude'], 6),
+        'deg_in_nakshatra': round(birth['deg_in_nakshatra'], 6),
         'dasha_timeline': dasha_timeline
-    }
\ No newline at end of file
+    }
+
+def stream_maha_antar_pratyantar_pran_dasha(user_input, depth=MAX_DEPTH, start_jd=None, end_jd=None):
+    """
+    The pran dasha response as an iterator of NDJSON-ready dicts: a header, then one row per period.
+
+    The header carries the fields of calculate_maha_antar_pratyantar_pran_dasha without
+    the timeline; rows follow the timeline depth-first (see DashaTree.iter_period_rows).
+    The birth data is validated before anything is yielded.
+    """
+    birth = calculate_birth_dasha(user_input)
+    birth_jd = birth['birth_jd']
+    header = {
+        'user_name': user_input['user_name'],
+        'nakshatra_at_birth': birth['nakshatra_at_birth'],
+        'nakshatra_ruler': birth['nakshatra_ruler'],
+        'moon_longitude': round(birth['moon_longitude'], 6),
+        'deg_in_nakshatra': round(birth['deg_in_nakshatra'], 6)
+    }
+    periods = mahadashas(birth['nakshatra_ruler'], birth['maha_start_jd'], YEAR_LENGTH)
+    rows = iter_period_rows(periods, lambda period: format_dasha_period(period, birth_jd),
+                            depth, start_jd, end_jd)
+    return itertools.chain([header], rows)
+
+def calculate_current_kp_dasha(user_input, jd, depth=MAX_DEPTH):
+    """Dasha periods running at ``jd``, from Mahadasha down to ``depth`` levels."""
+    birth = calculate_birth_dasha(user_input)
+    periods = mahadashas(birth['nakshatra_ruler'], birth['maha_start_jd'], YEAR_LENGTH)
+    current = [dict(format_dasha_period(period, birth['birth_jd']), level=LEVEL_NAMES[period.level])
+               for period in find_active_periods(periods, jd, depth)]
+    return {
+        'user_name': user_input.get('user_name', 'Unknown'),
+        'nakshatra_at_birth': birth['nakshatra_at_birth'],
+        'nakshatra_ruler': birth['nakshatra_ruler'],
+        'moon_longitude': round(birth['moon_longitude'], 6),
+        'current_dasha': current
+    }
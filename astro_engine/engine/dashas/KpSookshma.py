@@ -1,11 +1,7 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import swisseph as swe
-from datetime import datetime, timedelta
-
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from datetime import datetime
+from astro_engine.engine.core.Nakshatras import nakshatra_offset
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, local_to_utc, utc_to_jd
 
 # Constants
 DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
@@ -13,26 +9,10 @@ DASHA_YEARS = {
     'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7,
     'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
 }
-NAKSHATRAS = [
-    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu",
-    "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta",
-    "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha", "Mula", "Purva Ashadha",
-    "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
-    "Uttara Bhadrapada", "Revati"
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 NAKSHATRA_RULERS = DASHA_SEQUENCE * 3
 YEAR_LENGTH = 365.2425  # Tropical year length
 
-def local_to_utc(birth_date, birth_time, timezone_offset):
-    """Convert local birth time to UTC."""
-    local_dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-    utc_dt = local_dt - timedelta(hours=float(timezone_offset))
-    return utc_dt
-
-def get_julian_day(dt):
-    """Calculate Julian Day from UTC datetime."""
-    return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0 + dt.second / 3600.0)
-
 def jd_to_datetime(jd):
     """Convert Julian Day to Gregorian datetime."""
     year, month, day, hour = swe.revjul(jd, swe.GREG_CAL)
@@ -59,12 +39,8 @@ def calculate_moon_longitude(jd):
 
 def get_nakshatra_details(moon_longitude):
     """Determine Nakshatra, ruler, and degrees traversed."""
-    nakshatra_size = 360 / 27  # 13.3333 degrees
-    nakshatra_index = int(moon_longitude / nakshatra_size)
-    deg_in_nakshatra = moon_longitude % nakshatra_size
-    nakshatra_name = NAKSHATRAS[nakshatra_index]
-    ruler = NAKSHATRA_RULERS[nakshatra_index]
-    return nakshatra_name, ruler, deg_in_nakshatra, nakshatra_index
+    nakshatra_index, deg_in_nakshatra = nakshatra_offset(moon_longitude)
+    return NAKSHATRAS[nakshatra_index], NAKSHATRA_RULERS[nakshatra_index], deg_in_nakshatra, nakshatra_index
 
 def get_vimshottari_sequence(start_planet):
     """Get the Vimshottari sequence starting from the given planet."""
@@ -117,7 +93,7 @@ def calculate_maha_antar_pratyantar_sooksha_dashas(user_input):
     birth_time = user_input['birth_time']
     timezone_offset = float(user_input['timezone_offset'])
     utc_dt = local_to_utc(birth_date, birth_time, timezone_offset)
-    birth_jd = get_julian_day(utc_dt)
+    birth_jd = utc_to_jd(utc_dt)
     moon_longitude = calculate_moon_longitude(birth_jd)
     nakshatra_name, ruler, deg_in_nakshatra, _ = get_nakshatra_details(moon_longitude)
 
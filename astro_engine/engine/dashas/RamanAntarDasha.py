@@ -1,6 +1,6 @@
-import swisseph as swe
-from datetime import datetime
+from astro_engine.engine.core import swe
 from dateutil.relativedelta import relativedelta
+from astro_engine.engine.core.Nakshatras import NAKSHATRA_SPAN, nakshatra_of, nakshatra_start
 
 # Nakshatra details: name, start degree, ruling planet
 NAKSHATRAS = [
@@ -24,13 +24,6 @@ PLANET_DURATIONS = {
 # Fixed order of planets for Mahadasha and Antardasha sequence
 PLANET_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
 
-def get_julian_day_antar_raman(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - relativedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
 def calculate_moon_sidereal_position_raman_antar(jd):
     """Calculate the Moon's sidereal longitude using Raman Ayanamsa."""
     swe.set_sid_mode(swe.SIDM_RAMAN)
@@ -41,20 +34,16 @@ def calculate_moon_sidereal_position_raman_antar(jd):
 
 def get_nakshatra_and_lord_raman_antar(moon_longitude):
     """Determine the nakshatra, its ruling planet, and start longitude."""
-    for nakshatra, start, lord in NAKSHATRAS:
-        if start <= moon_longitude < start + 13.333:
-            return nakshatra, lord, start
-    if moon_longitude >= 346.666 or moon_longitude < 0:
-        return "Revati", "Mercury", 346.666
-    return None, None, None
+    index = nakshatra_of(moon_longitude)
+    nakshatra, _, lord = NAKSHATRAS[index]
+    return nakshatra, lord, nakshatra_start(index)
 
 def calculate_dasha_balance_raman_antar(moon_longitude, nakshatra_start, lord):
     """Calculate the remaining balance and elapsed time of the starting Mahadasha."""
-    nakshatra_span = 13.333
     degrees_in_nakshatra = moon_longitude - nakshatra_start
     if degrees_in_nakshatra < 0:
         degrees_in_nakshatra += 360
-    fraction_traversed = degrees_in_nakshatra / nakshatra_span
+    fraction_traversed = degrees_in_nakshatra / NAKSHATRA_SPAN
     mahadasha_duration = PLANET_DURATIONS[lord]
     elapsed_years = mahadasha_duration * fraction_traversed
     balance_years = mahadasha_duration - elapsed_years
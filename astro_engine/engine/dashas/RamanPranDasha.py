@@ -1,5 +1,6 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.DashaTree import LEVEL_NAMES, MAX_DEPTH, expand_periods, find_active_periods, iter_period_rows, mahadashas
+from astro_engine.engine.core.Nakshatras import NAKSHATRA_SPAN, nakshatra_of, nakshatra_start
 
 # Nakshatra details: Name, Start Degree, Ruling Planet
 NAKSHATRAS = [
@@ -20,16 +21,12 @@ PLANET_DURATIONS = {
     "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17
 }
 
+# Days per year used for dasha lengths (Gregorian average)
+GREGORIAN_YEAR = 365.2425
+
 # Fixed order of planets
 PLANET_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
 
-def get_julian_day_pran_raman(date_str, time_str, tz_offset):
-    """Convert birth date and time to Julian Day."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
 def jd_to_date(jd):
     """Convert Julian Day to readable date-time string."""
     year, month, day, hour = swe.revjul(jd, swe.GREG_CAL)
@@ -47,123 +44,60 @@ def calculate_moon_sidereal_position_pran_raman(jd):
 
 def get_nakshatra_and_lord_pran_raman(moon_longitude):
     """Determine Nakshatra and its ruling planet based on Moon's longitude."""
-    for nakshatra, start, lord in NAKSHATRAS:
-        if start <= moon_longitude < (start + 13.333):
-            return nakshatra, lord, start
-    return "Revati", "Mercury", 346.666  # Default to Revati if at the end
+    index = nakshatra_of(moon_longitude)
+    nakshatra, _, lord = NAKSHATRAS[index]
+    return nakshatra, lord, nakshatra_start(index)
 
 def calculate_dasha_balance_pran_raman(moon_longitude, nakshatra_start, lord):
     """Calculate remaining and elapsed time of the first Mahadasha in days."""
-    nakshatra_span = 13.333
     degrees_in_nakshatra = moon_longitude - nakshatra_start
     if degrees_in_nakshatra < 0:
         degrees_in_nakshatra += 360
-    fraction_elapsed = degrees_in_nakshatra / nakshatra_span
+    fraction_elapsed = degrees_in_nakshatra / NAKSHATRA_SPAN
     mahadasha_duration_years = PLANET_DURATIONS[lord]
     elapsed_time_years = mahadasha_duration_years * fraction_elapsed
     remaining_time_years = mahadasha_duration_years - elapsed_time_years
-    avg_days_per_year = 365.2425  # Gregorian average
-    elapsed_days = elapsed_time_years * avg_days_per_year
-    remaining_days = remaining_time_years * avg_days_per_year
-    return remaining_days, mahadasha_duration_years * avg_days_per_year, elapsed_days
+    elapsed_days = elapsed_time_years * GREGORIAN_YEAR
+    remaining_days = remaining_time_years * GREGORIAN_YEAR
+    return remaining_days, mahadasha_duration_years * GREGORIAN_YEAR, elapsed_days
+
+# Key each level's sub-periods go under: maha -> antar -> pratyantar -> sookshma -> pran.
+CHILD_KEYS = ('antardashas', 'pratyantardashas', 'sookshma_dashas', 'pran_dashas')
 
-def calculate_antardashas(mahadasha_planet, mahadasha_duration_days, mahadasha_start_jd):
-    """Calculate all 9 Antardashas for a given Mahadasha."""
-    antardashas = []
-    start_idx = PLANET_ORDER.index(mahadasha_planet)
-    total_cycle = 120
-    current_jd = mahadasha_start_jd
-    for i in range(9):
-        planet = PLANET_ORDER[(start_idx + i) % 9]
-        duration_years = (PLANET_DURATIONS[planet] * mahadasha_duration_days) / total_cycle / 365.2425
-        duration_days = duration_years * 365.2425
-        end_jd = current_jd + duration_days
-        pratyantardashas = calculate_pratyantardashas(planet, duration_days, current_jd)
-        antardashas.append({
-            'planet': planet,
-            'start_date': jd_to_date(current_jd),
-            'end_date': jd_to_date(end_jd),
-            'duration_years': round(duration_years, 4),
-            'pratyantardashas': pratyantardashas
-        })
-        current_jd = end_jd
-    return antardashas
+def format_dasha_period(period):
+    """Format one dasha period; the duration field depends on the level."""
+    node = {
+        'planet': period.planet,
+        'start_date': jd_to_date(period.start_jd),
+        'end_date': jd_to_date(period.end_jd)
+    }
+    if period.level == 0:
+        node['duration_years'] = PLANET_DURATIONS[period.planet]
+    elif period.level == 1:
+        node['duration_years'] = round(period.days / GREGORIAN_YEAR, 4)
+    elif period.level < 4:
+        node['duration_days'] = round(period.days, 2)
+    else:
+        node['duration_hours'] = round(period.days * 24, 4)
+    return node
 
-def calculate_pratyantardashas(antardasha_planet, antardasha_duration_days, antardasha_start_jd):
-    """Calculate all 9 Pratyantardashas for a given Antardasha."""
-    pratyantardashas = []
-    start_idx = PLANET_ORDER.index(antardasha_planet)
-    total_cycle = 120
-    current_jd = antardasha_start_jd
-    for i in range(9):
-        planet = PLANET_ORDER[(start_idx + i) % 9]
-        duration_days = (PLANET_DURATIONS[planet] * antardasha_duration_days) / total_cycle
-        sookshma_dashas = calculate_sookshma_dashas(planet, duration_days, current_jd)
-        pratyantardashas.append({
-            'planet': planet,
-            'start_date': jd_to_date(current_jd),
-            'end_date': jd_to_date(current_jd + duration_days),
-            'duration_days': round(duration_days, 2),
-            'sookshma_dashas': sookshma_dashas
-        })
-        current_jd += duration_days
-    return pratyantardashas
+def calculate_pran_raman_periods(birth_jd, starting_planet, elapsed_days, depth=MAX_DEPTH, start_jd=None, end_jd=None):
+    """
+    Calculate the Mahadashas starting from the birth Nakshatra lord.
 
-def calculate_sookshma_dashas(pratyantardasha_planet, pratyantardasha_duration_days, pratyantardasha_start_jd):
-    """Calculate all 9 Sookshma Dashas for a given Pratyantardasha."""
-    sookshma_dashas = []
-    start_idx = PLANET_ORDER.index(pratyantardasha_planet)
-    total_cycle = 120
-    current_jd = pratyantardasha_start_jd
-    for i in range(9):
-        planet = PLANET_ORDER[(start_idx + i) % 9]
-        duration_days = (PLANET_DURATIONS[planet] * pratyantardasha_duration_days) / total_cycle
-        pran_dashas = raman_pran_dasha(planet, duration_days, current_jd)
-        sookshma_dashas.append({
-            'planet': planet,
-            'start_date': jd_to_date(current_jd),
-            'end_date': jd_to_date(current_jd + duration_days),
-            'duration_days': round(duration_days, 2),
-            'pran_dashas': pran_dashas
-        })
-        current_jd += duration_days
-    return sookshma_dashas
+    Sub-periods are nested down to ``depth`` levels (5 = pran dashas) and, when
+    ``start_jd`` / ``end_jd`` are given, only periods overlapping that window are returned.
+    """
+    periods = mahadashas(starting_planet, birth_jd - elapsed_days, GREGORIAN_YEAR)
+    return expand_periods(periods, format_dasha_period, CHILD_KEYS, depth, start_jd, end_jd)
 
-def raman_pran_dasha(sookshma_planet, sookshma_duration_days, sookshma_start_jd):
-    """Calculate all 9 Pran Dashas for a given Sookshma Dasha."""
-    pran_dashas = []
-    start_idx = PLANET_ORDER.index(sookshma_planet)
-    total_cycle = 120
-    current_jd = sookshma_start_jd
-    for i in range(9):
-        planet = PLANET_ORDER[(start_idx + i) % 9]
-        duration_days = (PLANET_DURATIONS[planet] * sookshma_duration_days) / total_cycle
-        pran_dashas.append({
-            'planet': planet,
-            'start_date': jd_to_date(current_jd),
-            'end_date': jd_to_date(current_jd + duration_days),
-            'duration_hours': round(duration_days * 24, 4)
-        })
-        current_jd += duration_days
-    return pran_dashas
+def raman_current_dasha(birth_jd, starting_planet, elapsed_days, jd, depth=MAX_DEPTH):
+    """Dasha periods running at ``jd``, from Mahadasha down to ``depth`` levels."""
+    periods = mahadashas(starting_planet, birth_jd - elapsed_days, GREGORIAN_YEAR)
+    return [dict(format_dasha_period(period), level=LEVEL_NAMES[period.level])
+            for period in find_active_periods(periods, jd, depth)]
 
-def calculate_pran_raman_periods(birth_jd, starting_planet, elapsed_days):
-    """Calculate all 9 Mahadashas starting from the birth Nakshatra lord."""
-    mahadasha_sequence = []
-    start_idx = PLANET_ORDER.index(starting_planet)
-    mahadasha_start_jd = birth_jd - elapsed_days
-    for i in range(9):
-        planet = PLANET_ORDER[(start_idx + i) % 9]
-        duration_years = PLANET_DURATIONS[planet]
-        duration_days = duration_years * 365.2425
-        end_jd = mahadasha_start_jd + duration_days
-        antardashas = calculate_antardashas(planet, duration_days, mahadasha_start_jd)
-        mahadasha_sequence.append({
-            'planet': planet,
-            'start_date': jd_to_date(mahadasha_start_jd),
-            'end_date': jd_to_date(end_jd),
-            'duration_years': duration_years,
-            'antardashas': antardashas
-        })
-        mahadasha_start_jd = end_jd
-    return mahadasha_sequence
\ No newline at end of file
+def raman_pran_dasha_rows(birth_jd, starting_planet, elapsed_days, depth=MAX_DEPTH, start_jd=None, end_jd=None):
+    """Yield the same periods as the nested timeline as flat rows, one per period."""
+    periods = mahadashas(starting_planet, birth_jd - elapsed_days, GREGORIAN_YEAR)
+    return iter_period_rows(periods, format_dasha_period, depth, start_jd, end_jd)
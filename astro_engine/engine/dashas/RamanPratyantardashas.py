@@ -1,6 +1,6 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
 import logging
+from astro_engine.engine.core.Nakshatras import nakshatra_of, nakshatra_start
 
 # Nakshatra definitions with precise start degrees and ruling planets
 NAKSHATRAS = [
@@ -26,15 +26,6 @@ PLANET_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Satu
 # Use tropical year for consistency with astrological calculations
 VIMSHOTTARI_YEAR_DAYS = 365.2425
 
-def get_julian_day_prataythar_raman(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day with timezone adjustment."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0
-    jd = swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-    logging.debug(f"Julian Day: {jd}")
-    return jd
-
 def jd_to_date(jd):
     """Convert Julian Day back to Gregorian date with precise time."""
     year, month, day, hour = swe.revjul(jd, swe.GREG_CAL)
@@ -62,12 +53,9 @@ def calculate_moon_sidereal_position_prataythar_raman(jd):
 
 def get_nakshatra_and_lord_prataythar_raman(moon_longitude):
     """Determine Nakshatra and its ruling planet based on Moon's longitude."""
-    for nakshatra, start, lord in NAKSHATRAS:
-        if start <= moon_longitude < start + 13.333333333333334:
-            return nakshatra, lord, start
-    if moon_longitude >= 346.6666666666667 or moon_longitude < 0:
-        return "Revati", "Mercury", 346.6666666666667
-    return None, None, None
+    index = nakshatra_of(moon_longitude)
+    nakshatra, _, lord = NAKSHATRAS[index]
+    return nakshatra, lord, nakshatra_start(index)
 
 def calculate_dasha_balance_prataythar_raman(moon_longitude, nakshatra_start, lord):
     """Calculate elapsed and remaining time in the first Mahadasha at birth with high precision."""
@@ -1,6 +1,6 @@
-import swisseph as swe
+from astro_engine.engine.core import swe
 from math import floor
-from datetime import datetime, timedelta
+from astro_engine.engine.core.Nakshatras import NAKSHATRA_SPAN, nakshatra_of, nakshatra_start
 
 # Nakshatra details: name, start degree, ruling planet
 NAKSHATRAS = [
@@ -27,13 +27,6 @@ PLANET_ORDER = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Satu
 # Days in a tropical year for precise calculations
 DAYS_PER_YEAR = 365.242189
 
-def get_julian_day_sookshma_raman(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in Universal Time (UT)."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
 def jd_to_date(jd):
     """Convert Julian Day to Gregorian date string with time."""
     year, month, day, hour = swe.revjul(jd, swe.GREG_CAL)
@@ -52,20 +45,16 @@ def calculate_moon_sidereal_sookshma_raman(jd):
 
 def get_nakshatra_and_lord_soo_raman(moon_longitude):
     """Determine the nakshatra, its ruling planet, and start longitude."""
-    for nakshatra, start, lord in NAKSHATRAS:
-        if start <= moon_longitude < (start + 13.333):
-            return nakshatra, lord, start
-    if moon_longitude >= 346.666 or moon_longitude < 0:
-        return "Revati", "Mercury", 346.666
-    return None, None, None
+    index = nakshatra_of(moon_longitude)
+    nakshatra, _, lord = NAKSHATRAS[index]
+    return nakshatra, lord, nakshatra_start(index)
 
 def calculate_sookshma_dasha_balance_raman(moon_longitude, nakshatra_start, lord):
     """Calculate the remaining balance and elapsed time of the starting Mahadasha."""
-    nakshatra_span = 13.333
     degrees_in_nakshatra = moon_longitude - nakshatra_start
     if degrees_in_nakshatra < 0:
         degrees_in_nakshatra += 360
-    fraction_elapsed = degrees_in_nakshatra / nakshatra_span
+    fraction_elapsed = degrees_in_nakshatra / NAKSHATRA_SPAN
     mahadasha_duration = PLANET_DURATIONS[lord]
     elapsed_time = mahadasha_duration * fraction_elapsed
     remaining_time = mahadasha_duration - elapsed_time
@@ -1,41 +1,21 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from datetime import datetime
 import math
-
-# Zodiac signs (0-based index: Aries=0, Taurus=1, ..., Pisces=11)
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, whole_sign_house
 
 # Nakshatra list (27 nakshatras)
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 
 # Sign natures for D45 calculation
 MOVABLE = [0, 3, 6, 9]  # Aries, Cancer, Libra, Capricorn
 FIXED = [1, 4, 7, 10]    # Taurus, Leo, Scorpio, Aquarius
 DUAL = [2, 5, 8, 11]     # Gemini, Virgo, Sagittarius, Pisces
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date and time to Julian Day (UT)."""
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-
 def format_dms(degrees):
     """Format longitude in degrees, minutes, seconds."""
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
+    d, m, s = dms(degrees, 1)
     return f"{d}°{m}'{s:.1f}\""
 
 def get_d45_position(sidereal_lon):
@@ -58,25 +38,14 @@ def get_d45_position(sidereal_lon):
     d45_sign = SIGNS[d45_sign_index]
     return {'sign': d45_sign, 'sign_index': d45_sign_index}
 
-def get_d45_house(planet_d45_sign_index, d45_asc_sign_index):
-    """Calculate house number using Whole Sign system."""
-    return (planet_d45_sign_index - d45_asc_sign_index) % 12 + 1
-
 def get_nakshatra_and_pada(sidereal_lon):
     """Calculate nakshatra and pada from sidereal longitude."""
-    nakshatra_size = 13.3333  # 360° / 27 nakshatras
-    pada_size = nakshatra_size / 4  # Each nakshatra has 4 padas
-    lon = sidereal_lon % 360
-    nakshatra_index = int(lon / nakshatra_size) % 27
-    position_in_nakshatra = lon % nakshatra_size
-    pada_index = int(position_in_nakshatra / pada_size) + 1
-    return {"nakshatra": NAKSHATRAS[nakshatra_index], "pada": pada_index}
-
-def lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown'):
+    nakshatra_index, pada = nakshatra_and_pada(sidereal_lon)
+    return {"nakshatra": NAKSHATRAS[nakshatra_index], "pada": pada}
+
+def lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown', snapshot=None):
     """Calculate the Lahiri Akshavedamsha (D45) chart with retrograde, nakshatras, and padas."""
-    # Calculate Julian Day and set ayanamsa
-    jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
-    swe.set_sid_mode(swe.SIDM_LAHIRI)  # Lahiri ayanamsa
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Planets to calculate
     planets = [
@@ -89,7 +58,7 @@ def lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset
     # Calculate D1 (natal) positions
     d1_positions = {}
     for planet_id, name in planets:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         lon = pos[0] % 360
         retro = 'R' if pos[3] < 0 else ''
         d1_positions[name] = (lon, retro)
@@ -100,7 +69,7 @@ def lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset
     d1_positions['Ketu'] = (ketu_lon, '')
 
     # Calculate ascendant longitude (D1)
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon = ascmc[0] % 360
 
     # Calculate D45 ascendant
@@ -112,7 +81,7 @@ def lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset
     d45_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d45_pos = get_d45_position(d1_lon)
-        house = get_d45_house(d45_pos['sign_index'], d45_asc_sign_index)
+        house = whole_sign_house(d45_pos['sign_index'], d45_asc_sign_index)
         planet_nakshatra_pada = get_nakshatra_and_pada(d1_lon)
         d45_positions[planet] = {
             "sign": d45_pos['sign'],
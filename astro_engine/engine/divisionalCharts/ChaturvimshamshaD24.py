@@ -1,35 +1,11 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
 import math
-
-# Zodiac signs
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms, whole_sign_house
 
 # Nakshatras (27 divisions of the zodiac)
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date, time, and timezone to Julian Day."""
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-
-def format_dms(degrees):
-    """Format degrees into D°M'S\"."""
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
-    return f"{d}° {m}' {s:.2f}\""
+NAKSHATRAS = NAKSHATRA_NAMES
 
 def get_d24_position(d1_sidereal_lon):
     """Calculate D24 position from D1 sidereal longitude."""
@@ -54,27 +30,14 @@ def get_d24_position(d1_sidereal_lon):
         "longitude": d24_longitude
     }
 
-def get_d24_house(d24_sign_index, d24_asc_sign_index):
-    """Assign house using Whole Sign system."""
-    return (d24_sign_index - d24_asc_sign_index) % 12 + 1
-
 def get_nakshatra_and_pada(sidereal_lon):
     """Calculate nakshatra and pada from D1 sidereal longitude."""
-    lon = sidereal_lon % 360
-    nakshatra_index = int(lon / (360 / 27))
-    position_in_nakshatra = lon % (360 / 27)
-    pada = int(position_in_nakshatra / (360 / 108)) + 1
-    nakshatra = NAKSHATRAS[nakshatra_index]
-    return {"nakshatra": nakshatra, "pada": pada}
+    nakshatra_index, pada = nakshatra_and_pada(sidereal_lon)
+    return {"nakshatra": NAKSHATRAS[nakshatra_index], "pada": pada}
 
-def lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_offset):
+def lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate the Lahiri Chaturvimshamsha (D24) chart."""
-    # Set ephemeris path (adjust as needed)
-    swe.set_ephe_path('astro_api/ephe')
-    
-    # Calculate Julian Day and set Lahiri ayanamsa
-    jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Planetary positions
     planets = [
@@ -86,7 +49,7 @@ def lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_off
 
     d1_positions = {}
     for planet_id, name in planets:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         lon = pos[0] % 360
         retro = 'R' if pos[3] < 0 else ''
         d1_positions[name] = (lon, retro)
@@ -97,7 +60,7 @@ def lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_off
     d1_positions['Ketu'] = (ketu_lon, '')
 
     # Ascendant
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon = ascmc[0] % 360
 
     # D24 Ascendant
@@ -109,7 +72,7 @@ def lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_off
     d24_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d24_pos = get_d24_position(d1_lon)
-        house = get_d24_house(d24_pos['sign_index'], d24_asc_sign_index)
+        house = whole_sign_house(d24_pos['sign_index'], d24_asc_sign_index)
         planet_nakshatra_pada = get_nakshatra_and_pada(d1_lon)
         d24_positions[planet] = {
             "sign": d24_pos['sign'],
@@ -2,30 +2,17 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, house_of_sign, longitude_to_sign
 
 # Constants
 PLANET_NAMES = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
-NAKSHATRA_NAMES = [
-    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
-    "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
-    "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta",
-    "Shatabhisha", "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-]
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth time to Julian Day using UTC."""
-    dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    dt_utc = dt - timedelta(hours=tz_offset)
-    jd = swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, dt_utc.hour + dt_utc.minute / 60 + dt_utc.second / 3600)
-    return jd
-
-def calculate_sidereal_position(jd, planet_id, ayanamsa):
+def calculate_sidereal_position(snapshot, planet_id, ayanamsa):
     """Calculate sidereal longitude and retrograde status for a planet."""
-    pos, ret = swe.calc_ut(jd, planet_id, swe.FLG_SWIEPH | swe.FLG_SPEED)
+    pos, ret = snapshot.calc_ut(planet_id, swe.FLG_SWIEPH | swe.FLG_SPEED)
     if ret < 0:
         return 0.0, ''
     tropical_lon = pos[0]
@@ -34,23 +21,15 @@ def calculate_sidereal_position(jd, planet_id, ayanamsa):
     retrograde = 'R' if speed < 0 else ''
     return sidereal_lon, retrograde
 
-def calculate_ascendant(jd, lat, lon):
+def calculate_ascendant(snapshot):
     """Calculate sidereal ascendant longitude."""
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    houses, ascmc = swe.houses_ex(jd, lat, lon, b'W', flags=swe.FLG_SIDEREAL)
+    houses, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     asc_lon = ascmc[0] % 360
     return asc_lon
 
-def get_sign_and_degrees(longitude):
-    """Get sign and degrees from longitude."""
-    sign_index = int(longitude // 30)
-    degrees = longitude % 30
-    sign = SIGNS[sign_index]
-    return sign, degrees
-
 def calculate_d3_sign(longitude):
     """Calculate D3 sign based on degrees in natal sign."""
-    natal_sign, degrees = get_sign_and_degrees(longitude)
+    natal_sign, degrees = longitude_to_sign(longitude)
     natal_index = SIGNS.index(natal_sign)
     if degrees < 10:
         d3_sign = natal_sign
@@ -60,29 +39,18 @@ def calculate_d3_sign(longitude):
         d3_sign = SIGNS[(natal_index + 8) % 12]  # 9th sign
     return d3_sign
 
-def calculate_d3_house(d3_sign, d3_asc_sign):
-    """Calculate D3 house number."""
-    d3_sign_index = SIGNS.index(d3_sign)
-    d3_asc_index = SIGNS.index(d3_asc_sign)
-    house = (d3_sign_index - d3_asc_index + 12) % 12 + 1
-    return house
-
 def get_nakshatra_and_pada(longitude):
     """Calculate nakshatra and pada from sidereal longitude."""
-    nakshatra_index = int(longitude / (360 / 27))
-    position_in_nakshatra = longitude % (360 / 27)
-    pada = int(position_in_nakshatra / (360 / 108)) + 1
-    nakshatra_name = NAKSHATRA_NAMES[nakshatra_index]
-    return nakshatra_name, pada
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRA_NAMES[nakshatra_index], pada
 
-def lahairi_drerkhana(birth_date, birth_time, latitude, longitude, tz_offset):
+def lahairi_drerkhana(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate D3 chart using Lahiri ayanamsa with retrograde, nakshatras, and padas."""
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    ayanamsa = swe.get_ayanamsa_ut(jd)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
+    ayanamsa = snapshot.get_ayanamsa_ut()
 
-    asc_lon = calculate_ascendant(jd, latitude, longitude)
-    natal_asc_sign, asc_degrees = get_sign_and_degrees(asc_lon)
+    asc_lon = calculate_ascendant(snapshot)
+    natal_asc_sign, asc_degrees = longitude_to_sign(asc_lon)
     d3_asc_sign = calculate_d3_sign(asc_lon)
     asc_nakshatra, asc_pada = get_nakshatra_and_pada(asc_lon)
 
@@ -90,20 +58,20 @@ def lahairi_drerkhana(birth_date, birth_time, latitude, longitude, tz_offset):
     for planet_name in PLANET_NAMES:
         if planet_name == 'Rahu':
             planet_id = swe.MEAN_NODE
-            lon, _ = calculate_sidereal_position(jd, planet_id, ayanamsa)
+            lon, _ = calculate_sidereal_position(snapshot, planet_id, ayanamsa)
             retrograde = 'R'  # Rahu is always retrograde
         elif planet_name == 'Ketu':
             planet_id = swe.MEAN_NODE
-            lon, _ = calculate_sidereal_position(jd, planet_id, ayanamsa)
+            lon, _ = calculate_sidereal_position(snapshot, planet_id, ayanamsa)
             lon = (lon + 180) % 360  # Ketu is opposite Rahu
             retrograde = 'R'  # Ketu is always retrograde
         else:
             planet_id = getattr(swe, planet_name.upper())
-            lon, retrograde = calculate_sidereal_position(jd, planet_id, ayanamsa)
+            lon, retrograde = calculate_sidereal_position(snapshot, planet_id, ayanamsa)
         
-        natal_sign, degrees = get_sign_and_degrees(lon)
+        natal_sign, degrees = longitude_to_sign(lon)
         d3_sign = calculate_d3_sign(lon)
-        house = calculate_d3_house(d3_sign, d3_asc_sign)
+        house = house_of_sign(d3_sign, d3_asc_sign)
         nakshatra, pada = get_nakshatra_and_pada(lon)
         
         planets[planet_name] = {
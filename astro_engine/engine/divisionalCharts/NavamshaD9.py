@@ -3,15 +3,13 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path (ensure ephemeris files are in 'astro_api/ephe')
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, format_dms, get_house, longitude_to_sign
 
 # List of zodiac signs
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+signs = SIGNS
 
 # Nakshatra list with start and end degrees (27 nakshatras, each 13°20' or 13.3333°)
 nakshatras = [
@@ -26,34 +24,6 @@ nakshatras = [
     ('Purva Bhadrapada', 320, 333.3333), ('Uttara Bhadrapada', 333.3333, 346.6667), ('Revati', 346.6667, 360)
 ]
 
-def get_house(lon, asc_sign_index, orientation_shift=0):
-    """
-    Calculate house number based on planet longitude and ascendant sign index for Whole Sign system.
-    """
-    sign_index = int(lon // 30) % 12  # Planet's sign index
-    house_index = (sign_index - asc_sign_index + orientation_shift) % 12  # Adjusted house index
-    return house_index + 1  # 1-based house number
-
-def longitude_to_sign(deg):
-    """
-    Convert longitude to sign and degree within sign.
-    """
-    deg = deg % 360
-    sign_index = int(deg // 30)
-    sign = signs[sign_index]
-    sign_deg = deg % 30
-    return sign, sign_deg
-
-def format_dms(deg):
-    """
-    Format degrees as degrees, minutes, seconds.
-    """
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
-
 def get_navamsa_position(d1_lon):
     """
     Calculate D9 sign and degree from D1 sidereal longitude.
@@ -67,31 +37,19 @@ def get_nakshatra_and_pada(longitude):
     """
     Determine the nakshatra and pada based on longitude.
     """
-    longitude = longitude % 360
-    for nakshatra, start, end in nakshatras:
-        if start <= longitude < end:
-            pada = int(((longitude - start) / (end - start)) * 4) + 1
-            return nakshatra, pada
-    return 'Revati', 4 if longitude >= 346.6667 else 1
-
-def lahairi_navamsha_chart(data):
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return nakshatras[nakshatra_index][0], pada
+
+def lahairi_navamsha_chart(data, snapshot=None):
     """Calculate Navamsa (D9) chart with retrograde, nakshatras, and padas."""
     # Parse input data
     latitude = float(data['latitude'])
     longitude = float(data['longitude'])
     timezone_offset = float(data['timezone_offset'])
 
-    # Parse birth date and time
-    birth_date = datetime.strptime(data['birth_date'], '%Y-%m-%d')
-    birth_time = datetime.strptime(data['birth_time'], '%H:%M:%S').time()
-    local_datetime = datetime.combine(birth_date, birth_time)
-    ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-    hour_decimal = ut_datetime.hour + ut_datetime.minute / 60.0 + ut_datetime.second / 3600.0
-    jd_ut = swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-
-    # Set Lahiri Ayanamsa for sidereal calculations
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    ayanamsa_value = swe.get_ayanamsa_ut(jd_ut)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', data['birth_date'], data['birth_time'],
+                                latitude, longitude, timezone_offset)
+    ayanamsa_value = snapshot.get_ayanamsa_ut()
 
     # Calculate D1 planetary positions (sidereal)
     planets = [
@@ -102,7 +60,7 @@ def lahairi_navamsha_chart(data):
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     planet_positions = {}
     for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {planet_name}")
         lon = pos[0] % 360
@@ -116,7 +74,7 @@ def lahairi_navamsha_chart(data):
     planet_positions['Ketu'] = (ketu_lon, '')
 
     # Calculate D1 Ascendant (sidereal)
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     ascendant_lon = ascmc[0] % 360
     asc_sign_index = int(ascendant_lon // 30)
 
@@ -1,15 +1,9 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from datetime import datetime
 import math
-
-# Set Swiss Ephemeris path
-swe.set_ephe_path('astro_api/ephe')
-
-# Zodiac signs (0-based index: Aries = 0, Pisces = 11)
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, whole_sign_house
 
 # Shashtiamsha deities list (1 to 60, as per Brihat Parashara Hora Shastra)
 SHASHTIAMSHA_DEITIES = [
@@ -24,57 +18,27 @@ SHASHTIAMSHA_DEITIES = [
 ]
 
 # Nakshatras (27 lunar mansions, each spanning 13°20')
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    """
-    Convert birth date, time, and timezone offset to Julian Day (UT).
-    
-    Args:
-        date_str (str): Birth date in 'YYYY-MM-DD' format.
-        time_str (str): Birth time in 'HH:MM:SS' format.
-        tz_offset (float): Timezone offset in hours (e.g., 5.5 for IST).
-    
-    Returns:
-        float: Julian Day in Universal Time.
-    """
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
+NAKSHATRAS = NAKSHATRA_NAMES
 
-def get_sidereal_longitude(jd_ut, planet_id, ascendant=False, lat=None, lon=None):
+def get_sidereal_longitude(snapshot, planet_id, ascendant=False):
     """
     Calculate sidereal longitude for a planet or ascendant using Lahiri Ayanamsa.
     
     Args:
-        jd_ut (float): Julian Day in UT.
+        snapshot (ChartSnapshot): Lahiri snapshot of the birth chart.
         planet_id (int): Swiss Ephemeris planet ID (e.g., swe.SUN) or None for ascendant.
         ascendant (bool): True if calculating for ascendant, False for planets.
-        lat (float): Latitude (required for ascendant).
-        lon (float): Longitude (required for ascendant).
     
     Returns:
         tuple: (longitude, retrograde flag) where longitude is 0-360° and retrograde is 'R' or ''.
     """
-    swe.set_sid_mode(swe.SIDM_LAHIRI)  # Set Lahiri Ayanamsa
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     
     if ascendant:
-        if lat is None or lon is None:
-            raise ValueError("Latitude and longitude required for ascendant calculation")
-        cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'W', flags=swe.FLG_SIDEREAL)
+        cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
         return ascmc[0] % 360, ''
     else:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         longitude = pos[0] % 360
         retrograde = 'R' if pos[3] < 0 else ''
         return longitude, retrograde
@@ -107,19 +71,6 @@ def get_d60_position(sidereal_lon):
         "longitude": sidereal_lon
     }
 
-def get_d60_house(d60_sign_index, d60_asc_sign_index):
-    """
-    Assign house number using Whole Sign system.
-    
-    Args:
-        d60_sign_index (int): D60 sign index of the planet (0-11).
-        d60_asc_sign_index (int): D60 ascendant sign index (0-11).
-    
-    Returns:
-        int: House number (1-12).
-    """
-    return (d60_sign_index - d60_asc_sign_index) % 12 + 1
-
 def format_dms(degrees):
     """
     Format longitude in degrees, minutes, seconds (e.g., 17°41'36").
@@ -130,9 +81,7 @@ def format_dms(degrees):
     Returns:
         str: Formatted string in D°M'S" format.
     """
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
+    d, m, s = dms(degrees, 1)
     return f"{d}°{m}'{s:.1f}\""
 
 def get_nakshatra_and_pada(longitude):
@@ -145,12 +94,10 @@ def get_nakshatra_and_pada(longitude):
     Returns:
         dict: Nakshatra name and pada number (1-4).
     """
-    nakshatra_index = int(longitude / (360 / 27)) % 27
-    pada = int((longitude % (360 / 27)) / (360 / 108)) + 1
-    nakshatra = NAKSHATRAS[nakshatra_index]
-    return {"nakshatra": nakshatra, "pada": pada}
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return {"nakshatra": NAKSHATRAS[nakshatra_index], "pada": pada}
 
-def lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown'):
+def lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown', snapshot=None):
     """
     Calculate the D60 (Shashtiamsha) chart including nakshatras and padas.
     
@@ -161,12 +108,13 @@ def lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset,
         longitude (float): Longitude of birth place.
         tz_offset (float): Timezone offset in hours.
         user_name (str): Name of the user (optional).
+        snapshot (ChartSnapshot): Lahiri snapshot for the same birth data (optional).
     
     Returns:
         dict: D60 chart details including ascendant, planetary positions, house signs, and metadata.
     """
-    # Step 1: Calculate Julian Day
-    jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
+    # Step 1: Julian Day and Lahiri ayanamsa
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Step 2: Calculate sidereal longitudes for planets
     planets = [
@@ -176,7 +124,7 @@ def lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset,
     ]
     d1_positions = {}
     for planet_id, name in planets:
-        lon, retro = get_sidereal_longitude(jd_ut, planet_id)
+        lon, retro = get_sidereal_longitude(snapshot, planet_id)
         d1_positions[name] = (lon, retro)
 
     # Calculate Ketu (180° opposite Rahu)
@@ -185,7 +133,7 @@ def lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset,
     d1_positions['Ketu'] = (ketu_lon, 'R')  # Ketu is always retrograde
 
     # Step 3: Calculate ascendant sidereal longitude
-    d1_asc_lon, _ = get_sidereal_longitude(jd_ut, None, ascendant=True, lat=latitude, lon=longitude)
+    d1_asc_lon, _ = get_sidereal_longitude(snapshot, None, ascendant=True)
 
     # Step 4: Calculate D60 ascendant
     d60_asc = get_d60_position(d1_asc_lon)
@@ -195,7 +143,7 @@ def lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset,
     d60_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d60_pos = get_d60_position(d1_lon)
-        house = get_d60_house(d60_pos['sign_index'], d60_asc_sign_index)
+        house = whole_sign_house(d60_pos['sign_index'], d60_asc_sign_index)
         nakshatra_pada = get_nakshatra_and_pada(d1_lon)
         d60_positions[planet] = {
             "sign": d60_pos['sign'],
@@ -1,45 +1,14 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Zodiac signs
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms
 
 # Nakshatras
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, timezone_offset):
-    """Convert birth date and time to Julian Day."""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_dt = datetime.combine(date_obj, time_obj.time())
-        ut_dt = local_dt - timedelta(hours=timezone_offset)
-        hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-        jd = swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-        print(f"Julian Day: {jd}")
-        return jd
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def format_dms(degrees):
-    """Format degrees into degrees, minutes, seconds with high precision."""
-    d = int(degrees)
-    m_fraction = (degrees - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
+NAKSHATRAS = NAKSHATRA_NAMES
 
 def get_nakshatra(longitude):
     """Calculate nakshatra from sidereal longitude."""
-    nakshatra_index = int((longitude % 360) / 13.3333) % 27
-    return NAKSHATRAS[nakshatra_index]
+    return NAKSHATRAS[nakshatra_of(longitude)]
 
 def get_d16_position(sidereal_lon):
     """Calculate D16 position from sidereal longitude, including pada."""
@@ -60,10 +29,7 @@ def get_d16_position(sidereal_lon):
     segment_position = d1_sign_deg - segment_start
     d16_deg = (segment_position / 1.875) * 30  # Scale to 30 degrees per sign
     nakshatra = get_nakshatra(sidereal_lon)
-
-    # Calculate pada (each nakshatra = 13.3333°, each pada = 3.3333°)
-    position_in_nakshatra = sidereal_lon % 13.3333
-    pada = int(position_in_nakshatra / 3.3333) + 1
+    pada = pada_of(sidereal_lon)
 
     return {
         "sign": SIGNS[d16_sign_index],
@@ -81,11 +47,10 @@ def get_d16_house(d16_sign_index, d16_asc_sign_index, is_ketu=False, rahu_house=
         house_number = (d16_sign_index - d16_asc_sign_index + 12) % 12 + 1
     return house_number
 
-def lahairi_Shodashamsha(birth_date, birth_time, latitude, longitude, timezone_offset, enforce_opposition=False):
+def lahairi_Shodashamsha(birth_date, birth_time, latitude, longitude, timezone_offset, enforce_opposition=False, snapshot=None):
     """Calculate the complete Shodasamsa (D16) chart."""
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, timezone_offset)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_sidereal = ascmc[0] % 360
     d1_asc_sign = SIGNS[int(d1_asc_sidereal // 30)]
     d16_asc = get_d16_position(d1_asc_sidereal)
@@ -98,7 +63,7 @@ def lahairi_Shodashamsha(birth_date, birth_time, latitude, longitude, timezone_o
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     d1_positions = {}
     for planet_id, name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {name}")
         lon = pos[0] % 360
@@ -1,10 +1,7 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
-
-# Constants
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, format_dms, longitude_to_sign
 
 ODD_SIGN_D30_RANGES = [
     (0, 5, 'Aries'),
@@ -58,13 +55,6 @@ PLANETS = {
     'Rahu': swe.MEAN_NODE, 'Ketu': None
 }
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
 def calculate_sidereal_longitudes(jd, latitude, longitude):
     """Calculate sidereal longitudes using Lahiri Ayanamsa."""
     swe.set_sid_mode(swe.SIDM_LAHIRI)
@@ -105,41 +95,20 @@ def assign_houses(d30_positions, ascendant_sign):
         house = (sign_index - ascendant_index) % 12 + 1
         data['house'] = house
 
-def format_degree(deg):
-    """Format degrees as degrees, minutes, seconds."""
-    d = int(deg)
-    m = int((deg - d) * 60)
-    s = (deg - d - m / 60) * 3600
-    return f"{d}° {m}' {s:.2f}\""
-
-def get_sign_and_degree(longitude):
-    """Determine sign and degrees within the sign from longitude."""
-    sign_index = int(longitude // 30)
-    degree_in_sign = longitude % 30
-    sign = SIGNS[sign_index]
-    return sign, degree_in_sign
-
 def get_nakshatra_and_pada(longitude):
     """Determine nakshatra and pada from longitude."""
-    longitude = longitude % 360
-    for i, (name, start) in enumerate(NAKSHATRAS):
-        end = start + 13.333 if i < 26 else 360
-        if start <= longitude < end:
-            offset = longitude - start
-            pada = math.ceil(offset / (13.333 / 4))
-            return name, pada
-    return "Unknown", 0
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
-def calculate_natal_positions(jd, latitude, longitude):
+def calculate_natal_positions(snapshot):
     """Calculate natal positions with additional details."""
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
     positions = {}
     for planet, code in PLANETS.items():
         if planet == 'Ketu':
             rahu_lon = positions['Rahu']['longitude']
             ketu_lon = (rahu_lon + 180) % 360
             retrograde = True
-            sign, degree = get_sign_and_degree(ketu_lon)
+            sign, degree = longitude_to_sign(ketu_lon)
             nakshatra, pada = get_nakshatra_and_pada(ketu_lon)
             positions['Ketu'] = {
                 'longitude': ketu_lon,
@@ -150,11 +119,11 @@ def calculate_natal_positions(jd, latitude, longitude):
                 'pada': pada
             }
         else:
-            pos = swe.calc_ut(jd, code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+            pos = snapshot.calc_ut(code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
             lon = pos[0][0] % 360
             speed = pos[0][3]
             retrograde = speed < 0 if planet not in ['Sun', 'Moon'] else False
-            sign, degree = get_sign_and_degree(lon)
+            sign, degree = longitude_to_sign(lon)
             nakshatra, pada = get_nakshatra_and_pada(lon)
             positions[planet] = {
                 'longitude': lon,
@@ -164,9 +133,9 @@ def calculate_natal_positions(jd, latitude, longitude):
                 'nakshatra': nakshatra,
                 'pada': pada
             }
-    cusps, ascmc = swe.houses_ex(jd, float(latitude), float(longitude), b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     asc_lon = ascmc[0] % 360
-    sign, degree = get_sign_and_degree(asc_lon)
+    sign, degree = longitude_to_sign(asc_lon)
     nakshatra, pada = get_nakshatra_and_pada(asc_lon)
     positions['Ascendant'] = {
         'longitude': asc_lon,
@@ -177,17 +146,17 @@ def calculate_natal_positions(jd, latitude, longitude):
     }
     return positions
 
-def lahiri_trimshamsha_D30(birth_date, birth_time, latitude, longitude, tz_offset):
+def lahiri_trimshamsha_D30(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate D30 chart with natal details including pada, stars, and retrograde."""
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
-    natal_positions = calculate_natal_positions(jd, latitude, longitude)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
+    natal_positions = calculate_natal_positions(snapshot)
     d30_positions = {}
     for planet, data in natal_positions.items():
         longitude = data['longitude']
         sign, degree, natal_sign, natal_deg = get_d30_sign_and_degree(longitude)
         d30_positions[planet] = {
             'sign': sign,
-            'degree': format_degree(degree),
+            'degree': format_dms(degree),
             # 'natal_sign': natal_sign,
             # 'natal_degree': format_degree(natal_deg),
             # 'natal_longitude': round(longitude, 4),
@@ -1,40 +1,12 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from datetime import datetime
 import math
-
-# Zodiac signs list
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, whole_sign_house
 
 # Nakshatras list
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    """
-    Convert birth date, time, and timezone offset to Julian Day (UT).
-    
-    Args:
-        date_str (str): Birth date in 'YYYY-MM-DD' format
-        time_str (str): Birth time in 'HH:MM:SS' format
-        tz_offset (float): Timezone offset in hours (e.g., 5.5 for IST)
-    
-    Returns:
-        float: Julian Day in Universal Time
-    """
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
+NAKSHATRAS = NAKSHATRA_NAMES
 
 def format_dms(degrees):
     """
@@ -46,9 +18,7 @@ def format_dms(degrees):
     Returns:
         str: Formatted string in DMS
     """
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
+    d, m, s = dms(degrees, 1)
     return f"{d}°{m}'{s:.1f}\""
 
 def get_d20_position(sidereal_lon):
@@ -70,19 +40,6 @@ def get_d20_position(sidereal_lon):
     d20_sign = SIGNS[d20_sign_index]
     return {'sign': d20_sign, 'sign_index': d20_sign_index}
 
-def get_d20_house(planet_d20_sign_index, d20_asc_sign_index):
-    """
-    Assign house number using Whole Sign system.
-    
-    Args:
-        planet_d20_sign_index (int): D20 sign index of the planet (0-11)
-        d20_asc_sign_index (int): D20 ascendant sign index (0-11)
-    
-    Returns:
-        int: House number (1-12)
-    """
-    return (planet_d20_sign_index - d20_asc_sign_index) % 12 + 1
-
 def get_nakshatra_and_pada(sidereal_lon):
     """
     Calculate nakshatra and pada from sidereal longitude.
@@ -93,13 +50,10 @@ def get_nakshatra_and_pada(sidereal_lon):
     Returns:
         dict: Nakshatra name and pada number (1-4)
     """
-    nakshatra_index = int(sidereal_lon / 13.3333) % 27
-    position_in_nakshatra = sidereal_lon % 13.3333
-    pada = int(position_in_nakshatra / 3.3333) + 1
-    nakshatra = NAKSHATRAS[nakshatra_index]
-    return {"nakshatra": nakshatra, "pada": pada}
+    nakshatra_index, pada = nakshatra_and_pada(sidereal_lon)
+    return {"nakshatra": NAKSHATRAS[nakshatra_index], "pada": pada}
 
-def lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, timezone_offset, user_name='Unknown'):
+def lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, timezone_offset, user_name='Unknown', snapshot=None):
     """
     Calculate the D20 (Vimsamsa) chart with retrograde, nakshatras, and padas.
     
@@ -110,15 +64,13 @@ def lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, timezone_off
         longitude (float): Birth longitude
         timezone_offset (float): Timezone offset in hours
         user_name (str): Optional user name
+        snapshot (ChartSnapshot): Optional Lahiri snapshot for the same birth data
     
     Returns:
         dict: D20 chart details
     """
-    # Step 1: Calculate Julian Day
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-
-    # Step 2: Set Lahiri Ayanamsa for sidereal calculations
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    # Steps 1-2: Julian Day and Lahiri ayanamsa
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, timezone_offset)
 
     # Step 3: Calculate sidereal longitudes for planets
     planets = [
@@ -130,7 +82,7 @@ def lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, timezone_off
 
     d1_positions = {}
     for planet_id, name in planets:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         lon = pos[0] % 360  # Normalize to 0-360°
         retro = 'R' if pos[3] < 0 else ''  # Check retrograde via speed
         d1_positions[name] = (lon, retro)
@@ -141,7 +93,7 @@ def lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, timezone_off
     d1_positions['Ketu'] = (ketu_lon, '')  # Ketu is not retrograde by convention
 
     # Step 4: Calculate ascendant sidereal longitude
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon = ascmc[0] % 360  # Ascendant longitude
 
     # Step 5: Calculate D20 ascendant position
@@ -153,7 +105,7 @@ def lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, timezone_off
     d20_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d20_pos = get_d20_position(d1_lon)
-        house = get_d20_house(d20_pos['sign_index'], d20_asc_sign_index)
+        house = whole_sign_house(d20_pos['sign_index'], d20_asc_sign_index)
         planet_nakshatra_pada = get_nakshatra_and_pada(d1_lon)
         d20_positions[planet] = {
             "sign": d20_pos['sign'],
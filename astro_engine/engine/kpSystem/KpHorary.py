@@ -1,16 +1,15 @@
 
-import swisseph as swe
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.KpSubLords import horary_longitude, kp_lords
+from astro_engine.engine.core.Nakshatras import nakshatra_offset
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from datetime import datetime, timedelta
+from astro_engine.engine.core.SiderealKernel import SIGNS, get_sign, sign_of
 
 # --- KP Constants ---
-SWISS_EPHE_PATH = "astro_api/ephe"
 KP_NEW_AYANAMSA = swe.SIDM_KRISHNAMURTI
-ZODIAC_SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+ZODIAC_SIGNS = SIGNS
 NAKSHATRA_LORDS = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury'] * 3
 DASHA_YEARS = {
     'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7, 'Rahu': 18,
@@ -27,10 +26,7 @@ def normalize360(deg):
     return deg % 360.0
 
 def sign_deg(deg):
-    sign = int(deg // 30)
-    sign_name = ZODIAC_SIGNS[sign]
-    deg_in_sign = deg % 30
-    return sign, sign_name, deg_in_sign
+    return sign_of(deg), get_sign(deg), deg % 30
 
 def get_sign_lord(sign_name):
     lords = {
@@ -41,31 +37,7 @@ def get_sign_lord(sign_name):
     return lords[sign_name]
 
 def get_nakshatra_chain(degree, levels=4):
-    deg = normalize360(degree)
-    chain = []
-    nak_index = int(deg // NAKSHATRA_LENGTH)
-    nak_lord = NAKSHATRA_LORDS[nak_index]
-    chain.append(nak_lord)
-    pos = deg - nak_index * NAKSHATRA_LENGTH
-    for level in range(levels - 1):
-        start_idx = DASHA_ORDER.index(chain[-1])
-        sub_sequence = DASHA_ORDER[start_idx:] + DASHA_ORDER[:start_idx]
-        total_len = NAKSHATRA_LENGTH if level == 0 else sub_span
-        mins_cumulative = 0
-        found = False
-        for lord in sub_sequence:
-            sub_span = total_len * (DASHA_YEARS[lord] / 120)
-            sub_span_mins = sub_span * 60
-            if (pos * 60) < (mins_cumulative + sub_span_mins):
-                chain.append(lord)
-                pos = (pos * 60 - mins_cumulative) / sub_span_mins * sub_span if sub_span_mins != 0 else 0
-                found = True
-                break
-            mins_cumulative += sub_span_mins
-        if not found:
-            chain.append(sub_sequence[-1])
-            pos = 0
-    return chain[:levels]
+    return kp_lords(normalize360(degree), levels)
 
 def julday_from_date_time(date_str, time_str, tz_offset):
     y, m, d = [int(x) for x in date_str.split("-")]
@@ -76,19 +48,7 @@ def julday_from_date_time(date_str, time_str, tz_offset):
     return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute/60 + dt.second/3600)
 
 def get_asc_from_horary_num(horary_num):
-    sub_sizes = []
-    for n in range(TOTAL_NAKSHATRAS):
-        nak_lord = NAKSHATRA_LORDS[n]
-        start_idx = DASHA_ORDER.index(nak_lord)
-        sub_sequence = DASHA_ORDER[start_idx:] + DASHA_ORDER[:start_idx]
-        for lord in sub_sequence:
-            size = NAKSHATRA_LENGTH * DASHA_YEARS[lord] / 120
-            sub_sizes.append(size)
-    degs = [0]
-    for sz in sub_sizes:
-        degs.append(degs[-1] + sz)
-    idx = min(max(horary_num, 1), 249) - 1
-    return normalize360(degs[idx])
+    return horary_longitude(horary_num)
 
 def house_cusps(jd, lat, lon, asc_long, ayanamsha_mode):
     swe.set_sid_mode(ayanamsha_mode, 0, 0)
@@ -226,9 +186,8 @@ def sub_lord_chain_judgment(house_num, cusps, planets, good_houses=None, bad_hou
 
 def calc_vimshottari_dasha_path(jd, moon_longitude):
     deg = normalize360(moon_longitude)
-    nak_num = int(deg // NAKSHATRA_LENGTH)
+    nak_num, pos_in_nak = nakshatra_offset(deg)
     nak_lord = NAKSHATRA_LORDS[nak_num]
-    pos_in_nak = deg - nak_num * NAKSHATRA_LENGTH
     percent = pos_in_nak / NAKSHATRA_LENGTH
     idx = DASHA_ORDER.index(nak_lord)
     sequence = DASHA_ORDER[idx:] + DASHA_ORDER[:idx]
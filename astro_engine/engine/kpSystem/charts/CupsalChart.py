@@ -1,23 +1,16 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.KpSubLords import kp_lords
+from astro_engine.engine.core.Nakshatras import nakshatra_of
 import math
+from astro_engine.engine.core.SiderealKernel import SIGNS, dms
 
 # Constants
-ZODIAC_SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+ZODIAC_SIGNS = SIGNS
 PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu', 'Uranus', 'Neptune', 'Pluto']
 SWE_PLANETS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE, swe.MEAN_NODE, swe.URANUS, swe.NEPTUNE, swe.PLUTO]
 NAKSHATRAS = ['Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha',
               'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshta',
               'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati']
-STAR_LORDS = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury'] * 3
-VIMSHOTTARI_PROPORTIONS = {'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10, 'Mars': 7, 'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17}
-NAKSHATRA_SPAN = 13 + 1/3  # 13 degrees 20 minutes (13.333333 degrees)
-
-def cupsal_get_julian_day(birth_date, birth_time, tz_offset):
-    """Convert birth date and time to Julian Day with timezone adjustment."""
-    local_dt = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0)
 
 def cupsal_calculate_kp_new_ayanamsa(jd):
     """Calculate KP New Ayanamsa for the given Julian Day."""
@@ -49,25 +42,10 @@ def cupsal_calculate_planet_positions(jd, kp_new_ayanamsa):
 
 def cupsal_assign_nakshatra_and_lords(longitude):
     """Assign Nakshatra, star lord, and sub-lord to a longitude."""
-    nakshatra_index = int(longitude / NAKSHATRA_SPAN)
-    nakshatra = NAKSHATRAS[nakshatra_index % 27]
-    star_lord = STAR_LORDS[nakshatra_index % 27]
-    remaining_minutes = (longitude % NAKSHATRA_SPAN) * 60  # Convert remaining degrees to minutes
-    sub_lord = cupsal_calculate_sub_lord(remaining_minutes)
+    nakshatra = NAKSHATRAS[nakshatra_of(longitude)]
+    star_lord, sub_lord = kp_lords(longitude, 2)
     return nakshatra, star_lord, sub_lord
 
-def cupsal_calculate_sub_lord(remaining_minutes):
-    """Calculate sub-lord based on remaining longitude within Nakshatra."""
-    total_minutes = NAKSHATRA_SPAN * 60  # 800 minutes per Nakshatra
-    sub_lords = list(VIMSHOTTARI_PROPORTIONS.keys())
-    sub_spans = [VIMSHOTTARI_PROPORTIONS[lord] / 120 * total_minutes for lord in sub_lords]
-    cumulative = 0
-    for i, span in enumerate(sub_spans):
-        cumulative += span
-        if remaining_minutes <= cumulative:
-            return sub_lords[i]
-    return sub_lords[-1]  # Fallback to last sub-lord
-
 def cupsal_assign_planet_to_house(planet_lon, house_cusps):
     """Assign planet to house based on house cusps."""
     for i in range(12):
@@ -89,6 +67,7 @@ def cupsal_calculate_significators(planets, house_cusps):
         'Virgo': 'Mercury', 'Libra': 'Venus', 'Scorpio': 'Mars', 'Sagittarius': 'Jupiter',
         'Capricorn': 'Saturn', 'Aquarius': 'Saturn', 'Pisces': 'Jupiter'
     }
+    star_lords = {planet: cupsal_assign_nakshatra_and_lords(lon)[1] for planet, lon in planets.items()}
     
     for house in range(1, 13):
         cusp_start = house_cusps[house - 1]
@@ -105,13 +84,13 @@ def cupsal_calculate_significators(planets, house_cusps):
         
         # Level B: Planets in the star of occupants
         for planet, lon in planets.items():
-            _, star_lord, _ = cupsal_assign_nakshatra_and_lords(lon)
+            star_lord = star_lords[planet]
             if planet in significators[house]['A'] and star_lord not in significators[house]['B']:
                 significators[house]['B'].append(star_lord)
         
         # Level D: Planets in the star of house lord
         for planet, lon in planets.items():
-            _, star_lord, _ = cupsal_assign_nakshatra_and_lords(lon)
+            star_lord = star_lords[planet]
             if significators[house]['C'][0] == star_lord and planet not in significators[house]['D']:
                 significators[house]['D'].append(planet)
     
@@ -119,7 +98,5 @@ def cupsal_calculate_significators(planets, house_cusps):
 
 def cupsal_format_dms(degrees):
     """Convert decimal degrees to degrees, minutes, seconds format."""
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = int(((degrees - d) * 60 - m) * 60)
+    d, m, s = dms(degrees, 0, truncate=True)
     return f"{d}° {m}' {s}\""
\ No newline at end of file
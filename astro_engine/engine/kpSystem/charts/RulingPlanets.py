@@ -1,8 +1,11 @@
-import swisseph as swe
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.KpSubLords import kp_lords
 from datetime import datetime, timedelta
+from astro_engine.engine.core.Nakshatras import nakshatra_of, nakshatra_offset
+from astro_engine.engine.core.SiderealKernel import SIGNS, get_sign
 
 # Constants
-ZODIAC_SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+ZODIAC_SIGNS = SIGNS
 SIGN_RULERS = {
     'Aries': 'Mars', 'Taurus': 'Venus', 'Gemini': 'Mercury', 'Cancer': 'Moon', 'Leo': 'Sun', 
     'Virgo': 'Mercury', 'Libra': 'Venus', 'Scorpio': 'Mars', 'Sagittarius': 'Jupiter', 
@@ -21,34 +24,14 @@ DASHA_YEARS = {
 }
 NAKSHATRA_SPAN = 360 / 27  # 13.3333 degrees per Nakshatra
 
-def ruling_get_sign(degree):
-    """Determine the zodiac sign from a given longitude (0-360 degrees)."""
-    sign_index = int(degree / 30) % 12
-    return ZODIAC_SIGNS[sign_index]
-
 def ruling_get_nakshatra_and_lord(degree):
     """Determine the Nakshatra and its lord from a given longitude."""
-    nak_index = int(degree / NAKSHATRA_SPAN) % 27
-    nakshatra = NAKSHATRAS[nak_index]
-    lord = NAKSHATRA_LORDS[nak_index]
-    return nakshatra, lord
+    nak_index = nakshatra_of(degree)
+    return NAKSHATRAS[nak_index], NAKSHATRA_LORDS[nak_index]
 
 def ruling_get_sub_lord(degree):
     """Calculate the Sub-Lord for a given longitude based on Vimshottari Dasha proportions."""
-    lords = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
-    dasha_years = [7, 20, 6, 10, 7, 18, 16, 19, 17]
-    nak_span = NAKSHATRA_SPAN
-    nak_index = int(degree / nak_span) % 27
-    nak_lord = NAKSHATRA_LORDS[nak_index]
-    start_index = lords.index(nak_lord)
-    sub_lord_sequence = (lords * 2)[start_index:start_index + 9]
-    sub_spans = [(dasha_years[(start_index + i) % 9] / 120 * nak_span) for i in range(9)]
-    cumulative_spans = [0] + [sum(sub_spans[:i + 1]) for i in range(9)]
-    position_in_nak = degree % nak_span
-    for i in range(9):
-        if cumulative_spans[i] <= position_in_nak < cumulative_spans[i + 1]:
-            return sub_lord_sequence[i]
-    return sub_lord_sequence[-1]  # Fallback for edge case
+    return kp_lords(degree, 2)[1]
 
 def ruling_calculate_jd(birth_date, birth_time, timezone_offset):
     """Calculate Julian Day from birth date, time, and timezone offset."""
@@ -81,7 +64,7 @@ def ruling_get_day_lord(utc_dt):
 
 def ruling_get_details(longitude):
     """Get sign, rashi lord, nakshatra, star lord, sub lord for a longitude."""
-    sign = ruling_get_sign(longitude)
+    sign = get_sign(longitude)
     rashi_lord = SIGN_RULERS[sign]
     nakshatra, star_lord = ruling_get_nakshatra_and_lord(longitude)
     sub_lord = ruling_get_sub_lord(longitude)
@@ -112,8 +95,7 @@ def ruling_calculate_fortuna(ascendant, moon_pos, sun_pos):
 
 def ruling_calculate_balance_of_dasha(moon_pos, moon_star_lord):
     """Calculate Balance of Dasha based on Moon's position."""
-    nak_start = int(moon_pos / NAKSHATRA_SPAN) * NAKSHATRA_SPAN
-    position_in_nak = moon_pos - nak_start
+    _, position_in_nak = nakshatra_offset(moon_pos)
     fraction_passed = position_in_nak / NAKSHATRA_SPAN
     fraction_remaining = 1 - fraction_passed
     dasha_lord = moon_star_lord
@@ -1,5 +1,7 @@
-import swisseph as swe
+from astro_engine.engine.core import swe
 from datetime import datetime, timedelta
+from astro_engine.engine.core.Nakshatras import nakshatra_of
+from astro_engine.engine.core.SiderealKernel import get_sign
 
 # Constants
 PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
@@ -7,7 +9,6 @@ PLANET_IDS = {
     'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
     'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN, 'Rahu': swe.MEAN_NODE
 }
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
 SIGN_RULERS = {
     'Aries': 'Mars', 'Taurus': 'Venus', 'Gemini': 'Mercury', 'Cancer': 'Moon', 'Leo': 'Sun',
     'Virgo': 'Mercury', 'Libra': 'Venus', 'Scorpio': 'Mars', 'Sagittarius': 'Jupiter',
@@ -18,20 +19,12 @@ NAKSHATRAS = ['Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
               'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada',
               'Uttara Bhadrapada', 'Revati']
 NAKSHATRA_LORDS = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury'] * 3
-NAKSHATRA_SPAN = 360 / 27  # 13.3333 degrees per nakshatra
 
 # Utility Functions
-def get_sign(longitude):
-    """Determine the zodiac sign from a longitude (0-360 degrees)."""
-    sign_index = int(longitude / 30) % 12
-    return SIGNS[sign_index]
-
 def get_nakshatra(longitude):
     """Determine the nakshatra and its lord from a longitude."""
-    nak_index = int(longitude / NAKSHATRA_SPAN) % 27
-    nakshatra = NAKSHATRAS[nak_index]
-    lord = NAKSHATRA_LORDS[nak_index]
-    return nakshatra, lord
+    nak_index = nakshatra_of(longitude)
+    return NAKSHATRAS[nak_index], NAKSHATRA_LORDS[nak_index]
 
 def get_house(longitude, cusps):
     """Determine the house a planet falls into based on Placidus house cusps."""
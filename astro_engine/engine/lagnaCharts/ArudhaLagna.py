@@ -1,9 +1,10 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS, get_sign
 
 # Constants
-ZODIAC_SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+ZODIAC_SIGNS = SIGNS
 LORDS = {
     'Aries': 'Mars', 'Taurus': 'Venus', 'Gemini': 'Mercury', 'Cancer': 'Moon', 'Leo': 'Sun', 'Virgo': 'Mercury',
     'Libra': 'Venus', 'Scorpio': 'Mars', 'Sagittarius': 'Jupiter', 'Capricorn': 'Saturn', 'Aquarius': 'Saturn', 'Pisces': 'Jupiter'
@@ -24,22 +25,14 @@ NAKSHATRAS = [
     ('Purva Bhadrapada', 320, 333.3333), ('Uttara Bhadrapada', 333.3333, 346.6667), ('Revati', 346.6667, 360)
 ]
 
-def get_julian_day(birth_date, birth_time, tz_offset):
-    """Convert birth date and time to Julian Day with timezone adjustment."""
-    local_dt = datetime.strptime(birth_date + " " + birth_time, "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0)
-
-def calculate_ascendant(jd, latitude, longitude):
+def calculate_ascendant(snapshot):
     """Calculate sidereal Ascendant longitude using Lahiri Ayanamsa."""
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    houses = swe.houses_ex(jd, latitude, longitude, flags=swe.FLG_SIDEREAL)
+    houses = snapshot.houses_ex(flags=swe.FLG_SIDEREAL)
     return houses[0][0]  # Ascendant longitude
 
-def calculate_planet_data(jd, planet_code):
+def calculate_planet_data(snapshot, planet_code):
     """Calculate sidereal longitude and retrograde status of a planet."""
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    pos, ret = swe.calc_ut(jd, planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+    pos, ret = snapshot.calc_ut(planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
     if ret < 0:
         raise ValueError(f"Error calculating position for planet code {planet_code}")
     longitude = pos[0]
@@ -47,11 +40,6 @@ def calculate_planet_data(jd, planet_code):
     is_retrograde = speed < 0
     return longitude, is_retrograde
 
-def get_sign(longitude):
-    """Determine zodiac sign from sidereal longitude."""
-    sign_index = int(longitude // 30) % 12
-    return ZODIAC_SIGNS[sign_index]
-
 def get_arudha_lagna(asc_sign, lord_sign):
     """Calculate Arudha Lagna based on Ascendant and Lagna lord's sign."""
     asc_index = ZODIAC_SIGNS.index(asc_sign)
@@ -67,35 +55,28 @@ def get_arudha_lagna(asc_sign, lord_sign):
 
 def get_nakshatra_and_pada(longitude):
     """Calculate nakshatra and pada based on longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            position_in_nakshatra = longitude - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)
-            return nakshatra, pada
-    # Fallback for edge case at 360 degrees
-    return 'Revati', 4
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
-def lahairi_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset):
+def lahairi_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate Arudha Lagna chart with retrograde, nakshatras, and padas."""
-    # Calculate Julian Day
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Calculate sidereal Ascendant and its sign
-    asc_lon = calculate_ascendant(jd, latitude, longitude)
+    asc_lon = calculate_ascendant(snapshot)
     asc_sign = get_sign(asc_lon)
 
     # Calculate planetary positions, retrograde status, nakshatras, and padas
     planet_data = {}
     for planet, code in zip(PLANETS, SWE_PLANETS):
         if planet == 'Ketu':
-            rahu_lon, rahu_retro = calculate_planet_data(jd, swe.MEAN_NODE)
+            rahu_lon, rahu_retro = calculate_planet_data(snapshot, swe.MEAN_NODE)
             ketu_lon = (rahu_lon + 180) % 360
             ketu_retro = rahu_retro  # Ketu retrogrades with Rahu
             nakshatra, pada = get_nakshatra_and_pada(ketu_lon)
             planet_data[planet] = {'longitude': ketu_lon, 'sign': get_sign(ketu_lon), 'retrograde': ketu_retro, 'nakshatra': nakshatra, 'pada': pada}
         else:
-            lon, retro = calculate_planet_data(jd, code)
+            lon, retro = calculate_planet_data(snapshot, code)
             nakshatra, pada = get_nakshatra_and_pada(lon)
             planet_data[planet] = {'longitude': lon, 'sign': get_sign(lon), 'retrograde': retro, 'nakshatra': nakshatra, 'pada': pada}
 
@@ -1,7 +1,8 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Sunrise import sunrise_before
+from datetime import datetime
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
 
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
 PLANET_IDS = {
     'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
     'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN,
@@ -18,27 +19,13 @@ NAKSHATRAS = [
     ("Shravana", "Moon"), ("Dhanishta", "Mars"), ("Shatabhisha", "Rahu"),
     ("Purva Bhadrapada", "Jupiter"), ("Uttara Bhadrapada", "Saturn"), ("Revati", "Mercury"),
 ]
-NAK_LEN = 13 + 1/3
-PADA_LEN = NAK_LEN / 4
-
-def bava_get_julian_day(date_str, time_str, tz_offset):
-    dt = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
-    ut_dt = dt - timedelta(hours=tz_offset)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0)
 
 def bava_calculate_sunrise(jd, lat, lon, tz_offset):
-    geopos = [lon, lat, 0.0]
-    flags = swe.CALC_RISE | swe.BIT_DISC_CENTER | swe.BIT_NO_REFRACTION
-    for offset in range(-3, 4):
-        search_jd = jd + offset
-        try:
-            ret, t_rise = swe.rise_trans(search_jd - 1.0, swe.SUN, geopos, flags=flags)
-            if ret == 0 and t_rise[0] is not None:
-                sunrise_jd = t_rise[0]
-                sun_lon = swe.calc_ut(sunrise_jd, swe.SUN, swe.FLG_SIDEREAL)[0][0] % 360
-                return sunrise_jd, sun_lon
-        except Exception:
-            continue
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    sunrise_jd = sunrise_before(jd, lat, lon)
+    if sunrise_jd is not None:
+        sun_lon = swe.calc_ut(sunrise_jd, swe.SUN, swe.FLG_SIDEREAL)[0][0] % 360
+        return sunrise_jd, sun_lon
     # Fallback: 6 AM local
     dt = datetime.strptime(f"{bava_jd_to_date(jd)} 06:00:00", '%Y-%m-%d %H:%M:%S')
     sunrise_jd = swe.julday(dt.year, dt.month, dt.day, 6.0 - tz_offset)
@@ -53,23 +40,11 @@ def bava_calculate_bhava_lagna(birth_jd, sunrise_jd, sunrise_sun_lon):
     bl_lon = (sunrise_sun_lon + degrees_progressed) % 360
     return bl_lon
 
-def bava_get_sign_and_degrees(longitude):
-    sign_index = int(longitude // 30)
-    degrees = longitude % 30
-    return SIGNS[sign_index % 12], degrees
-
-def bava_calculate_house(planet_sign, bl_sign):
-    planet_index = SIGNS.index(planet_sign)
-    bl_index = SIGNS.index(bl_sign)
-    return (planet_index - bl_index) % 12 + 1
-
 def bava_jd_to_date(jd):
     y, m, d, _ = swe.revjul(jd)
     return f"{y:04d}-{m:02d}-{d:02d}"
 
 def bava_nakshatra_and_pada(lon):
-    nak_num = int(lon // NAK_LEN)
-    nak_deg = lon - nak_num * NAK_LEN
-    pada_num = int(nak_deg // PADA_LEN) + 1
-    nak_name, nak_lord = NAKSHATRAS[nak_num % 27]
+    nak_num, pada_num = nakshatra_and_pada(lon)
+    nak_name, nak_lord = NAKSHATRAS[nak_num]
     return nak_name, nak_lord, pada_num
@@ -90,15 +90,11 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
-
-# Zodiac signs for reference
-SIGNS = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+from astro_engine.engine.core import swe
+from datetime import datetime
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS, dms
 
 # Nakshatra list with start and end degrees
 NAKSHATRAS = [
@@ -113,29 +109,16 @@ NAKSHATRAS = [
     ('Purva Bhadrapada', 320, 333.3333), ('Uttara Bhadrapada', 333.3333, 346.6667), ('Revati', 346.6667, 360)
 ]
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date and time to Julian Day (UT)."""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_dt = datetime.combine(date_obj, time_obj.time())
-        ut_dt = local_dt - timedelta(hours=tz_offset)
-        hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-        return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def calculate_ascendant(jd, latitude, longitude):
+def calculate_ascendant(snapshot):
     """Calculate the sidereal ascendant longitude using Lahiri Ayanamsa."""
     try:
-        swe.set_sid_mode(swe.SIDM_LAHIRI)  # Set Lahiri Ayanamsa
-        cusps, ascmc = swe.houses_ex(jd, latitude, longitude, b'P', flags=swe.FLG_SIDEREAL)
+        cusps, ascmc = snapshot.houses_ex(b'P', swe.FLG_SIDEREAL)
         ascendant = ascmc[0] % 360.0  # Ascendant longitude in degrees
         return ascendant
     except Exception as e:
         raise Exception(f"Ascendant calculation failed: {str(e)}")
 
-def get_planet_positions(jd):
+def get_planet_positions(snapshot):
     """Calculate sidereal positions and retrograde status of planets."""
     try:
         planets = {
@@ -147,7 +130,7 @@ def get_planet_positions(jd):
         for planet, pid in planets.items():
             if planet == 'Ketu':
                 continue
-            pos, ret = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL)
+            pos, ret = snapshot.calc_ut(pid, swe.FLG_SIDEREAL)
             if ret < 0:
                 raise ValueError(f"Error calculating position for {planet}")
             longitude = pos[0] % 360.0
@@ -186,34 +169,24 @@ def assign_planets_to_houses(planetary_positions, ascendant_sign_index):
 
 def format_dms(degrees):
     """Format degrees into degrees, minutes, and seconds."""
-    degrees = degrees % 360.0
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = int(((degrees - d) * 60 - m) * 60)
+    d, m, s = dms(degrees % 360.0, 0, truncate=True)
     return f"{d}° {m}' {s}\""
 
 def get_nakshatra_and_pada(longitude):
     """Calculate nakshatra and pada based on longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            position_in_nakshatra = longitude - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)
-            return nakshatra, pada
-    # Fallback for edge case at 360 degrees
-    return 'Revati', 4
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
-def lahairi_equal_bava(birth_date, birth_time, latitude, longitude, tz_offset):
+def lahairi_equal_bava(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate Equal Bhava Lagna, house cusps, and planetary positions with retrograde, nakshatras, and padas."""
-    # Calculate Julian Day (UT)
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Calculate sidereal ascendant
-    ascendant = calculate_ascendant(jd, latitude, longitude)
+    ascendant = calculate_ascendant(snapshot)
     ascendant_sign_index = int(ascendant // 30)
 
     # Calculate planetary positions with retrograde status
-    planetary_positions = get_planet_positions(jd)
+    planetary_positions = get_planet_positions(snapshot)
 
     # Calculate equal bhava house cusps
     cusps_degrees = calculate_equal_bhava_cusps(ascendant)
@@ -1,10 +1,8 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
 import math
-
-# Zodiac signs (0-based index)
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS, longitude_to_sign
 
 # Nakshatra details: (name, start degree, end degree)
 NAKSHATRAS = [
@@ -65,48 +63,23 @@ SIGN_ELEMENTS = {
     'Sagittarius': 'Fire', 'Capricorn': 'Earth', 'Aquarius': 'Air', 'Pisces': 'Water'
 }
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
-def calculate_sidereal_positions(jd):
+def calculate_sidereal_positions(snapshot):
     """Calculate sidereal longitudes and retrograde status of planets using Lahiri Ayanamsa."""
-    swe.set_sid_mode(swe.SIDM_LAHIRI)  # Lahiri Ayanamsa
     positions = {}
     for planet, code in PLANETS.items():
         if planet == 'Ketu':
-            # Ketu is opposite to Rahu
-            rahu_lon = positions['Rahu']['longitude']
-            ketu_lon = (rahu_lon + 180) % 360
-            positions['Ketu'] = {'longitude': ketu_lon, 'retrograde': True}  # Ketu is always retrograde
-        else:
-            # Calculate position and speed
-            pos = swe.calc_ut(jd, code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
-            lon = pos[0][0] % 360
-            speed = pos[0][3]  # Speed in longitude
-            retrograde = speed < 0 if planet not in ['Sun', 'Moon'] else False  # Sun and Moon are never retrograde
-            positions[planet] = {'longitude': lon, 'retrograde': retrograde}
+            continue
+        pos, _ = snapshot.calc_ut(code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+        retrograde = pos[3] < 0 if planet not in ['Sun', 'Moon'] else False  # Sun and Moon are never retrograde
+        positions[planet] = {'longitude': pos[0] % 360, 'retrograde': retrograde}
+    # Ketu is opposite to Rahu and always retrograde
+    positions['Ketu'] = {'longitude': (positions['Rahu']['longitude'] + 180) % 360, 'retrograde': True}
     return positions
 
-def get_sign_and_degree(longitude):
-    """Determine natal sign and degrees within the sign from longitude."""
-    sign_index = int(longitude // 30)  # Each sign is 30 degrees
-    degrees_in_sign = longitude % 30
-    return SIGNS[sign_index], degrees_in_sign
-
 def get_nakshatra_and_pada(longitude):
     """Determine nakshatra and pada from longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            nakshatra_name = nakshatra
-            nakshatra_span = end - start
-            pada = math.ceil((longitude - start) / (nakshatra_span / 4))
-            return nakshatra_name, pada
-    return "Unknown", 0  # Fallback in case of error
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 def get_navamsa_sign(natal_sign, degrees_in_sign):
     """Calculate the Navamsa sign for a planet."""
@@ -132,7 +105,7 @@ def find_atmakaraka(positions):
 def calculate_karkamsha(positions, atmakaraka):
     """Calculate the Karkamsha sign (Navamsa sign of Atmakaraka)."""
     atmakaraka_lon = positions[atmakaraka]['longitude']
-    natal_sign, degrees_in_sign = get_sign_and_degree(atmakaraka_lon)
+    natal_sign, degrees_in_sign = longitude_to_sign(atmakaraka_lon)
     navamsa_sign = get_navamsa_sign(natal_sign, degrees_in_sign)
     return navamsa_sign
 
@@ -142,7 +115,7 @@ def calculate_navamsa_positions(positions):
     for planet, data in positions.items():
         lon = data['longitude']
         retrograde = data['retrograde']
-        natal_sign, degrees_in_sign = get_sign_and_degree(lon)
+        natal_sign, degrees_in_sign = longitude_to_sign(lon)
         navamsa_sign = get_navamsa_sign(natal_sign, degrees_in_sign)
         nakshatra, pada = get_nakshatra_and_pada(lon)
         navamsa_positions[planet] = {
@@ -161,13 +134,12 @@ def assign_houses(navamsa_positions, karkamsha_sign):
         house = (sign_index - karkamsha_index) % 12 + 1  # House number (1-12)
         data['house'] = house
 
-def lahiri_karkamsha_D9(birth_date, birth_time, latitude, longitude, tz_offset):
+def lahiri_karkamsha_D9(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate the Karkamsha chart based on birth details using Lahiri Ayanamsa."""
-    # Calculate Julian Day in UT
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Calculate sidereal positions
-    positions = calculate_sidereal_positions(jd)
+    positions = calculate_sidereal_positions(snapshot)
 
     # Identify Atmakaraka
     atmakaraka = find_atmakaraka(positions)
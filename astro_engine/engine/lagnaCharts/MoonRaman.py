@@ -1,14 +1,8 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path
-swe.set_ephe_path('astro_api/ephe')
-
-# Zodiac signs list
-SIGNS = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+from astro_engine.engine.core import swe
+from datetime import datetime
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS, dms
 
 # Nakshatra list with their start degrees
 NAKSHATRAS = [
@@ -21,36 +15,15 @@ NAKSHATRAS = [
     ("Purva Bhadrapada", 320), ("Uttara Bhadrapada", 333.3333), ("Revati", 346.6667)
 ]
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """
-    Calculate Julian Day in Universal Time (UT) from local time.
-    Args:
-        date_str (str): Birth date in 'YYYY-MM-DD' format
-        time_str (str): Birth time in 'HH:MM:SS' format
-        tz_offset (float): Timezone offset from UTC in hours
-    Returns:
-        float: Julian Day in UT
-    """
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_dt = datetime.combine(date_obj, time_obj.time())
-        ut_dt = local_dt - timedelta(hours=tz_offset)
-        hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-        return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def calculate_planetary_positions(jd):
+def calculate_planetary_positions(snapshot):
     """
     Calculate sidereal positions and retrograde status of planets using Lahiri Ayanamsa.
     Args:
-        jd (float): Julian Day in UT
+        snapshot (ChartSnapshot): Raman snapshot of the birth chart
     Returns:
         dict: Planetary positions with longitudes and retrograde status
     """
     try:
-        swe.set_sid_mode(swe.SIDM_RAMAN)
         planets = {
             'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
             'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN,
@@ -62,7 +35,7 @@ def calculate_planetary_positions(jd):
         for planet, pid in planets.items():
             if planet == 'Ketu':
                 continue
-            pos, ret = swe.calc_ut(jd, pid, flags)
+            pos, ret = snapshot.calc_ut(pid, flags)
             if ret < 0:
                 raise ValueError(f"Error calculating position for {planet}")
             longitude = pos[0] % 360.0
@@ -120,10 +93,7 @@ def format_dms(degrees):
     Returns:
         str: Formatted string (e.g., "21° 50' 0\"")
     """
-    degrees = degrees % 360.0
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = int(((degrees - d) * 60 - m) * 60)
+    d, m, s = dms(degrees % 360.0, 0, truncate=True)
     return f"{d}° {m}' {s}\""
 
 def validate_input(data):
@@ -152,20 +122,15 @@ def get_nakshatra_and_pada(longitude):
     Returns:
         tuple: (nakshatra_name, pada_number)
     """
-    longitude = longitude % 360
-    for i, (nakshatra, start) in enumerate(NAKSHATRAS):
-        end = NAKSHATRAS[(i + 1) % len(NAKSHATRAS)][1] if i < 26 else 360
-        if start <= longitude < end:
-            nakshatra_name = nakshatra
-            pada = int((longitude - start) / 3.3333) + 1
-            return nakshatra_name, pada
-    return "Revati", 4  # Fallback for edge case
-
-def raman_moon_chart(data):
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
+
+def raman_moon_chart(data, snapshot=None):
     """
     Calculate Moon Chart (sidereal) with Whole Sign house system, including retrograde, nakshatras, and padas.
     Args:
         data (dict): Input JSON data
+        snapshot (ChartSnapshot, optional): Raman snapshot of the same birth data
     Returns:
         dict: Moon Chart data with Chandra Lagna, house cusps, and planetary positions
     """
@@ -177,11 +142,10 @@ def raman_moon_chart(data):
     longitude = float(data['longitude'])
     tz_offset = float(data['timezone_offset'])
 
-    # Calculate Julian Day
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Calculate planetary positions with retrograde status
-    planetary_positions = calculate_planetary_positions(jd)
+    planetary_positions = calculate_planetary_positions(snapshot)
 
     # Moon's position (Chandra Lagna)
     moon_longitude, moon_retro = planetary_positions['Moon']
@@ -1,41 +1,27 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from datetime import datetime
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, get_sign
 
 # Constants
-ZODIAC_SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+ZODIAC_SIGNS = SIGNS
 LORDS = {
     'Aries': 'Mars', 'Taurus': 'Venus', 'Gemini': 'Mercury', 'Cancer': 'Moon', 'Leo': 'Sun', 'Virgo': 'Mercury',
     'Libra': 'Venus', 'Scorpio': 'Mars', 'Sagittarius': 'Jupiter', 'Capricorn': 'Saturn', 'Aquarius': 'Saturn', 'Pisces': 'Jupiter'
 }
 PLANETS = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
 SWE_PLANETS = [swe.SUN, swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS, swe.JUPITER, swe.SATURN, swe.MEAN_NODE, swe.MEAN_NODE]
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 
-# Set Swiss Ephemeris path
-swe.set_ephe_path('astro_api/ephe')
-
-def get_julian_day(birth_date, birth_time, tz_offset):
-    """Convert birth date and time to Julian Day with timezone adjustment."""
-    local_dt = datetime.strptime(birth_date + " " + birth_time, "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0)
-
-def calculate_ascendant(jd, latitude, longitude):
+def calculate_ascendant(snapshot):
     """Calculate sidereal Ascendant longitude using Raman Ayanamsa."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    houses = swe.houses_ex(jd, latitude, longitude, flags=swe.FLG_SIDEREAL)
+    houses = snapshot.houses_ex(flags=swe.FLG_SIDEREAL)
     return houses[0][0]  # Ascendant longitude
 
-def calculate_planet_data(jd, planet_code):
+def calculate_planet_data(snapshot, planet_code):
     """Calculate sidereal longitude and retrograde status of a planet."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    pos, ret = swe.calc_ut(jd, planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+    pos, ret = snapshot.calc_ut(planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
     if ret < 0:
         raise ValueError(f"Error calculating position for planet code {planet_code}")
     longitude = pos[0]
@@ -43,20 +29,10 @@ def calculate_planet_data(jd, planet_code):
     is_retrograde = speed < 0
     return longitude, is_retrograde
 
-def get_sign(longitude):
-    """Determine zodiac sign from sidereal longitude."""
-    sign_index = int(longitude // 30) % 12
-    return ZODIAC_SIGNS[sign_index]
-
 def get_nakshatra_pada(longitude):
     """Determine nakshatra and pada from sidereal longitude."""
-    longitude = longitude % 360
-    nakshatra_index = int(longitude / 13.3333)
-    nakshatra_start = nakshatra_index * 13.3333
-    position_in_nakshatra = longitude - nakshatra_start
-    pada = min(int(position_in_nakshatra / 3.3333) + 1, 4)  # Ensure pada <= 4
-    nakshatra_name = NAKSHATRAS[nakshatra_index % 27]
-    return nakshatra_name, pada
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index], pada
 
 def get_arudha_lagna(asc_sign, lord_sign):
     """Calculate Arudha Lagna based on Ascendant and Lagna lord's sign."""
@@ -71,13 +47,12 @@ def get_arudha_lagna(asc_sign, lord_sign):
         al_index = (lord_index + count - 1) % 12
     return ZODIAC_SIGNS[al_index]
 
-def raman_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown'):
+def raman_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown', snapshot=None):
     """Calculate Arudha Lagna chart with retrograde status, nakshatras, and padas."""
-    # Calculate Julian Day
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Calculate sidereal Ascendant and its sign
-    asc_lon = calculate_ascendant(jd, latitude, longitude)
+    asc_lon = calculate_ascendant(snapshot)
     asc_sign = get_sign(asc_lon)
     asc_nakshatra, asc_pada = get_nakshatra_pada(asc_lon)
 
@@ -91,7 +66,7 @@ def raman_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, u
             lon = ketu_lon
             retro = ketu_retro
         else:
-            lon, retro = calculate_planet_data(jd, code)
+            lon, retro = calculate_planet_data(snapshot, code)
         sign = get_sign(lon)
         nakshatra, pada = get_nakshatra_pada(lon)
         planet_data[planet] = {
@@ -1,47 +1,22 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path
-swe.set_ephe_path('astro_api/ephe')
-
-# Zodiac signs
-SIGNS = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+from astro_engine.engine.core import swe
+from datetime import datetime
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms
 
 # Nakshatra list
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date and time to Julian Day (UT)."""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_dt = datetime.combine(date_obj, time_obj.time())
-        ut_dt = local_dt - timedelta(hours=tz_offset)
-        hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-        return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
+NAKSHATRAS = NAKSHATRA_NAMES
 
-def calculate_ascendant(jd, latitude, longitude):
+def calculate_ascendant(snapshot):
     """Calculate the sidereal ascendant longitude using Raman Ayanamsa."""
     try:
-        swe.set_sid_mode(swe.SIDM_RAMAN)  # Set Raman Ayanamsa
-        cusps, ascmc = swe.houses_ex(jd, latitude, longitude, b'P', flags=swe.FLG_SIDEREAL)
+        cusps, ascmc = snapshot.houses_ex(b'P', swe.FLG_SIDEREAL)
         ascendant = ascmc[0] % 360.0  # Ascendant longitude in degrees
         return ascendant
     except Exception as e:
         raise Exception(f"Ascendant calculation failed: {str(e)}")
 
-def get_planet_positions(jd):
+def get_planet_positions(snapshot):
     """Calculate sidereal positions and retrograde status of planets."""
     try:
         planets = {
@@ -53,7 +28,7 @@ def get_planet_positions(jd):
         for planet, pid in planets.items():
             if planet == 'Ketu':
                 continue
-            pos, ret = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL)
+            pos, ret = snapshot.calc_ut(pid, swe.FLG_SIDEREAL)
             if ret < 0:
                 raise ValueError(f"Error calculating position for {planet}")
             longitude = pos[0] % 360.0
@@ -89,31 +64,23 @@ def assign_planets_to_houses(planetary_positions, ascendant_sign_index):
 
 def format_dms(degrees):
     """Format degrees into degrees, minutes, and seconds."""
-    degrees = degrees % 360.0
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = int(((degrees - d) * 60 - m) * 60)
+    d, m, s = dms(degrees % 360.0, 0, truncate=True)
     return f"{d}° {m}' {s}\""
 
 def get_nakshatra(longitude):
     """Determine the nakshatra based on sidereal longitude."""
-    longitude = longitude % 360
-    nakshatra_index = int(longitude / 13.3333) % 27
-    return NAKSHATRAS[nakshatra_index]
+    return NAKSHATRAS[nakshatra_of(longitude)]
 
 def get_pada(longitude):
     """Determine the pada (1-4) within the nakshatra based on sidereal longitude."""
-    longitude = longitude % 360
-    position_in_nakshatra = longitude % 13.3333
-    pada = int(position_in_nakshatra / 3.3333) + 1
-    return pada
+    return pada_of(longitude)
 
-def raman_equal_bava_lagnas(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown'):
+def raman_equal_bava_lagnas(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown', snapshot=None):
     """Calculate Equal Bhava Lagna, house cusps, and planetary positions with nakshatra and pada."""
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
-    ascendant = calculate_ascendant(jd, latitude, longitude)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
+    ascendant = calculate_ascendant(snapshot)
     ascendant_sign_index = int(ascendant // 30)
-    planetary_positions = get_planet_positions(jd)
+    planetary_positions = get_planet_positions(snapshot)
 
     cusps_degrees = calculate_equal_bhava_cusps(ascendant)
     cusps_formatted = [format_dms(cusp) for cusp in cusps_degrees]
@@ -1,10 +1,8 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
 import math
-
-# Constants
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS, longitude_to_sign
 
 NAKSHATRAS = [
     ("Ashwini", 0, 13.333), ("Bharani", 13.333, 26.666), ("Krittika", 26.666, 40),
@@ -31,19 +29,11 @@ SIGN_ELEMENTS = {
     'Sagittarius': 'Fire', 'Capricorn': 'Earth', 'Aquarius': 'Air', 'Pisces': 'Water'
 }
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
-def calculate_ascendant(jd, latitude, longitude):
+def calculate_ascendant(snapshot):
     """Calculate the D1 Ascendant using Swiss Ephemeris."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)  # Lahiri Ayanamsa for sidereal
-    cusps, ascmc = swe.houses_ex(jd, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', swe.FLG_SIDEREAL)
     asc_lon = ascmc[0] % 360
-    sign, degrees = get_sign_and_degree(asc_lon)
+    sign, degrees = longitude_to_sign(asc_lon)
     nakshatra, pada = get_nakshatra_and_pada(asc_lon)
     return {
         'longitude': asc_lon,
@@ -54,24 +44,23 @@ def calculate_ascendant(jd, latitude, longitude):
         'retrograde': False  # Ascendant doesn't have retrograde status
     }
 
-def calculate_planetary_positions(jd):
+def calculate_planetary_positions(snapshot):
     """Calculate sidereal longitudes, signs, degrees, retrograde status, nakshatras, and padas for planets."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)  # Lahiri Ayanamsa
     positions = {}
     for planet, code in PLANETS.items():
         if planet == 'Ketu':
             rahu_lon = positions['Rahu']['longitude']
             ketu_lon = (rahu_lon + 180) % 360
-            sign, degrees = get_sign_and_degree(ketu_lon)
+            sign, degrees = longitude_to_sign(ketu_lon)
             nakshatra, pada = get_nakshatra_and_pada(ketu_lon)
             positions['Ketu'] = {
                 'longitude': ketu_lon, 'sign': sign, 'degrees': degrees,
                 'retrograde': True, 'nakshatra': nakshatra, 'pada': pada
             }
         else:
-            pos = swe.calc_ut(jd, code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+            pos = snapshot.calc_ut(code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
             lon = pos[0][0] % 360
-            sign, degrees = get_sign_and_degree(lon)
+            sign, degrees = longitude_to_sign(lon)
             retrograde = pos[0][3] < 0 if planet not in ['Sun', 'Moon'] else False
             nakshatra, pada = get_nakshatra_and_pada(lon)
             positions[planet] = {
@@ -80,22 +69,10 @@ def calculate_planetary_positions(jd):
             }
     return positions
 
-def get_sign_and_degree(longitude):
-    """Determine sign and degrees within the sign from longitude."""
-    sign_index = int(longitude // 30)
-    degrees_in_sign = longitude % 30
-    return SIGNS[sign_index], degrees_in_sign
-
 def get_nakshatra_and_pada(longitude):
     """Determine nakshatra and pada from longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            nakshatra_name = nakshatra
-            nakshatra_span = end - start
-            pada = math.ceil((longitude - start) / (nakshatra_span / 4))
-            return nakshatra_name, pada
-    return "Revati", 4 if longitude == 360 else ("Unknown", 0)
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 def get_navamsa_sign(natal_sign, degrees_in_sign):
     """Calculate the Navamsa sign for a planet or point."""
@@ -134,16 +111,16 @@ def assign_houses_d1_karkamsha(positions, karkamsha_ascendant):
         house = (sign_index - karkamsha_index) % 12 + 1
         data['house'] = house
 
-def raman_karkamsha_D1(birth_date, birth_time, latitude, longitude, tz_offset):
+def raman_karkamsha_D1(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate the D1 Karkamsha chart based on birth details using Raman Ayanamsa."""
-    # Step 1: Convert to Julian Day
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    # Step 1: Julian Day and Raman positions
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Step 2: Calculate D1 Ascendant
-    ascendant = calculate_ascendant(jd, latitude, longitude)
+    ascendant = calculate_ascendant(snapshot)
 
     # Step 3: Calculate D1 planetary positions
-    positions = calculate_planetary_positions(jd)
+    positions = calculate_planetary_positions(snapshot)
 
     # Step 4: Include Ascendant in positions dictionary
     positions['Ascendant'] = ascendant
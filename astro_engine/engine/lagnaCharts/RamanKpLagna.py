@@ -1,9 +1,7 @@
-import swisseph as swe
-from math import floor
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada, nakshatra_of, nakshatra_offset
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import get_sign
 
 # Define constants
 PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
@@ -23,28 +21,16 @@ SUB_LORD_PROPORTIONS = [
     ('Mars', 0.7778), ('Rahu', 2.0000), ('Jupiter', 1.7778), ('Saturn', 2.1111),
     ('Mercury', 1.8889)
 ]
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
-def calculate_planet_positions(jd):
+def calculate_planet_positions(snapshot):
     """Calculate sidereal positions of planets using Raman Ayanamsa, including Ketu and retrograde status."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)
     planet_ids = {
         'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
         'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN, 'Rahu': swe.MEAN_NODE
     }
     positions = {}
     for planet, pid in planet_ids.items():
-        result = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL)
+        result = snapshot.calc_ut(pid, swe.FLG_SIDEREAL)
         positions[planet] = result[0][0] % 360
         speed = result[0][3]  # Speed in longitude
         positions[planet + '_retro'] = speed < 0
@@ -54,40 +40,24 @@ def calculate_planet_positions(jd):
     
     return positions
 
-def calculate_house_cusps(jd, latitude, longitude):
+def calculate_house_cusps(snapshot):
     """Calculate sidereal house cusps using Placidus house system with Raman Ayanamsa."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    house_pos = swe.houses_ex(jd, latitude, longitude, b'P', flags=swe.FLG_SIDEREAL)
+    house_pos = snapshot.houses_ex(b'P', swe.FLG_SIDEREAL)
     cusps = [cusp % 360 for cusp in house_pos[0]]
     return cusps
 
-def get_sign(longitude):
-    """Get zodiac sign based on longitude."""
-    sign_index = floor(longitude / 30) % 12
-    return SIGNS[sign_index]
-
 def get_nakshatra(longitude):
     """Get nakshatra name based on longitude."""
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            return nakshatra
-    return 'Revati' if longitude >= 346.6667 else 'Ashwini'
+    return NAKSHATRAS[nakshatra_of(longitude)][0]
 
 def get_nakshatra_pada(longitude):
     """Get nakshatra and pada based on longitude."""
-    longitude = longitude % 360
-    pada_size = 360 / 108  # 3.3333° per pada
-    pada_index = floor(longitude / pada_size)
-    nakshatra_index = pada_index // 4
-    pada_number = (pada_index % 4) + 1
-    nakshatra = NAKSHATRAS[nakshatra_index][0]
-    return nakshatra, pada_number
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 def get_sub_lord(longitude):
     """Get sub-lord based on longitude within nakshatra."""
-    nakshatra_span = 13.3333
-    nakshatra_start = floor(longitude / nakshatra_span) * nakshatra_span
-    progress = longitude - nakshatra_start
+    _, progress = nakshatra_offset(longitude)
     cumulative = 0
     for sub_lord, proportion in SUB_LORD_PROPORTIONS:
         cumulative += proportion
@@ -161,11 +131,11 @@ def calculate_significators(planet_positions, house_cusps):
     
     return significators
 
-def raman_kp_bava(user_name, birth_date, birth_time, latitude, longitude, tz_offset):
+def raman_kp_bava(user_name, birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate KP Bhava Chart with Raman ayanamsa, including retrograde, nakshatra, and pada."""
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
-    planet_positions = calculate_planet_positions(jd)
-    house_cusps = calculate_house_cusps(jd, latitude, longitude)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
+    planet_positions = calculate_planet_positions(snapshot)
+    house_cusps = calculate_house_cusps(snapshot)
     house_assignments = assign_planets_to_houses(planet_positions, house_cusps)
     significators = calculate_significators(planet_positions, house_cusps)
 
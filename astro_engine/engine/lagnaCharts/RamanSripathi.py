@@ -1,9 +1,9 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
 import math
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS
 
-# Constants
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
 PLANET_IDS = {
     'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
     'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN,
@@ -21,16 +21,9 @@ NAKSHATRAS = [
     ("Purva Bhadrapada", 320), ("Uttara Bhadrapada", 333.3333), ("Revati", 346.6667)
 ]
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    dt = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
-    ut_dt = dt - timedelta(hours=tz_offset)
-    jd = swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0)
-    return jd
-
-def calculate_ascendant(jd, lat, lon):
+def calculate_ascendant(snapshot):
     """Calculate the ascendant longitude and house cusps using Sripathi Bhava system."""
-    cusps, ascmc = swe.houses_ex(jd, lat, lon, b'W', flags=swe.FLG_SIDEREAL)  # 'S' for Sripathi
+    cusps, ascmc = snapshot.houses_ex(b'W', swe.FLG_SIDEREAL)  # 'S' for Sripathi
     asc_lon = ascmc[0] % 360  # Ascendant longitude
     asc_sign_index = math.floor(asc_lon / 30)
     return asc_lon, asc_sign_index, cusps
@@ -51,25 +44,16 @@ def calculate_house(planet_lon, cusps):
 
 def get_nakshatra_and_pada(longitude):
     """Determine the nakshatra and pada based on longitude."""
-    longitude = longitude % 360
-    for i, (nakshatra, start) in enumerate(NAKSHATRAS):
-        end = NAKSHATRAS[(i + 1) % len(NAKSHATRAS)][1] if i < 26 else 360
-        if start <= longitude < end:
-            nakshatra_name = nakshatra
-            # Calculate pada: each pada is 3°20' (3.3333°)
-            pada = math.ceil((longitude - start) / 3.3333)
-            if pada > 4:  # Ensure pada doesn't exceed 4
-                pada = 4
-            return nakshatra_name, pada
-    return "Revati", 4  # Fallback for edge case
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
-def get_planet_data(jd, asc_lon, cusps):
+def get_planet_data(snapshot, asc_lon, cusps):
     """Calculate planetary positions, signs, degrees, retrograde status, nakshatras, padas, and houses."""
     natal_positions = {}
     for planet, pid in PLANET_IDS.items():
         if planet == 'Ketu':
             continue
-        pos_data, _ = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+        pos_data, _ = snapshot.calc_ut(pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)
         lon = pos_data[0] % 360
         retrograde = 'R' if pos_data[3] < 0 else ''
         sign_index = math.floor(lon / 30)
@@ -104,15 +88,15 @@ def get_planet_data(jd, asc_lon, cusps):
     }
     return natal_positions
 
-def raman_sripathi_bava(birth_date, birth_time, latitude, longitude, tz_offset):
+def raman_sripathi_bava(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate natal chart data using Lahiri Ayanamsa and Sripathi Bhava system."""
-    jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
-    asc_lon, asc_sign_index, cusps = calculate_ascendant(jd_ut, latitude, longitude)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
+    asc_lon, asc_sign_index, cusps = calculate_ascendant(snapshot)
     asc_sign = SIGNS[asc_sign_index]
     asc_degrees = asc_lon % 30
     asc_nakshatra, asc_pada = get_nakshatra_and_pada(asc_lon)
     
-    natal_positions = get_planet_data(jd_ut, asc_lon, cusps)
+    natal_positions = get_planet_data(snapshot, asc_lon, cusps)
     
     response = {
         "ascendant": {
@@ -130,43 +130,27 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
 import math
 import logging
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Configure Swiss Ephemeris
-swe.set_ephe_path('astro_api/ephe')  # Ensure this path points to your ephemeris files
-swe.set_sid_mode(swe.SIDM_LAHIRI)    # Lahiri Ayanamsa for sidereal astrology
-
-# Constants
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
 PLANET_IDS = {
     'Sun': swe.SUN, 'Moon': swe.MOON, 'Mars': swe.MARS, 'Mercury': swe.MERCURY,
     'Jupiter': swe.JUPITER, 'Venus': swe.VENUS, 'Saturn': swe.SATURN,
     'Rahu': swe.MEAN_NODE, 'Ketu': None  # Ketu calculated separately
 }
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu', 'Pushya', 'Ashlesha',
-    'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 
 # Helper Functions
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert local birth date and time to Julian Day in UT."""
-    dt = datetime.strptime(f"{date_str} {time_str}", '%Y-%m-%d %H:%M:%S')
-    ut_dt = dt - timedelta(hours=tz_offset)
-    jd = swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, ut_dt.hour + ut_dt.minute / 60.0 + ut_dt.second / 3600.0)
-    logger.debug(f"Julian Day: {jd} for UT: {ut_dt}")
-    return jd
-
 def calculate_ascendant_sri(jd, lat, lon):
     """Calculate the ascendant longitude and house cusps using Sripathi Bhava system."""
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
     cusps, ascmc = swe.houses_ex(jd, lat, lon, b'S', flags=swe.FLG_SIDEREAL)  # 'S' for Sripathi
     asc_lon = ascmc[0] % 360  # Ascendant longitude
     asc_sign_index = math.floor(asc_lon / 30)
@@ -189,27 +173,12 @@ def calculate_house(planet_lon, cusps):
 
 def get_nakshatra_pada_sri(longitude):
     """Calculate nakshatra and pada from longitude."""
-    nakshatra_span = 13 + 1/3  # 13.3333 degrees (13°20')
-    pada_span = nakshatra_span / 4  # 3.3333 degrees (3°20')
-    
-    # Normalize longitude to 0-360°
-    longitude = longitude % 360
-    
-    # Calculate nakshatra index (0-26)
-    nakshatra_index = math.floor(longitude / nakshatra_span)
-    
-    # Calculate pada within nakshatra (1-4)
-    nakshatra_start = nakshatra_index * nakshatra_span
-    pada_offset = (longitude - nakshatra_start) / pada_span
-    pada = math.floor(pada_offset) + 1
-    
-    # Get nakshatra name
-    nakshatra = NAKSHATRAS[nakshatra_index]
-    
-    return nakshatra, pada
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index], pada
 
 def get_planet_data_sri(jd, asc_lon, cusps):
     """Calculate planetary positions, signs, degrees, retrograde status, houses, nakshatra, and pada."""
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
     natal_positions = {}
     for planet, pid in PLANET_IDS.items():
         if planet == 'Ketu':
@@ -0,0 +1,142 @@
+"""
+Bulk Lahiri natal / navamsa computation for back-office jobs.
+
+``lahairi_natal_batch`` takes any iterable of birth records (dicts, or NDJSON lines as
+strings) and yields one result per record, in input order, as soon as it is ready. Records
+are handed to the shared process pool (core.ProcessPool) in chunks, so every worker charts
+a block of users with one ChartSnapshot per user (shared by the natal chart and D9) and no
+per-record IPC round trip. A request therefore never forks its own workers, and a busy pool
+answers with PoolSaturated like the dasha routes. With the pool disabled (the default) the
+records are charted in the calling thread. Back-office jobs can pass their own
+``ProcessPool(os.cpu_count())``.
+
+Snapshots built here bypass the shared snapshot LRU: a nightly job touches each user once,
+and caching hundreds of thousands of one-off charts would only evict the hot profiles the
+API is serving.
+"""
+import json
+import os
+from collections import deque
+from itertools import islice
+
+from astro_engine.engine.core import ProcessPool
+from astro_engine.engine.core.ChartSnapshot import ChartSnapshot
+from astro_engine.engine.divisionalCharts.NavamshaD9 import lahairi_navamsha_chart
+from astro_engine.engine.natalCharts.natal import lahairi_natal, lahairi_natal_response
+from astro_engine.engine.core.SiderealKernel import get_julian_day
+
+# Records sent to a worker at a time.
+DEFAULT_BATCH_CHUNKSIZE = int(os.environ.get('ASTRO_BATCH_CHUNKSIZE', 64))
+
+BATCH_REQUIRED_FIELDS = ['birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
+
+
+def _natal_product(record, snapshot):
+    return lahairi_natal_response(record, lahairi_natal(record, snapshot))
+
+
+# Product name -> function(record, snapshot) returning the product's JSON body.
+BATCH_PRODUCTS = {
+    'natal': _natal_product,
+    'd9': lahairi_navamsha_chart,
+}
+
+
+def lahairi_natal_record(record, products=('natal', 'd9')):
+    """
+    Compute the requested products for one birth record.
+
+    ``record`` is a dict or a JSON string. Returns a dict with ``user_name`` (and ``id`` when
+    the record has one) plus one key per product, or with ``error`` when the record is
+    invalid; errors never propagate, so one bad record cannot abort a batch.
+    """
+    try:
+        if isinstance(record, (str, bytes)):
+            record = json.loads(record)
+        if not isinstance(record, dict):
+            raise ValueError("Birth record must be a JSON object")
+        if not all(key in record for key in BATCH_REQUIRED_FIELDS):
+            raise ValueError("Missing required parameters")
+
+        latitude = float(record['latitude'])
+        longitude = float(record['longitude'])
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+            raise ValueError("Invalid latitude or longitude")
+
+        jd_ut = get_julian_day(record['birth_date'], record['birth_time'], record['timezone_offset'])
+        snapshot = ChartSnapshot(jd_ut, latitude, longitude, 'lahiri')
+
+        result = {"user_name": record.get('user_name', 'Unknown')}
+        if 'id' in record:
+            result['id'] = record['id']
+        for name in products:
+            result[name] = BATCH_PRODUCTS[name](record, snapshot)
+        return result
+    except ValueError as ve:
+        result = {"error": f"Invalid input: {str(ve)}"}
+    except Exception as e:
+        result = {"error": f"An error occurred: {str(e)}"}
+    if isinstance(record, dict) and 'id' in record:
+        result['id'] = record['id']
+    return result
+
+
+def _chunk_worker(chunk, products):
+    return [lahairi_natal_record(record, products) for record in chunk]
+
+
+def _chunks(records, chunksize):
+    records = iter(records)
+    chunk = list(islice(records, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(records, chunksize))
+
+
+def _stream_chunks(pool, first, chunks, products):
+    """Yield the results of ``first`` and of every further chunk, keeping ``pool.size`` in flight."""
+    pending = deque([first])
+    for chunk in chunks:
+        while len(pending) >= pool.size:
+            yield from pending.popleft().result()
+        while True:
+            try:
+                pending.append(pool.submit(_chunk_worker, chunk, products))
+                break
+            except ProcessPool.PoolSaturated:
+                if not pending:
+                    # Other requests hold every slot and the response has already started.
+                    yield from _chunk_worker(chunk, products)
+                    break
+                yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def lahairi_natal_batch(records, products=('natal', 'd9'), pool=None, chunksize=None):
+    """
+    Iterator over ``lahairi_natal_record`` results for an iterable of birth records, in order.
+
+    ``records`` is consumed lazily, so it can be a generator over an NDJSON file or request
+    body. Chunks of ``chunksize`` records (default ASTRO_BATCH_CHUNKSIZE) run on ``pool``,
+    the shared ProcessPool unless given; a disabled pool computes them in the calling
+    thread. The first chunk is queued before this returns, so a saturated pool raises
+    PoolSaturated here rather than in the middle of a streamed response.
+    """
+    products = tuple(products)
+    unknown = [name for name in products if name not in BATCH_PRODUCTS]
+    if unknown:
+        raise ValueError(f"Unknown products: {', '.join(map(str, unknown))}")
+
+    if pool is None:
+        pool = ProcessPool.pool
+    chunksize = chunksize or DEFAULT_BATCH_CHUNKSIZE
+
+    if not pool.size:
+        return (lahairi_natal_record(record, products) for record in records)
+
+    chunks = _chunks(records, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        return iter(())
+    return _stream_chunks(pool, pool.submit(_chunk_worker, first, products), chunks, products)
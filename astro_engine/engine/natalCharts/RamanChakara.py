@@ -1,51 +1,21 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path
-swe.set_ephe_path('astro_api/ephe')
-
-# Define zodiac signs
-SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-         "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_of
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, longitude_to_sign
 
 # Define nakshatras
-NAKSHATRAS = [
-    "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra", "Punarvasu", "Pushya", "Ashlesha",
-    "Magha", "Purva Phalguni", "Uttara Phalguni", "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-    "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha", "Purva Bhadrapada",
-    "Uttara Bhadrapada", "Revati"
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    """
-    Convert local birth date and time to Julian Day in Universal Time (UT).
-    
-    Args:
-        date_str (str): Birth date in 'YYYY-MM-DD' format
-        time_str (str): Birth time in 'HH:MM:SS' format
-        tz_offset (float): Timezone offset in hours (e.g., 5.5 for IST)
-    
-    Returns:
-        float: Julian Day for the UT time
-    """
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
+NAKSHATRAS = NAKSHATRA_NAMES
 
-def calculate_sidereal_positions(jd, latitude, longitude):
+def calculate_sidereal_positions(snapshot):
     """
     Calculate sidereal longitudes of planets and ascendant using Lahiri Ayanamsa.
     
     Args:
-        jd (float): Julian Day in UT
-        latitude (float): Latitude of birth place in degrees
-        longitude (float): Longitude of birth place in degrees
+        snapshot (ChartSnapshot): Raman snapshot of the birth chart
     
     Returns:
         dict: Sidereal longitudes of planets and ascendant
     """
-    swe.set_sid_mode(swe.SIDM_RAMAN)  # Set Lahiri Ayanamsa
     positions = {}
     planet_ids = {
         "Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS,
@@ -56,31 +26,18 @@ def calculate_sidereal_positions(jd, latitude, longitude):
     # Calculate planetary positions
     for planet, pid in planet_ids.items():
         if planet == "Ketu":
-            rahu_pos = swe.calc_ut(jd, pid[0], swe.FLG_SIDEREAL)[0][0]
+            rahu_pos = snapshot.calc_ut(pid[0], swe.FLG_SIDEREAL)[0][0]
             positions[planet] = (rahu_pos + pid[1]) % 360
         else:
-            pos = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL)[0][0]
+            pos = snapshot.calc_ut(pid, swe.FLG_SIDEREAL)[0][0]
             positions[planet] = pos % 360
     
     # Calculate ascendant
-    _, ascmc = swe.houses_ex(jd, latitude, longitude, b'W', swe.FLG_SIDEREAL)  # 'W' for whole sign
+    _, ascmc = snapshot.houses_ex(b'W', swe.FLG_SIDEREAL)  # 'W' for whole sign
     positions["Ascendant"] = ascmc[0] % 360
     
     return positions
 
-def get_sign(longitude):
-    """
-    Determine the zodiac sign and degree within the sign from longitude.
-    
-    Args:
-        longitude (float): Sidereal longitude in degrees
-    
-    Returns:
-        tuple: (sign name, degrees within sign)
-    """
-    sign_idx = int(longitude // 30)
-    return SIGNS[sign_idx], longitude % 30
-
 def get_nakshatra(longitude):
     """
     Determine the nakshatra based on longitude.
@@ -91,9 +48,7 @@ def get_nakshatra(longitude):
     Returns:
         str: Nakshatra name
     """
-    longitude = longitude % 360
-    nakshatra_index = int(longitude / (360 / 27))
-    return NAKSHATRAS[nakshatra_index]
+    return NAKSHATRAS[nakshatra_of(longitude)]
 
 def generate_chart(positions, reference_sign_idx):
     """
@@ -108,7 +63,7 @@ def generate_chart(positions, reference_sign_idx):
     """
     chart = {sign: [] for sign in SIGNS}
     for planet, lon in positions.items():
-        sign, _ = get_sign(lon)
+        sign, _ = longitude_to_sign(lon)
         chart[sign].append(planet)
     
     # Assign house numbers relative to the reference sign
@@ -128,13 +83,10 @@ def format_dms(degrees):
     Returns:
         str: Formatted string as "D° M' S\""
     """
-    degrees = degrees % 360.0
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = ((degrees - d) * 60 - m) * 60
+    d, m, s = dms(degrees % 360.0)
     return f"{d}° {m}' {s:.2f}\""
 
-def raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown'):
+def raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown', snapshot=None):
     """
     Calculate the Sudarshan Chakra and planetary details based on birth details.
     
@@ -145,22 +97,23 @@ def raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offse
         longitude (float): Longitude of birth place in degrees
         tz_offset (float): Timezone offset in hours
         user_name (str): Name of the user (default 'Unknown')
+        snapshot (ChartSnapshot): Optional Raman snapshot for the same birth data
     
     Returns:
         dict: Sudarshan Chakra details with planetary positions and nakshatras
     """
-    # Step 1: Calculate Julian Day in UT
-    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+    # Step 1: Julian Day and Raman positions
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Step 2: Calculate sidereal positions
-    positions = calculate_sidereal_positions(jd_birth, latitude, longitude)
+    positions = calculate_sidereal_positions(snapshot)
 
     # Step 3: Compute planetary positions with nakshatras
     planetary_positions = []
     for planet, lon in positions.items():
         if planet == "Ascendant":
             continue
-        sign, degree = get_sign(lon)
+        sign, degree = longitude_to_sign(lon)
         nakshatra = get_nakshatra(lon)
         planetary_positions.append({
             "planet": planet,
@@ -172,7 +125,7 @@ def raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offse
 
     # Step 4: Ascendant details with nakshatra
     asc_lon = positions["Ascendant"]
-    asc_sign, asc_degree = get_sign(asc_lon)
+    asc_sign, asc_degree = longitude_to_sign(asc_lon)
     asc_nakshatra = get_nakshatra(asc_lon)
     ascendant = {
         "longitude": format_dms(asc_lon),
@@ -183,9 +136,9 @@ def raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offse
 
     # Step 5: Determine reference sign indices
     asc_sign_idx = SIGNS.index(asc_sign)
-    moon_sign, _ = get_sign(positions["Moon"])
+    moon_sign, _ = longitude_to_sign(positions["Moon"])
     moon_sign_idx = SIGNS.index(moon_sign)
-    sun_sign, _ = get_sign(positions["Sun"])
+    sun_sign, _ = longitude_to_sign(positions["Sun"])
     sun_sign_idx = SIGNS.index(sun_sign)
 
     # Step 6: Generate the three charts
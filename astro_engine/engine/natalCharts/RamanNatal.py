@@ -245,13 +245,13 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, get_house
 
 # Constants
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+signs = SIGNS
 
 nakshatras = [
     ('Ashwini', 0, 13.3333),
@@ -284,47 +284,19 @@ nakshatras = [
 ]
 
 # Helper Functions
-def get_house(lon, asc_sign_index, orientation_shift=0):
-    """
-    Calculate house number based on planet longitude and ascendant sign index for Whole Sign system.
-    """
-    sign_index = int(lon // 30) % 12
-    house_index = (sign_index - asc_sign_index + orientation_shift) % 12
-    return house_index + 1
-
-def longitude_to_sign(deg):
-    """Convert longitude to sign and degree within sign."""
-    deg = deg % 360
-    sign_index = int(deg // 30)
-    sign = signs[sign_index]
-    sign_deg = deg % 30
-    return sign, sign_deg
-
-def format_dms(deg):
-    """Format degrees as degrees, minutes, seconds."""
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
-
 def get_nakshatra_and_pada(lon):
     """Calculate nakshatra and pada based on longitude."""
-    lon = lon % 360
-    for name, start, end in nakshatras:
-        if start <= lon < end:
-            position_in_nakshatra = lon - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)  # 3°20' = 3.3333°
-            return name, pada
-    return 'Revati', 4  # Fallback for edge case
+    nakshatra_index, pada = nakshatra_and_pada(lon)
+    return nakshatras[nakshatra_index][0], pada
 
 # Main Calculation Function
-def raman_natal(birth_data):
+def raman_natal(birth_data, snapshot=None):
     """
     Calculate natal chart data using Raman ayanamsa, including retrograde, nakshatras, and padas.
     
     Parameters:
     - birth_data: Dictionary with birth details
+    - snapshot: Optional Raman ChartSnapshot for the same birth data, reused instead of recomputing
     
     Returns:
     - Dictionary with calculated chart data
@@ -332,16 +304,9 @@ def raman_natal(birth_data):
     latitude = float(birth_data['latitude'])
     longitude = float(birth_data['longitude'])
     timezone_offset = float(birth_data['timezone_offset'])
-    birth_date = datetime.strptime(birth_data['birth_date'], '%Y-%m-%d')
-    birth_time = datetime.strptime(birth_data['birth_time'], '%H:%M:%S').time()
-    local_datetime = datetime.combine(birth_date, birth_time)
-    ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-    hour_decimal = ut_datetime.hour + ut_datetime.minute / 60.0 + ut_datetime.second / 3600.0
-    jd_ut = swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-
-    # Set Raman ayanamsa
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    ayanamsa_value = swe.get_ayanamsa_ut(jd_ut)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_data['birth_date'], birth_data['birth_time'],
+                                latitude, longitude, timezone_offset)
+    ayanamsa_value = snapshot.get_ayanamsa_ut()
 
     # Planetary positions
     planets = [
@@ -352,7 +317,7 @@ def raman_natal(birth_data):
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     planet_positions = {}
     for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {planet_name}")
         lon = pos[0] % 360
@@ -378,7 +343,7 @@ def raman_natal(birth_data):
     }
 
     # Ascendant and houses
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     ascendant_lon = ascmc[0] % 360
     asc_sign_index = int(ascendant_lon // 30)
     asc_nakshatra, asc_pada = get_nakshatra_and_pada(ascendant_lon)
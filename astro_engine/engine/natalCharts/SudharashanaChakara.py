@@ -1,40 +1,17 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.SiderealKernel import SIGNS, longitude_to_sign
 
-# Define zodiac signs
-SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", 
-         "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    """
-    Convert local birth date and time to Julian Day in Universal Time (UT).
-    
-    Args:
-        date_str (str): Birth date in 'YYYY-MM-DD' format
-        time_str (str): Birth time in 'HH:MM:SS' format
-        tz_offset (float): Timezone offset in hours (e.g., 5.5 for IST)
-    
-    Returns:
-        float: Julian Day for the UT time
-    """
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
-
-def calculate_sidereal_positions(jd, latitude, longitude):
+def calculate_sidereal_positions(snapshot):
     """
     Calculate sidereal longitudes of planets and ascendant using Lahiri Ayanamsa.
     
     Args:
-        jd (float): Julian Day in UT
-        latitude (float): Latitude of birth place in degrees
-        longitude (float): Longitude of birth place in degrees
+        snapshot (ChartSnapshot): Lahiri snapshot of the birth chart
     
     Returns:
         dict: Sidereal longitudes of planets and ascendant
     """
-    swe.set_sid_mode(swe.SIDM_LAHIRI)  # Set Lahiri Ayanamsa
     positions = {}
     planet_ids = {
         "Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS,
@@ -45,31 +22,18 @@ def calculate_sidereal_positions(jd, latitude, longitude):
     # Calculate planetary positions
     for planet, pid in planet_ids.items():
         if planet == "Ketu":
-            rahu_pos = swe.calc_ut(jd, pid[0], swe.FLG_SIDEREAL)[0][0]
+            rahu_pos = snapshot.calc_ut(pid[0], swe.FLG_SIDEREAL)[0][0]
             positions[planet] = (rahu_pos + pid[1]) % 360
         else:
-            pos = swe.calc_ut(jd, pid, swe.FLG_SIDEREAL)[0][0]
+            pos = snapshot.calc_ut(pid, swe.FLG_SIDEREAL)[0][0]
             positions[planet] = pos % 360
     
     # Calculate ascendant
-    _, ascmc = swe.houses_ex(jd, latitude, longitude, b'W', swe.FLG_SIDEREAL)  # 'W' for whole sign
+    _, ascmc = snapshot.houses_ex(b'W', swe.FLG_SIDEREAL)  # 'W' for whole sign
     positions["Ascendant"] = ascmc[0] % 360
     
     return positions
 
-def get_sign(longitude):
-    """
-    Determine the zodiac sign and degree within the sign from longitude.
-    
-    Args:
-        longitude (float): Sidereal longitude in degrees
-    
-    Returns:
-        tuple: (sign name, degrees within sign)
-    """
-    sign_idx = int(longitude // 30)
-    return SIGNS[sign_idx], longitude % 30
-
 def generate_chart(positions, reference_sign_idx):
     """
     Generate a chart (Lagna, Chandra, or Surya) using the whole sign house system.
@@ -83,7 +47,7 @@ def generate_chart(positions, reference_sign_idx):
     """
     chart = {sign: [] for sign in SIGNS}
     for planet, lon in positions.items():
-        sign, _ = get_sign(lon)
+        sign, _ = longitude_to_sign(lon)
         chart[sign].append(planet)
     
     # Assign house numbers relative to the reference sign
@@ -91,4 +55,34 @@ def generate_chart(positions, reference_sign_idx):
     for i, sign in enumerate(SIGNS):
         house_num = (i - reference_sign_idx) % 12 + 1
         house_chart[house_num] = {"sign": sign, "planets": chart[sign]}
-    return house_chart
\ No newline at end of file
+    return house_chart
+
+def lahiri_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offset, user_name='Unknown', snapshot=None):
+    """
+    Calculate the Lagna, Chandra and Surya charts of the Sudarshan Chakra.
+    
+    Args:
+        birth_date (str): Birth date in 'YYYY-MM-DD' format
+        birth_time (str): Birth time in 'HH:MM:SS' format
+        latitude (float): Latitude of birth place in degrees
+        longitude (float): Longitude of birth place in degrees
+        tz_offset (float): Timezone offset in hours
+        user_name (str): Name of the user (default 'Unknown')
+        snapshot (ChartSnapshot): Optional Lahiri snapshot for the same birth data
+    
+    Returns:
+        dict: Sudarshan Chakra with the three whole sign charts
+    """
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_date, birth_time, latitude, longitude, tz_offset)
+    positions = calculate_sidereal_positions(snapshot)
+    asc_sign, _ = longitude_to_sign(positions["Ascendant"])
+    moon_sign, _ = longitude_to_sign(positions["Moon"])
+    sun_sign, _ = longitude_to_sign(positions["Sun"])
+    lagna_chart = generate_chart(positions, SIGNS.index(asc_sign))
+    chandra_chart = generate_chart(positions, SIGNS.index(moon_sign))
+    surya_chart = generate_chart(positions, SIGNS.index(sun_sign))
+
+    return {
+        "user_name": user_name,
+        "sudarshan_chakra": {"lagna_chart": lagna_chart, "chandra_chart": chandra_chart, "surya_chart": surya_chart}
+    }
\ No newline at end of file
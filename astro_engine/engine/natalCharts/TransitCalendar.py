@@ -0,0 +1,226 @@
+"""
+Transit calendar: transit events for a natal chart over a date range.
+
+Each transit body is sampled at a coarse step (a day, six hours for the Moon) from the
+shared transit ephemeris: at a daily step the samples are one strided slice of the table.
+Per-sample keys (sign, nakshatra, direction of motion and how many natal points lie behind
+the body) are computed for the whole series at once, and only the steps where a key
+changes are examined for sign and nakshatra ingresses, retrograde / direct stations and
+conjunctions with natal points. Each event found is then narrowed down to the minute by
+bisection on the same interpolated ephemeris, which is where most of the time goes: about
+ten interpolations per event.
+
+A ten-year calendar for all bodies holds about 5,000 events and takes roughly 0.3 s with
+the table mapped. The Moon's nakshatra ingresses add about 3,600 more (roughly 0.6 s in
+all), so they are only included when the request names its "events".
+
+Houses are whole-sign houses from the natal ascendant, as in the single-instant transit
+chart, so a house ingress is the same moment as the sign ingress and is reported on it.
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import ChartSnapshot
+from astro_engine.engine.core.DashaTree import date_to_jd
+from astro_engine.engine.core.Ephemeris import transit_position_function, transit_series
+from astro_engine.engine.core.Nakshatras import absolute_padas, nakshatra_of
+from astro_engine.engine.natalCharts.transit import nakshatras, signs
+from astro_engine.engine.core.SiderealKernel import format_dms, get_house
+
+TRANSIT_PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu']
+EVENT_TYPES = ['sign_ingress', 'nakshatra_ingress', 'station', 'natal_conjunction']
+# The Moon changes nakshatra about once a day, which would be over a third of a default
+# calendar; those ingresses are only reported when "events" names nakshatra_ingress.
+ON_REQUEST_EVENTS = {'Moon': {'nakshatra_ingress'}}
+
+# Natal points a transit can conjoin; Rahu uses the true node like the transit chart.
+NATAL_POINTS = [
+    ('Sun', swe.SUN), ('Moon', swe.MOON), ('Mars', swe.MARS), ('Mercury', swe.MERCURY),
+    ('Jupiter', swe.JUPITER), ('Venus', swe.VENUS), ('Saturn', swe.SATURN), ('Rahu', swe.TRUE_NODE)
+]
+
+DEFAULT_STEP_DAYS = 1.0
+STEP_DAYS = {'Moon': 0.25}
+# Events are located to within a minute.
+REFINE_TOLERANCE_DAYS = 1 / 1440
+MAX_RANGE_DAYS = 100 * 365.25
+# The nodes' true motion wobbles back and forth every few days, so their stations are noise.
+NO_STATIONS = ('Rahu', 'Ketu')
+
+
+def jd_to_utc_string(jd):
+    year, month, day, hour = swe.revjul(jd, swe.GREG_CAL)
+    dt = datetime(year, month, day) + timedelta(seconds=round(hour * 3600))
+    return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def _refine(key_at, t0, t1, key0):
+    """Earliest time in (t0, t1] at which ``key_at`` no longer returns ``key0``."""
+    while t1 - t0 > REFINE_TOLERANCE_DAYS:
+        mid = (t0 + t1) / 2
+        if key_at(mid) == key0:
+            t0 = mid
+        else:
+            t1 = mid
+    return t1
+
+
+def _signed_distance(lon, point):
+    """Arc from ``point`` to ``lon`` in (-180, 180]."""
+    return (lon - point + 180) % 360 - 180
+
+
+def scan_planet_events(planet, start_jd, end_jd, natal_points, asc_sign_index,
+                       event_types=EVENT_TYPES, ayanamsa='lahiri'):
+    """Events of one transit body in [start_jd, end_jd), in time order."""
+    position = transit_position_function(planet, ayanamsa)
+
+    def sign_at(jd):
+        return int(position(jd)[0] // 30) % 12
+
+    def nakshatra_at(jd):
+        return nakshatra_of(position(jd)[0])
+
+    def retrograde_at(jd):
+        return position(jd)[1] < 0
+
+    def side_of(point):
+        return lambda jd: _signed_distance(position(jd)[0], point) >= 0
+
+    wanted = set(event_types)
+    want_stations = 'station' in wanted and planet not in NO_STATIONS
+    conjunctions = natal_points if 'natal_conjunction' in wanted else []
+
+    # Coarse samples every ``step`` days, plus ``end_jd`` when the range is not a whole
+    # number of steps.
+    step = STEP_DAYS.get(planet, DEFAULT_STEP_DAYS)
+    count = int((end_jd - start_jd) // step) + 1
+    times = [start_jd + k * step for k in range(count)]
+    lons, speeds = transit_series(planet, start_jd, step, count, ayanamsa)
+    if times[-1] < end_jd:
+        lon, speed = position(end_jd)
+        times.append(end_jd)
+        lons.append(lon)
+        speeds.append(speed)
+
+    # Per-sample keys for the wanted events: sign, nakshatra, motion and the natal points
+    # passed so far. Only a step whose keys change can hold an event.
+    keys = []
+    if 'sign_ingress' in wanted:
+        keys.append([int(lon // 30) % 12 for lon in lons])
+    if 'nakshatra_ingress' in wanted:
+        keys.append([pada // 4 for pada in absolute_padas(lons)])
+    if want_stations:
+        keys.append([speed < 0 for speed in speeds])
+    if conjunctions:
+        points = sorted(point_lon for _, point_lon in conjunctions)
+        keys.append([bisect_right(points, lon) for lon in lons])
+    samples = list(zip(*keys))
+    changed = [i for i in range(len(samples) - 1) if samples[i] != samples[i + 1]]
+
+    events = []
+    for i in changed:
+        t0, t1 = times[i], times[i + 1]
+        lon0, speed0, lon1, speed1 = lons[i], speeds[i], lons[i + 1], speeds[i + 1]
+
+        sign0, sign1 = int(lon0 // 30) % 12, int(lon1 // 30) % 12
+        if 'sign_ingress' in wanted and sign0 != sign1:
+            t = _refine(sign_at, t0, t1, sign0)
+            lon, speed = position(t)
+            sign = int(lon // 30) % 12
+            events.append((t, {
+                "type": "sign_ingress", "planet": planet,
+                "from_sign": signs[sign0], "sign": signs[sign],
+                "house": get_house(lon, asc_sign_index), "retrograde": speed < 0,
+            }))
+
+        nak0, nak1 = nakshatra_of(lon0), nakshatra_of(lon1)
+        if 'nakshatra_ingress' in wanted and nak0 != nak1:
+            t = _refine(nakshatra_at, t0, t1, nak0)
+            lon, speed = position(t)
+            events.append((t, {
+                "type": "nakshatra_ingress", "planet": planet,
+                "from_nakshatra": nakshatras[nak0][0],
+                "nakshatra": nakshatras[nakshatra_of(lon)][0],
+                "retrograde": speed < 0,
+            }))
+
+        if want_stations and (speed0 < 0) != (speed1 < 0):
+            t = _refine(retrograde_at, t0, t1, speed0 < 0)
+            lon, _ = position(t)
+            events.append((t, {
+                "type": "station", "planet": planet,
+                "station": "direct" if speed0 < 0 else "retrograde",
+                "sign": signs[int(lon // 30) % 12], "degrees": format_dms(lon % 30),
+            }))
+
+        for point_name, point_lon in conjunctions:
+            d0, d1 = _signed_distance(lon0, point_lon), _signed_distance(lon1, point_lon)
+            # A sign flip far from the point is the wrap at the opposite side, not a crossing.
+            if (d0 >= 0) != (d1 >= 0) and abs(d0) < 90 and abs(d1) < 90:
+                t = _refine(side_of(point_lon), t0, t1, d0 >= 0)
+                events.append((t, {
+                    "type": "natal_conjunction", "planet": planet, "natal_point": point_name,
+                    "sign": signs[int(point_lon // 30) % 12], "degrees": format_dms(point_lon % 30),
+                    "retrograde": position(t)[1] < 0,
+                }))
+    return events
+
+
+def lahairi_transit_calendar(data):
+    """Transit events for the birth chart in ``data`` between its ``from`` and ``to`` dates."""
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid latitude or longitude")
+
+    start_jd = date_to_jd(data['from'])
+    end_jd = date_to_jd(data['to'])
+    if end_jd <= start_jd:
+        raise ValueError("'to' must be after 'from'")
+    if end_jd - start_jd > MAX_RANGE_DAYS:
+        raise ValueError("Date range must be at most 100 years")
+
+    planets = data.get('planets') or TRANSIT_PLANETS
+    if not isinstance(planets, list):
+        raise ValueError("planets must be a list of planet names")
+    unknown = [p for p in planets if p not in TRANSIT_PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planets: {', '.join(map(str, unknown))}")
+    requested_events = data.get('events')
+    event_types = requested_events or EVENT_TYPES
+    if not isinstance(event_types, list):
+        raise ValueError("events must be a list of event types")
+    unknown = [e for e in event_types if e not in EVENT_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown event types: {', '.join(map(str, unknown))}")
+
+    snapshot = ChartSnapshot.from_birth_data(data, 'lahiri')
+    ascendant_lon = snapshot.ascendant
+    asc_sign_index = int(ascendant_lon // 30)
+    natal_points = [('Ascendant', ascendant_lon)]
+    natal_points += [(name, snapshot.calc_ut(body)[0][0] % 360) for name, body in NATAL_POINTS]
+    natal_points.append(('Ketu', (natal_points[-1][1] + 180) % 360))
+
+    events = []
+    for planet in planets:
+        planet_events = event_types
+        if not requested_events:
+            planet_events = [e for e in EVENT_TYPES if e not in ON_REQUEST_EVENTS.get(planet, ())]
+        events.extend(scan_planet_events(planet, start_jd, end_jd, natal_points,
+                                         asc_sign_index, planet_events))
+    events.sort(key=lambda event: event[0])
+
+    return {
+        "user_name": data['user_name'],
+        "from": data['from'],
+        "to": data['to'],
+        "natal_ascendant": {"sign": signs[asc_sign_index], "degrees": format_dms(ascendant_lon % 30)},
+        "events": [{"time": jd_to_utc_string(jd), **event} for jd, event in events],
+        "notes": {
+            "ayanamsa": "Lahiri",
+            "house_system": "Whole Sign",
+            "precision": "1 minute",
+        }
+    }
@@ -370,13 +370,13 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, format_dms, get_house, longitude_to_sign
 
 # Constants
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+signs = SIGNS
 
 nakshatras = [
     ('Ashwini', 0, 13.3333),
@@ -409,47 +409,19 @@ nakshatras = [
 ]
 
 # Helper Functions
-def get_house(lon, asc_sign_index, orientation_shift=0):
-    """
-    Calculate house number based on planet longitude and ascendant sign index for Whole Sign system.
-    """
-    sign_index = int(lon // 30) % 12
-    house_index = (sign_index - asc_sign_index + orientation_shift) % 12
-    return house_index + 1
-
-def longitude_to_sign(deg):
-    """Convert longitude to sign and degree within sign."""
-    deg = deg % 360
-    sign_index = int(deg // 30)
-    sign = signs[sign_index]
-    sign_deg = deg % 30
-    return sign, sign_deg
-
-def format_dms(deg):
-    """Format degrees as degrees, minutes, seconds."""
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
-
 def get_nakshatra_and_pada(lon):
     """Calculate nakshatra and pada based on longitude."""
-    lon = lon % 360
-    for name, start, end in nakshatras:
-        if start <= lon < end:
-            position_in_nakshatra = lon - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)  # 3°20' = 3.3333°
-            return name, pada
-    return 'Revati', 4  # Fallback for edge case
+    nakshatra_index, pada = nakshatra_and_pada(lon)
+    return nakshatras[nakshatra_index][0], pada
 
 # Main Calculation Function
-def lahairi_natal(birth_data):
+def lahairi_natal(birth_data, snapshot=None):
     """
     Calculate natal chart data using Lahiri ayanamsa, including retrograde, nakshatras, and padas.
     
     Parameters:
     - birth_data: Dictionary with birth details
+    - snapshot: Optional Lahiri ChartSnapshot for the same birth data, reused instead of recomputing
     
     Returns:
     - Dictionary with calculated chart data
@@ -457,16 +429,9 @@ def lahairi_natal(birth_data):
     latitude = float(birth_data['latitude'])
     longitude = float(birth_data['longitude'])
     timezone_offset = float(birth_data['timezone_offset'])
-    birth_date = datetime.strptime(birth_data['birth_date'], '%Y-%m-%d')
-    birth_time = datetime.strptime(birth_data['birth_time'], '%H:%M:%S').time()
-    local_datetime = datetime.combine(birth_date, birth_time)
-    ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-    hour_decimal = ut_datetime.hour + ut_datetime.minute / 60.0 + ut_datetime.second / 3600.0
-    jd_ut = swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-
-    # Set Lahiri ayanamsa
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    ayanamsa_value = swe.get_ayanamsa_ut(jd_ut)
+    snapshot = resolve_snapshot(snapshot, 'lahiri', birth_data['birth_date'], birth_data['birth_time'],
+                                latitude, longitude, timezone_offset)
+    ayanamsa_value = snapshot.get_ayanamsa_ut()
 
     # Planetary positions
     planets = [
@@ -477,7 +442,7 @@ def lahairi_natal(birth_data):
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     planet_positions = {}
     for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {planet_name}")
         lon = pos[0] % 360
@@ -503,7 +468,7 @@ def lahairi_natal(birth_data):
     }
 
     # Ascendant and houses
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     ascendant_lon = ascmc[0] % 360
     asc_sign_index = int(ascendant_lon // 30)
     asc_nakshatra, asc_pada = get_nakshatra_and_pada(ascendant_lon)
@@ -526,4 +491,59 @@ def lahairi_natal(birth_data):
         'house_signs': house_signs,
         'planet_houses': planet_houses,
         'ayanamsa_value': ayanamsa_value
-    }
\ No newline at end of file
+    }
+
+def lahairi_natal_response(birth_data, chart_data):
+    """
+    Format the output of ``lahairi_natal`` as the /lahiri/natal JSON response.
+
+    Parameters:
+    - birth_data: Dictionary with birth details
+    - chart_data: Dictionary returned by lahairi_natal for the same birth data
+
+    Returns:
+    - Dictionary with the response body
+    """
+    # Format planetary positions
+    planetary_positions_json = {}
+    for planet, data in chart_data['planet_positions'].items():
+        sign, sign_deg = longitude_to_sign(data['lon'])
+        dms = format_dms(sign_deg)
+        house = chart_data['planet_houses'][planet]
+        planetary_positions_json[planet] = {
+            "sign": sign,
+            "degrees": dms,
+            "retrograde": data['retro'],
+            "house": house,
+            "nakshatra": data['nakshatra'],
+            "pada": data['pada']
+        }
+
+    # Format ascendant
+    asc_sign, asc_deg = longitude_to_sign(chart_data['ascendant']['lon'])
+    asc_dms = format_dms(asc_deg)
+    ascendant_json = {
+        "sign": asc_sign,
+        "degrees": asc_dms,
+        "nakshatra": chart_data['ascendant']['nakshatra'],
+        "pada": chart_data['ascendant']['pada']
+    }
+
+    return {
+        "user_name": birth_data.get('user_name', 'Unknown'),
+        "birth_details": {
+            "birth_date": birth_data['birth_date'],
+            "birth_time": birth_data['birth_time'],
+            "latitude": float(birth_data['latitude']),
+            "longitude": float(birth_data['longitude']),
+            "timezone_offset": float(birth_data['timezone_offset'])
+        },
+        "planetary_positions": planetary_positions_json,
+        "ascendant": ascendant_json,
+        "notes": {
+            "ayanamsa": "Lahiri",
+            "ayanamsa_value": f"{chart_data['ayanamsa_value']:.6f}",
+            "chart_type": "Rasi",
+            "house_system": "Whole Sign"
+        }
+    }
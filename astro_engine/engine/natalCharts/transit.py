@@ -152,15 +152,14 @@
 
 
 
-import swisseph as swe
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Ephemeris import transit_positions as ephemeris_transit_positions
 from datetime import datetime, timedelta, timezone
-
-# Set Swiss Ephemeris path (ensure ephemeris files are in this directory)
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, format_dms, get_house, longitude_to_sign
 
 # List of zodiac signs
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+signs = SIGNS
 
 # Nakshatra list with their start and end degrees
 nakshatras = [
@@ -175,45 +174,10 @@ nakshatras = [
     ('Purva Bhadrapada', 320, 333.3333), ('Uttara Bhadrapada', 333.3333, 346.6667), ('Revati', 346.6667, 360)
 ]
 
-def get_house(lon, asc_sign_index):
-    """
-    Calculate house number based on planet longitude and ascendant sign index (Whole Sign system).
-    
-    Args:
-        lon (float): Planet's longitude (0–360°)
-        asc_sign_index (int): Ascendant's sign index (0–11, Aries–Pisces)
-    
-    Returns:
-        int: House number (1–12)
-    """
-    sign_index = int(lon // 30) % 12  # Planet's sign index
-    house_index = (sign_index - asc_sign_index) % 12  # Adjusted house index
-    return house_index + 1  # 1-based house number
-
-def longitude_to_sign(deg):
-    """Convert longitude to sign and degree within sign."""
-    deg = deg % 360
-    sign_index = int(deg // 30)
-    sign = signs[sign_index]
-    sign_deg = deg % 30
-    return sign, sign_deg
-
-def format_dms(deg):
-    """Format degrees as degrees, minutes, seconds."""
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
-
 def get_nakshatra_and_pada(longitude):
     """Determine the nakshatra and pada based on longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in nakshatras:
-        if start <= longitude < end:
-            pada = int(((longitude - start) / (end - start)) * 4) + 1
-            return nakshatra, pada
-    return 'Revati', 4 if longitude >= 346.6667 else 1
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return nakshatras[nakshatra_index][0], pada
 
 def lahairi_tranist(data):
     # Extract and validate inputs
@@ -249,28 +213,12 @@ def lahairi_tranist(data):
     asc_sign_index = int(ascendant_lon // 30)
     asc_sign = signs[asc_sign_index]
 
-    # Calculate transit planetary positions for current time
-    planets = [
-        (swe.SUN, 'Sun'), (swe.MOON, 'Moon'), (swe.MARS, 'Mars'),
-        (swe.MERCURY, 'Mercury'), (swe.JUPITER, 'Jupiter'), (swe.VENUS, 'Venus'),
-        (swe.SATURN, 'Saturn'), (swe.TRUE_NODE, 'Rahu')
-    ]
-    flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
+    # Transit positions for current time, shared by every user (see core.Ephemeris)
     transit_positions = {}
-    for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut_transit, planet_id, flag)
-        if ret < 0:
-            raise Exception(f"Error calculating {planet_name} for transit")
-        lon = pos[0] % 360
-        speed = pos[3]
-        retrograde = 'R' if speed < 0 else ''
+    for planet_name, (lon, speed) in ephemeris_transit_positions(jd_ut_transit, 'lahiri').items():
+        retrograde = 'R' if speed < 0 and planet_name != 'Ketu' else ''
         transit_positions[planet_name] = (lon, retrograde)
 
-    # Calculate Ketu (180° opposite Rahu)
-    rahu_lon_transit = transit_positions['Rahu'][0]
-    ketu_lon_transit = (rahu_lon_transit + 180) % 360
-    transit_positions['Ketu'] = (ketu_lon_transit, '')
-
     # Assign transit planets to houses based on natal ascendant
     transit_houses = {planet: get_house(lon, asc_sign_index) 
                       for planet, (lon, _) in transit_positions.items()}
@@ -1,11 +1,8 @@
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
-
-# Set Swiss Ephemeris path (adjust path as needed)
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, dms, get_julian_day
 
 # Constants
 PLANETS = {
@@ -18,8 +15,6 @@ ASPECTS = {
     'Square': {'angle': 90, 'orb': 8}, 'Trine': {'angle': 120, 'orb': 8},
     'Opposition': {'angle': 180, 'orb': 8}
 }
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio',
-         'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
 
 NAKSHATRAS = [
     ('Ashwini', 0, 13.3333),
@@ -51,19 +46,10 @@ NAKSHATRAS = [
     ('Revati', 346.6667, 360)
 ]
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date, time, and timezone offset to Julian Day."""
-    dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    dt_utc = dt - timedelta(hours=tz_offset)
-    return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day,
-                      dt_utc.hour + dt_utc.minute / 60 + dt_utc.second / 3600)
-
 def format_degrees(deg):
     """Convert decimal degrees to degrees, minutes, and seconds."""
-    degrees = int(deg)
-    minutes = int((deg - degrees) * 60)
-    seconds = int(((deg - degrees) * 60 - minutes) * 60)
-    return f"{degrees}° {minutes}' {seconds}\""
+    d, m, s = dms(deg, 0, truncate=True)
+    return f"{d}° {m}' {s}\""
 
 def calculate_sidereal_position(jd, planet_id):
     """Calculate sidereal position for a planet using Lahiri ayanamsa."""
@@ -195,15 +181,8 @@ def validate_person_data(person_data, person_label):
 
 def get_nakshatra_pada(longitude):
     """Calculate nakshatra and pada for a given longitude."""
-    longitude = longitude % 360
-    for name, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            position_in_nakshatra = longitude - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)
-            return name, pada
-    if math.isclose(longitude, 360, rel_tol=1e-5):
-        return 'Revati', 4
-    raise ValueError(f"Longitude {longitude} not in any nakshatra range")
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 def lahairi_composite(person_a_data, person_b_data):
     """Calculate composite chart with nakshatras and padas using Lahiri ayanamsa."""
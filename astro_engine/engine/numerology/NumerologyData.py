@@ -173,7 +173,7 @@
 
 
 
-import swisseph as swe
+from astro_engine.engine.core import swe
 from datetime import datetime
 
 # Chaldean numerology chart
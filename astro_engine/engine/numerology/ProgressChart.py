@@ -2,13 +2,9 @@
 
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
-
-# Set ephemeris path and sidereal mode to Lahiri ayanamsa
-swe.set_ephe_path('astro_api/ephe')
-swe.set_sid_mode(swe.SIDM_LAHIRI)
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, get_julian_day
 
 # Define planets and corresponding Swiss Ephemeris constants
 PLANETS = {
@@ -17,10 +13,6 @@ PLANETS = {
     'Neptune': swe.NEPTUNE, 'Pluto': swe.PLUTO, 'North Node': swe.MEAN_NODE
 }
 
-# Sidereal zodiac signs
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio',
-         'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
-
 # Nakshatras with their longitude ranges (start, end in degrees)
 NAKSHATRAS = [
     ('Ashwini', 0, 13.3333),
@@ -130,13 +122,6 @@ ASPECT_INTERPRETATIONS = {
 }
 
 # Original calculation functions (unchanged)
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert date, time, and timezone offset to Julian Day."""
-    dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    dt_utc = dt - timedelta(hours=tz_offset)
-    return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day,
-                      dt_utc.hour + dt_utc.minute / 60.0 + dt_utc.second / 3600.0)
-
 def format_position(longitude):
     """Format celestial longitude into sign, degrees, minutes, and seconds."""
     longitude = longitude % 360
@@ -154,6 +139,7 @@ def format_position(longitude):
 
 def calculate_planetary_positions(jd):
     """Compute sidereal positions of planets for a given Julian Day."""
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
     positions = {}
     for planet_name, planet_id in PLANETS.items():
         result = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL)
@@ -166,6 +152,7 @@ def calculate_planetary_positions(jd):
 
 def calculate_angles(jd, lat, lon):
     """Determine progressed Ascendant and Midheaven."""
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
     house_cusps, ascmc = swe.houses_ex(jd, lat, lon, b'P', flags=swe.FLG_SIDEREAL)
     asc = ascmc[0] % 360
     mc = ascmc[1] % 360
@@ -241,19 +228,13 @@ def interpret_aspects(aspects):
 # New function to calculate nakshatra and pada
 def get_nakshatra_pada(longitude):
     """Calculate nakshatra and pada for a given longitude."""
-    longitude = longitude % 360
-    for name, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            position_in_nakshatra = longitude - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)  # Each pada is 3°20' (3.3333°)
-            return name, pada
-    if math.isclose(longitude, 360, rel_tol=1e-5):
-        return 'Revati', 4
-    raise ValueError(f"Longitude {longitude} not in any nakshatra range")
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 # Main function as requested
 def lahairi_progress(birth_date, birth_time, latitude, longitude, tz_offset, age):
     """Calculate progressed chart data with retrograde, nakshatras, and padas."""
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
     # Calculate Julian Days
     natal_jd = get_julian_day(birth_date, birth_time, tz_offset)
     progressed_jd = natal_jd + age  # Secondary progression: 1 day = 1 year
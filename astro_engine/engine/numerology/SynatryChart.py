@@ -1,12 +1,9 @@
 
 
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
+from astro_engine.engine.core import swe
 import logging
-
-# Set Swiss Ephemeris path (update to your ephemeris files' location)
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, dms, get_julian_day
 
 # Constants
 PLANETS = {
@@ -19,8 +16,6 @@ ASPECTS = {
     'Square': {'angle': 90, 'orb': 8}, 'Trine': {'angle': 120, 'orb': 8},
     'Opposition': {'angle': 180, 'orb': 8}
 }
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra', 'Scorpio',
-         'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
 
 # Nakshatra list with start and end degrees
 NAKSHATRAS = [
@@ -38,33 +33,17 @@ NAKSHATRAS = [
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date, time, and timezone offset to Julian Day."""
-    dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    dt_utc = dt - timedelta(hours=tz_offset)
-    jd = swe.julday(dt_utc.year, dt_utc.month, dt_utc.day,
-                    dt_utc.hour + dt_utc.minute / 60 + dt_utc.second / 3600)
-    logging.debug(f"Calculated Julian Day: {jd}")
-    return jd
-
 def format_degrees(deg):
     """Convert decimal degrees to degrees, minutes, and seconds."""
     if not isinstance(deg, (float, int)):
         raise ValueError(f"Degree value must be a number, got {type(deg)}: {deg}")
-    degrees = int(deg)
-    minutes = int((deg - degrees) * 60)
-    seconds = int(((deg - degrees) * 60 - minutes) * 60)
+    degrees, minutes, seconds = dms(deg, 0, truncate=True)
     return f"{degrees}° {minutes}' {seconds}\""
 
 def get_nakshatra_and_pada(longitude):
     """Determine the nakshatra and pada for a given longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            position_in_nakshatra = longitude - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)
-            return nakshatra, pada
-    return 'Revati', 4  # Fallback for edge cases
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 def calculate_planetary_positions(jd):
     """Calculate sidereal planetary positions, nakshatra, and pada using Lahiri ayanamsa."""
@@ -1,44 +1,21 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from datetime import datetime
 import math
-
-# Set Swiss Ephemeris path (adjust path as needed)
-swe.set_ephe_path('astro_api/ephe')
-
-# Zodiac signs (0-based index: Aries=0, Taurus=1, ..., Pisces=11)
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, whole_sign_house
 
 # Nakshatras list
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
+NAKSHATRAS = NAKSHATRA_NAMES
 
 # Sign natures for D45 calculation
 MOVABLE = [0, 3, 6, 9]  # Aries, Cancer, Libra, Capricorn
 FIXED = [1, 4, 7, 10]    # Taurus, Leo, Scorpio, Aquarius
 DUAL = [2, 5, 8, 11]     # Gemini, Virgo, Sagittarius, Pisces
 
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date and time to Julian Day (UT)."""
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-
 def format_dms(degrees):
     """Format longitude in degrees, minutes, seconds."""
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
+    d, m, s = dms(degrees, 1)
     return f"{d}°{m}'{s:.1f}\""
 
 def get_d45_position(sidereal_lon):
@@ -61,25 +38,17 @@ def get_d45_position(sidereal_lon):
     d45_sign = SIGNS[d45_sign_index]
     return {'sign': d45_sign, 'sign_index': d45_sign_index}
 
-def get_d45_house(planet_d45_sign_index, d45_asc_sign_index):
-    """Calculate house number using Whole Sign system."""
-    return (planet_d45_sign_index - d45_asc_sign_index) % 12 + 1
-
 def get_nakshatra(longitude):
     """Determine the nakshatra based on sidereal longitude."""
-    nakshatra_index = int((longitude % 360) / 13.3333) % 27
-    return NAKSHATRAS[nakshatra_index]
+    return NAKSHATRAS[nakshatra_of(longitude)]
 
 def get_pada(longitude):
     """Determine the pada (1-4) within the nakshatra based on sidereal longitude."""
-    position_in_nakshatra = (longitude % 360) % 13.3333
-    pada = math.ceil(position_in_nakshatra / 3.3333)
-    return pada
+    return pada_of(longitude)
 
-def raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, timezone_offset, user_name='Unknown'):
+def raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, timezone_offset, user_name='Unknown', snapshot=None):
     """Calculate the D45 (Akshavedamsa) chart using Raman ayanamsa."""
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-    swe.set_sid_mode(swe.SIDM_RAMAN)  # Raman ayanamsa
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
 
     planets = [
         (swe.SUN, 'Sun'), (swe.MOON, 'Moon'), (swe.MARS, 'Mars'),
@@ -90,7 +59,7 @@ def raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, timezon
 
     d1_positions = {}
     for planet_id, name in planets:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         lon = pos[0] % 360
         retro = 'R' if pos[3] < 0 else ''
         d1_positions[name] = (lon, retro)
@@ -99,7 +68,7 @@ def raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, timezon
     ketu_lon = (rahu_lon + 180) % 360
     d1_positions['Ketu'] = (ketu_lon, 'R')  # Ketu is always retrograde
 
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon = ascmc[0] % 360
 
     d45_asc_pos = get_d45_position(d1_asc_lon)
@@ -116,7 +85,7 @@ def raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, timezon
     d45_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d45_pos = get_d45_position(d1_lon)
-        house = get_d45_house(d45_pos['sign_index'], d45_asc_sign_index)
+        house = whole_sign_house(d45_pos['sign_index'], d45_asc_sign_index)
         nakshatra = get_nakshatra(d1_lon)
         pada = get_pada(d1_lon)
         d45_positions[planet] = {
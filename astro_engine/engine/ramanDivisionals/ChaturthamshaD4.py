@@ -1,56 +1,16 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms, get_house
 
 # Zodiac signs and nakshatras
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
-nakshatras = ['Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-              'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-              'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-              'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-              'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati']
-
-def get_julian_day(date_str, time_str, timezone_offset):
-    """
-    Convert date and time to Julian Day with high precision.
-    
-    Args:
-        date_str (str): Date in 'YYYY-MM-DD' format
-        time_str (str): Time in 'HH:MM:SS' format
-        timezone_offset (float): Timezone offset from UTC in hours
-    
-    Returns:
-        float: Julian Day
-    """
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_datetime = datetime.combine(date_obj, time_obj.time())
-        ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-        hour_decimal = ut_datetime.hour + (ut_datetime.minute / 60.0) + (ut_datetime.second / 3600.0)
-        return swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def format_dms(deg):
-    """Format degrees as degrees, minutes, seconds with precision."""
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
+signs = SIGNS
+nakshatras = NAKSHATRA_NAMES
 
 def get_nakshatra_pada(longitude):
     """Calculate nakshatra and pada based on sidereal longitude."""
-    longitude = longitude % 360
-    pada_size = 360 / 108  # 108 padas in 360 degrees
-    pada_index = int(longitude / pada_size)
-    nakshatra_index = pada_index // 4
-    pada_number = (pada_index % 4) + 1
-    nakshatra = nakshatras[nakshatra_index]
-    return nakshatra, pada_number
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return nakshatras[nakshatra_index], pada
 
 def get_d4_position(d1_lon):
     """
@@ -72,21 +32,11 @@ def get_d4_position(d1_lon):
     d4_degree = (segment_position / d4_division) * 30  # Scale to 0–30°
     return d4_sign_index, d4_degree
 
-def get_d4_house(d4_lon, d4_asc_sign_index):
-    """Calculate house number in D4 chart using Whole Sign system."""
-    sign_index = int(d4_lon // 30) % 12
-    house_index = (sign_index - d4_asc_sign_index) % 12
-    return house_index + 1
-
-def raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone_offset):
+def raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=None):
     """Calculate the Chaturthamsha (D4) chart based on birth details."""
     try:
-        # Calculate Julian Day
-        jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-
-        # Set Lahiri Ayanamsa for sidereal calculations
-        swe.set_sid_mode(swe.SIDM_RAMAN)
-        ayanamsa_value = swe.get_ayanamsa_ut(jd_ut)
+        snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
+        ayanamsa_value = snapshot.get_ayanamsa_ut()
 
         # Calculate D1 sidereal positions for planets
         planets = [
@@ -97,7 +47,7 @@ def raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone
         flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
         d1_positions = {}
         for planet_id, planet_name in planets:
-            pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+            pos, ret = snapshot.calc_ut(planet_id, flag)
             if ret < 0:
                 error_msg = swe.get_err_msg().decode()
                 raise Exception(f"Error calculating {planet_name}: {error_msg}")
@@ -112,7 +62,7 @@ def raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone
         d1_positions['Ketu'] = (ketu_lon, 'R')  # Ketu is always retrograde
 
         # Calculate D1 Ascendant (sidereal) using Whole Sign system
-        cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+        cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
         ascendant_d1 = ascmc[0] % 360
 
         # Calculate D4 positions
@@ -127,7 +77,7 @@ def raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone
         d4_asc_lon = (d4_asc_sign_index * 30) + d4_asc_degree
 
         # Assign D4 houses based on D4 Ascendant
-        planet_houses = {planet: get_d4_house(d4_lon, d4_asc_sign_index) 
+        planet_houses = {planet: get_house(d4_lon, d4_asc_sign_index) 
                          for planet, (d4_lon, _) in d4_positions.items()}
 
         # Calculate house signs based on D4 Ascendant
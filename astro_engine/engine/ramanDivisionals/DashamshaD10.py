@@ -1,55 +1,11 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms, get_house
 
 # Constants
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
-nakshatras = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, timezone_offset):
-    """
-    Convert birth date and time to Julian Day in UTC.
-
-    Args:
-        date_str (str): Date in 'YYYY-MM-DD' format
-        time_str (str): Time in 'HH:MM:SS' format
-        timezone_offset (float): Offset from UTC in hours
-
-    Returns:
-        float: Julian Day in UTC
-    """
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_datetime = datetime.combine(date_obj, time_obj.time())
-        ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-        hour_decimal = ut_datetime.hour + (ut_datetime.minute / 60.0) + (ut_datetime.second / 3600.0)
-        jd = swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-        return jd
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def format_dms(deg):
-    """
-    Format degrees into degrees, minutes, and seconds for readability.
-
-    Args:
-        deg (float): Degree value
-
-    Returns:
-        str: Formatted string (e.g., "10° 15' 30.00\"")
-    """
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
+signs = SIGNS
+nakshatras = NAKSHATRA_NAMES
 
 def get_nakshatra_pada(longitude):
     """
@@ -61,9 +17,7 @@ def get_nakshatra_pada(longitude):
     Returns:
         tuple: (nakshatra name, pada number)
     """
-    longitude = longitude % 360
-    nakshatra_index = int(longitude / 13.3333) % 27
-    pada = int((longitude % 13.3333) / 3.3333) + 1
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
     return nakshatras[nakshatra_index], pada
 
 def get_d10_position(d1_lon_sidereal):
@@ -93,21 +47,6 @@ def get_d10_position(d1_lon_sidereal):
 
     return d10_sign_index, d10_degree, d10_lon
 
-def get_d10_house(d10_lon, d10_asc_sign_index):
-    """
-    Assign house number in the D10 chart using Whole Sign system.
-
-    Args:
-        d10_lon (float): D10 longitude (0–360°)
-        d10_asc_sign_index (int): D10 ascendant sign index (0–11)
-
-    Returns:
-        int: House number (1–12)
-    """
-    sign_index = int(d10_lon // 30) % 12
-    house_index = (sign_index - d10_asc_sign_index) % 12
-    return house_index + 1
-
 def get_conjunct_planets(d10_asc_lon, d10_positions, orb=2.0):
     """
     Identify planets conjunct with the ascendant within a specified orb.
@@ -126,7 +65,7 @@ def get_conjunct_planets(d10_asc_lon, d10_positions, orb=2.0):
             conjunct.append({"planet": planet, "retrograde": retro})
     return conjunct
 
-def raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_offset):
+def raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=None):
     """
     Calculate the Dashamsha (D10) chart accurately.
 
@@ -140,11 +79,7 @@ def raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_of
     Returns:
         dict: Planetary positions, ascendant with conjunctions, house signs, and metadata
     """
-    # Calculate Julian Day
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-
-    # Set Lahiri Ayanamsa
-    swe.set_sid_mode(swe.SIDM_RAMAN)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
 
     # Calculate D1 sidereal positions for planets
     planets = [
@@ -155,7 +90,7 @@ def raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_of
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     d1_positions_sidereal = {}
     for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {planet_name}: {swe.get_err_msg().decode()}")
         lon = pos[0] % 360
@@ -169,7 +104,7 @@ def raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_of
     d1_positions_sidereal['Ketu'] = (ketu_lon, '')  # Original script does not set Ketu as retrograde
 
     # Calculate D1 sidereal ascendant
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     ascendant_d1_sidereal = ascmc[0] % 360
 
     # Calculate D10 positions
@@ -185,7 +120,7 @@ def raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_of
     asc_conjunct = get_conjunct_planets(d10_asc_lon, d10_positions, orb=2.0)
 
     # Assign houses
-    planet_houses = {planet: get_d10_house(d10_lon, d10_asc_sign_index) 
+    planet_houses = {planet: get_house(d10_lon, d10_asc_sign_index) 
                      for planet, (d10_lon, _) in d10_positions.items()}
 
     # Calculate house signs
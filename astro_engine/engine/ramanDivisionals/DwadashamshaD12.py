@@ -1,58 +1,26 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms, get_house
 
 # Zodiac signs list (0 = Aries, 1 = Taurus, ..., 11 = Pisces)
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+signs = SIGNS
 
 # Nakshatra list (27 nakshatras)
-nakshatras = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, timezone_offset):
-    """
-    Convert birth date and time to Julian Day for astronomical calculations.
-    """
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_datetime = datetime.combine(date_obj, time_obj.time())
-        ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-        hour_decimal = ut_datetime.hour + (ut_datetime.minute / 60.0) + (ut_datetime.second / 3600.0)
-        return swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def format_dms(deg):
-    """
-    Format degrees into degrees, minutes, and seconds for readability.
-    """
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
+nakshatras = NAKSHATRA_NAMES
 
 def get_nakshatra(longitude):
     """
     Determine the nakshatra based on sidereal longitude.
     """
-    nakshatra_index = int((longitude % 360) / 13.3333) % 27
-    return nakshatras[nakshatra_index]
+    return nakshatras[nakshatra_of(longitude)]
 
 def get_pada(longitude):
     """
     Calculate the pada (1-4) within the nakshatra based on sidereal longitude.
     Each nakshatra spans 13.3333°, divided into 4 padas of 3.3333° each.
     """
-    position_in_nakshatra = (longitude % 360) % 13.3333
-    pada = int(position_in_nakshatra / 3.3333) + 1
-    return pada
+    return pada_of(longitude)
 
 def get_d12_position(d1_lon_sidereal):
     """
@@ -80,23 +48,11 @@ def get_d12_position(d1_lon_sidereal):
         "longitude": d12_lon
     }
 
-def get_d12_house(d12_lon, d12_asc_sign_index):
-    """
-    Assign house number in the D12 chart using Whole Sign system.
-    """
-    sign_index = int(d12_lon // 30) % 12
-    house_index = (sign_index - d12_asc_sign_index + 12) % 12  # Ensure positive offset
-    return house_index + 1
-
-def raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone_offset):
+def raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=None):
     """
     Calculate the complete Dwadasamsa (D12) chart using Raman ayanamsa.
     """
-    # Calculate Julian Day
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-
-    # Set Raman Ayanamsa
-    swe.set_sid_mode(swe.SIDM_RAMAN)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
 
     # Calculate D1 sidereal positions for planets
     planets = [
@@ -107,7 +63,7 @@ def raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     d1_positions_sidereal = {}
     for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {planet_name}")
         lon = pos[0] % 360
@@ -121,7 +77,7 @@ def raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone
     d1_positions_sidereal['Ketu'] = (ketu_lon, 'R')  # Ketu is always retrograde
 
     # Calculate D1 sidereal ascendant
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon_sidereal = ascmc[0] % 360
 
     # Calculate D12 ascendant
@@ -133,7 +89,7 @@ def raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone
     for planet, (d1_lon, retro) in d1_positions_sidereal.items():
         d12_pos = get_d12_position(d1_lon)
         d12_lon = d12_pos['longitude']
-        house = get_d12_house(d12_lon, d12_asc_sign_index)
+        house = get_house(d12_lon, d12_asc_sign_index)
         d12_positions[planet] = {
             "sign": d12_pos['sign'],
             "degrees": d12_pos['degrees'],
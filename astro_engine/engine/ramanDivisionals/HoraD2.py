@@ -1,12 +1,10 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-import math
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import SIGNS, get_sign
 
 # Constants
-ZODIAC_SIGNS = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+ZODIAC_SIGNS = SIGNS
 
 NAKSHATRAS = [
     ('Ashwini', 0, 13.3333), ('Bharani', 13.3333, 26.6667), ('Krittika', 26.6667, 40),
@@ -27,22 +25,9 @@ PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu
 SWE_PLANETS = [swe.SUN, swe.MOON, swe.MARS, swe.MERCURY, swe.JUPITER, swe.VENUS, swe.SATURN, swe.MEAN_NODE, swe.MEAN_NODE]
 
 # Helper Functions
-def get_julian_day(date_str, time_str, tz_offset):
-    """Convert birth date and time to Julian Day (UT)."""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_dt = datetime.combine(date_obj, time_obj.time())
-        ut_dt = local_dt - timedelta(hours=tz_offset)
-        hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-        return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def calculate_planet_data(jd, planet_code):
+def calculate_planet_data(snapshot, planet_code):
     """Calculate sidereal longitude and retrograde status of a planet."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    pos, ret = swe.calc_ut(jd, planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+    pos, ret = snapshot.calc_ut(planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
     if ret < 0:
         raise ValueError(f"Error calculating position for planet code {planet_code}")
     longitude = pos[0] % 360
@@ -50,20 +35,10 @@ def calculate_planet_data(jd, planet_code):
     is_retrograde = speed < 0
     return longitude, is_retrograde
 
-def get_sign(longitude):
-    """Determine zodiac sign from sidereal longitude."""
-    sign_index = int(longitude // 30) % 12
-    return ZODIAC_SIGNS[sign_index]
-
 def get_nakshatra_and_pada(longitude):
     """Calculate nakshatra and pada based on longitude."""
-    longitude = longitude % 360
-    for nakshatra, start, end in NAKSHATRAS:
-        if start <= longitude < end:
-            position_in_nakshatra = longitude - start
-            pada = math.ceil(position_in_nakshatra / 3.3333)
-            return nakshatra, pada
-    return 'Revati', 4  # Fallback for edge cases
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRAS[nakshatra_index][0], pada
 
 def map_to_d2_hora(sign, degree):
     """Map planet's sign and degree to D2 Hora chart (Cancer or Leo)."""
@@ -79,22 +54,20 @@ def map_to_d2_hora(sign, degree):
             return "Leo", degree
     raise ValueError(f"Invalid sign or degree: {sign}, {degree}")
 
-def calculate_ascendant(jd, latitude, longitude):
+def calculate_ascendant(snapshot):
     """Calculate sidereal Ascendant longitude using Lahiri Ayanamsa."""
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    houses = swe.houses_ex(jd, latitude, longitude, flags=swe.FLG_SIDEREAL)
+    houses = snapshot.houses_ex(flags=swe.FLG_SIDEREAL)
     return houses[0][0]  # Ascendant longitude
 
-def raman_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset):
+def raman_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
     """Calculate D2 Hora chart with retrograde, nakshatra, and pada."""
-    # Calculate Julian Day
-    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
 
     # Calculate planetary positions, retrograde status, nakshatra, and pada
     planet_data = {}
     for planet, code in zip(PLANETS, SWE_PLANETS):
         if planet == 'Ketu':
-            rahu_lon, rahu_retro = calculate_planet_data(jd, swe.MEAN_NODE)
+            rahu_lon, rahu_retro = calculate_planet_data(snapshot, swe.MEAN_NODE)
             ketu_lon = (rahu_lon + 180) % 360
             ketu_retro = rahu_retro  # Ketu retrogrades with Rahu
             sign = get_sign(ketu_lon)
@@ -111,7 +84,7 @@ def raman_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset):
                 'pada': pada
             }
         else:
-            lon, retro = calculate_planet_data(jd, code)
+            lon, retro = calculate_planet_data(snapshot, code)
             sign = get_sign(lon)
             degree = lon % 30
             d2_sign, d2_degree = map_to_d2_hora(sign, degree)
@@ -127,7 +100,7 @@ def raman_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset):
             }
 
     # Calculate Ascendant (Lagna) for D2 chart
-    asc_lon = calculate_ascendant(jd, latitude, longitude)
+    asc_lon = calculate_ascendant(snapshot)
     asc_sign = get_sign(asc_lon)
     asc_degree = asc_lon % 30
     d2_asc_sign, d2_asc_degree = map_to_d2_hora(asc_sign, asc_degree)
@@ -1,69 +1,13 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path (ensure ephemeris files are in 'astro_api/ephe')
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms, get_house, longitude_to_sign
 
 # List of zodiac signs
-signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+signs = SIGNS
 
 # Nakshatra list (27 nakshatras)
-nakshatras = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_house(lon, asc_sign_index, orientation_shift=0):
-    """
-    Calculate house number based on planet longitude and ascendant sign index for Whole Sign system.
-    
-    Args:
-        lon (float): Planet's longitude (0–360°)
-        asc_sign_index (int): Ascendant's sign index (0–11, Aries–Pisces)
-        orientation_shift (int): Shift in house numbering (default 0 for standard Whole Sign)
-    
-    Returns:
-        int: House number (1–12)
-    """
-    sign_index = int(lon // 30) % 12  # Planet's sign index
-    house_index = (sign_index - asc_sign_index + orientation_shift) % 12  # Adjusted house index
-    return house_index + 1  # 1-based house number
-
-def longitude_to_sign(deg):
-    """
-    Convert longitude to sign and degree within sign.
-    
-    Args:
-        deg (float): Longitude in degrees
-    
-    Returns:
-        tuple: (sign name, degrees within sign)
-    """
-    deg = deg % 360
-    sign_index = int(deg // 30)
-    sign = signs[sign_index]
-    sign_deg = deg % 30
-    return sign, sign_deg
-
-def format_dms(deg):
-    """
-    Format degrees as degrees, minutes, seconds.
-    
-    Args:
-        deg (float): Degrees to format
-    
-    Returns:
-        str: Formatted string (e.g., "15° 30' 45.00\"")
-    """
-    d = int(deg)
-    m_fraction = (deg - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
+nakshatras = NAKSHATRA_NAMES
 
 def get_navamsa_position(d1_lon):
     """
@@ -90,9 +34,7 @@ def get_nakshatra(longitude):
     Returns:
         str: Nakshatra name
     """
-    longitude = longitude % 360
-    nakshatra_index = int(longitude / 13.3333) % 27
-    return nakshatras[nakshatra_index]
+    return nakshatras[nakshatra_of(longitude)]
 
 def get_pada(longitude):
     """
@@ -104,12 +46,9 @@ def get_pada(longitude):
     Returns:
         int: Pada number (1–4)
     """
-    longitude = longitude % 360
-    position_in_nakshatra = longitude % 13.3333
-    pada = int(position_in_nakshatra / 3.3333) + 1
-    return pada
+    return pada_of(longitude)
 
-def raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offset):
+def raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=None):
     """
     Calculate the Navamsa (D9) chart using Raman ayanamsa.
     
@@ -119,21 +58,13 @@ def raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offse
         latitude (float): Latitude of birth location
         longitude (float): Longitude of birth location
         timezone_offset (float): Timezone offset in hours from UTC
+        snapshot (ChartSnapshot): Optional Raman snapshot for the same birth data
     
     Returns:
         dict: Navamsa chart data including planetary positions and ascendant
     """
-    # Parse birth date and time
-    birth_date_obj = datetime.strptime(birth_date, '%Y-%m-%d')
-    birth_time_obj = datetime.strptime(birth_time, '%H:%M:%S').time()
-    local_datetime = datetime.combine(birth_date_obj, birth_time_obj)
-    ut_datetime = local_datetime - timedelta(hours=timezone_offset)
-    hour_decimal = ut_datetime.hour + ut_datetime.minute / 60.0 + ut_datetime.second / 3600.0
-    jd_ut = swe.julday(ut_datetime.year, ut_datetime.month, ut_datetime.day, hour_decimal)
-
-    # Set Raman Ayanamsa for sidereal calculations
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    ayanamsa_value = swe.get_ayanamsa_ut(jd_ut)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
+    ayanamsa_value = snapshot.get_ayanamsa_ut()
 
     # Calculate D1 planetary positions (sidereal)
     planets = [
@@ -144,7 +75,7 @@ def raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offse
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     planet_positions = {}
     for planet_id, planet_name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {planet_name}")
         lon = pos[0] % 360
@@ -158,7 +89,7 @@ def raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offse
     planet_positions['Ketu'] = (ketu_lon, '')
 
     # Calculate D1 Ascendant (sidereal)
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     ascendant_lon = ascmc[0] % 360
     asc_sign_index = int(ascendant_lon // 30)
 
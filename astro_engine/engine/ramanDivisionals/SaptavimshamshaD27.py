@@ -1,12 +1,8 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_LORDS, SIGNS, whole_sign_house
 
-swe.set_ephe_path('astro_api/ephe')
-
-ZODIAC_SIGNS_raman = [
-    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-]
+ZODIAC_SIGNS_raman = SIGNS
 
 PLANET_CODES = {
     "Sun": swe.SUN,
@@ -27,19 +23,6 @@ NAKSHATRA_NAMES = [
     "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
 
-NAKSHATRA_LORDS = [
-    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
-    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
-    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"
-]
-
-def raman_d27_get_julian_day_utc(date_str, time_str, tz_offset):
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    utc_dt = local_dt - timedelta(hours=tz_offset)
-    jd_utc = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day,
-                        utc_dt.hour + utc_dt.minute / 60.0 + utc_dt.second / 3600.0)
-    return jd_utc
-
 def raman_d27_calculate_sidereal_longitude(jd, planet_code):
     swe.set_sid_mode(swe.SIDM_RAMAN)
     result = swe.calc_ut(jd, planet_code, swe.FLG_SIDEREAL | swe.FLG_SPEED)
@@ -59,17 +42,9 @@ def raman_d27_calculate_ascendant(jd, latitude, longitude):
 def raman_d27_calculate_d27_longitude(natal_longitude):
     return (natal_longitude * 27) % 360.0
 
-def raman_d27_get_sign_index(longitude):
-    return int(longitude // 30)
-
 def raman_d27_calculate_house(d27_asc_sign_index, d27_planet_sign_index):
-    return (d27_planet_sign_index - d27_asc_sign_index) % 12 + 1
+    return whole_sign_house(d27_planet_sign_index, d27_asc_sign_index)
 
 def raman_d27_get_nakshatra_pada(longitude):
-    nak_num = int(longitude // (13 + 1/3))  # 13°20' = 13.333...
-    nakshatra = NAKSHATRA_NAMES[nak_num]
-    lord = NAKSHATRA_LORDS[nak_num]
-    nak_start = nak_num * 13.3333333333
-    deg_in_nakshatra = longitude - nak_start
-    pada = int(deg_in_nakshatra // 3.3333333333) + 1
-    return nakshatra, lord, pada
\ No newline at end of file
+    nak_num, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRA_NAMES[nak_num], NAKSHATRA_LORDS[nak_num], pada
\ No newline at end of file
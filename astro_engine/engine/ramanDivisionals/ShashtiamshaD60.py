@@ -1,13 +1,9 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from datetime import datetime
 import math
-
-swe.set_ephe_path('astro_api/ephe')
-
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, whole_sign_house
 
 SHASHTIAMSHA_DEITIES = [
     "Ghora", "Rakshasa", "Deva", "Kubera", "Yaksha", "Kinnara", "Bhrashta", "Kulagna",
@@ -20,30 +16,15 @@ SHASHTIAMSHA_DEITIES = [
     "Amrita", "Payodhi", "Brahmana", "Indu Rekha"
 ]
 
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
+NAKSHATRAS = NAKSHATRA_NAMES
 
-def get_sidereal_longitude(jd_ut, planet_id, ascendant=False):
-    swe.set_sid_mode(swe.SIDM_RAMAN)  # Changed to Raman Ayanamsa
+def get_sidereal_longitude(snapshot, planet_id, ascendant=False):
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     
     if ascendant:
         return None, ''
     else:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         longitude = pos[0] % 360
         retrograde = 'R' if pos[3] < 0 else ''
         return longitude, retrograde
@@ -71,26 +52,18 @@ def get_d60_position(sidereal_lon):
         "longitude": sidereal_lon
     }
 
-def get_d60_house(d60_sign_index, d60_asc_sign_index):
-    return (d60_sign_index - d60_asc_sign_index) % 12 + 1
-
 def format_dms(degrees):
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
+    d, m, s = dms(degrees, 1)
     return f"{d}°{m}'{s:.1f}\""
 
 def get_nakshatra(longitude):
-    nakshatra_index = int((longitude % 360) / 13.3333) % 27
-    return NAKSHATRAS[nakshatra_index]
+    return NAKSHATRAS[nakshatra_of(longitude)]
 
 def get_pada(longitude):
-    position_in_nakshatra = (longitude % 360) % 13.3333
-    pada = math.ceil(position_in_nakshatra / 3.3333)
-    return pada
+    return pada_of(longitude)
 
-def raman_Shashtiamsha_D60(birth_date, birth_time, latitude, longitude, tz_offset):
-    jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
+def raman_Shashtiamsha_D60(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=None):
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, tz_offset)
 
     planets = [
         (swe.SUN, 'Sun'), (swe.MOON, 'Moon'), (swe.MARS, 'Mars'),
@@ -99,14 +72,14 @@ def raman_Shashtiamsha_D60(birth_date, birth_time, latitude, longitude, tz_offse
     ]
     d1_positions = {}
     for planet_id, name in planets:
-        lon, retro = get_sidereal_longitude(jd_ut, planet_id)
+        lon, retro = get_sidereal_longitude(snapshot, planet_id)
         d1_positions[name] = (lon, retro)
 
     rahu_lon = d1_positions['Rahu'][0]
     ketu_lon = (rahu_lon + 180) % 360
     d1_positions['Ketu'] = (ketu_lon, 'R')  # Ketu is always retrograde
 
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon = ascmc[0] % 360
 
     d60_asc = get_d60_position(d1_asc_lon)
@@ -123,7 +96,7 @@ def raman_Shashtiamsha_D60(birth_date, birth_time, latitude, longitude, tz_offse
     d60_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d60_pos = get_d60_position(d1_lon)
-        house = get_d60_house(d60_pos['sign_index'], d60_asc_sign_index)
+        house = whole_sign_house(d60_pos['sign_index'], d60_asc_sign_index)
         nakshatra = get_nakshatra(d1_lon)
         pada = get_pada(d1_lon)
         d60_positions[planet] = {
@@ -1,50 +1,14 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-# Set Swiss Ephemeris path (adjust this path as needed)
-swe.set_ephe_path('astro_api/ephe')
-
-# Zodiac signs (0 = Aries, 1 = Taurus, ..., 11 = Pisces)
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, format_dms
 
 # Nakshatras (27 nakshatras)
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, timezone_offset):
-    """Convert birth date and time to Julian Day."""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        time_obj = datetime.strptime(time_str, '%H:%M:%S')
-        local_dt = datetime.combine(date_obj, time_obj.time())
-        ut_dt = local_dt - timedelta(hours=timezone_offset)
-        hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-        jd = swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
-        print(f"Julian Day: {jd}")
-        return jd
-    except ValueError as e:
-        raise ValueError(f"Invalid date or time format: {str(e)}")
-
-def format_dms(degrees):
-    """Format degrees into degrees, minutes, seconds with high precision."""
-    d = int(degrees)
-    m_fraction = (degrees - d) * 60
-    m = int(m_fraction)
-    s = (m_fraction - m) * 60
-    return f"{d}° {m}' {s:.2f}\""
+NAKSHATRAS = NAKSHATRA_NAMES
 
 def get_nakshatra_pada(longitude):
     """Calculate nakshatra and pada from sidereal longitude."""
-    longitude = longitude % 360
-    nakshatra_index = int(longitude / 13.3333) % 27
-    position_in_nakshatra = longitude % 13.3333
-    pada = int(position_in_nakshatra / 3.3333) + 1
+    nakshatra_index, pada = nakshatra_and_pada(longitude)
     return NAKSHATRAS[nakshatra_index], pada
 
 def get_d16_position(sidereal_lon):
@@ -85,11 +49,10 @@ def get_d16_house(d16_sign_index, d16_asc_sign_index, is_ketu=False, rahu_house=
         house_number = (d16_sign_index - d16_asc_sign_index + 12) % 12 + 1
     return house_number
 
-def raman_Shodashamsha_D16(birth_date, birth_time, latitude, longitude, timezone_offset, enforce_opposition=False):
+def raman_Shodashamsha_D16(birth_date, birth_time, latitude, longitude, timezone_offset, enforce_opposition=False, snapshot=None):
     """Calculate the Shodasamsa (D16) chart using Raman ayanamsa."""
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-    swe.set_sid_mode(swe.SIDM_RAMAN)
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_sidereal = ascmc[0] % 360
     d1_asc_sign = SIGNS[int(d1_asc_sidereal // 30)]
 
@@ -104,7 +67,7 @@ def raman_Shodashamsha_D16(birth_date, birth_time, latitude, longitude, timezone
     flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
     d1_positions = {}
     for planet_id, name in planets:
-        pos, ret = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, ret = snapshot.calc_ut(planet_id, flag)
         if ret < 0:
             raise Exception(f"Error calculating {name}")
         lon = pos[0] % 360
@@ -1,8 +1,6 @@
-import swisseph as swe
-from datetime import datetime, timedelta
-
-SIGNS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-         'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.Nakshatras import nakshatra_and_pada
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_LORDS, SIGNS
 
 ODD_SIGN_D30_RANGES = [
     (0, 5, 'Aries'),
@@ -27,17 +25,6 @@ NAKSHATRA_NAMES = [
     "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
     "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
-NAKSHATRA_LORDS = [
-    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
-    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury",
-    "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"
-]
-
-def raman_d30_get_julian_day(date_str, time_str, tz_offset):
-    local_dt = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M:%S")
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal, swe.GREG_CAL)
 
 def raman_d30_calculate_sidereal_longitudes(jd, latitude, longitude):
     swe.set_sid_mode(swe.SIDM_RAMAN)
@@ -78,19 +65,8 @@ def raman_d30_get_d30_sign_and_degree(longitude):
     return sign, d30_degree, d30_sign_index, natal_sign, degree_in_sign
 
 def raman_d30_get_nakshatra_and_pada(longitude):
-    nak_num = int(longitude // (13 + 1/3))
-    nakshatra = NAKSHATRA_NAMES[nak_num]
-    nak_lord = NAKSHATRA_LORDS[nak_num]
-    nak_start = nak_num * 13.3333333333
-    deg_in_nak = longitude - nak_start
-    pada = int(deg_in_nak // 3.3333333333) + 1
-    return nakshatra, nak_lord, pada
-
-def raman_d30_format_degree(deg):
-    d = int(deg)
-    m = int((deg - d) * 60)
-    s = (deg - d - m / 60) * 3600
-    return f"{d}° {m}' {s:.2f}\""
+    nak_num, pada = nakshatra_and_pada(longitude)
+    return NAKSHATRA_NAMES[nak_num], NAKSHATRA_LORDS[nak_num], pada
 
 def raman_d30_assign_houses(d30_positions, asc_sign_index):
     for planet, pdata in d30_positions.items():
@@ -1,44 +1,21 @@
-import swisseph as swe
-from datetime import datetime, timedelta
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import resolve_snapshot
+from datetime import datetime
 import math
+from astro_engine.engine.core.Nakshatras import nakshatra_of, pada_of
+from astro_engine.engine.core.SiderealKernel import NAKSHATRA_NAMES, SIGNS, dms, whole_sign_house
 
-swe.set_ephe_path('astro_api/ephe')
-
-SIGNS = [
-    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
-]
-
-NAKSHATRAS = [
-    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
-    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
-    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
-    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta',
-    'Shatabhisha', 'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
-]
-
-def get_julian_day(date_str, time_str, tz_offset):
-    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-    time_obj = datetime.strptime(time_str, '%H:%M:%S')
-    local_dt = datetime.combine(date_obj, time_obj.time())
-    ut_dt = local_dt - timedelta(hours=tz_offset)
-    hour_decimal = ut_dt.hour + (ut_dt.minute / 60.0) + (ut_dt.second / 3600.0)
-    return swe.julday(ut_dt.year, ut_dt.month, ut_dt.day, hour_decimal)
+NAKSHATRAS = NAKSHATRA_NAMES
 
 def format_dms(degrees):
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = (degrees - d - m / 60) * 3600
+    d, m, s = dms(degrees, 1)
     return f"{d}°{m}'{s:.1f}\""
 
 def get_nakshatra(longitude):
-    nakshatra_index = int((longitude % 360) / 13.3333) % 27
-    return NAKSHATRAS[nakshatra_index]
+    return NAKSHATRAS[nakshatra_of(longitude)]
 
 def get_pada(longitude):
-    position_in_nakshatra = (longitude % 360) % 13.3333
-    pada = math.ceil(position_in_nakshatra / 3.3333)
-    return pada
+    return pada_of(longitude)
 
 def get_d20_position(sidereal_lon):
     natal_sign_index = int(sidereal_lon // 30) % 12
@@ -48,12 +25,8 @@ def get_d20_position(sidereal_lon):
     d20_sign = SIGNS[d20_sign_index]
     return {'sign': d20_sign, 'sign_index': d20_sign_index}
 
-def get_d20_house(planet_d20_sign_index, d20_asc_sign_index):
-    return (planet_d20_sign_index - d20_asc_sign_index) % 12 + 1
-
-def raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, timezone_offset, user_name='Unknown'):
-    jd_ut = get_julian_day(birth_date, birth_time, timezone_offset)
-    swe.set_sid_mode(swe.SIDM_RAMAN)
+def raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, timezone_offset, user_name='Unknown', snapshot=None):
+    snapshot = resolve_snapshot(snapshot, 'raman', birth_date, birth_time, latitude, longitude, timezone_offset)
 
     planets = [
         (swe.SUN, 'Sun'), (swe.MOON, 'Moon'), (swe.MARS, 'Mars'),
@@ -64,7 +37,7 @@ def raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, timezone_o
 
     d1_positions = {}
     for planet_id, name in planets:
-        pos, _ = swe.calc_ut(jd_ut, planet_id, flag)
+        pos, _ = snapshot.calc_ut(planet_id, flag)
         lon = pos[0] % 360
         retro = 'R' if pos[3] < 0 else ''
         d1_positions[name] = (lon, retro)
@@ -73,7 +46,7 @@ def raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, timezone_o
     ketu_lon = (rahu_lon + 180) % 360
     d1_positions['Ketu'] = (ketu_lon, 'R')
 
-    cusps, ascmc = swe.houses_ex(jd_ut, latitude, longitude, b'W', flags=swe.FLG_SIDEREAL)
+    cusps, ascmc = snapshot.houses_ex(b'W', flags=swe.FLG_SIDEREAL)
     d1_asc_lon = ascmc[0] % 360
 
     d20_asc_pos = get_d20_position(d1_asc_lon)
@@ -90,7 +63,7 @@ def raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, timezone_o
     d20_positions = {}
     for planet, (d1_lon, retro) in d1_positions.items():
         d20_pos = get_d20_position(d1_lon)
-        house = get_d20_house(d20_pos['sign_index'], d20_asc_sign_index)
+        house = whole_sign_house(d20_pos['sign_index'], d20_asc_sign_index)
         nakshatra = get_nakshatra(d1_lon)
         pada = get_pada(d1_lon)
         d20_positions[planet] = {
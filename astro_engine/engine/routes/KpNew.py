@@ -4,16 +4,21 @@ from datetime import datetime
 import logging
 from venv import logger
 
-from astro_engine.engine.ashatakavargha.KpShodashVargha import CHARTS_kp, SIGNS_kp, get_sidereal_asc_kp, get_sidereal_positions_kp, julian_day_kp, local_to_utc_kp, varga_sign_kp
+from astro_engine.engine.ashatakavargha.KpShodashVargha import SIGNS_kp, get_sidereal_asc_kp, get_sidereal_positions_kp
+from astro_engine.engine.core.Vargas import varga_sign_summary
+from astro_engine.engine.core.ProcessPool import PoolSaturated, run_in_pool
+from astro_engine.engine.core.DashaTree import MAX_DEPTH, datetime_to_jd, parse_dasha_window
 from astro_engine.engine.dashas.KpAntar import calculate_maha_antar_dasha
-from astro_engine.engine.dashas.KpPran import calculate_maha_antar_pratyantar_pran_dasha
+from astro_engine.engine.dashas.KpPran import calculate_current_kp_dasha, calculate_maha_antar_pratyantar_pran_dasha, stream_maha_antar_pratyantar_pran_dasha
+from astro_engine.engine.routes.Streaming import ndjson_response, wants_ndjson
 from astro_engine.engine.dashas.KpPratyantar import calculate_maha_antar_pratyantar_dasha
 from astro_engine.engine.dashas.KpSookshma import calculate_maha_antar_pratyantar_sooksha_dashas
 from astro_engine.engine.kpSystem.KpHorary import KP_NEW_AYANAMSA, calc_vimshottari_dasha_path, check_radicality, check_void_of_course_moon, get_asc_from_horary_num, get_nakshatra_chain, get_ruling_planets, get_sign_lord, get_significators_expanded, house_cusps, julday_from_date_time, kp_timing_by_dasha_layers, planet_chain, planet_house_assignment, sign_deg, sub_lord_chain_judgment
 from astro_engine.engine.kpSystem.charts.BhavaHouses import calculate_bhava_houses_details
-from astro_engine.engine.kpSystem.charts.CupsalChart import ZODIAC_SIGNS, cupsal_assign_nakshatra_and_lords, cupsal_assign_planet_to_house, cupsal_calculate_ascendant_and_cusps, cupsal_calculate_kp_new_ayanamsa, cupsal_calculate_planet_positions, cupsal_calculate_significators, cupsal_format_dms, cupsal_get_julian_day
+from astro_engine.engine.kpSystem.charts.CupsalChart import ZODIAC_SIGNS, cupsal_assign_nakshatra_and_lords, cupsal_assign_planet_to_house, cupsal_calculate_ascendant_and_cusps, cupsal_calculate_kp_new_ayanamsa, cupsal_calculate_planet_positions, cupsal_calculate_significators, cupsal_format_dms
 from astro_engine.engine.kpSystem.charts.RulingPlanets import ruling_calculate_ascendant_and_cusps, ruling_calculate_balance_of_dasha, ruling_calculate_fortuna, ruling_calculate_jd, ruling_calculate_planet_positions, ruling_check_rahu_ketu, ruling_compile_core_rp, ruling_get_day_lord, ruling_get_details
 from astro_engine.engine.kpSystem.charts.SignificatorHouse import calculate_planets_significations
+from astro_engine.engine.core.SiderealKernel import get_julian_day, local_to_utc, utc_to_jd
 
 
 
@@ -41,32 +46,32 @@ def calculate_kp_planets_cusps():
         longitude = float(data['longitude'])
         tz_offset = float(data['timezone_offset'])
 
-        jd = cupsal_get_julian_day(birth_date, birth_time, tz_offset)
+        jd = get_julian_day(birth_date, birth_time, tz_offset)
         kp_new_ayanamsa = cupsal_calculate_kp_new_ayanamsa(jd)
         ascendant, house_cusps = cupsal_calculate_ascendant_and_cusps(jd, latitude, longitude, kp_new_ayanamsa)
         planets = cupsal_calculate_planet_positions(jd, kp_new_ayanamsa)
 
-        planet_details = {
-            planet: {
+        planet_details = {}
+        for planet, lon in planets.items():
+            nakshatra, star_lord, sub_lord = cupsal_assign_nakshatra_and_lords(lon)
+            planet_details[planet] = {
                 "longitude": cupsal_format_dms(lon),
                 "sign": ZODIAC_SIGNS[int(lon // 30)],
-                "nakshatra": cupsal_assign_nakshatra_and_lords(lon)[0],
-                "star_lord": cupsal_assign_nakshatra_and_lords(lon)[1],
-                "sub_lord": cupsal_assign_nakshatra_and_lords(lon)[2],
+                "nakshatra": nakshatra,
+                "star_lord": star_lord,
+                "sub_lord": sub_lord,
                 "house": cupsal_assign_planet_to_house(lon, house_cusps)
             }
-            for planet, lon in planets.items()
-        }
-        cusp_details = {
-            str(i + 1): {
+        cusp_details = {}
+        for i, cusp in enumerate(house_cusps):
+            nakshatra, star_lord, sub_lord = cupsal_assign_nakshatra_and_lords(cusp)
+            cusp_details[str(i + 1)] = {
                 "longitude": cupsal_format_dms(cusp),
                 "sign": ZODIAC_SIGNS[int(cusp // 30)],
-                "nakshatra": cupsal_assign_nakshatra_and_lords(cusp)[0],
-                "star_lord": cupsal_assign_nakshatra_and_lords(cusp)[1],
-                "sub_lord": cupsal_assign_nakshatra_and_lords(cusp)[2]
+                "nakshatra": nakshatra,
+                "star_lord": star_lord,
+                "sub_lord": sub_lord
             }
-            for i, cusp in enumerate(house_cusps)
-        }
         significators = cupsal_calculate_significators(planets, house_cusps)
 
         response = {
@@ -245,8 +250,10 @@ def calculate_maha_antar_pratyantar_sookshma_dasha():
         required_fields = ['user_name', 'birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
         if not all(key in data for key in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
-        response = calculate_maha_antar_pratyantar_sooksha_dashas(data)
+        response = run_in_pool(calculate_maha_antar_pratyantar_sooksha_dashas, data)
         return jsonify(response), 200
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -260,8 +267,43 @@ def calculate_maha_antar_pratyantar_dasha_pran():
         required_fields = ['user_name', 'birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
         if not all(key in data for key in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
-        response = calculate_maha_antar_pratyantar_pran_dasha(data)
+        depth, start_jd, end_jd = parse_dasha_window(request.args)
+        if wants_ndjson(request):
+            return ndjson_response(stream_maha_antar_pratyantar_pran_dasha(data, depth, start_jd, end_jd))
+        response = run_in_pool(calculate_maha_antar_pratyantar_pran_dasha, data, depth, start_jd, end_jd)
         return jsonify(response), 200
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
+#  Current Dasha at a date :
+@kp.route('/kp/current_dasha', methods=['POST'])
+def calculate_current_dasha_kp():
+    """
+    API endpoint returning the Maha/Antar/Pratyantar/Sookshma/Pran dashas running at a date.
+
+    Takes the birth fields plus optional "date" ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS', UTC;
+    defaults to now) and "depth" (1-5, default 5).
+    """
+    try:
+        data = request.get_json()
+        required_fields = ['birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
+        if not data or not all(key in data for key in required_fields):
+            return jsonify({"error": "Missing required fields"}), 400
+        depth = int(data.get('depth', MAX_DEPTH))
+        if not 1 <= depth <= MAX_DEPTH:
+            return jsonify({"error": f"depth must be between 1 and {MAX_DEPTH}"}), 400
+        response = calculate_current_kp_dasha(data, datetime_to_jd(data.get('date')), depth)
+        if not response['current_dasha']:
+            return jsonify({"error": "Date is outside the 120-year dasha cycle"}), 400
+        return jsonify(response), 200
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -285,22 +327,18 @@ def shodasha_varga_signs():
         timezone_offset = float(data['timezone_offset'])
         user_name = data.get('user_name', 'Unknown')
 
-        utc_dt = local_to_utc_kp(birth_date, birth_time, timezone_offset)
-        jd = julian_day_kp(utc_dt)
+        utc_dt = local_to_utc(birth_date, birth_time, timezone_offset)
+        jd = utc_to_jd(utc_dt)
 
         # Sidereal positions of all planets
         sid_positions = get_sidereal_positions_kp(jd)
         sid_asc, asc_sign_idx, asc_deg_in_sign = get_sidereal_asc_kp(jd, latitude, longitude)
         sid_positions['Ascendant'] = (sid_asc, asc_sign_idx, asc_deg_in_sign)
 
-        summary = {}
-        for pname in sid_positions.keys():
-            summary[pname] = {}
-
-        for chart in CHARTS_kp:
-            for pname, (lon, sign_idx, deg_in_sign) in sid_positions.items():
-                varga_idx = varga_sign_kp(sign_idx, deg_in_sign, chart)
-                summary[pname][chart] = {"sign": SIGNS_kp[varga_idx]}
+        varga_signs = varga_sign_summary(
+            {pname: lon for pname, (lon, _, _) in sid_positions.items()}, 'kp')
+        summary = {pname: {chart: {"sign": SIGNS_kp[sign_idx]} for chart, sign_idx in signs.items()}
+                   for pname, signs in varga_signs.items()}
 
         return jsonify({
             "ayanamsa": "KP New",
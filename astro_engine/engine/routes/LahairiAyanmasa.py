@@ -1,21 +1,27 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import itertools
 # import logging
 # from venv import logger
-import swisseph as swe
-
-swe.set_ephe_path('astro_api/ephe')
-
-
-from astro_engine.engine.lagnaCharts.LahiriHoraLagna import lahiri_hora_calculate_hora_lagna, lahiri_hora_calculate_house, lahiri_hora_calculate_sunrise_jd_and_asc, lahiri_hora_get_julian_day, lahiri_hora_get_sign_and_degrees, lahiri_hora_nakshatra_and_pada
-from astro_engine.engine.lagnaCharts.LahiriBavaLagna import PLANET_IDS, bava_calculate_bhava_lagna, bava_calculate_house, bava_calculate_sunrise, bava_get_julian_day, bava_get_sign_and_degrees, bava_nakshatra_and_pada
-from astro_engine.engine.ashatakavargha.LahiriVarghSigns import DCHARTS, lahiri_sign_get_sidereal_asc, lahiri_sign_get_sidereal_positions, lahiri_sign_julian_day, lahiri_sign_local_to_utc, lahiri_sign_varga_sign
+from astro_engine.engine.core import swe
+from astro_engine.engine.routes.ProfileBatch import profile_response
+from astro_engine.engine.routes.Streaming import NDJSON_MIMETYPE, ndjson_response, wants_ndjson
+from astro_engine.engine.core.SiderealKernel import get_julian_day, house_of_sign, local_to_utc, longitude_to_sign, sign_of, utc_to_jd
+
+
+from astro_engine.engine.lagnaCharts.LahiriHoraLagna import lahiri_hora_calculate_hora_lagna, lahiri_hora_calculate_sunrise_jd_and_asc, lahiri_hora_nakshatra_and_pada
+from astro_engine.engine.lagnaCharts.LahiriBavaLagna import PLANET_IDS, bava_calculate_bhava_lagna, bava_calculate_sunrise, bava_nakshatra_and_pada
+from astro_engine.engine.ashatakavargha.LahiriVarghSigns import DCHARTS, lahiri_sign_get_sidereal_asc, lahiri_sign_get_sidereal_positions
+from astro_engine.engine.core.Vargas import varga_sign_summary
+from astro_engine.engine.core.ProcessPool import PoolSaturated, run_in_pool
+from astro_engine.engine.core.DashaTree import MAX_DEPTH, datetime_to_jd, parse_dasha_window
 from astro_engine.engine.ashatakavargha.Sarvasthakavargha import lahiri_sarvathakavargha
-from astro_engine.engine.dashas.AntarDasha import calculate_dasha_antar_balance, calculate_mahadasha_periods, calculate_moon_sidereal_antar_position, get_julian_dasha_day, get_nakshatra_and_antar_lord
-from astro_engine.engine.dashas.LahiriPranDasha import calculate_dasha_balance_pran, calculate_moon_sidereal_position_prana, calculate_pranaDasha_periods, get_julian_day_pran, get_nakshatra_and_lord_prana
-from astro_engine.engine.dashas.Pratyantardashas import calculate_Pratythardasha_periods, calculate_moon_praty_sidereal_position, calculate_pratythar_dasha_balance, get_julian_pratyathar_day, get_nakshatra_party_and_lord
-from astro_engine.engine.dashas.Sookashama import calculate_moon_sookshma_sidereal_position, calculate_sookshma_dasha_balance, calculate_sookshma_dasha_periods, get_julian_sookshma_day, get_nakshatra_and_lord_sookshma
-from astro_engine.engine.divisionalCharts.ChathruthamshaD4 import  get_julian_day, lahairi_Chaturthamsha
+from astro_engine.engine.ashatakavargha.TransitAshtakavarga import lahiri_transit_ashtakavarga
+from astro_engine.engine.dashas.AntarDasha import calculate_dasha_antar_balance, calculate_mahadasha_periods, calculate_moon_sidereal_antar_position, get_nakshatra_and_antar_lord
+from astro_engine.engine.dashas.LahiriPranDasha import calculate_dasha_balance_pran, calculate_moon_sidereal_position_prana, calculate_pranaDasha_periods, get_nakshatra_and_lord_prana, lahiri_current_dasha, lahiri_prana_dasha_rows
+from astro_engine.engine.dashas.Pratyantardashas import calculate_Pratythardasha_periods, calculate_moon_praty_sidereal_position, calculate_pratythar_dasha_balance, get_nakshatra_party_and_lord
+from astro_engine.engine.dashas.Sookashama import calculate_moon_sookshma_sidereal_position, calculate_sookshma_dasha_balance, calculate_sookshma_dasha_periods, get_nakshatra_and_lord_sookshma
+from astro_engine.engine.divisionalCharts.ChathruthamshaD4 import lahairi_Chaturthamsha
 from astro_engine.engine.divisionalCharts.ChaturvimshamshaD24 import  lahairi_Chaturvimshamsha
 from astro_engine.engine.divisionalCharts.DashamshaD10 import  lahairi_Dashamsha
 from astro_engine.engine.divisionalCharts.DreshkanaD3 import PLANET_NAMES, lahairi_drerkhana
@@ -24,7 +30,7 @@ from astro_engine.engine.divisionalCharts.HoraD2 import lahairi_hora_chart
 from astro_engine.engine.divisionalCharts.KvedamshaD40 import  lahairi_Khavedamsha
 from astro_engine.engine.divisionalCharts.NavamshaD9 import  lahairi_navamsha_chart
 from astro_engine.engine.divisionalCharts.SaptamshaD7 import  lahairi_saptamsha
-from astro_engine.engine.divisionalCharts.SaptavimshamshaD27 import PLANET_CODES, ZODIAC_SIGNS_d27, d27_calculate_ascendant, d27_calculate_house, d27_calculate_longitude, d27_calculate_sidereal_longitude, d27_get_julian_day_utc, d27_get_nakshatra_pada, d27_get_sign_index
+from astro_engine.engine.divisionalCharts.SaptavimshamshaD27 import PLANET_CODES, ZODIAC_SIGNS_d27, d27_calculate_ascendant, d27_calculate_house, d27_calculate_longitude, d27_calculate_sidereal_longitude, d27_get_nakshatra_pada
 from astro_engine.engine.divisionalCharts.ShodasmasD16 import  lahairi_Shodashamsha
 
 from astro_engine.engine.divisionalCharts.TrimshamshaD30 import lahiri_trimshamsha_D30
@@ -34,8 +40,10 @@ from astro_engine.engine.lagnaCharts.KPLagna import  lahairi_kp_bava
 from astro_engine.engine.lagnaCharts.LahiriKarkamshaD1 import lahiri_karkamsha_d1
 from astro_engine.engine.lagnaCharts.LahiriKarkamshaD9 import lahiri_karkamsha_D9
 from astro_engine.engine.lagnaCharts.Sripathi import calculate_ascendant_sri, get_nakshatra_pada_sri, get_planet_data_sri
-from astro_engine.engine.natalCharts.natal import lahairi_natal,  longitude_to_sign, format_dms
+from astro_engine.engine.natalCharts.NatalBatch import BATCH_PRODUCTS, lahairi_natal_batch
+from astro_engine.engine.natalCharts.natal import lahairi_natal, lahairi_natal_response
 from astro_engine.engine.natalCharts.transit import  lahairi_tranist
+from astro_engine.engine.natalCharts.TransitCalendar import lahairi_transit_calendar
 from astro_engine.engine.numerology.CompositeChart import  lahairi_composite
 from astro_engine.engine.numerology.LoShuGridNumerology import calculate_lo_shu_grid
 from astro_engine.engine.ashatakavargha.Binnastakavargha import  lahiri_binnastakavargha
@@ -43,7 +51,7 @@ from astro_engine.engine.numerology.NumerologyData import calculate_chaldean_num
 from astro_engine.engine.divisionalCharts.AkshavedamshaD45 import  lahairi_Akshavedamsha
 from astro_engine.engine.divisionalCharts.ShashtiamshaD60 import  lahairi_Shashtiamsha
 from astro_engine.engine.divisionalCharts.VimshamshaD20 import  lahairi_Vimshamsha
-from astro_engine.engine.natalCharts.SudharashanaChakara import calculate_sidereal_positions, generate_chart, get_sign
+from astro_engine.engine.natalCharts.SudharashanaChakara import lahiri_sudarshan_chakra
 from astro_engine.engine.natalCharts.SunChart import  lahrir_sun_chart,  validate_input_sun
 from astro_engine.engine.natalCharts.MoonChart import  lahairi_moon_chart, validate_input
 from astro_engine.engine.numerology.ProgressChart import  lahairi_progress
@@ -53,6 +61,13 @@ from astro_engine.engine.numerology.SynatryChart import analyze_house_overlays,
 bp = Blueprint('bp_routes', __name__)
 
 # Natal Chart
+def _natal_product(birth_data, snapshot=None):
+    """Body of the /lahiri/natal response; the engines read ``snapshot`` when given."""
+    # Calculate chart data
+    chart_data = lahairi_natal(birth_data, snapshot=snapshot)
+    return lahairi_natal_response(birth_data, chart_data)
+
+
 @bp.route('/lahiri/natal', methods=['POST'])
 def natal_chart():
     try:
@@ -69,62 +84,52 @@ def natal_chart():
         if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
             return jsonify({"error": "Invalid latitude or longitude"}), 400
 
-        # Calculate chart data
-        chart_data = lahairi_natal(birth_data)
-
-        # Format planetary positions
-        planetary_positions_json = {}
-        for planet, data in chart_data['planet_positions'].items():
-            sign, sign_deg = longitude_to_sign(data['lon'])
-            dms = format_dms(sign_deg)
-            house = chart_data['planet_houses'][planet]
-            planetary_positions_json[planet] = {
-                "sign": sign,
-                "degrees": dms,
-                "retrograde": data['retro'],
-                "house": house,
-                "nakshatra": data['nakshatra'],
-                "pada": data['pada']
-            }
+        return jsonify(_natal_product(birth_data))
 
-        # Format ascendant
-        asc_sign, asc_deg = longitude_to_sign(chart_data['ascendant']['lon'])
-        asc_dms = format_dms(asc_deg)
-        ascendant_json = {
-            "sign": asc_sign,
-            "degrees": asc_dms,
-            "nakshatra": chart_data['ascendant']['nakshatra'],
-            "pada": chart_data['ascendant']['pada']
-        }
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
-        # Format house signs
-        house_signs_json = {f"House {i+1}": {"sign": house["sign"], "start_longitude": format_dms(house["start_longitude"])}
-                           for i, house in enumerate(chart_data['house_signs'])}
 
-        # Construct response
-        response = {
-            "user_name": birth_data['user_name'],
-            "birth_details": {
-                "birth_date": birth_data['birth_date'],
-                "birth_time": birth_data['birth_time'],
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone_offset": float(birth_data['timezone_offset'])
-            },
-            "planetary_positions": planetary_positions_json,
-            "ascendant": ascendant_json,
-            # "house_signs": house_signs_json,
-            "notes": {
-                "ayanamsa": "Lahiri",
-                "ayanamsa_value": f"{chart_data['ayanamsa_value']:.6f}",
-                "chart_type": "Rasi",
-                "house_system": "Whole Sign"
-            }
-        }
-        return jsonify(response)
 
-    except ValueError as ve:
-        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+# Natal Chart (bulk)
+@bp.route('/lahiri/natal/bulk', methods=['POST'])
+def natal_chart_bulk():
+    """
+    API endpoint computing natal and D9 charts for many birth records.
+
+    The body is either JSON (a list of records, or {"records": [...], "products": [...]}) or
+    NDJSON with one record per line (Content-Type: application/x-ndjson; products then come
+    from the comma-separated "products" query argument). Results are streamed back as NDJSON,
+    one line per record in input order, each carrying the record's "index".
+    """
+    try:
+        if request.mimetype == NDJSON_MIMETYPE:
+            records = (line for line in request.stream if line.strip())
+            products = request.args.get('products', 'natal,d9').split(',')
+        else:
+            data = request.get_json()
+            if isinstance(data, dict):
+                records = data.get('records')
+                products = data.get('products') or ['natal', 'd9']
+            else:
+                records, products = data, ['natal', 'd9']
+            if not isinstance(records, list):
+                return jsonify({"error": "No birth records provided"}), 400
+            if not isinstance(products, list):
+                return jsonify({"error": "products must be a list of product names"}), 400
+
+        unknown = [name for name in products if name not in BATCH_PRODUCTS]
+        if unknown:
+            return jsonify({"error": f"Unknown products: {', '.join(map(str, unknown))}",
+                            "available_products": list(BATCH_PRODUCTS)}), 400
+
+        results = lahairi_natal_batch(records, products)
+        return ndjson_response({"index": index, **result} for index, result in enumerate(results))
+
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except Exception as e:
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
@@ -154,9 +159,56 @@ def transit_chart():
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
 
+# Transit calendar: ingresses, stations and natal conjunctions between two dates
+@bp.route('/lahiri/transit_calendar', methods=['POST'])
+def transit_calendar():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+
+        required = ['user_name', 'birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset', 'from', 'to']
+        if not all(key in data for key in required):
+            return jsonify({"error": "Missing required parameters"}), 400
+
+        response = lahairi_transit_calendar(data)
+        return jsonify(response)
+
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+
+# Transit ashtakavarga: daily scores of the transiting planets against natal bindus
+@bp.route('/lahiri/transit_ashtakavarga', methods=['POST'])
+def transit_ashtakavarga():
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+
+        required = ['user_name', 'birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset', 'from', 'to']
+        if not all(key in data for key in required):
+            return jsonify({"error": "Missing required parameters"}), 400
+
+        response = lahiri_transit_ashtakavarga(data)
+        return jsonify(response)
+
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+
 
 # Sun Chart
 
+def _sun_chart_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_sun_chart response; the engines read ``snapshot`` when given."""
+    return lahrir_sun_chart(data, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_sun_chart', methods=['POST'])
 def calculate_sun_chart():
     """
@@ -170,9 +222,7 @@ def calculate_sun_chart():
         
         validate_input_sun(data)
         
-        # Call the calculation function
-        response = lahrir_sun_chart(data)
-        return jsonify(response), 200
+        return jsonify(_sun_chart_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -183,6 +233,11 @@ def calculate_sun_chart():
 
 # Moon Chart
 
+def _moon_chart_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_moon_chart response; the engines read ``snapshot`` when given."""
+    return lahairi_moon_chart(data, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_moon_chart', methods=['POST'])
 def calculate_moon_chart():
     """
@@ -196,9 +251,7 @@ def calculate_moon_chart():
         
         validate_input(data)
         
-        # Call the calculation function
-        response = lahairi_moon_chart(data)
-        return jsonify(response), 200
+        return jsonify(_moon_chart_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -208,6 +261,18 @@ def calculate_moon_chart():
 
 
 # Sudarshan Chakra
+def _sudarshan_chakra_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_sudarshan_chakra response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return lahiri_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_sudarshan_chakra', methods=['POST'])
 def calculate_sudarshan_chakra():
     try:
@@ -219,30 +284,7 @@ def calculate_sudarshan_chakra():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
-        positions = calculate_sidereal_positions(jd_birth, latitude, longitude)
-        asc_sign, _ = get_sign(positions["Ascendant"])
-        moon_sign, _ = get_sign(positions["Moon"])
-        sun_sign, _ = get_sign(positions["Sun"])
-        asc_sign_idx = SIGNS.index(asc_sign)
-        moon_sign_idx = SIGNS.index(moon_sign)
-        sun_sign_idx = SIGNS.index(sun_sign)
-        lagna_chart = generate_chart(positions, asc_sign_idx)
-        chandra_chart = generate_chart(positions, moon_sign_idx)
-        surya_chart = generate_chart(positions, sun_sign_idx)
-
-        response = {
-            "user_name": user_name,
-            "sudarshan_chakra": {"lagna_chart": lagna_chart, "chandra_chart": chandra_chart, "surya_chart": surya_chart}
-        }
-        return jsonify(response), 200
+        return jsonify(_sudarshan_chakra_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -253,6 +295,30 @@ def calculate_sudarshan_chakra():
 
 # Hora (D-2)
 
+def _d2_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d2_hora response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    result = lahairi_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+    response = {
+        'user_name': user_name,
+        'd2_hora_chart': result,
+        'metadata': {
+            'ayanamsa': 'Lahiri',
+            'house_system': 'Whole Sign',
+            'calculation_time': datetime.utcnow().isoformat(),
+            'input': data
+        }
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_d2_hora', methods=['POST'])
 def calculate_d2_hora():
     """API endpoint to calculate the D2 Hora chart."""
@@ -265,26 +331,7 @@ def calculate_d2_hora():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = lahairi_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset)
-        response = {
-            'user_name': user_name,
-            'd2_hora_chart': result,
-            'metadata': {
-                'ayanamsa': 'Lahiri',
-                'house_system': 'Whole Sign',
-                'calculation_time': datetime.utcnow().isoformat(),
-                'input': data
-            }
-        }
-        return jsonify(response), 200
+        return jsonify(_d2_product(data)), 200
 
     except Exception as e:
         return jsonify({"error": f"Calculation error: {str(e)}"}), 500
@@ -292,6 +339,17 @@ def calculate_d2_hora():
 
 # Dreshkana (D-3)
 
+def _d3_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d3 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return lahairi_drerkhana(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d3', methods=['POST'])
 def calculate_d3_chart_endpoint():
     """API endpoint to calculate D3 chart with retrograde status, nakshatras, and padas."""
@@ -304,14 +362,7 @@ def calculate_d3_chart_endpoint():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        d3_data = lahairi_drerkhana(birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(d3_data), 200
+        return jsonify(_d3_product(data)), 200
 
     except Exception as e:
         logger.error(f"Error in D3 chart calculation: {str(e)}")
@@ -320,6 +371,11 @@ def calculate_d3_chart_endpoint():
 
 
 # Chaturthamsha (D-4)
+def _d4_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d4 response; the engines read ``snapshot`` when given."""
+    return lahairi_Chaturthamsha(data, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d4', methods=['POST'])
 def calculate_d4():
     """API endpoint to calculate the Chaturthamsha (D4) chart."""
@@ -334,9 +390,7 @@ def calculate_d4():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        # Call the calculation function
-        response = lahairi_Chaturthamsha(data)
-        return jsonify(response)
+        return jsonify(_d4_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -347,6 +401,25 @@ def calculate_d4():
 
 
 # Saptamsha (D-7)
+def _d7_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d7_chart response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Calculate D7 chart using lahairi_saptamsha
+    d7_data = lahairi_saptamsha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Prepare response
+    response = {
+        "ascendant": d7_data['Ascendant'],
+        "planets": {planet: d7_data[planet] for planet in PLANET_NAMES}
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_d7_chart', methods=['POST'])
 def calculate_d7_chart_endpoint():
     """API endpoint to calculate D7 chart from birth details."""
@@ -359,21 +432,7 @@ def calculate_d7_chart_endpoint():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Calculate D7 chart using lahairi_saptamsha
-        d7_data = lahairi_saptamsha(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Prepare response
-        response = {
-            "ascendant": d7_data['Ascendant'],
-            "planets": {planet: d7_data[planet] for planet in PLANET_NAMES}
-        }
-        return jsonify(response), 200
+        return jsonify(_d7_product(data)), 200
 
     except Exception as e:
         logger.error(f"Error in D7 calculation: {str(e)}")
@@ -383,6 +442,11 @@ def calculate_d7_chart_endpoint():
 
 # Dashamsha (D-10)
 
+def _d10_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d10 response; the engines read ``snapshot`` when given."""
+    return lahairi_Dashamsha(data, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d10', methods=['POST'])
 def calculate_d10():
     """
@@ -406,12 +470,22 @@ def calculate_d10():
     if not all(key in data for key in required):
         return jsonify({"error": "Missing required parameters"}), 400
 
-    response = lahairi_Dashamsha(data)
-    return jsonify(response)
+    return jsonify(_d10_product(data))
 
 
 
 # Dwadashamsha (D-12)
+def _d12_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d12 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+
+    return lahairi_Dwadashamsha(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d12', methods=['POST'])
 def calculate_d12():
     """
@@ -436,15 +510,7 @@ def calculate_d12():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        response = lahairi_Dwadashamsha(birth_date, birth_time, latitude, longitude, timezone_offset)
-        return jsonify(response)
+        return jsonify(_d12_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -454,6 +520,21 @@ def calculate_d12():
 
 # Shodashamsha (D-16)
 
+def _d16_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d16 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    enforce_opposition = data.get('enforce_opposition', False)
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180) or not (-12 <= tz_offset <= 14):
+        raise ValueError("Invalid geographic or timezone data")
+
+    return lahairi_Shodashamsha(birth_date, birth_time, latitude, longitude, tz_offset, enforce_opposition, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d16', methods=['POST'])
 def calculate_d16():
     try:
@@ -465,19 +546,7 @@ def calculate_d16():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        enforce_opposition = data.get('enforce_opposition', False)
-
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180) or not (-12 <= tz_offset <= 14):
-            return jsonify({"error": "Invalid geographic or timezone data"}), 400
-
-        # Call the calculation function
-        response = lahairi_Shodashamsha(birth_date, birth_time, latitude, longitude, tz_offset, enforce_opposition)
-        return jsonify(response)
+        return jsonify(_d16_product(data))
 
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
@@ -487,6 +556,18 @@ def calculate_d16():
 
 
 # Vimshamsha (D-20)
+def _d20_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d20 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    return lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d20', methods=['POST'])
 def calculate_d20():
     """
@@ -514,16 +595,7 @@ def calculate_d20():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
-        # Call the calculation function
-        response = lahairi_Vimshamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(response)
+        return jsonify(_d20_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -535,6 +607,17 @@ def calculate_d20():
 
 # Chaturvimshamsha (D-24)
 
+def _d24_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d24 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']  # e.g., '1990-01-01'
+    birth_time = data['birth_time']  # e.g., '12:00:00'
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])  # e.g., 5.5 for IST
+
+    return lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d24', methods=['POST'])
 def calculate_d24():
     """API endpoint to calculate D24 chart."""
@@ -543,15 +626,7 @@ def calculate_d24():
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
 
-        birth_date = data['birth_date']  # e.g., '1990-01-01'
-        birth_time = data['birth_time']  # e.g., '12:00:00'
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])  # e.g., 5.5 for IST
-
-        # Call the calculation function
-        response = lahairi_Chaturvimshamsha(birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(response)
+        return jsonify(_d24_product(data))
 
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -560,6 +635,91 @@ def calculate_d24():
 
 # Saptavimshamsha (D-27)
 
+def _d27_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d27 response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd_utc = get_julian_day(birth_date, birth_time, tz_offset)
+    natal_asc_lon = d27_calculate_ascendant(jd_utc, latitude, longitude)
+    d27_asc_lon = d27_calculate_longitude(natal_asc_lon)
+    d27_asc_sign_index = sign_of(d27_asc_lon)
+    d27_asc_deg = d27_asc_lon % 30
+
+    natal_planet_lons = {}
+    natal_planet_retro = {}
+
+    # Rahu/Ketu
+    natal_rahu_lon, _ = d27_calculate_sidereal_longitude(jd_utc, swe.MEAN_NODE)
+    natal_ketu_lon = (natal_rahu_lon + 180) % 360
+    natal_planet_lons["Rahu"] = natal_rahu_lon
+    natal_planet_lons["Ketu"] = natal_ketu_lon
+    natal_planet_retro["Rahu"] = True
+    natal_planet_retro["Ketu"] = True
+
+    for planet, code in PLANET_CODES.items():
+        if planet == "Rahu":
+            continue  # Already handled
+        lon, retro = d27_calculate_sidereal_longitude(jd_utc, code)
+        natal_planet_lons[planet] = lon
+        natal_planet_retro[planet] = retro
+
+    d27_chart = {}
+
+    # Ascendant
+    asc_nak, asc_lord, asc_pada = d27_get_nakshatra_pada(d27_asc_lon)
+    natal_asc_nak, natal_asc_lord, natal_asc_pada = d27_get_nakshatra_pada(natal_asc_lon)
+    d27_chart["Ascendant"] = {
+        "d27_sign": ZODIAC_SIGNS_d27[d27_asc_sign_index],
+        "degrees": round(d27_asc_deg, 4),
+        "house": 1,
+        "d27_nakshatra": asc_nak,
+        "d27_nakshatra_lord": asc_lord,
+        "d27_pada": asc_pada,
+        # "natal_sign": ZODIAC_SIGNS_d27[d27_get_sign_index(natal_asc_lon)],
+        # "natal_nakshatra": natal_asc_nak,
+        # "natal_nakshatra_lord": natal_asc_lord,
+        # "natal_pada": natal_asc_pada,
+        "retrograde": False
+    }
+
+    for planet in list(PLANET_CODES.keys()) + ["Ketu"]:
+        natal_lon = natal_planet_lons[planet]
+        d27_lon = d27_calculate_longitude(natal_lon)
+        d27_sign_index = sign_of(d27_lon)
+        d27_deg = d27_lon % 30
+        house = d27_calculate_house(d27_asc_sign_index, d27_sign_index)
+        natal_sign = ZODIAC_SIGNS_d27[sign_of(natal_lon)]
+        retro = natal_planet_retro[planet]
+
+        d27_nakshatra, d27_nak_lord, d27_pada = d27_get_nakshatra_pada(d27_lon)
+        natal_nakshatra, natal_nak_lord, natal_pada = d27_get_nakshatra_pada(natal_lon)
+
+        d27_chart[planet] = {
+            "d27_sign": ZODIAC_SIGNS_d27[d27_sign_index],
+            "degrees": round(d27_deg, 4),
+            "house": house,
+            "d27_nakshatra": d27_nakshatra,
+            "d27_nakshatra_lord": d27_nak_lord,
+            "d27_pada": d27_pada,
+            # "natal_sign": natal_sign,
+            # "natal_nakshatra": natal_nakshatra,
+            # "natal_nakshatra_lord": natal_nak_lord,
+            # "natal_pada": natal_pada,
+            # "retrograde": retro
+        }
+
+    response = {
+        "user_name": user_name,
+        "d27_chart": d27_chart
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_d27', methods=['POST'])
 def calculate_d27_chart():
     try:
@@ -569,87 +729,7 @@ def calculate_d27_chart():
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_utc = d27_get_julian_day_utc(birth_date, birth_time, tz_offset)
-        natal_asc_lon = d27_calculate_ascendant(jd_utc, latitude, longitude)
-        d27_asc_lon = d27_calculate_longitude(natal_asc_lon)
-        d27_asc_sign_index = d27_get_sign_index(d27_asc_lon)
-        d27_asc_deg = d27_asc_lon % 30
-
-        natal_planet_lons = {}
-        natal_planet_retro = {}
-
-        # Rahu/Ketu
-        natal_rahu_lon, _ = d27_calculate_sidereal_longitude(jd_utc, swe.MEAN_NODE)
-        natal_ketu_lon = (natal_rahu_lon + 180) % 360
-        natal_planet_lons["Rahu"] = natal_rahu_lon
-        natal_planet_lons["Ketu"] = natal_ketu_lon
-        natal_planet_retro["Rahu"] = True
-        natal_planet_retro["Ketu"] = True
-
-        for planet, code in PLANET_CODES.items():
-            if planet == "Rahu":
-                continue  # Already handled
-            lon, retro = d27_calculate_sidereal_longitude(jd_utc, code)
-            natal_planet_lons[planet] = lon
-            natal_planet_retro[planet] = retro
-
-        d27_chart = {}
-
-        # Ascendant
-        asc_nak, asc_lord, asc_pada = d27_get_nakshatra_pada(d27_asc_lon)
-        natal_asc_nak, natal_asc_lord, natal_asc_pada = d27_get_nakshatra_pada(natal_asc_lon)
-        d27_chart["Ascendant"] = {
-            "d27_sign": ZODIAC_SIGNS_d27[d27_asc_sign_index],
-            "degrees": round(d27_asc_deg, 4),
-            "house": 1,
-            "d27_nakshatra": asc_nak,
-            "d27_nakshatra_lord": asc_lord,
-            "d27_pada": asc_pada,
-            # "natal_sign": ZODIAC_SIGNS_d27[d27_get_sign_index(natal_asc_lon)],
-            # "natal_nakshatra": natal_asc_nak,
-            # "natal_nakshatra_lord": natal_asc_lord,
-            # "natal_pada": natal_asc_pada,
-            "retrograde": False
-        }
-
-        for planet in list(PLANET_CODES.keys()) + ["Ketu"]:
-            natal_lon = natal_planet_lons[planet]
-            d27_lon = d27_calculate_longitude(natal_lon)
-            d27_sign_index = d27_get_sign_index(d27_lon)
-            d27_deg = d27_lon % 30
-            house = d27_calculate_house(d27_asc_sign_index, d27_sign_index)
-            natal_sign = ZODIAC_SIGNS_d27[d27_get_sign_index(natal_lon)]
-            retro = natal_planet_retro[planet]
-
-            d27_nakshatra, d27_nak_lord, d27_pada = d27_get_nakshatra_pada(d27_lon)
-            natal_nakshatra, natal_nak_lord, natal_pada = d27_get_nakshatra_pada(natal_lon)
-
-            d27_chart[planet] = {
-                "d27_sign": ZODIAC_SIGNS_d27[d27_sign_index],
-                "degrees": round(d27_deg, 4),
-                "house": house,
-                "d27_nakshatra": d27_nakshatra,
-                "d27_nakshatra_lord": d27_nak_lord,
-                "d27_pada": d27_pada,
-                # "natal_sign": natal_sign,
-                # "natal_nakshatra": natal_nakshatra,
-                # "natal_nakshatra_lord": natal_nak_lord,
-                # "natal_pada": natal_pada,
-                # "retrograde": retro
-            }
-
-        response = {
-            "user_name": user_name,
-            "d27_chart": d27_chart
-        }
-        return jsonify(response), 200
+        return jsonify(_d27_product(data)), 200
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -661,6 +741,24 @@ def calculate_d27_chart():
 
 #  Trimshamsha D-30 
 
+def _d30_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d30 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = data['latitude']
+    longitude = data['longitude']
+    tz_offset = float(data['timezone_offset'])
+
+    natal_positions, d30_positions = lahiri_trimshamsha_D30(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    response = {
+        "user_name": data.get('user_name', 'Unknown'),
+        "natal_positions": {p: natal_positions[p]['longitude'] for p in natal_positions},
+        "d30_chart": d30_positions
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_d30', methods=['POST'])
 def calculate_d30_chart():
     """API endpoint to calculate D30 chart."""
@@ -673,20 +771,7 @@ def calculate_d30_chart():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = data['latitude']
-        longitude = data['longitude']
-        tz_offset = float(data['timezone_offset'])
-
-        natal_positions, d30_positions = lahiri_trimshamsha_D30(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        response = {
-            "user_name": data.get('user_name', 'Unknown'),
-            "natal_positions": {p: natal_positions[p]['longitude'] for p in natal_positions},
-            "d30_chart": d30_positions
-        }
-        return jsonify(response), 200
+        return jsonify(_d30_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -697,6 +782,18 @@ def calculate_d30_chart():
 
 
 # Khavedamsha (D-40)
+def _d40_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d40 response; the engines read ``snapshot`` when given."""
+    # Extract input data
+    birth_date = data['birth_date']  # e.g., '1990-01-01'
+    birth_time = data['birth_time']  # e.g., '12:00:00'
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])  # e.g., 5.5 for IST
+
+    return lahairi_Khavedamsha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d40', methods=['POST'])
 def calculate_d40():
     """API endpoint to calculate the D40 chart."""
@@ -705,16 +802,7 @@ def calculate_d40():
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
 
-        # Extract input data
-        birth_date = data['birth_date']  # e.g., '1990-01-01'
-        birth_time = data['birth_time']  # e.g., '12:00:00'
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])  # e.g., 5.5 for IST
-
-        # Call the calculation function
-        response = lahairi_Khavedamsha(birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(response)
+        return jsonify(_d40_product(data))
 
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -724,6 +812,18 @@ def calculate_d40():
 
 
 # Akshavedamsha (D-45)
+def _d45_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d45 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    return lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d45', methods=['POST'])
 def calculate_d45():
     try:
@@ -735,16 +835,7 @@ def calculate_d45():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
-        # Call the calculation function
-        response = lahairi_Akshavedamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(response)
+        return jsonify(_d45_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -754,6 +845,20 @@ def calculate_d45():
 
 # Shashtiamsha (D-60)
 
+def _d60_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d60 response; the engines read ``snapshot`` when given."""
+    # Extract input data
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Calculate D60 chart using lahairi_Shashtiamsha
+    return lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_d60', methods=['POST'])
 def calculate_d60():
     """API endpoint to calculate the D60 chart."""
@@ -766,22 +871,17 @@ def calculate_d60():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        # Extract input data
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Calculate D60 chart using lahairi_Shashtiamsha
-        response = lahairi_Shashtiamsha(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(response), 200
+        return jsonify(_d60_product(data)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 # Navamsa Chart D9
+def _d9_product(data, snapshot=None):
+    """Body of the /lahiri/navamsa response; the engines read ``snapshot`` when given."""
+    return lahairi_navamsha_chart(data, snapshot=snapshot)
+
+
 @bp.route('/lahiri/navamsa', methods=['POST'])
 def navamsa_chart():
     """API endpoint to calculate Navamsa (D9) chart with retrograde, nakshatras, and padas."""
@@ -796,9 +896,7 @@ def navamsa_chart():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        # Call the calculation function
-        response = lahairi_navamsha_chart(data)
-        return jsonify(response)
+        return jsonify(_d9_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -843,6 +941,37 @@ def navamsa_chart():
 
 
 
+def _sripathi_bhava_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_sripathi_bhava response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # logger.debug(f"Input: Date={birth_date}, Time={birth_time}, Lat={latitude}, Lon={longitude}, TZ Offset={tz_offset}")
+
+    jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
+    asc_lon, asc_sign_index, cusps = calculate_ascendant_sri(jd_ut, latitude, longitude)
+    asc_sign = SIGNS[asc_sign_index]
+    asc_degrees = asc_lon % 30
+    asc_nakshatra, asc_pada = get_nakshatra_pada_sri(asc_lon)
+
+    natal_positions = get_planet_data_sri(jd_ut, asc_lon, cusps)
+
+    response = {
+        "ascendant": {
+            "sign": asc_sign,
+            "degrees": round(asc_degrees, 4),
+            "nakshatra": asc_nakshatra,
+            "pada": asc_pada
+        },
+        "planets": natal_positions
+    }
+    # logger.debug(f"Output JSON: {response}")
+    return response
+
+
 @bp.route('/lahiri/calculate_sripathi_bhava', methods=['POST'])
 def calculate_sripathi_bhava():
     """Compute the Sripathi Bhava Chart and return JSON output with nakshatra and pada."""
@@ -855,33 +984,7 @@ def calculate_sripathi_bhava():
         if not all(key in data for key in required_fields):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # logger.debug(f"Input: Date={birth_date}, Time={birth_time}, Lat={latitude}, Lon={longitude}, TZ Offset={tz_offset}")
-
-        jd_ut = get_julian_day(birth_date, birth_time, tz_offset)
-        asc_lon, asc_sign_index, cusps = calculate_ascendant_sri(jd_ut, latitude, longitude)
-        asc_sign = SIGNS[asc_sign_index]
-        asc_degrees = asc_lon % 30
-        asc_nakshatra, asc_pada = get_nakshatra_pada_sri(asc_lon)
-
-        natal_positions = get_planet_data_sri(jd_ut, asc_lon, cusps)
-
-        response = {
-            "ascendant": {
-                "sign": asc_sign,
-                "degrees": round(asc_degrees, 4),
-                "nakshatra": asc_nakshatra,
-                "pada": asc_pada
-            },
-            "planets": natal_positions
-        }
-        # logger.debug(f"Output JSON: {response}")
-        return jsonify(response), 200
+        return jsonify(_sripathi_bhava_product(data)), 200
 
     except ValueError as ve:
         # logger.error(f"Invalid input format: {str(ve)}")
@@ -892,22 +995,25 @@ def calculate_sripathi_bhava():
 
 
 # KP Bhava
+def _kp_bhava_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_kp_bhava response; the engines read ``snapshot`` when given."""
+    # Extract and validate input
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return lahairi_kp_bava(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @bp.route('/lahiri/calculate_kp_bhava', methods=['POST'])
 def calculate_kp_bhava():
     """API endpoint to calculate KP Bhava chart."""
     data = request.get_json()
     try:
-        # Extract and validate input
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = lahairi_kp_bava(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(result), 200
+        return jsonify(_kp_bhava_product(data)), 200
 
     except KeyError as e:
         return jsonify({"error": f"Missing input field: {str(e)}"}), 400
@@ -923,6 +1029,57 @@ def calculate_kp_bhava():
 # Bhava Lagna
 
 
+def _bhava_lagna_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_bhava_lagna response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    lat = float(data['latitude'])
+    lon = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    birth_jd = get_julian_day(birth_date, birth_time, tz_offset)
+    sunrise_jd, sunrise_sun_lon = bava_calculate_sunrise(birth_jd, lat, lon, tz_offset)
+    bl_lon = bava_calculate_bhava_lagna(birth_jd, sunrise_jd, sunrise_sun_lon)
+    bl_sign, bl_degrees = longitude_to_sign(bl_lon)
+    bl_nak, bl_nak_lord, bl_pada = bava_nakshatra_and_pada(bl_lon)
+
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    positions = {}
+    for planet, pid in PLANET_IDS.items():
+        if planet == 'Ketu':
+            continue
+        pos_data = swe.calc_ut(birth_jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+        lon = pos_data[0] % 360
+        sign, degrees = longitude_to_sign(lon)
+        retrograde = 'R' if pos_data[3] < 0 else ''
+        house = house_of_sign(sign, bl_sign)
+        nak, nak_lord, pada = bava_nakshatra_and_pada(lon)
+        positions[planet] = {
+            "degrees": round(degrees, 4), "sign": sign, "retrograde": retrograde,
+            "house": house, "nakshatra": nak, "nakshatra_lord": nak_lord, "pada": pada
+        }
+
+    # Calculate Ketu
+    rahu_lon = positions['Rahu']['degrees'] + (SIGNS.index(positions['Rahu']['sign']) * 30)
+    ketu_lon = (rahu_lon + 180) % 360
+    ketu_sign, ketu_degrees = longitude_to_sign(ketu_lon)
+    ketu_nak, ketu_nak_lord, ketu_pada = bava_nakshatra_and_pada(ketu_lon)
+    positions['Ketu'] = {
+        "degrees": round(ketu_degrees, 4), "sign": ketu_sign, "retrograde": "",
+        "house": house_of_sign(ketu_sign, bl_sign),
+        "nakshatra": ketu_nak, "nakshatra_lord": ketu_nak_lord, "pada": ketu_pada
+    }
+
+    response = {
+        "bhava_lagna": {
+            "sign": bl_sign, "degrees": round(bl_degrees, 4),
+            "nakshatra": bl_nak, "nakshatra_lord": bl_nak_lord, "pada": bl_pada
+        },
+        "planets": positions
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_bhava_lagna', methods=['POST'])
 def bava_calculate_bhava_lagna_chart():
     try:
@@ -931,52 +1088,7 @@ def bava_calculate_bhava_lagna_chart():
         if not data or not all(k in data for k in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        lat = float(data['latitude'])
-        lon = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        birth_jd = bava_get_julian_day(birth_date, birth_time, tz_offset)
-        sunrise_jd, sunrise_sun_lon = bava_calculate_sunrise(birth_jd, lat, lon, tz_offset)
-        bl_lon = bava_calculate_bhava_lagna(birth_jd, sunrise_jd, sunrise_sun_lon)
-        bl_sign, bl_degrees = bava_get_sign_and_degrees(bl_lon)
-        bl_nak, bl_nak_lord, bl_pada = bava_nakshatra_and_pada(bl_lon)
-
-        positions = {}
-        for planet, pid in PLANET_IDS.items():
-            if planet == 'Ketu':
-                continue
-            pos_data = swe.calc_ut(birth_jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
-            lon = pos_data[0] % 360
-            sign, degrees = bava_get_sign_and_degrees(lon)
-            retrograde = 'R' if pos_data[3] < 0 else ''
-            house = bava_calculate_house(sign, bl_sign)
-            nak, nak_lord, pada = bava_nakshatra_and_pada(lon)
-            positions[planet] = {
-                "degrees": round(degrees, 4), "sign": sign, "retrograde": retrograde,
-                "house": house, "nakshatra": nak, "nakshatra_lord": nak_lord, "pada": pada
-            }
-
-        # Calculate Ketu
-        rahu_lon = positions['Rahu']['degrees'] + (SIGNS.index(positions['Rahu']['sign']) * 30)
-        ketu_lon = (rahu_lon + 180) % 360
-        ketu_sign, ketu_degrees = bava_get_sign_and_degrees(ketu_lon)
-        ketu_nak, ketu_nak_lord, ketu_pada = bava_nakshatra_and_pada(ketu_lon)
-        positions['Ketu'] = {
-            "degrees": round(ketu_degrees, 4), "sign": ketu_sign, "retrograde": "",
-            "house": bava_calculate_house(ketu_sign, bl_sign),
-            "nakshatra": ketu_nak, "nakshatra_lord": ketu_nak_lord, "pada": ketu_pada
-        }
-
-        response = {
-            "bhava_lagna": {
-                "sign": bl_sign, "degrees": round(bl_degrees, 4),
-                "nakshatra": bl_nak, "nakshatra_lord": bl_nak_lord, "pada": bl_pada
-            },
-            "planets": positions
-        }
-        return jsonify(response), 200
+        return jsonify(_bhava_lagna_product(data)), 200
 
     except Exception as e:
         # logging.error(f"Error in calculation: {str(e)}")
@@ -985,6 +1097,22 @@ def bava_calculate_bhava_lagna_chart():
 
 
 # Equal Bhava Lagna
+def _equal_bhava_lagna_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_equal_bhava_lagna response; the engines read ``snapshot`` when given."""
+    # Extract input data
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    response = lahairi_equal_bava(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+    response["user_name"] = user_name
+    return response
+
+
 @bp.route('/lahiri/calculate_equal_bhava_lagna', methods=['POST'])
 def calculate_equal_bhava_lagna():
     """API endpoint to calculate Equal Bhava Lagna, house cusps, and planetary positions."""
@@ -998,18 +1126,7 @@ def calculate_equal_bhava_lagna():
         if not all(key in data for key in required_fields):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        # Extract input data
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        response = lahairi_equal_bava(birth_date, birth_time, latitude, longitude, tz_offset)
-        response["user_name"] = user_name
-        return jsonify(response), 200
+        return jsonify(_equal_bhava_lagna_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -1020,6 +1137,30 @@ def calculate_equal_bhava_lagna():
 
 # Arudha lagna
 
+def _arudha_lagna_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_arudha_lagna response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    result = lahairi_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+    response = {
+        'user_name': user_name,
+        'arudha_lagna': result['arudha_lagna'],
+        'planets': result['planets'],
+        'metadata': {
+            'ayanamsa': 'Lahiri',
+            'calculation_time': datetime.utcnow().isoformat(),
+            'input': data
+        }
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_arudha_lagna', methods=['POST'])
 def calculate_arudha_lagna():
     """API endpoint to calculate Arudha Lagna chart with retrograde, nakshatras, and padas."""
@@ -1032,26 +1173,7 @@ def calculate_arudha_lagna():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = lahairi_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset)
-        response = {
-            'user_name': user_name,
-            'arudha_lagna': result['arudha_lagna'],
-            'planets': result['planets'],
-            'metadata': {
-                'ayanamsa': 'Lahiri',
-                'calculation_time': datetime.utcnow().isoformat(),
-                'input': data
-            }
-        }
-        return jsonify(response), 200
+        return jsonify(_arudha_lagna_product(data)), 200
 
     except Exception as e:
         return jsonify({"error": f"Calculation error: {str(e)}"}), 500
@@ -1059,6 +1181,29 @@ def calculate_arudha_lagna():
 
 # Karkamsha Birth chart 
 
+def _karkamsha_d1_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_d1_karkamsha response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    results = lahiri_karkamsha_d1(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct response
+    response = {
+        "user_name": user_name,
+        "d1_ascendant": results['d1_ascendant'],
+        "atmakaraka": results['atmakaraka'],
+        "karkamsha_ascendant": results['karkamsha_ascendant'],
+        "d1_karkamsha_chart": results['d1_karkamsha_chart']
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_d1_karkamsha', methods=['POST'])
 def calculate_d1_karkamsha_endpoint():
     """Calculate the D1 Karkamsha chart based on birth details."""
@@ -1071,25 +1216,7 @@ def calculate_d1_karkamsha_endpoint():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        results = lahiri_karkamsha_d1(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct response
-        response = {
-            "user_name": user_name,
-            "d1_ascendant": results['d1_ascendant'],
-            "atmakaraka": results['atmakaraka'],
-            "karkamsha_ascendant": results['karkamsha_ascendant'],
-            "d1_karkamsha_chart": results['d1_karkamsha_chart']
-        }
-        return jsonify(response), 200
+        return jsonify(_karkamsha_d1_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1098,6 +1225,28 @@ def calculate_d1_karkamsha_endpoint():
 
 
 #  KarKamsha D9 Chart 
+def _karkamsha_d9_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_karkamsha_d9 response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    results = lahiri_karkamsha_D9(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct response
+    response = {
+        "user_name": user_name,
+        "atmakaraka": results['atmakaraka'],
+        "karkamsha_sign": results['karkamsha_sign'],
+        "karkamsha_chart": results['karkamsha_chart']
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_karkamsha_d9', methods=['POST'])
 def calculate_karkamsha_endpoint():
     """API endpoint to calculate the Karkamsha chart."""
@@ -1110,24 +1259,7 @@ def calculate_karkamsha_endpoint():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        results = lahiri_karkamsha_D9(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct response
-        response = {
-            "user_name": user_name,
-            "atmakaraka": results['atmakaraka'],
-            "karkamsha_sign": results['karkamsha_sign'],
-            "karkamsha_chart": results['karkamsha_chart']
-        }
-        return jsonify(response), 200
+        return jsonify(_karkamsha_d9_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1138,6 +1270,57 @@ def calculate_karkamsha_endpoint():
 
 #  Hora Lagna Chart :
 
+def _hora_lagna_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_hora_lagna response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    lat = float(data['latitude'])
+    lon = float(data['longitude'])
+    global tz_offset
+    tz_offset = float(data['timezone_offset'])
+
+    birth_jd = get_julian_day(birth_date, birth_time, tz_offset)
+    sunrise_jd, sunrise_asc = lahiri_hora_calculate_sunrise_jd_and_asc(birth_jd, lat, lon, tz_offset)
+    hl_lon = lahiri_hora_calculate_hora_lagna(birth_jd, sunrise_jd, sunrise_asc)
+    hl_sign, hl_degrees = longitude_to_sign(hl_lon)
+    hl_nak, hl_nak_lord, hl_pada = lahiri_hora_nakshatra_and_pada(hl_lon)
+
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    positions = {}
+    for planet, pid in PLANET_IDS.items():
+        if planet == 'Ketu':
+            continue
+        pos_data = swe.calc_ut(birth_jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+        lon = pos_data[0] % 360
+        sign, degrees = longitude_to_sign(lon)
+        retrograde = 'R' if pos_data[3] < 0 else ''
+        house = house_of_sign(sign, hl_sign)
+        nak, nak_lord, pada = lahiri_hora_nakshatra_and_pada(lon)
+        positions[planet] = {
+            "degrees": round(degrees, 4), "sign": sign, "retrograde": retrograde,
+            "house": house, "nakshatra": nak, "nakshatra_lord": nak_lord, "pada": pada
+        }
+
+    rahu_lon = positions['Rahu']['degrees'] + (SIGNS.index(positions['Rahu']['sign']) * 30)
+    ketu_lon = (rahu_lon + 180) % 360
+    ketu_sign, ketu_degrees = longitude_to_sign(ketu_lon)
+    ketu_nak, ketu_nak_lord, ketu_pada = lahiri_hora_nakshatra_and_pada(ketu_lon)
+    positions['Ketu'] = {
+        "degrees": round(ketu_degrees, 4), "sign": ketu_sign, "retrograde": "",
+        "house": house_of_sign(ketu_sign, hl_sign),
+        "nakshatra": ketu_nak, "nakshatra_lord": ketu_nak_lord, "pada": ketu_pada
+    }
+
+    response = {
+        "hora_lagna": {
+            "sign": hl_sign, "degrees": round(hl_degrees, 4),
+            "nakshatra": hl_nak, "nakshatra_lord": hl_nak_lord, "pada": hl_pada
+        },
+        "planets": positions
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_hora_lagna', methods=['POST'])
 def lahiri_hora_calculate_hora_lagna_chart():
     try:
@@ -1146,52 +1329,7 @@ def lahiri_hora_calculate_hora_lagna_chart():
         if not data or not all(k in data for k in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        lat = float(data['latitude'])
-        lon = float(data['longitude'])
-        global tz_offset
-        tz_offset = float(data['timezone_offset'])
-
-        birth_jd = lahiri_hora_get_julian_day(birth_date, birth_time, tz_offset)
-        sunrise_jd, sunrise_asc = lahiri_hora_calculate_sunrise_jd_and_asc(birth_jd, lat, lon, tz_offset)
-        hl_lon = lahiri_hora_calculate_hora_lagna(birth_jd, sunrise_jd, sunrise_asc)
-        hl_sign, hl_degrees = lahiri_hora_get_sign_and_degrees(hl_lon)
-        hl_nak, hl_nak_lord, hl_pada = lahiri_hora_nakshatra_and_pada(hl_lon)
-
-        positions = {}
-        for planet, pid in PLANET_IDS.items():
-            if planet == 'Ketu':
-                continue
-            pos_data = swe.calc_ut(birth_jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
-            lon = pos_data[0] % 360
-            sign, degrees = lahiri_hora_get_sign_and_degrees(lon)
-            retrograde = 'R' if pos_data[3] < 0 else ''
-            house = lahiri_hora_calculate_house(sign, hl_sign)
-            nak, nak_lord, pada = lahiri_hora_nakshatra_and_pada(lon)
-            positions[planet] = {
-                "degrees": round(degrees, 4), "sign": sign, "retrograde": retrograde,
-                "house": house, "nakshatra": nak, "nakshatra_lord": nak_lord, "pada": pada
-            }
-
-        rahu_lon = positions['Rahu']['degrees'] + (SIGNS.index(positions['Rahu']['sign']) * 30)
-        ketu_lon = (rahu_lon + 180) % 360
-        ketu_sign, ketu_degrees = lahiri_hora_get_sign_and_degrees(ketu_lon)
-        ketu_nak, ketu_nak_lord, ketu_pada = lahiri_hora_nakshatra_and_pada(ketu_lon)
-        positions['Ketu'] = {
-            "degrees": round(ketu_degrees, 4), "sign": ketu_sign, "retrograde": "",
-            "house": lahiri_hora_calculate_house(ketu_sign, hl_sign),
-            "nakshatra": ketu_nak, "nakshatra_lord": ketu_nak_lord, "pada": ketu_pada
-        }
-
-        response = {
-            "hora_lagna": {
-                "sign": hl_sign, "degrees": round(hl_degrees, 4),
-                "nakshatra": hl_nak, "nakshatra_lord": hl_nak_lord, "pada": hl_pada
-            },
-            "planets": positions
-        }
-        return jsonify(response), 200
+        return jsonify(_hora_lagna_product(data)), 200
 
     except Exception as e:
         logging.error(f"Error in calculation: {str(e)}")
@@ -1457,6 +1595,42 @@ def lo_shu():
 # Vimshottari Mahadasha and Antardashas
 
 
+def _antar_dasha_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_antar_dasha response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Step 1: Convert birth date and time to Julian Day in UT
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+
+    # Step 2: Calculate Moon's sidereal position with Lahiri Ayanamsa
+    moon_longitude = calculate_moon_sidereal_antar_position(jd_birth)
+
+    # Step 3: Determine Nakshatra and ruling planet
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_antar_lord(moon_longitude)
+    if not nakshatra:
+        raise RuntimeError("Unable to determine Nakshatra")
+
+    # Step 4: Calculate remaining Mahadasha time and elapsed time
+    remaining_time, mahadasha_duration, elapsed_time = calculate_dasha_antar_balance(moon_longitude, nakshatra_start, lord)
+
+    # Step 5: Calculate Mahadasha periods with Antardashas
+    mahadasha_periods = calculate_mahadasha_periods(birth_date, remaining_time, lord, elapsed_time)
+
+    # Step 6: Construct response
+    response = {
+        "user_name": user_name,
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": round(moon_longitude, 4),
+        "mahadashas": mahadasha_periods
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_antar_dasha', methods=['POST'])
 def calculate_vimshottari_antar_dasha():
     """
@@ -1484,38 +1658,7 @@ def calculate_vimshottari_antar_dasha():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Step 1: Convert birth date and time to Julian Day in UT
-        jd_birth = get_julian_dasha_day(birth_date, birth_time, tz_offset)
-
-        # Step 2: Calculate Moon's sidereal position with Lahiri Ayanamsa
-        moon_longitude = calculate_moon_sidereal_antar_position(jd_birth)
-
-        # Step 3: Determine Nakshatra and ruling planet
-        nakshatra, lord, nakshatra_start = get_nakshatra_and_antar_lord(moon_longitude)
-        if not nakshatra:
-            return jsonify({"error": "Unable to determine Nakshatra"}), 500
-
-        # Step 4: Calculate remaining Mahadasha time and elapsed time
-        remaining_time, mahadasha_duration, elapsed_time = calculate_dasha_antar_balance(moon_longitude, nakshatra_start, lord)
-
-        # Step 5: Calculate Mahadasha periods with Antardashas
-        mahadasha_periods = calculate_mahadasha_periods(birth_date, remaining_time, lord, elapsed_time)
-
-        # Step 6: Construct response
-        response = {
-            "user_name": user_name,
-            "nakshatra_at_birth": nakshatra,
-            "moon_longitude": round(moon_longitude, 4),
-            "mahadashas": mahadasha_periods
-        }
-        return jsonify(response), 200
+        return jsonify(_antar_dasha_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1526,6 +1669,33 @@ def calculate_vimshottari_antar_dasha():
 
 
 # # Vimshottari Antardasha and Pratyantardashas
+def _pratyantar_dasha_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_maha_antar_pratyantar_dasha response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+    moon_longitude = calculate_moon_praty_sidereal_position(jd_birth)
+    nakshatra, lord, nakshatra_start = get_nakshatra_party_and_lord(moon_longitude)
+    if not nakshatra:
+        raise RuntimeError("Unable to determine Nakshatra")
+
+    remaining_time, mahadasha_duration, elapsed_time = calculate_pratythar_dasha_balance(moon_longitude, nakshatra_start, lord)
+    mahadasha_periods = calculate_Pratythardasha_periods(jd_birth, remaining_time, lord, elapsed_time)
+
+    response = {
+        "user_name": user_name,
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": moon_longitude,
+        "mahadashas": mahadasha_periods
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_maha_antar_pratyantar_dasha', methods=['POST'])
 def calculate_vimshottari_pratyantar_dasha():
     try:
@@ -1537,29 +1707,7 @@ def calculate_vimshottari_pratyantar_dasha():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_birth = get_julian_pratyathar_day(birth_date, birth_time, tz_offset)
-        moon_longitude = calculate_moon_praty_sidereal_position(jd_birth)
-        nakshatra, lord, nakshatra_start = get_nakshatra_party_and_lord(moon_longitude)
-        if not nakshatra:
-            return jsonify({"error": "Unable to determine Nakshatra"}), 500
-
-        remaining_time, mahadasha_duration, elapsed_time = calculate_pratythar_dasha_balance(moon_longitude, nakshatra_start, lord)
-        mahadasha_periods = calculate_Pratythardasha_periods(jd_birth, remaining_time, lord, elapsed_time)
-
-        response = {
-            "user_name": user_name,
-            "nakshatra_at_birth": nakshatra,
-            "moon_longitude": moon_longitude,
-            "mahadashas": mahadasha_periods
-        }
-        return jsonify(response), 200
+        return jsonify(_pratyantar_dasha_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1571,6 +1719,33 @@ def calculate_vimshottari_pratyantar_dasha():
 
 # # Vimshottari Pratyantardasha and Sookshma Dasha
 
+def _sookshma_dasha_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_antar_pratyantar_sookshma_dasha response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+    moon_longitude = calculate_moon_sookshma_sidereal_position(jd_birth)
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_sookshma(moon_longitude)
+    if not nakshatra:
+        raise RuntimeError("Unable to determine Nakshatra")
+
+    remaining_time, mahadasha_duration, elapsed_time = calculate_sookshma_dasha_balance(moon_longitude, nakshatra_start, lord)
+    mahadasha_periods = run_in_pool(calculate_sookshma_dasha_periods, birth_date, remaining_time, lord, elapsed_time)
+
+    response = {
+        "user_name": user_name,
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": round(moon_longitude, 4),
+        "mahadashas": mahadasha_periods
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_antar_pratyantar_sookshma_dasha', methods=['POST'])
 def calculate_vimshottari_sookshma_dasha():
     """
@@ -1598,30 +1773,10 @@ def calculate_vimshottari_sookshma_dasha():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_birth = get_julian_sookshma_day(birth_date, birth_time, tz_offset)
-        moon_longitude = calculate_moon_sookshma_sidereal_position(jd_birth)
-        nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_sookshma(moon_longitude)
-        if not nakshatra:
-            return jsonify({"error": "Unable to determine Nakshatra"}), 500
-
-        remaining_time, mahadasha_duration, elapsed_time = calculate_sookshma_dasha_balance(moon_longitude, nakshatra_start, lord)
-        mahadasha_periods = calculate_sookshma_dasha_periods(birth_date, remaining_time, lord, elapsed_time)
-
-        response = {
-            "user_name": user_name,
-            "nakshatra_at_birth": nakshatra,
-            "moon_longitude": round(moon_longitude, 4),
-            "mahadashas": mahadasha_periods
-        }
-        return jsonify(response), 200
+        return jsonify(_sookshma_dasha_product(data)), 200
 
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
     except Exception as e:
@@ -1631,6 +1786,41 @@ def calculate_vimshottari_sookshma_dasha():
 
 # # Vimshottari Sookshma Dasha and Prana Dasha :
 
+def _prana_dasha_start(data):
+    """Response header and the (jd_birth, lord, elapsed_days) the prana dasha tree starts from."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    tz_offset = float(data['timezone_offset'])
+
+    # Calculate Julian Day for birth
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+
+    # Calculate Moon's sidereal position
+    moon_longitude = calculate_moon_sidereal_position_prana(jd_birth)
+
+    # Determine Nakshatra and lord
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_prana(moon_longitude)
+
+    # Calculate dasha balance
+    remaining_days, mahadasha_duration_days, elapsed_days = calculate_dasha_balance_pran(moon_longitude, nakshatra_start, lord)
+
+    header = {
+        "user_name": data.get('user_name', 'Unknown'),
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": round(moon_longitude, 4)
+    }
+    return header, jd_birth, lord, elapsed_days
+
+
+def _prana_dasha_product(data, snapshot=None, window=None):
+    """Body of the /lahiri/calculate_sookshma_prana_dashas response; ``window`` holds its depth/from/to arguments."""
+    depth, start_jd, end_jd = parse_dasha_window(window or {})
+    header, jd_birth, lord, elapsed_days = _prana_dasha_start(data)
+    mahadasha_periods = run_in_pool(calculate_pranaDasha_periods, jd_birth, lord, elapsed_days,
+                                    depth, start_jd, end_jd)
+    return dict(header, mahadashas=mahadasha_periods)
+
+
 @bp.route('/lahiri/calculate_sookshma_prana_dashas', methods=['POST'])
 def calculate_vimshottari_dasha():
     """API endpoint to calculate Vimshottari Dasha."""
@@ -1640,32 +1830,61 @@ def calculate_vimshottari_dasha():
         if not data or not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
+        if wants_ndjson(request):
+            depth, start_jd, end_jd = parse_dasha_window(request.args)
+            header, jd_birth, lord, elapsed_days = _prana_dasha_start(data)
+            rows = lahiri_prana_dasha_rows(jd_birth, lord, elapsed_days, depth, start_jd, end_jd)
+            return ndjson_response(itertools.chain([header], rows))
+
+        return jsonify(_prana_dasha_product(data, window=request.args)), 200
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
+# Current Dasha at a date
+@bp.route('/lahiri/current_dasha', methods=['POST'])
+def calculate_current_dasha():
+    """
+    API endpoint returning the Maha/Antar/Pratyantar/Sookshma/Pran dashas running at a date.
+
+    Takes the birth fields plus optional "date" ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS', UTC;
+    defaults to now) and "depth" (1-5, default 5).
+    """
+    try:
+        data = request.get_json()
+        required_fields = ['birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
+        if not data or not all(field in data for field in required_fields):
+            return jsonify({"error": "Missing required fields"}), 400
+
         tz_offset = float(data['timezone_offset'])
+        depth = int(data.get('depth', MAX_DEPTH))
+        if not 1 <= depth <= MAX_DEPTH:
+            return jsonify({"error": f"depth must be between 1 and {MAX_DEPTH}"}), 400
+        target_jd = datetime_to_jd(data.get('date'))
 
-        # Calculate Julian Day for birth
-        jd_birth = get_julian_day_pran(birth_date, birth_time, tz_offset)
-        
-        # Calculate Moon's sidereal position
+        jd_birth = get_julian_day(data['birth_date'], data['birth_time'], tz_offset)
         moon_longitude = calculate_moon_sidereal_position_prana(jd_birth)
-        
-        # Determine Nakshatra and lord
         nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_prana(moon_longitude)
-        
-        # Calculate dasha balance
         remaining_days, mahadasha_duration_days, elapsed_days = calculate_dasha_balance_pran(moon_longitude, nakshatra_start, lord)
-        
-        # Calculate all Mahadasha periods
-        mahadasha_periods = calculate_pranaDasha_periods(jd_birth, lord, elapsed_days)
+
+        current_dasha = lahiri_current_dasha(jd_birth, lord, elapsed_days, target_jd, depth)
+        if not current_dasha:
+            return jsonify({"error": "Date is outside the 120-year dasha cycle"}), 400
 
         response = {
             "user_name": data.get('user_name', 'Unknown'),
             "nakshatra_at_birth": nakshatra,
             "moon_longitude": round(moon_longitude, 4),
-            "mahadashas": mahadasha_periods
+            "current_dasha": current_dasha
         }
         return jsonify(response), 200
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1673,6 +1892,39 @@ def calculate_vimshottari_dasha():
 
 # Binnashtakavarga
 
+def _binnashtakavarga_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_binnatakvarga response; the engines read ``snapshot`` when given."""
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid latitude or longitude")
+
+    # Call the calculation function
+    results = lahiri_binnastakavargha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct JSON response
+    response = {
+        "user_name": user_name,
+        "birth_details": {
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone_offset": tz_offset
+        },
+        "planetary_positions": results["planetary_positions"],
+        "ascendant": results["ascendant"],
+        "ashtakvarga": results["ashtakvarga"],
+        "notes": results["notes"]
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_binnatakvarga', methods=['POST'])
 def calculate_lahiri_binnashtakvarga():
     try:
@@ -1684,35 +1936,7 @@ def calculate_lahiri_binnashtakvarga():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-            return jsonify({"error": "Invalid latitude or longitude"}), 400
-
-        # Call the calculation function
-        results = lahiri_binnastakavargha(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct JSON response
-        response = {
-            "user_name": user_name,
-            "birth_details": {
-                "birth_date": birth_date,
-                "birth_time": birth_time,
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone_offset": tz_offset
-            },
-            "planetary_positions": results["planetary_positions"],
-            "ascendant": results["ascendant"],
-            "ashtakvarga": results["ashtakvarga"],
-            "notes": results["notes"]
-        }
-        return jsonify(response), 200
+        return jsonify(_binnashtakavarga_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
@@ -1721,6 +1945,49 @@ def calculate_lahiri_binnashtakvarga():
 
 
 #  Sarvathakavargha 
+def _sarvashtakavarga_product(data, snapshot=None):
+    """Body of the /lahiri/calculate_sarvashtakavarga response; the engines read ``snapshot`` when given."""
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid latitude or longitude")
+
+    # Call the calculation function
+    results = lahiri_sarvathakavargha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct JSON response
+    response = {
+        "user_name": user_name,
+        "birth_details": {
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone_offset": tz_offset
+        },
+        "planetary_positions": results["planetary_positions"],
+        "ascendant": results["ascendant"],
+        "bhinnashtakavarga": results["bhinnashtakavarga"],
+        "sarvashtakavarga": results["sarvashtakavarga"],
+        "notes": {
+            "ayanamsa": "Lahiri",
+            "ayanamsa_value": f"{results['ayanamsa']:.6f}",
+            "chart_type": "Rasi",
+            "house_system": "Whole Sign"
+        },
+        "debug": {
+            "julian_day": results["julian_day"],
+            "ayanamsa": f"{results['ayanamsa']:.6f}"
+        }
+    }
+    return response
+
+
 @bp.route('/lahiri/calculate_sarvashtakavarga', methods=['POST'])
 def calculate_sarvashtakavarga_endpoint():
     """API endpoint to calculate Sarvashtakvarga with matrix table based on birth details."""
@@ -1733,46 +2000,10 @@ def calculate_sarvashtakavarga_endpoint():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-            return jsonify({"error": "Invalid latitude or longitude"}), 400
-
-        # Call the calculation function
-        results = lahiri_sarvathakavargha(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct JSON response
-        response = {
-            "user_name": user_name,
-            "birth_details": {
-                "birth_date": birth_date,
-                "birth_time": birth_time,
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone_offset": tz_offset
-            },
-            "planetary_positions": results["planetary_positions"],
-            "ascendant": results["ascendant"],
-            "bhinnashtakavarga": results["bhinnashtakavarga"],
-            "sarvashtakavarga": results["sarvashtakavarga"],
-            "notes": {
-                "ayanamsa": "Lahiri",
-                "ayanamsa_value": f"{results['ayanamsa']:.6f}",
-                "chart_type": "Rasi",
-                "house_system": "Whole Sign"
-            },
-            "debug": {
-                "julian_day": results["julian_day"],
-                "ayanamsa": f"{results['ayanamsa']:.6f}"
-            }
-        }
-        return jsonify(response), 200
+        return jsonify(_sarvashtakavarga_product(data)), 200
 
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         logging.error(f"Error: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
@@ -1781,44 +2012,96 @@ def calculate_sarvashtakavarga_endpoint():
 
 
 #  Shodamsha Vargha sumary Sings.
+def _shodasha_varga_summary_product(data, snapshot=None):
+    """Body of the /lahiri/shodasha_varga_summary response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    utc_dt = local_to_utc(birth_date, birth_time, timezone_offset)
+    jd = utc_to_jd(utc_dt)
+
+    sid_positions = lahiri_sign_get_sidereal_positions(jd)
+    sid_asc, asc_sign_idx, asc_deg_in_sign = lahiri_sign_get_sidereal_asc(jd, latitude, longitude)
+    sid_positions['Ascendant'] = (sid_asc, asc_sign_idx, asc_deg_in_sign)
+
+    varga_signs = varga_sign_summary(
+        {pname: lon for pname, (lon, _, _) in sid_positions.items()}, 'lahiri', DCHARTS)
+    summary = {pname: {chart: SIGNS[sign_idx] for chart, sign_idx in signs.items()}
+               for pname, signs in varga_signs.items()}
+
+    return {
+        "user_name": user_name,
+        "shodasha_varga_summary": summary
+    }
+
+
 @bp.route('/lahiri/shodasha_varga_summary', methods=['POST'])
 def shodasha_varga_summary():
     try:
         data = request.get_json()
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
-        utc_dt = lahiri_sign_local_to_utc(birth_date, birth_time, timezone_offset)
-        jd = lahiri_sign_julian_day(utc_dt)
-
-        sid_positions = lahiri_sign_get_sidereal_positions(jd)
-        sid_asc, asc_sign_idx, asc_deg_in_sign = lahiri_sign_get_sidereal_asc(jd, latitude, longitude)
-        sid_positions['Ascendant'] = (sid_asc, asc_sign_idx, asc_deg_in_sign)
-
-        summary = {}
-        for pname in list(sid_positions.keys()):
-            summary[pname] = {}
-
-        for chart, _ in DCHARTS:
-            for pname, (lon, sign_idx, deg_in_sign) in sid_positions.items():
-                sign_result = lahiri_sign_varga_sign(
-                    pname,
-                    deg_in_sign,
-                    sign_idx,
-                    chart,
-                    asc=(pname == "Ascendant")
-                )
-                summary[pname][chart] = SIGNS[sign_result]
-
-        return jsonify({
-            "user_name": user_name,
-            "shodasha_varga_summary": summary
-        }), 200
+        return jsonify(_shodasha_varga_summary_product(data)), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+
+
+# Full profile (batch)
+
+# Product name -> endpoint view used by /lahiri/profile.
+PROFILE_PRODUCTS = {
+    'natal': _natal_product,
+    'sun_chart': _sun_chart_product,
+    'moon_chart': _moon_chart_product,
+    'sudarshan_chakra': _sudarshan_chakra_product,
+    'd2': _d2_product,
+    'd3': _d3_product,
+    'd4': _d4_product,
+    'd7': _d7_product,
+    'd9': _d9_product,
+    'd10': _d10_product,
+    'd12': _d12_product,
+    'd16': _d16_product,
+    'd20': _d20_product,
+    'd24': _d24_product,
+    'd27': _d27_product,
+    'd30': _d30_product,
+    'd40': _d40_product,
+    'd45': _d45_product,
+    'd60': _d60_product,
+    'sripathi_bhava': _sripathi_bhava_product,
+    'kp_bhava': _kp_bhava_product,
+    'bhava_lagna': _bhava_lagna_product,
+    'equal_bhava_lagna': _equal_bhava_lagna_product,
+    'arudha_lagna': _arudha_lagna_product,
+    'karkamsha_d1': _karkamsha_d1_product,
+    'karkamsha_d9': _karkamsha_d9_product,
+    'hora_lagna': _hora_lagna_product,
+    'binnashtakavarga': _binnashtakavarga_product,
+    'sarvashtakavarga': _sarvashtakavarga_product,
+    'shodasha_varga_summary': _shodasha_varga_summary_product,
+    'antar_dasha': _antar_dasha_product,
+    'pratyantar_dasha': _pratyantar_dasha_product,
+    'sookshma_dasha': _sookshma_dasha_product,
+    'prana_dasha': _prana_dasha_product,
+}
+
+
+@bp.route('/lahiri/profile', methods=['POST'])
+def lahiri_profile():
+    """
+    API endpoint returning several charts for one birth record in a single response.
+
+    Takes the usual birth fields plus an optional "products" list (keys of PROFILE_PRODUCTS;
+    when omitted, all of them except the sookshma and prana dasha trees, which are only
+    computed on request). Each product is the body its own /lahiri endpoint returns.
+    """
+    try:
+        return profile_response(PROFILE_PRODUCTS, 'lahiri', 'Lahiri')
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
@@ -0,0 +1,94 @@
+"""
+Load the route blueprints, and the engine modules behind them, on first use.
+
+Importing the three blueprint modules pulls in over a hundred engine modules, and a worker
+pays for all of them before it can answer its first health check. ``LazyBlueprints`` wraps
+the app's WSGI callable instead: every blueprint owns one URL prefix (/lahiri, /kp,
+/raman), and the first request under a prefix imports its module and builds a small Flask
+app holding just that blueprint, configured like the main one. Later requests go straight
+to it. Paths outside every prefix (e.g. the index route) are served by the main app.
+
+``load_all`` imports everything up front, e.g. before forking workers.
+``python -m astro_engine.engine.routes.LazyBlueprints`` prints the import time of every
+blueprint and of the slowest engine modules below it.
+"""
+import importlib
+import logging
+import subprocess
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LazyBlueprints:
+    """WSGI middleware dispatching URL prefixes to blueprints loaded on first request."""
+
+    def __init__(self, wsgi_app, blueprints, make_app):
+        """
+        ``blueprints`` maps a URL prefix to ``(module name, blueprint attribute)``;
+        ``make_app(blueprint)`` returns a Flask app serving that blueprint.
+        """
+        self.wsgi_app = wsgi_app
+        self.blueprints = blueprints
+        self.make_app = make_app
+        self.apps = {}
+        self._lock = threading.Lock()
+
+    def prefix_for(self, path):
+        for prefix in self.blueprints:
+            if path == prefix or path.startswith(prefix + '/'):
+                return prefix
+        return None
+
+    def load(self, prefix):
+        """The app serving ``prefix``, importing its blueprint module if needed."""
+        app = self.apps.get(prefix)
+        if app is None:
+            with self._lock:
+                app = self.apps.get(prefix)
+                if app is None:
+                    module_name, attribute = self.blueprints[prefix]
+                    started = time.perf_counter()
+                    module = importlib.import_module(module_name)
+                    app = self.apps[prefix] = self.make_app(getattr(module, attribute))
+                    logger.info("Loaded %s routes from %s in %.0f ms", prefix, module_name,
+                                (time.perf_counter() - started) * 1000)
+        return app
+
+    def load_all(self):
+        for prefix in self.blueprints:
+            self.load(prefix)
+
+    def __call__(self, environ, start_response):
+        prefix = self.prefix_for(environ.get('PATH_INFO', ''))
+        if prefix is None:
+            return self.wsgi_app(environ, start_response)
+        return self.load(prefix)(environ, start_response)
+
+
+def import_times(module_name):
+    """
+    ``[(module, cumulative microseconds)]`` for ``module_name`` and the astro_engine
+    modules it imports, measured with ``-X importtime`` in a fresh interpreter.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                            capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip().startswith('astro_engine.'):
+            times.append((parts[2].strip(), int(parts[1])))
+    return times
+
+
+if __name__ == '__main__':
+    from astro_engine.app import BLUEPRINTS
+
+    for prefix, (module_name, _) in BLUEPRINTS.items():
+        times = dict(import_times(module_name))
+        print(f"{prefix:8} {module_name}: {times.get(module_name, 0) / 1000:.1f} ms")
+        slowest = sorted(times.items(), key=lambda item: -item[1])
+        for name, micros in [item for item in slowest if item[0] != module_name][:10]:
+            print(f"{'':8} {name}: {micros / 1000:.1f} ms")
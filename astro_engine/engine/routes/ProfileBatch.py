@@ -0,0 +1,82 @@
+"""
+Full-profile batch endpoint support shared by the Lahiri and Raman blueprints.
+
+Opening a saved profile in the app used to fire one request per chart. A profile request
+carries the birth record once plus the list of products wanted and is answered in one
+response: the chart snapshot for the birth data is computed up front and handed to each
+product function, which returns the same body its own endpoint serves. Products are plain
+function calls collected into one dict; nothing is replayed through Flask or re-parsed.
+"""
+from flask import jsonify, request
+
+from astro_engine.engine.core.ChartSnapshot import ChartSnapshot
+from astro_engine.engine.core.ProcessPool import PoolSaturated
+
+PROFILE_REQUIRED_FIELDS = ['birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
+
+# The full sookshma and prana trees run to megabytes and seconds of work per chart, so a
+# profile only includes them when they are named in "products".
+ON_REQUEST_PRODUCTS = {'sookshma_dasha', 'prana_dasha'}
+
+
+def default_products(catalogue):
+    """Products returned when the request does not name any."""
+    return [name for name in catalogue if name not in ON_REQUEST_PRODUCTS]
+
+
+def profile_response(catalogue, ayanamsa, ayanamsa_label):
+    """
+    Handle a profile request for one blueprint.
+
+    ``catalogue`` maps product names (e.g. 'natal', 'd9', 'kp_bhava') to functions taking
+    ``(birth_data, snapshot)`` and returning the body of the matching endpoint. Products are
+    taken from the optional ``products`` list in the payload and default to
+    ``default_products(catalogue)``. A failing product is reported under ``errors`` with the
+    status its endpoint would answer with and does not fail the others.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "No JSON data provided"}), 400
+
+    if not all(field in data for field in PROFILE_REQUIRED_FIELDS):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    requested = data.get('products') or default_products(catalogue)
+    if not isinstance(requested, list):
+        return jsonify({"error": "products must be a list of product names"}), 400
+    unknown = [name for name in requested if name not in catalogue]
+    if unknown:
+        return jsonify({"error": f"Unknown products: {', '.join(map(str, unknown))}",
+                        "available_products": list(catalogue)}), 400
+
+    try:
+        latitude = float(data['latitude'])
+        longitude = float(data['longitude'])
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+            return jsonify({"error": "Invalid latitude or longitude"}), 400
+        # Positions and houses once; every product reads them from this snapshot.
+        snapshot = ChartSnapshot.from_birth_data(data, ayanamsa)
+    except (TypeError, ValueError) as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+
+    birth_data = {'user_name': 'Unknown'}
+    birth_data.update((key, value) for key, value in data.items() if key != 'products')
+    products = {}
+    errors = {}
+    for name in dict.fromkeys(requested):
+        try:
+            # Each product gets its own copy: some endpoints echo the payload back.
+            products[name] = catalogue[name](dict(birth_data), snapshot)
+        except PoolSaturated as e:
+            errors[name] = {"status": 503, "error": str(e), "retry_after": e.retry_after}
+        except (KeyError, ValueError) as e:
+            errors[name] = {"status": 400, "error": f"Invalid input: {str(e)}"}
+        except Exception as e:
+            errors[name] = {"status": 500, "error": f"An error occurred: {str(e)}"}
+
+    return jsonify({
+        "user_name": birth_data['user_name'],
+        "ayanamsa": ayanamsa_label,
+        "products": products,
+        "errors": errors,
+    }), 200
@@ -1,15 +1,21 @@
 
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+import itertools
 import logging
 from venv import logger
-import swisseph as swe
-swe.set_ephe_path('astro_api/ephe')
+from astro_engine.engine.core import swe
+from astro_engine.engine.routes.ProfileBatch import profile_response
+from astro_engine.engine.routes.Streaming import ndjson_response, wants_ndjson
+from astro_engine.engine.core.SiderealKernel import SIGNS, format_dms, get_julian_day, house_of_sign, local_to_utc, longitude_to_sign, sign_of, utc_to_jd
 
 from astro_engine.engine.lagnaCharts.RamanHoraLagna import raman_hora_calculate_chart
-from astro_engine.engine.lagnaCharts.RamanBavaLagna import PLANET_IDS, raman_bava_calculate_bhava_lagna, raman_bava_calculate_house, raman_bava_calculate_sunrise, raman_bava_get_julian_day, raman_bava_get_sign_and_degrees, raman_bava_nakshatra_and_pada
-from astro_engine.engine.ashatakavargha.RamanVarghaSigns import CHARTS, SIGNS, raman_sign_get_sidereal_asc, raman_sign_get_sidereal_positions, raman_sign_julian_day, raman_sign_local_to_utc, raman_sign_varga_sign
-from astro_engine.engine.ramanDivisionals.TrimshamshaD30 import raman_d30_assign_houses, raman_d30_calculate_sidereal_longitudes, raman_d30_format_degree, raman_d30_get_d30_sign_and_degree, raman_d30_get_julian_day, raman_d30_get_nakshatra_and_pada
+from astro_engine.engine.lagnaCharts.RamanBavaLagna import PLANET_IDS, raman_bava_calculate_bhava_lagna, raman_bava_calculate_sunrise, raman_bava_nakshatra_and_pada
+from astro_engine.engine.ashatakavargha.RamanVarghaSigns import raman_sign_get_sidereal_asc, raman_sign_get_sidereal_positions
+from astro_engine.engine.core.Vargas import varga_sign_summary
+from astro_engine.engine.core.ProcessPool import PoolSaturated, run_in_pool
+from astro_engine.engine.core.DashaTree import MAX_DEPTH, datetime_to_jd, parse_dasha_window
+from astro_engine.engine.ramanDivisionals.TrimshamshaD30 import raman_d30_assign_houses, raman_d30_calculate_sidereal_longitudes, raman_d30_get_d30_sign_and_degree, raman_d30_get_nakshatra_and_pada
 
 
 
@@ -18,11 +24,11 @@ from astro_engine.engine.ramanDivisionals.TrimshamshaD30 import raman_d30_assign
 
 from astro_engine.engine.ashatakavargha.RamanBinnastakvargha import raman_binnastakavargha
 from astro_engine.engine.ashatakavargha.RamanSarvastakavargha import raman_sarvathakavargha
-from astro_engine.engine.dashas.RamanAntarDasha import calculate_dasha_balance_raman_antar, calculate_mahadasha_periods_antar_raman, calculate_moon_sidereal_position_raman_antar, get_julian_day_antar_raman, get_nakshatra_and_lord_raman_antar
-from astro_engine.engine.dashas.RamanPranDasha import calculate_dasha_balance_pran_raman, calculate_moon_sidereal_position_pran_raman, calculate_pran_raman_periods, get_julian_day_pran_raman, get_nakshatra_and_lord_pran_raman
-from astro_engine.engine.dashas.RamanPratyantardashas import calculate_dasha_balance_prataythar_raman, calculate_moon_sidereal_position_prataythar_raman, calculate_prataythar_raman_periods, get_julian_day_prataythar_raman, get_nakshatra_and_lord_prataythar_raman
-from astro_engine.engine.dashas.RamanSookshmaDasha import calculate_moon_sidereal_sookshma_raman, calculate_sookshma_dasha_balance_raman, calculate_sookshma_raman_periods, get_julian_day_sookshma_raman, get_nakshatra_and_lord_soo_raman
-from astro_engine.engine.divisionalCharts.DreshkanaD3 import PLANET_NAMES, get_julian_day
+from astro_engine.engine.dashas.RamanAntarDasha import calculate_dasha_balance_raman_antar, calculate_mahadasha_periods_antar_raman, calculate_moon_sidereal_position_raman_antar, get_nakshatra_and_lord_raman_antar
+from astro_engine.engine.dashas.RamanPranDasha import calculate_dasha_balance_pran_raman, calculate_moon_sidereal_position_pran_raman, calculate_pran_raman_periods, get_nakshatra_and_lord_pran_raman, raman_current_dasha, raman_pran_dasha_rows
+from astro_engine.engine.dashas.RamanPratyantardashas import calculate_dasha_balance_prataythar_raman, calculate_moon_sidereal_position_prataythar_raman, calculate_prataythar_raman_periods, get_nakshatra_and_lord_prataythar_raman
+from astro_engine.engine.dashas.RamanSookshmaDasha import calculate_moon_sidereal_sookshma_raman, calculate_sookshma_dasha_balance_raman, calculate_sookshma_raman_periods, get_nakshatra_and_lord_soo_raman
+from astro_engine.engine.divisionalCharts.DreshkanaD3 import PLANET_NAMES
 from astro_engine.engine.lagnaCharts.MoonRaman import raman_moon_chart, validate_input
 from astro_engine.engine.lagnaCharts.RamanArudha import raman_arudha_lagna
     
@@ -33,8 +39,7 @@ from astro_engine.engine.lagnaCharts.RamanKpLagna import raman_kp_bava
 from astro_engine.engine.lagnaCharts.RamanSripathi import raman_sripathi_bava
 from astro_engine.engine.lagnaCharts.SunRaman import  raman_sun_chart, validate_input_sun
 from astro_engine.engine.natalCharts.RamanChakara import raman_sudarshan_chakra
-from astro_engine.engine.natalCharts.RamanNatal import raman_natal, format_dms
-from astro_engine.engine.natalCharts.natal import longitude_to_sign
+from astro_engine.engine.natalCharts.RamanNatal import raman_natal
 from astro_engine.engine.ramanDivisionals.AkshavedamshaD45 import raman_Akshavedamsha_D45
 from astro_engine.engine.ramanDivisionals.ChaturthamshaD4 import raman_Chaturthamsha_D4
 from astro_engine.engine.ramanDivisionals.ChaturvimshamshaD24 import raman_Chaturvimshamsha_D24
@@ -45,7 +50,7 @@ from astro_engine.engine.ramanDivisionals.HoraD2 import raman_hora_chart
 from astro_engine.engine.ramanDivisionals.KhavedamshaD40 import raman_Khavedamsha_D40
 from astro_engine.engine.ramanDivisionals.NavamsaD9 import raman_navamsa_D9
 from astro_engine.engine.ramanDivisionals.SaptamshaD7 import raman_saptamsha
-from astro_engine.engine.ramanDivisionals.SaptavimshamshaD27 import PLANET_CODES, ZODIAC_SIGNS_raman, raman_d27_calculate_ascendant, raman_d27_calculate_d27_longitude, raman_d27_calculate_house, raman_d27_calculate_sidereal_longitude, raman_d27_get_julian_day_utc, raman_d27_get_nakshatra_pada, raman_d27_get_sign_index
+from astro_engine.engine.ramanDivisionals.SaptavimshamshaD27 import PLANET_CODES, ZODIAC_SIGNS_raman, raman_d27_calculate_ascendant, raman_d27_calculate_d27_longitude, raman_d27_calculate_house, raman_d27_calculate_sidereal_longitude, raman_d27_get_nakshatra_pada
 from astro_engine.engine.ramanDivisionals.ShashtiamshaD60 import raman_Shashtiamsha_D60
 from astro_engine.engine.ramanDivisionals.ShodashamshaD16 import raman_Shodashamsha_D16
 from astro_engine.engine.ramanDivisionals.VimshamshaD20 import raman_Vimshamsha_D20
@@ -58,6 +63,63 @@ rl = Blueprint('rl_routes', __name__)
 
 
 #   Natal Chart 
+def _natal_product(birth_data, snapshot=None):
+    """Body of the /raman/natal response; the engines read ``snapshot`` when given."""
+    # Calculate chart data
+    chart_data = raman_natal(birth_data, snapshot=snapshot)
+
+    # Format planetary positions
+    planetary_positions_json = {}
+    for planet, data in chart_data['planet_positions'].items():
+        sign, sign_deg = longitude_to_sign(data['lon'])
+        dms = format_dms(sign_deg)
+        house = chart_data['planet_houses'][planet]
+        planetary_positions_json[planet] = {
+            "sign": sign,
+            "degrees": dms,
+            "retrograde": data['retro'],
+            "house": house,
+            "nakshatra": data['nakshatra'],
+            "pada": data['pada']
+        }
+
+    # Format ascendant
+    asc_sign, asc_deg = longitude_to_sign(chart_data['ascendant']['lon'])
+    asc_dms = format_dms(asc_deg)
+    ascendant_json = {
+        "sign": asc_sign,
+        "degrees": asc_dms,
+        "nakshatra": chart_data['ascendant']['nakshatra'],
+        "pada": chart_data['ascendant']['pada']
+    }
+
+    # Format house signs
+    house_signs_json = {f"House {i+1}": {"sign": house["sign"], "start_longitude": format_dms(house["start_longitude"])}
+                       for i, house in enumerate(chart_data['house_signs'])}
+
+    # Construct response
+    response = {
+        "user_name": birth_data['user_name'],
+        "birth_details": {
+            "birth_date": birth_data['birth_date'],
+            "birth_time": birth_data['birth_time'],
+            "latitude": float(birth_data['latitude']),
+            "longitude": float(birth_data['longitude']),
+            "timezone_offset": float(birth_data['timezone_offset'])
+        },
+        "planetary_positions": planetary_positions_json,
+        "ascendant": ascendant_json,
+        # "house_signs": house_signs_json,
+        "notes": {
+            "ayanamsa": "Lahiri",
+            "ayanamsa_value": f"{chart_data['ayanamsa_value']:.6f}",
+            "chart_type": "Rasi",
+            "house_system": "Whole Sign"
+        }
+    }
+    return response
+
+
 @rl.route('/raman/natal', methods=['POST'])
 def natal_chart():
     try:
@@ -74,59 +136,7 @@ def natal_chart():
         if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
             return jsonify({"error": "Invalid latitude or longitude"}), 400
 
-        # Calculate chart data
-        chart_data = raman_natal(birth_data)
-
-        # Format planetary positions
-        planetary_positions_json = {}
-        for planet, data in chart_data['planet_positions'].items():
-            sign, sign_deg = longitude_to_sign(data['lon'])
-            dms = format_dms(sign_deg)
-            house = chart_data['planet_houses'][planet]
-            planetary_positions_json[planet] = {
-                "sign": sign,
-                "degrees": dms,
-                "retrograde": data['retro'],
-                "house": house,
-                "nakshatra": data['nakshatra'],
-                "pada": data['pada']
-            }
-
-        # Format ascendant
-        asc_sign, asc_deg = longitude_to_sign(chart_data['ascendant']['lon'])
-        asc_dms = format_dms(asc_deg)
-        ascendant_json = {
-            "sign": asc_sign,
-            "degrees": asc_dms,
-            "nakshatra": chart_data['ascendant']['nakshatra'],
-            "pada": chart_data['ascendant']['pada']
-        }
-
-        # Format house signs
-        house_signs_json = {f"House {i+1}": {"sign": house["sign"], "start_longitude": format_dms(house["start_longitude"])}
-                           for i, house in enumerate(chart_data['house_signs'])}
-
-        # Construct response
-        response = {
-            "user_name": birth_data['user_name'],
-            "birth_details": {
-                "birth_date": birth_data['birth_date'],
-                "birth_time": birth_data['birth_time'],
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone_offset": float(birth_data['timezone_offset'])
-            },
-            "planetary_positions": planetary_positions_json,
-            "ascendant": ascendant_json,
-            # "house_signs": house_signs_json,
-            "notes": {
-                "ayanamsa": "Lahiri",
-                "ayanamsa_value": f"{chart_data['ayanamsa_value']:.6f}",
-                "chart_type": "Rasi",
-                "house_system": "Whole Sign"
-            }
-        }
-        return jsonify(response)
+        return jsonify(_natal_product(birth_data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -139,6 +149,11 @@ def natal_chart():
 
 
 #  Moon Chart 
+def _moon_chart_product(data, snapshot=None):
+    """Body of the /raman/calculate_moon_chart response; the engines read ``snapshot`` when given."""
+    return raman_moon_chart(data, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_moon_chart', methods=['POST'])
 def calculate_moon_chart():
     """
@@ -152,9 +167,7 @@ def calculate_moon_chart():
         
         validate_input(data)
         
-        # Call the calculation function
-        response = raman_moon_chart(data)
-        return jsonify(response), 200
+        return jsonify(_moon_chart_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -165,6 +178,11 @@ def calculate_moon_chart():
 
 
 # Sun Chart :
+def _sun_chart_product(data, snapshot=None):
+    """Body of the /raman/calculate_sun_chart response; the engines read ``snapshot`` when given."""
+    return raman_sun_chart(data, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_sun_chart', methods=['POST'])
 def calculate_sun_chart():
     """
@@ -178,9 +196,7 @@ def calculate_sun_chart():
         
         validate_input_sun(data)
         
-        # Call the calculation function
-        response = raman_sun_chart(data)
-        return jsonify(response), 200
+        return jsonify(_sun_chart_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -191,6 +207,19 @@ def calculate_sun_chart():
 
 
 # Sudharasha Chakara 
+def _sudarshan_chakra_product(data, snapshot=None):
+    """Body of the /raman/calculate_sudarshan_chakra response; the engines read ``snapshot`` when given."""
+    # Extract input
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    return raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_sudarshan_chakra', methods=['POST'])
 def calculate_sudarshan_chakra():
     """
@@ -205,23 +234,13 @@ def calculate_sudarshan_chakra():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        # Extract and validate input
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
         # Basic validation for latitude and longitude
-        if not (-90 <= latitude <= 90):
+        if not (-90 <= float(data['latitude']) <= 90):
             return jsonify({"error": "Latitude must be between -90 and 90 degrees"}), 400
-        if not (-180 <= longitude <= 180):
+        if not (-180 <= float(data['longitude']) <= 180):
             return jsonify({"error": "Longitude must be between -180 and 180 degrees"}), 400
 
-        # Call the calculation function
-        result = raman_sudarshan_chakra(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(result), 200
+        return jsonify(_sudarshan_chakra_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -239,6 +258,30 @@ def calculate_sudarshan_chakra():
 
 
 #  Hora D2 :
+def _d2_product(data, snapshot=None):
+    """Body of the /raman/calculate_d2_hora response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    result = raman_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+    response = {
+        'user_name': user_name,
+        'd2_hora_chart': result,
+        'metadata': {
+            'ayanamsa': 'Raman',
+            'house_system': 'Whole Sign',
+            'calculation_time': datetime.utcnow().isoformat(),
+            'input': data
+        }
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d2_hora', methods=['POST'])
 def calculate_d2_hora():
     """API endpoint to calculate the D2 Hora chart."""
@@ -251,26 +294,7 @@ def calculate_d2_hora():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = raman_hora_chart(birth_date, birth_time, latitude, longitude, tz_offset)
-        response = {
-            'user_name': user_name,
-            'd2_hora_chart': result,
-            'metadata': {
-                'ayanamsa': 'Raman',
-                'house_system': 'Whole Sign',
-                'calculation_time': datetime.utcnow().isoformat(),
-                'input': data
-            }
-        }
-        return jsonify(response), 200
+        return jsonify(_d2_product(data)), 200
 
     except Exception as e:
         return jsonify({"error": f"Calculation error: {str(e)}"}), 500
@@ -279,6 +303,24 @@ def calculate_d2_hora():
 
 
 # Dreshkana D3
+def _d3_product(data, snapshot=None):
+    """Body of the /raman/calculate_d3_chart response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    d3_data = raman_drekshakana(jd, latitude, longitude, snapshot=snapshot)
+
+    response = {
+        "ascendant": d3_data['Ascendant'],
+        "planets": {planet: d3_data[planet] for planet in PLANET_NAMES}
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d3_chart', methods=['POST'])
 def calculate_d3_chart_endpoint():
     """API endpoint to calculate D3 chart with retrograde, nakshatra, and pada."""
@@ -291,20 +333,7 @@ def calculate_d3_chart_endpoint():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd = get_julian_day(birth_date, birth_time, tz_offset)
-        d3_data = raman_drekshakana(jd, latitude, longitude)
-
-        response = {
-            "ascendant": d3_data['Ascendant'],
-            "planets": {planet: d3_data[planet] for planet in PLANET_NAMES}
-        }
-        return jsonify(response), 200
+        return jsonify(_d3_product(data)), 200
 
     except Exception as e:
         logger.error(f"Error in D3 chart calculation: {str(e)}")
@@ -315,6 +344,19 @@ def calculate_d3_chart_endpoint():
 
 
 #  Chaturthamsha-D4
+def _d4_product(data, snapshot=None):
+    """Body of the /raman/calculate_d4 response; the engines read ``snapshot`` when given."""
+    # Parse inputs
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+
+    # Calculate D4 chart
+    return raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d4', methods=['POST'])
 def calculate_d4():
     """API endpoint to calculate the Chaturthamsha (D4) chart."""
@@ -329,16 +371,7 @@ def calculate_d4():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        # Parse inputs
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-
-        # Calculate D4 chart
-        result = raman_Chaturthamsha_D4(birth_date, birth_time, latitude, longitude, timezone_offset)
-        return jsonify(result)
+        return jsonify(_d4_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -348,6 +381,26 @@ def calculate_d4():
 
 
 # Saptamsha D7 
+def _d7_product(data, snapshot=None):
+    """Body of the /raman/calculate_d7_chart response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Calculate Julian Day and D7 chart
+    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    d7_data = raman_saptamsha(jd, latitude, longitude, snapshot=snapshot)
+
+    # Prepare response
+    response = {
+        "ascendant": d7_data['Ascendant'],
+        "planets": {planet: d7_data[planet] for planet in PLANET_NAMES}
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d7_chart', methods=['POST'])
 def calculate_d7_chart_endpoint():
     """API endpoint to calculate D7 chart from birth details."""
@@ -361,22 +414,7 @@ def calculate_d7_chart_endpoint():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Calculate Julian Day and D7 chart
-        jd = get_julian_day(birth_date, birth_time, tz_offset)
-        d7_data = raman_saptamsha(jd, latitude, longitude)
-
-        # Prepare response
-        response = {
-            "ascendant": d7_data['Ascendant'],
-            "planets": {planet: d7_data[planet] for planet in PLANET_NAMES}
-        }
-        return jsonify(response), 200
+        return jsonify(_d7_product(data)), 200
 
     except Exception as e:
         logger.error(f"Error in D7 calculation: {str(e)}")
@@ -384,6 +422,18 @@ def calculate_d7_chart_endpoint():
 
 
 #  Navamsa D9
+def _d9_product(data, snapshot=None):
+    """Body of the /raman/navamsha_d9 response; the engines read ``snapshot`` when given."""
+    # Parse input data
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+
+    return raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/navamsha_d9', methods=['POST'])
 def navamsa_chart():
     try:
@@ -397,16 +447,7 @@ def navamsa_chart():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        # Parse input data
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = raman_navamsa_D9(birth_date, birth_time, latitude, longitude, timezone_offset)
-        return jsonify(result)
+        return jsonify(_d9_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -418,6 +459,18 @@ def navamsa_chart():
 
 
 # Dashamsha D10
+def _d10_product(data, snapshot=None):
+    """Body of the /raman/calculate_d10 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+
+    # Calculate D10 chart
+    return raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d10', methods=['POST'])
 def calculate_d10():
     """
@@ -442,15 +495,7 @@ def calculate_d10():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-
-        # Calculate D10 chart
-        result = raman_Dashamsha_D10(birth_date, birth_time, latitude, longitude, timezone_offset)
-        return jsonify(result)
+        return jsonify(_d10_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -462,6 +507,19 @@ def calculate_d10():
 
 # Dwadashamsha D12
 
+def _d12_product(data, snapshot=None):
+    """Body of the /raman/calculate_d12 response; the engines read ``snapshot`` when given."""
+    # Extract inputs
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+
+    # Calculate D12 chart using the function from calculations.py
+    return raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d12', methods=['POST'])
 def calculate_d12():
     """
@@ -488,16 +546,7 @@ def calculate_d12():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        # Extract inputs
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-
-        # Calculate D12 chart using the function from calculations.py
-        result = raman_Dwadashamsha_D12(birth_date, birth_time, latitude, longitude, timezone_offset)
-        return jsonify(result)
+        return jsonify(_d12_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -506,6 +555,21 @@ def calculate_d12():
 
 
 #  Shodashamsha D16
+def _d16_product(data, snapshot=None):
+    """Body of the /raman/calculate_d16 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    enforce_opposition = data.get('enforce_opposition', False)
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180) or not (-12 <= tz_offset <= 14):
+        raise ValueError("Invalid geographic or timezone data")
+
+    return raman_Shodashamsha_D16(birth_date, birth_time, latitude, longitude, tz_offset, enforce_opposition, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d16', methods=['POST'])
 def calculate_d16():
     try:
@@ -517,18 +581,7 @@ def calculate_d16():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        enforce_opposition = data.get('enforce_opposition', False)
-
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180) or not (-12 <= tz_offset <= 14):
-            return jsonify({"error": "Invalid geographic or timezone data"}), 400
-
-        result = raman_Shodashamsha_D16(birth_date, birth_time, latitude, longitude, tz_offset, enforce_opposition)
-        return jsonify(result)
+        return jsonify(_d16_product(data))
 
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
@@ -538,6 +591,17 @@ def calculate_d16():
 
 
 #  Vimshamsha D20
+def _d20_product(data, snapshot=None):
+    """Body of the /raman/calculate_d20 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d20', methods=['POST'])
 def calculate_d20():
     """
@@ -565,15 +629,7 @@ def calculate_d20():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = raman_Vimshamsha_D20(birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(result)
+        return jsonify(_d20_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -584,6 +640,16 @@ def calculate_d20():
 
 #  Chaturvimshamsha D24
 
+def _d24_product(data, snapshot=None):
+    """Body of the /raman/calculate_d24 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    return raman_Chaturvimshamsha_D24(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d24', methods=['POST'])
 def calculate_d24():
     """API endpoint to calculate D24 chart."""
@@ -591,19 +657,98 @@ def calculate_d24():
         data = request.get_json()
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        result = raman_Chaturvimshamsha_D24(birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(result)
+        return jsonify(_d24_product(data))
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
 
 
 
 #  Saptavimshamsha D27
+def _d27_product(data, snapshot=None):
+    """Body of the /raman/calculate_d27_chart response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd_utc = get_julian_day(birth_date, birth_time, tz_offset)
+    natal_asc_lon = raman_d27_calculate_ascendant(jd_utc, latitude, longitude)
+    d27_asc_lon = raman_d27_calculate_d27_longitude(natal_asc_lon)
+    d27_asc_sign_index = sign_of(d27_asc_lon)
+    d27_asc_deg = d27_asc_lon % 30
+
+    natal_planet_lons = {}
+    natal_planet_retro = {}
+
+    # Rahu/Ketu
+    natal_rahu_lon, _ = raman_d27_calculate_sidereal_longitude(jd_utc, swe.MEAN_NODE)
+    natal_ketu_lon = (natal_rahu_lon + 180) % 360
+    natal_planet_lons["Rahu"] = natal_rahu_lon
+    natal_planet_lons["Ketu"] = natal_ketu_lon
+    natal_planet_retro["Rahu"] = True
+    natal_planet_retro["Ketu"] = True
+
+    for planet, code in PLANET_CODES.items():
+        if planet == "Rahu":
+            continue  # Already handled
+        lon, retro = raman_d27_calculate_sidereal_longitude(jd_utc, code)
+        natal_planet_lons[planet] = lon
+        natal_planet_retro[planet] = retro
+
+    d27_chart = {}
+
+    # Ascendant
+    asc_nak, asc_lord, asc_pada = raman_d27_get_nakshatra_pada(d27_asc_lon)
+    natal_asc_nak, natal_asc_lord, natal_asc_pada = raman_d27_get_nakshatra_pada(natal_asc_lon)
+    d27_chart["Ascendant"] = {
+        "d27_sign": ZODIAC_SIGNS_raman[d27_asc_sign_index],
+        "degrees": round(d27_asc_deg, 4),
+        "house": 1,
+        "d27_nakshatra": asc_nak,
+        "d27_nakshatra_lord": asc_lord,
+        "d27_pada": asc_pada,
+        # "natal_sign": ZODIAC_SIGNS_raman[raman_d27_get_sign_index(natal_asc_lon)],
+        # "natal_nakshatra": natal_asc_nak,
+        # "natal_nakshatra_lord": natal_asc_lord,
+        # "natal_pada": natal_asc_pada,
+        "retrograde": False
+    }
+
+    for planet in list(PLANET_CODES.keys()) + ["Ketu"]:
+        natal_lon = natal_planet_lons[planet]
+        d27_lon = raman_d27_calculate_d27_longitude(natal_lon)
+        d27_sign_index = sign_of(d27_lon)
+        d27_deg = d27_lon % 30
+        house = raman_d27_calculate_house(d27_asc_sign_index, d27_sign_index)
+        natal_sign = ZODIAC_SIGNS_raman[sign_of(natal_lon)]
+        retro = natal_planet_retro[planet]
+
+        d27_nakshatra, d27_nak_lord, d27_pada = raman_d27_get_nakshatra_pada(d27_lon)
+        natal_nakshatra, natal_nak_lord, natal_pada = raman_d27_get_nakshatra_pada(natal_lon)
+
+        d27_chart[planet] = {
+            "d27_sign": ZODIAC_SIGNS_raman[d27_sign_index],
+            "degrees": round(d27_deg, 4),
+            "house": house,
+            "d27_nakshatra": d27_nakshatra,
+            "d27_nakshatra_lord": d27_nak_lord,
+            "d27_pada": d27_pada,
+            # "natal_sign": natal_sign,
+            # "natal_nakshatra": natal_nakshatra,
+            # "natal_nakshatra_lord": natal_nak_lord,
+            # "natal_pada": natal_pada,
+            "retrograde": retro
+        }
+
+    response = {
+        "user_name": user_name,
+        "d27_chart": d27_chart
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d27_chart', methods=['POST'])
 def calculate_d27_chart():
     try:
@@ -613,87 +758,7 @@ def calculate_d27_chart():
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_utc = raman_d27_get_julian_day_utc(birth_date, birth_time, tz_offset)
-        natal_asc_lon = raman_d27_calculate_ascendant(jd_utc, latitude, longitude)
-        d27_asc_lon = raman_d27_calculate_d27_longitude(natal_asc_lon)
-        d27_asc_sign_index = raman_d27_get_sign_index(d27_asc_lon)
-        d27_asc_deg = d27_asc_lon % 30
-
-        natal_planet_lons = {}
-        natal_planet_retro = {}
-
-        # Rahu/Ketu
-        natal_rahu_lon, _ = raman_d27_calculate_sidereal_longitude(jd_utc, swe.MEAN_NODE)
-        natal_ketu_lon = (natal_rahu_lon + 180) % 360
-        natal_planet_lons["Rahu"] = natal_rahu_lon
-        natal_planet_lons["Ketu"] = natal_ketu_lon
-        natal_planet_retro["Rahu"] = True
-        natal_planet_retro["Ketu"] = True
-
-        for planet, code in PLANET_CODES.items():
-            if planet == "Rahu":
-                continue  # Already handled
-            lon, retro = raman_d27_calculate_sidereal_longitude(jd_utc, code)
-            natal_planet_lons[planet] = lon
-            natal_planet_retro[planet] = retro
-
-        d27_chart = {}
-
-        # Ascendant
-        asc_nak, asc_lord, asc_pada = raman_d27_get_nakshatra_pada(d27_asc_lon)
-        natal_asc_nak, natal_asc_lord, natal_asc_pada = raman_d27_get_nakshatra_pada(natal_asc_lon)
-        d27_chart["Ascendant"] = {
-            "d27_sign": ZODIAC_SIGNS_raman[d27_asc_sign_index],
-            "degrees": round(d27_asc_deg, 4),
-            "house": 1,
-            "d27_nakshatra": asc_nak,
-            "d27_nakshatra_lord": asc_lord,
-            "d27_pada": asc_pada,
-            # "natal_sign": ZODIAC_SIGNS_raman[raman_d27_get_sign_index(natal_asc_lon)],
-            # "natal_nakshatra": natal_asc_nak,
-            # "natal_nakshatra_lord": natal_asc_lord,
-            # "natal_pada": natal_asc_pada,
-            "retrograde": False
-        }
-
-        for planet in list(PLANET_CODES.keys()) + ["Ketu"]:
-            natal_lon = natal_planet_lons[planet]
-            d27_lon = raman_d27_calculate_d27_longitude(natal_lon)
-            d27_sign_index = raman_d27_get_sign_index(d27_lon)
-            d27_deg = d27_lon % 30
-            house = raman_d27_calculate_house(d27_asc_sign_index, d27_sign_index)
-            natal_sign = ZODIAC_SIGNS_raman[raman_d27_get_sign_index(natal_lon)]
-            retro = natal_planet_retro[planet]
-
-            d27_nakshatra, d27_nak_lord, d27_pada = raman_d27_get_nakshatra_pada(d27_lon)
-            natal_nakshatra, natal_nak_lord, natal_pada = raman_d27_get_nakshatra_pada(natal_lon)
-
-            d27_chart[planet] = {
-                "d27_sign": ZODIAC_SIGNS_raman[d27_sign_index],
-                "degrees": round(d27_deg, 4),
-                "house": house,
-                "d27_nakshatra": d27_nakshatra,
-                "d27_nakshatra_lord": d27_nak_lord,
-                "d27_pada": d27_pada,
-                # "natal_sign": natal_sign,
-                # "natal_nakshatra": natal_nakshatra,
-                # "natal_nakshatra_lord": natal_nak_lord,
-                # "natal_pada": natal_pada,
-                "retrograde": retro
-            }
-
-        response = {
-            "user_name": user_name,
-            "d27_chart": d27_chart
-        }
-        return jsonify(response), 200
+        return jsonify(_d27_product(data)), 200
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
@@ -706,6 +771,54 @@ def calculate_d27_chart():
 #  Trimshamsha D30 
 
 
+def _d30_product(data, snapshot=None):
+    """Body of the /raman/calculate_d30_chart response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = data['latitude']
+    longitude = data['longitude']
+    tz_offset = float(data['timezone_offset'])
+
+    jd = get_julian_day(birth_date, birth_time, tz_offset)
+    natal_positions = raman_d30_calculate_sidereal_longitudes(jd, latitude, longitude)
+
+    d30_positions = {}
+    # First get the D30 sign and index for the Ascendant
+    asc_sign, asc_deg, asc_sign_index, asc_natal_sign, asc_natal_deg = raman_d30_get_d30_sign_and_degree(
+        natal_positions['Ascendant']['longitude']
+    )
+
+    for planet, pdata in natal_positions.items():
+        longitude = pdata['longitude']
+        sign, degree, d30_sign_index, natal_sign, natal_deg = raman_d30_get_d30_sign_and_degree(longitude)
+        nak, nak_lord, pada = raman_d30_get_nakshatra_and_pada(longitude)
+        d30_positions[planet] = {
+            'sign': sign,
+            'degree': format_dms(degree),
+            'retrograde': pdata['retrograde'],
+            'nakshatra': nak,
+            # 'natal_sign': natal_sign,
+            # 'natal_degree': raman_d30_format_degree(natal_deg),
+            # 'natal_longitude': round(longitude, 4),
+            'pada': pada,
+            'd30_sign_index': d30_sign_index
+        }
+
+    # Now assign houses properly
+    raman_d30_assign_houses(d30_positions, asc_sign_index)
+    # Remove 'd30_sign_index' from output for clarity
+    for planet in d30_positions:
+        if 'd30_sign_index' in d30_positions[planet]:
+            del d30_positions[planet]['d30_sign_index']
+
+    response = {
+        "user_name": data.get('user_name', 'Unknown'),
+        # "natal_positions": {p: natal_positions[p]['longitude'] for p in natal_positions},
+        "d30_chart": d30_positions
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d30_chart', methods=['POST'])
 def calculate_d30_chart():
     try:
@@ -716,50 +829,7 @@ def calculate_d30_chart():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = data['latitude']
-        longitude = data['longitude']
-        tz_offset = float(data['timezone_offset'])
-
-        jd = raman_d30_get_julian_day(birth_date, birth_time, tz_offset)
-        natal_positions = raman_d30_calculate_sidereal_longitudes(jd, latitude, longitude)
-
-        d30_positions = {}
-        # First get the D30 sign and index for the Ascendant
-        asc_sign, asc_deg, asc_sign_index, asc_natal_sign, asc_natal_deg = raman_d30_get_d30_sign_and_degree(
-            natal_positions['Ascendant']['longitude']
-        )
-
-        for planet, pdata in natal_positions.items():
-            longitude = pdata['longitude']
-            sign, degree, d30_sign_index, natal_sign, natal_deg = raman_d30_get_d30_sign_and_degree(longitude)
-            nak, nak_lord, pada = raman_d30_get_nakshatra_and_pada(longitude)
-            d30_positions[planet] = {
-                'sign': sign,
-                'degree': raman_d30_format_degree(degree),
-                'retrograde': pdata['retrograde'],
-                'nakshatra': nak,
-                # 'natal_sign': natal_sign,
-                # 'natal_degree': raman_d30_format_degree(natal_deg),
-                # 'natal_longitude': round(longitude, 4),
-                'pada': pada,
-                'd30_sign_index': d30_sign_index
-            }
-
-        # Now assign houses properly
-        raman_d30_assign_houses(d30_positions, asc_sign_index)
-        # Remove 'd30_sign_index' from output for clarity
-        for planet in d30_positions:
-            if 'd30_sign_index' in d30_positions[planet]:
-                del d30_positions[planet]['d30_sign_index']
-
-        response = {
-            "user_name": data.get('user_name', 'Unknown'),
-            # "natal_positions": {p: natal_positions[p]['longitude'] for p in natal_positions},
-            "d30_chart": d30_positions
-        }
-        return jsonify(response), 200
+        return jsonify(_d30_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -770,6 +840,18 @@ def calculate_d30_chart():
 
 #  Khavedamsha D40
 
+def _d40_product(data, snapshot=None):
+    """Body of the /raman/calculate_d40 response; the engines read ``snapshot`` when given."""
+    # Extract input data
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return raman_Khavedamsha_D40(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d40', methods=['POST'])
 def calculate_d40():
     """API endpoint to calculate the D40 chart."""
@@ -778,16 +860,7 @@ def calculate_d40():
         if not data:
             return jsonify({"error": "No JSON data provided"}), 400
 
-        # Extract input data
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        result = raman_Khavedamsha_D40(birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(result)
+        return jsonify(_d40_product(data))
 
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -795,6 +868,18 @@ def calculate_d40():
 
 #  Akshavedamsha D45
 
+def _d45_product(data, snapshot=None):
+    """Body of the /raman/calculate_d45 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    return raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_d45', methods=['POST'])
 def calculate_d45():
     try:
@@ -806,15 +891,7 @@ def calculate_d45():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
-        result = raman_Akshavedamsha_D45(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(result)
+        return jsonify(_d45_product(data))
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -827,6 +904,24 @@ def calculate_d45():
 #  Shashtiamsha D60
 
 
+def _d60_product(data, snapshot=None):
+    """Body of the /raman/calculate_d60 response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    chart_data = raman_Shashtiamsha_D60(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    response = {
+        "user_name": user_name,
+        **chart_data
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d60', methods=['POST'])
 def calculate_d60():
     try:
@@ -838,20 +933,7 @@ def calculate_d60():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
-        chart_data = raman_Shashtiamsha_D60(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        response = {
-            "user_name": user_name,
-            **chart_data
-        }
-        return jsonify(response)
+        return jsonify(_d60_product(data))
 
     except Exception as e:
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -865,6 +947,57 @@ def calculate_d60():
 
 #  Bava Lagna 
 
+def _bhava_lagna_product(data, snapshot=None):
+    """Body of the /raman/calculate_bhava_lagna response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    lat = float(data['latitude'])
+    lon = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    birth_jd = get_julian_day(birth_date, birth_time, tz_offset)
+    sunrise_jd, sunrise_sun_lon = raman_bava_calculate_sunrise(birth_jd, lat, lon, tz_offset)
+    bl_lon = raman_bava_calculate_bhava_lagna(birth_jd, sunrise_jd, sunrise_sun_lon)
+    bl_sign, bl_degrees = longitude_to_sign(bl_lon)
+    bl_nak, bl_nak_lord, bl_pada = raman_bava_nakshatra_and_pada(bl_lon)
+
+    swe.set_sid_mode(swe.SIDM_RAMAN)
+    positions = {}
+    for planet, pid in PLANET_IDS.items():
+        if planet == 'Ketu':
+            continue
+        pos_data = swe.calc_ut(birth_jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+        lon = pos_data[0] % 360
+        sign, degrees = longitude_to_sign(lon)
+        retrograde = 'R' if pos_data[3] < 0 else ''
+        house = house_of_sign(sign, bl_sign)
+        nak, nak_lord, pada = raman_bava_nakshatra_and_pada(lon)
+        positions[planet] = {
+            "degrees": round(degrees, 4), "sign": sign, "retrograde": retrograde,
+            "house": house, "nakshatra": nak, "nakshatra_lord": nak_lord, "pada": pada
+        }
+
+    # Calculate Ketu
+    rahu_lon = positions['Rahu']['degrees'] + (SIGNS.index(positions['Rahu']['sign']) * 30)
+    ketu_lon = (rahu_lon + 180) % 360
+    ketu_sign, ketu_degrees = longitude_to_sign(ketu_lon)
+    ketu_nak, ketu_nak_lord, ketu_pada = raman_bava_nakshatra_and_pada(ketu_lon)
+    positions['Ketu'] = {
+        "degrees": round(ketu_degrees, 4), "sign": ketu_sign, "retrograde": "",
+        "house": house_of_sign(ketu_sign, bl_sign),
+        "nakshatra": ketu_nak, "nakshatra_lord": ketu_nak_lord, "pada": ketu_pada
+    }
+
+    response = {
+        "bhava_lagna": {
+            "sign": bl_sign, "degrees": round(bl_degrees, 4),
+            "nakshatra": bl_nak, "nakshatra_lord": bl_nak_lord, "pada": bl_pada
+        },
+        "planets": positions
+    }
+    return response
+
+
 @rl.route('/raman/calculate_bhava_lagna', methods=['POST'])
 def raman_bava_calculate_bhava_lagna_chart():
     try:
@@ -873,52 +1006,7 @@ def raman_bava_calculate_bhava_lagna_chart():
         if not data or not all(k in data for k in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        lat = float(data['latitude'])
-        lon = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        birth_jd = raman_bava_get_julian_day(birth_date, birth_time, tz_offset)
-        sunrise_jd, sunrise_sun_lon = raman_bava_calculate_sunrise(birth_jd, lat, lon, tz_offset)
-        bl_lon = raman_bava_calculate_bhava_lagna(birth_jd, sunrise_jd, sunrise_sun_lon)
-        bl_sign, bl_degrees = raman_bava_get_sign_and_degrees(bl_lon)
-        bl_nak, bl_nak_lord, bl_pada = raman_bava_nakshatra_and_pada(bl_lon)
-
-        positions = {}
-        for planet, pid in PLANET_IDS.items():
-            if planet == 'Ketu':
-                continue
-            pos_data = swe.calc_ut(birth_jd, pid, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
-            lon = pos_data[0] % 360
-            sign, degrees = raman_bava_get_sign_and_degrees(lon)
-            retrograde = 'R' if pos_data[3] < 0 else ''
-            house = raman_bava_calculate_house(sign, bl_sign)
-            nak, nak_lord, pada = raman_bava_nakshatra_and_pada(lon)
-            positions[planet] = {
-                "degrees": round(degrees, 4), "sign": sign, "retrograde": retrograde,
-                "house": house, "nakshatra": nak, "nakshatra_lord": nak_lord, "pada": pada
-            }
-
-        # Calculate Ketu
-        rahu_lon = positions['Rahu']['degrees'] + (SIGNS.index(positions['Rahu']['sign']) * 30)
-        ketu_lon = (rahu_lon + 180) % 360
-        ketu_sign, ketu_degrees = raman_bava_get_sign_and_degrees(ketu_lon)
-        ketu_nak, ketu_nak_lord, ketu_pada = raman_bava_nakshatra_and_pada(ketu_lon)
-        positions['Ketu'] = {
-            "degrees": round(ketu_degrees, 4), "sign": ketu_sign, "retrograde": "",
-            "house": raman_bava_calculate_house(ketu_sign, bl_sign),
-            "nakshatra": ketu_nak, "nakshatra_lord": ketu_nak_lord, "pada": ketu_pada
-        }
-
-        response = {
-            "bhava_lagna": {
-                "sign": bl_sign, "degrees": round(bl_degrees, 4),
-                "nakshatra": bl_nak, "nakshatra_lord": bl_nak_lord, "pada": bl_pada
-            },
-            "planets": positions
-        }
-        return jsonify(response), 200
+        return jsonify(_bhava_lagna_product(data)), 200
 
     except Exception as e:
         logging.error(f"Error in calculation: {str(e)}")
@@ -927,6 +1015,17 @@ def raman_bava_calculate_bhava_lagna_chart():
 
 
 #  Hora Lagna Chart .
+def _hora_lagna_product(data, snapshot=None):
+    """Body of the /raman/calculate_hora_lagna response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    lat = float(data['latitude'])
+    lon = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return raman_hora_calculate_chart(birth_date, birth_time, lat, lon, tz_offset)
+
+
 @rl.route('/raman/calculate_hora_lagna', methods=['POST'])
 def raman_hora_calculate_hora_lagna_chart():
     try:
@@ -935,14 +1034,7 @@ def raman_hora_calculate_hora_lagna_chart():
         if not data or not all(k in data for k in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        lat = float(data['latitude'])
-        lon = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        result = raman_hora_calculate_chart(birth_date, birth_time, lat, lon, tz_offset)
-        return jsonify(result), 200
+        return jsonify(_hora_lagna_product(data)), 200
 
     except Exception as e:
         logging.error(f"Error in calculation: {str(e)}")
@@ -951,6 +1043,18 @@ def raman_hora_calculate_hora_lagna_chart():
 
 
 # Equal Bava lagna chart :
+def _equal_bhava_lagna_product(data, snapshot=None):
+    """Body of the /raman/calculate_equal_bhava_lagna response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return raman_equal_bava_lagnas(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_equal_bhava_lagna', methods=['POST'])
 def calculate_equal_bhava_lagna():
     try:
@@ -962,15 +1066,7 @@ def calculate_equal_bhava_lagna():
         if not all(key in data for key in required_fields):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        result = raman_equal_bava_lagnas(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(result), 200
+        return jsonify(_equal_bhava_lagna_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -982,20 +1078,24 @@ def calculate_equal_bhava_lagna():
 
 #  KP Bava Lagna 
 
+def _kp_bhava_product(data, snapshot=None):
+    """Body of the /raman/calculate_kp_bhava response; the engines read ``snapshot`` when given."""
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return raman_kp_bava(user_name, birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_kp_bhava', methods=['POST'])
 def calculate_kp_bhava():
     """API endpoint to calculate KP Bhava Chart from birth details."""
     data = request.get_json()
     try:
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        result = raman_kp_bava(user_name, birth_date, birth_time, latitude, longitude, tz_offset)
-        return jsonify(result), 200
+        return jsonify(_kp_bhava_product(data)), 200
 
     except KeyError as e:
         return jsonify({"error": f"Missing input field: {str(e)}"}), 400
@@ -1007,6 +1107,22 @@ def calculate_kp_bhava():
 
 
 # Sripathi Bava 
+def _sripathi_bhava_product(data, snapshot=None):
+    """Body of the /raman/calculate_sripathi_bhava response; the engines read ``snapshot`` when given."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    logger.debug(f"Input: Date={birth_date}, Time={birth_time}, Lat={latitude}, Lon={longitude}, TZ Offset={tz_offset}")
+
+    # Call the calculation function
+    response = raman_sripathi_bava(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+    logger.debug(f"Output JSON: {response}")
+    return response
+
+
 @rl.route('/raman/calculate_sripathi_bhava', methods=['POST'])
 def calculate_sripathi_bhava():
     """Compute the Sripathi Bhava Chart and return JSON output."""
@@ -1019,18 +1135,7 @@ def calculate_sripathi_bhava():
         if not all(key in data for key in required_fields):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        logger.debug(f"Input: Date={birth_date}, Time={birth_time}, Lat={latitude}, Lon={longitude}, TZ Offset={tz_offset}")
-
-        # Call the calculation function
-        response = raman_sripathi_bava(birth_date, birth_time, latitude, longitude, tz_offset)
-        logger.debug(f"Output JSON: {response}")
-        return jsonify(response), 200
+        return jsonify(_sripathi_bhava_product(data)), 200
 
     except ValueError as ve:
         logger.error(f"Invalid input format: {str(ve)}")
@@ -1042,6 +1147,18 @@ def calculate_sripathi_bhava():
 
 
 # Arudha Lagna chart .
+def _arudha_lagna_product(data, snapshot=None):
+    """Body of the /raman/calculate_arudha_lagna response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    return raman_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, user_name, snapshot=snapshot)
+
+
 @rl.route('/raman/calculate_arudha_lagna', methods=['POST'])
 def calculate_arudha_lagna():
     try:
@@ -1053,15 +1170,7 @@ def calculate_arudha_lagna():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        response = raman_arudha_lagna(birth_date, birth_time, latitude, longitude, tz_offset, user_name)
-        return jsonify(response), 200
+        return jsonify(_arudha_lagna_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
@@ -1070,6 +1179,26 @@ def calculate_arudha_lagna():
 
 
 #  Karkamsha Birth chart 
+def _karkamsha_d1_product(data, snapshot=None):
+    """Body of the /raman/calculate_karkamsha_d1 response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    results = raman_karkamsha_D1(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct response
+    response = {
+        "user_name": user_name,
+        **results
+    }
+    return response
+
+
 @rl.route('/raman/calculate_karkamsha_d1', methods=['POST'])
 def calculate_d1_karkamsha_endpoint():
     """API endpoint to calculate the D1 Karkamsha chart."""
@@ -1082,22 +1211,7 @@ def calculate_d1_karkamsha_endpoint():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        results = raman_karkamsha_D1(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct response
-        response = {
-            "user_name": user_name,
-            **results
-        }
-        return jsonify(response), 200
+        return jsonify(_karkamsha_d1_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1107,6 +1221,26 @@ def calculate_d1_karkamsha_endpoint():
 
 
 #  Karkamsha D9 chart 
+def _karkamsha_d9_product(data, snapshot=None):
+    """Body of the /raman/calculate_d9_karkamsha response; the engines read ``snapshot`` when given."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    # Call the calculation function
+    results = raman_karkamsha_D9(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct response
+    response = {
+        "user_name": user_name,
+        **results
+    }
+    return response
+
+
 @rl.route('/raman/calculate_d9_karkamsha', methods=['POST'])
 def calculate_karkamsha_endpoint():
     """API endpoint to calculate the Karkamsha chart."""
@@ -1119,22 +1253,7 @@ def calculate_karkamsha_endpoint():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        # Call the calculation function
-        results = raman_karkamsha_D9(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct response
-        response = {
-            "user_name": user_name,
-            **results
-        }
-        return jsonify(response), 200
+        return jsonify(_karkamsha_d9_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1150,6 +1269,39 @@ def calculate_karkamsha_endpoint():
 
 
 # Binnastakavargha
+def _binnashtakavarga_product(data, snapshot=None):
+    """Body of the /raman/calculate_bhinnashtakavarga response; the engines read ``snapshot`` when given."""
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid latitude or longitude")
+
+    # Call the calculation function
+    results = raman_binnastakavargha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct JSON response
+    response = {
+        "user_name": user_name,
+        "birth_details": {
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone_offset": tz_offset
+        },
+        "planetary_positions": results["planetary_positions"],
+        "ascendant": results["ascendant"],
+        "ashtakvarga": results["ashtakvarga"],
+        "notes": results["notes"]
+    }
+    return response
+
+
 @rl.route('/raman/calculate_bhinnashtakavarga', methods=['POST'])
 def calculate_raman_ashtakvarga():
     try:
@@ -1161,35 +1313,7 @@ def calculate_raman_ashtakvarga():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-            return jsonify({"error": "Invalid latitude or longitude"}), 400
-
-        # Call the calculation function
-        results = raman_binnastakavargha(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct JSON response
-        response = {
-            "user_name": user_name,
-            "birth_details": {
-                "birth_date": birth_date,
-                "birth_time": birth_time,
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone_offset": tz_offset
-            },
-            "planetary_positions": results["planetary_positions"],
-            "ascendant": results["ascendant"],
-            "ashtakvarga": results["ashtakvarga"],
-            "notes": results["notes"]
-        }
-        return jsonify(response), 200
+        return jsonify(_binnashtakavarga_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
@@ -1198,6 +1322,49 @@ def calculate_raman_ashtakvarga():
 
 
 #  Sarvashakavargha 
+def _sarvashtakavarga_product(data, snapshot=None):
+    """Body of the /raman/calculate_sarvashtakavarga response; the engines read ``snapshot`` when given."""
+    user_name = data['user_name']
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid latitude or longitude")
+
+    # Call the calculation function
+    results = raman_sarvathakavargha(birth_date, birth_time, latitude, longitude, tz_offset, snapshot=snapshot)
+
+    # Construct JSON response
+    response = {
+        "user_name": user_name,
+        "birth_details": {
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone_offset": tz_offset
+        },
+        "planetary_positions": results["planetary_positions"],
+        "ascendant": results["ascendant"],
+        "bhinnashtakavarga": results["bhinnashtakavarga"],
+        "sarvashtakavarga": results["sarvashtakavarga"],
+        "notes": {
+            "ayanamsa": "Lahiri",
+            "ayanamsa_value": f"{results['ayanamsa']:.6f}",
+            "chart_type": "Rasi",
+            "house_system": "Whole Sign"
+        },
+        "debug": {
+            "julian_day": results["julian_day"],
+            "ayanamsa": f"{results['ayanamsa']:.6f}"
+        }
+    }
+    return response
+
+
 @rl.route('/raman/calculate_sarvashtakavarga', methods=['POST'])
 def calculate_sarvashtakavarga_endpoint():
     """API endpoint to calculate Sarvashtakvarga with matrix table based on birth details."""
@@ -1210,46 +1377,10 @@ def calculate_sarvashtakavarga_endpoint():
         if not all(key in data for key in required):
             return jsonify({"error": "Missing required parameters"}), 400
 
-        user_name = data['user_name']
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-            return jsonify({"error": "Invalid latitude or longitude"}), 400
-
-        # Call the calculation function
-        results = raman_sarvathakavargha(birth_date, birth_time, latitude, longitude, tz_offset)
-
-        # Construct JSON response
-        response = {
-            "user_name": user_name,
-            "birth_details": {
-                "birth_date": birth_date,
-                "birth_time": birth_time,
-                "latitude": latitude,
-                "longitude": longitude,
-                "timezone_offset": tz_offset
-            },
-            "planetary_positions": results["planetary_positions"],
-            "ascendant": results["ascendant"],
-            "bhinnashtakavarga": results["bhinnashtakavarga"],
-            "sarvashtakavarga": results["sarvashtakavarga"],
-            "notes": {
-                "ayanamsa": "Lahiri",
-                "ayanamsa_value": f"{results['ayanamsa']:.6f}",
-                "chart_type": "Rasi",
-                "house_system": "Whole Sign"
-            },
-            "debug": {
-                "julian_day": results["julian_day"],
-                "ayanamsa": f"{results['ayanamsa']:.6f}"
-            }
-        }
-        return jsonify(response), 200
+        return jsonify(_sarvashtakavarga_product(data)), 200
 
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         logging.error(f"Error: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
@@ -1258,38 +1389,39 @@ def calculate_sarvashtakavarga_endpoint():
 
 
 #  Shodamsha Vargha sumary Sings.
+def _shodasha_varga_signs_product(data, snapshot=None):
+    """Body of the /raman/shodasha_varga_signs response."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    timezone_offset = float(data['timezone_offset'])
+    user_name = data.get('user_name', 'Unknown')
+
+    utc_dt = local_to_utc(birth_date, birth_time, timezone_offset)
+    jd = utc_to_jd(utc_dt)
+
+    sid_positions = raman_sign_get_sidereal_positions(jd)
+    sid_asc, asc_sign_idx, asc_deg_in_sign = raman_sign_get_sidereal_asc(jd, latitude, longitude)
+    sid_positions['Ascendant'] = (sid_asc, asc_sign_idx, asc_deg_in_sign)
+
+    varga_signs = varga_sign_summary(
+        {pname: lon for pname, (lon, _, _) in sid_positions.items()}, 'raman')
+    summary = {pname: {chart: {"sign": SIGNS[sign_idx]} for chart, sign_idx in signs.items()}
+               for pname, signs in varga_signs.items()}
+
+    return {
+        "ayanamsa": "Raman",
+        "shodasha_varga_signs": summary,
+        "user_name": user_name
+    }
+
+
 @rl.route('/raman/shodasha_varga_signs', methods=['POST'])
 def shodasha_varga_signs():
     try:
         data = request.get_json()
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        timezone_offset = float(data['timezone_offset'])
-        user_name = data.get('user_name', 'Unknown')
-
-        utc_dt = raman_sign_local_to_utc(birth_date, birth_time, timezone_offset)
-        jd = raman_sign_julian_day(utc_dt)
-
-        sid_positions = raman_sign_get_sidereal_positions(jd)
-        sid_asc, asc_sign_idx, asc_deg_in_sign = raman_sign_get_sidereal_asc(jd, latitude, longitude)
-        sid_positions['Ascendant'] = (sid_asc, asc_sign_idx, asc_deg_in_sign)
-
-        summary = {}
-        for pname in sid_positions.keys():
-            summary[pname] = {}
-
-        for chart in CHARTS:
-            for pname, (lon, sign_idx, deg_in_sign) in sid_positions.items():
-                varga_idx = raman_sign_varga_sign(sign_idx, deg_in_sign, chart)
-                summary[pname][chart] = {"sign": SIGNS[varga_idx]}
-
-        return jsonify({
-            "ayanamsa": "Raman",
-            "shodasha_varga_signs": summary,
-            "user_name": user_name
-        }), 200
+        return jsonify(_shodasha_varga_signs_product(data)), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1304,6 +1436,35 @@ def shodasha_varga_signs():
 
 #  Vimshottari of mahaDasha and antar dasha :
 
+def _antar_dasha_product(data, snapshot=None):
+    """Body of the /raman/calculate_maha_antar_dashas response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+    moon_longitude = calculate_moon_sidereal_position_raman_antar(jd_birth)
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_raman_antar(moon_longitude)
+    if not nakshatra:
+        raise RuntimeError("Unable to determine Nakshatra")
+
+    balance_years, elapsed_years = calculate_dasha_balance_raman_antar(moon_longitude, nakshatra_start, lord)
+    mahadasha_periods = calculate_mahadasha_periods_antar_raman(birth_datetime, lord, balance_years, elapsed_years)
+
+    response = {
+        "user_name": user_name,
+        "birth_date": birth_datetime.strftime('%Y-%m-%d %H:%M:%S'),
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": round(moon_longitude, 4),
+        "mahadashas": mahadasha_periods
+    }
+    return response
+
+
 @rl.route('/raman/calculate_maha_antar_dashas', methods=['POST'])
 def calculate_antardasha_dasha():
     """Calculate Vimshottari Dasha based on birth details."""
@@ -1316,31 +1477,7 @@ def calculate_antardasha_dasha():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-        jd_birth = get_julian_day_antar_raman(birth_date, birth_time, tz_offset)
-        moon_longitude = calculate_moon_sidereal_position_raman_antar(jd_birth)
-        nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_raman_antar(moon_longitude)
-        if not nakshatra:
-            return jsonify({"error": "Unable to determine Nakshatra"}), 500
-
-        balance_years, elapsed_years = calculate_dasha_balance_raman_antar(moon_longitude, nakshatra_start, lord)
-        mahadasha_periods = calculate_mahadasha_periods_antar_raman(birth_datetime, lord, balance_years, elapsed_years)
-
-        response = {
-            "user_name": user_name,
-            "birth_date": birth_datetime.strftime('%Y-%m-%d %H:%M:%S'),
-            "nakshatra_at_birth": nakshatra,
-            "moon_longitude": round(moon_longitude, 4),
-            "mahadashas": mahadasha_periods
-        }
-        return jsonify(response), 200
+        return jsonify(_antar_dasha_product(data)), 200
 
     except Exception as e:
         return jsonify({"error": f"Calculation error: {str(e)}"}), 500
@@ -1349,6 +1486,33 @@ def calculate_antardasha_dasha():
 
 #  Vimshottari of antar dasha and Pratyantardashas Dasha 
 
+def _pratyantar_dasha_product(data, snapshot=None):
+    """Body of the /raman/calculate_maha_antar_pratyantar_dasha response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+    moon_longitude = calculate_moon_sidereal_position_prataythar_raman(jd_birth)
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_prataythar_raman(moon_longitude)
+    if not nakshatra:
+        raise RuntimeError("Unable to determine Nakshatra")
+
+    remaining_time, mahadasha_duration, elapsed_time = calculate_dasha_balance_prataythar_raman(moon_longitude, nakshatra_start, lord)
+    mahadasha_periods = calculate_prataythar_raman_periods(jd_birth, remaining_time, lord, elapsed_time)
+
+    response = {
+        "user_name": user_name,
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": moon_longitude,
+        "mahadashas": mahadasha_periods
+    }
+    return response
+
+
 @rl.route('/raman/calculate_maha_antar_pratyantar_dasha', methods=['POST'])
 def calculate_prataytar_dasha():
     """Calculate Vimshottari Dasha based on birth details."""
@@ -1361,29 +1525,7 @@ def calculate_prataytar_dasha():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_birth = get_julian_day_prataythar_raman(birth_date, birth_time, tz_offset)
-        moon_longitude = calculate_moon_sidereal_position_prataythar_raman(jd_birth)
-        nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_prataythar_raman(moon_longitude)
-        if not nakshatra:
-            return jsonify({"error": "Unable to determine Nakshatra"}), 500
-
-        remaining_time, mahadasha_duration, elapsed_time = calculate_dasha_balance_prataythar_raman(moon_longitude, nakshatra_start, lord)
-        mahadasha_periods = calculate_prataythar_raman_periods(jd_birth, remaining_time, lord, elapsed_time)
-
-        response = {
-            "user_name": user_name,
-            "nakshatra_at_birth": nakshatra,
-            "moon_longitude": moon_longitude,
-            "mahadashas": mahadasha_periods
-        }
-        return jsonify(response), 200
+        return jsonify(_pratyantar_dasha_product(data)), 200
 
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
@@ -1395,6 +1537,33 @@ def calculate_prataytar_dasha():
 
 
 #  Vimshottari of  Pratyantardashas Dasha  and Sookshma dasha 
+def _sookshma_dasha_product(data, snapshot=None):
+    """Body of the /raman/calculate_sookshma_dasha_raman response."""
+    user_name = data.get('user_name', 'Unknown')
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    latitude = float(data['latitude'])
+    longitude = float(data['longitude'])
+    tz_offset = float(data['timezone_offset'])
+
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+    moon_longitude = calculate_moon_sidereal_sookshma_raman(jd_birth)
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_soo_raman(moon_longitude)
+    if not nakshatra:
+        raise RuntimeError("Unable to determine Nakshatra")
+
+    remaining_time, mahadasha_duration, elapsed_time = calculate_sookshma_dasha_balance_raman(moon_longitude, nakshatra_start, lord)
+    mahadasha_periods = run_in_pool(calculate_sookshma_raman_periods, jd_birth, lord, elapsed_time)
+
+    response = {
+        "user_name": user_name,
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": round(moon_longitude, 4),
+        "mahadashas": mahadasha_periods
+    }
+    return response
+
+
 @rl.route('/raman/calculate_sookshma_dasha_raman', methods=['POST'])
 def calculate_sookshmadasha_dasha():
     """API endpoint to calculate Vimshottari Dasha periods."""
@@ -1407,30 +1576,10 @@ def calculate_sookshmadasha_dasha():
         if not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        user_name = data.get('user_name', 'Unknown')
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
-        latitude = float(data['latitude'])
-        longitude = float(data['longitude'])
-        tz_offset = float(data['timezone_offset'])
-
-        jd_birth = get_julian_day_sookshma_raman(birth_date, birth_time, tz_offset)
-        moon_longitude = calculate_moon_sidereal_sookshma_raman(jd_birth)
-        nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_soo_raman(moon_longitude)
-        if not nakshatra:
-            return jsonify({"error": "Unable to determine Nakshatra"}), 500
-
-        remaining_time, mahadasha_duration, elapsed_time = calculate_sookshma_dasha_balance_raman(moon_longitude, nakshatra_start, lord)
-        mahadasha_periods = calculate_sookshma_raman_periods(jd_birth, lord, elapsed_time)
-
-        response = {
-            "user_name": user_name,
-            "nakshatra_at_birth": nakshatra,
-            "moon_longitude": round(moon_longitude, 4),
-            "mahadashas": mahadasha_periods
-        }
-        return jsonify(response), 200
+        return jsonify(_sookshma_dasha_product(data)), 200
 
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
     except ValueError as ve:
         return jsonify({"error": f"Invalid input format: {str(ve)}"}), 400
     except Exception as e:
@@ -1439,6 +1588,41 @@ def calculate_sookshmadasha_dasha():
 
 
 # Vimshottari of  Prana dasha with all dash sequence.
+def _prana_dasha_start(data):
+    """Response header and the (jd_birth, lord, elapsed_days) the prana dasha tree starts from."""
+    birth_date = data['birth_date']
+    birth_time = data['birth_time']
+    tz_offset = float(data['timezone_offset'])
+
+    # Calculate Julian Day for birth
+    jd_birth = get_julian_day(birth_date, birth_time, tz_offset)
+
+    # Calculate Moon's sidereal position
+    moon_longitude = calculate_moon_sidereal_position_pran_raman(jd_birth)
+
+    # Determine Nakshatra and lord
+    nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_pran_raman(moon_longitude)
+
+    # Calculate dasha balance
+    remaining_days, mahadasha_duration_days, elapsed_days = calculate_dasha_balance_pran_raman(moon_longitude, nakshatra_start, lord)
+
+    header = {
+        "user_name": data.get('user_name', 'Unknown'),
+        "nakshatra_at_birth": nakshatra,
+        "moon_longitude": round(moon_longitude, 4)
+    }
+    return header, jd_birth, lord, elapsed_days
+
+
+def _prana_dasha_product(data, snapshot=None, window=None):
+    """Body of the /raman/calculate_raman_prana_dasha response; ``window`` holds its depth/from/to arguments."""
+    depth, start_jd, end_jd = parse_dasha_window(window or {})
+    header, jd_birth, lord, elapsed_days = _prana_dasha_start(data)
+    mahadasha_periods = run_in_pool(calculate_pran_raman_periods, jd_birth, lord, elapsed_days,
+                                    depth, start_jd, end_jd)
+    return dict(header, mahadashas=mahadasha_periods)
+
+
 @rl.route('/raman/calculate_raman_prana_dasha', methods=['POST'])
 def calculate_prana_dasha():
     """API endpoint to calculate Vimshottari Dasha."""
@@ -1448,31 +1632,117 @@ def calculate_prana_dasha():
         if not data or not all(field in data for field in required_fields):
             return jsonify({"error": "Missing required fields"}), 400
 
-        birth_date = data['birth_date']
-        birth_time = data['birth_time']
+        if wants_ndjson(request):
+            depth, start_jd, end_jd = parse_dasha_window(request.args)
+            header, jd_birth, lord, elapsed_days = _prana_dasha_start(data)
+            rows = raman_pran_dasha_rows(jd_birth, lord, elapsed_days, depth, start_jd, end_jd)
+            return ndjson_response(itertools.chain([header], rows))
+
+        return jsonify(_prana_dasha_product(data, window=request.args)), 200
+    except PoolSaturated as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+
+# Current Dasha at a date
+@rl.route('/raman/current_dasha', methods=['POST'])
+def calculate_current_dasha_raman():
+    """
+    API endpoint returning the Maha/Antar/Pratyantar/Sookshma/Pran dashas running at a date.
+
+    Takes the birth fields plus optional "date" ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS', UTC;
+    defaults to now) and "depth" (1-5, default 5).
+    """
+    try:
+        data = request.get_json()
+        required_fields = ['birth_date', 'birth_time', 'latitude', 'longitude', 'timezone_offset']
+        if not data or not all(field in data for field in required_fields):
+            return jsonify({"error": "Missing required fields"}), 400
+
         tz_offset = float(data['timezone_offset'])
+        depth = int(data.get('depth', MAX_DEPTH))
+        if not 1 <= depth <= MAX_DEPTH:
+            return jsonify({"error": f"depth must be between 1 and {MAX_DEPTH}"}), 400
+        target_jd = datetime_to_jd(data.get('date'))
 
-        # Calculate Julian Day for birth
-        jd_birth = get_julian_day_pran_raman(birth_date, birth_time, tz_offset)
-        
-        # Calculate Moon's sidereal position
+        jd_birth = get_julian_day(data['birth_date'], data['birth_time'], tz_offset)
         moon_longitude = calculate_moon_sidereal_position_pran_raman(jd_birth)
-        
-        # Determine Nakshatra and lord
         nakshatra, lord, nakshatra_start = get_nakshatra_and_lord_pran_raman(moon_longitude)
-        
-        # Calculate dasha balance
         remaining_days, mahadasha_duration_days, elapsed_days = calculate_dasha_balance_pran_raman(moon_longitude, nakshatra_start, lord)
-        
-        # Calculate all Mahadasha periods
-        mahadasha_periods = calculate_pran_raman_periods(jd_birth, lord, elapsed_days)
+
+        current_dasha = raman_current_dasha(jd_birth, lord, elapsed_days, target_jd, depth)
+        if not current_dasha:
+            return jsonify({"error": "Date is outside the 120-year dasha cycle"}), 400
 
         response = {
             "user_name": data.get('user_name', 'Unknown'),
             "nakshatra_at_birth": nakshatra,
             "moon_longitude": round(moon_longitude, 4),
-            "mahadashas": mahadasha_periods
+            "current_dasha": current_dasha
         }
         return jsonify(response), 200
+    except ValueError as ve:
+        return jsonify({"error": f"Invalid input: {str(ve)}"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+
+# Full profile (batch)
+
+# Product name -> endpoint view used by /raman/profile.
+PROFILE_PRODUCTS = {
+    'natal': _natal_product,
+    'sun_chart': _sun_chart_product,
+    'moon_chart': _moon_chart_product,
+    'sudarshan_chakra': _sudarshan_chakra_product,
+    'd2': _d2_product,
+    'd3': _d3_product,
+    'd4': _d4_product,
+    'd7': _d7_product,
+    'd9': _d9_product,
+    'd10': _d10_product,
+    'd12': _d12_product,
+    'd16': _d16_product,
+    'd20': _d20_product,
+    'd24': _d24_product,
+    'd27': _d27_product,
+    'd30': _d30_product,
+    'd40': _d40_product,
+    'd45': _d45_product,
+    'd60': _d60_product,
+    'sripathi_bhava': _sripathi_bhava_product,
+    'kp_bhava': _kp_bhava_product,
+    'bhava_lagna': _bhava_lagna_product,
+    'equal_bhava_lagna': _equal_bhava_lagna_product,
+    'arudha_lagna': _arudha_lagna_product,
+    'karkamsha_d1': _karkamsha_d1_product,
+    'karkamsha_d9': _karkamsha_d9_product,
+    'hora_lagna': _hora_lagna_product,
+    'binnashtakavarga': _binnashtakavarga_product,
+    'sarvashtakavarga': _sarvashtakavarga_product,
+    'shodasha_varga_signs': _shodasha_varga_signs_product,
+    'antar_dasha': _antar_dasha_product,
+    'pratyantar_dasha': _pratyantar_dasha_product,
+    'sookshma_dasha': _sookshma_dasha_product,
+    'prana_dasha': _prana_dasha_product,
+}
+
+
+@rl.route('/raman/profile', methods=['POST'])
+def raman_profile():
+    """
+    API endpoint returning several charts for one birth record in a single response.
+
+    Takes the usual birth fields plus an optional "products" list (keys of PROFILE_PRODUCTS;
+    when omitted, all of them except the sookshma and prana dasha trees, which are only
+    computed on request). Each product is the body its own /raman endpoint returns.
+    """
+    try:
+        return profile_response(PROFILE_PRODUCTS, 'raman', 'Raman')
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
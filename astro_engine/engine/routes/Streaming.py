@@ -0,0 +1,26 @@
+"""
+Streaming response helpers shared by the blueprints.
+
+Large results (bulk charts, full dasha timelines) are sent as NDJSON: one JSON document per
+line, written as the generator produces it, so the first bytes go out immediately and the
+worker never holds the whole body in memory.
+"""
+from flask import Response, stream_with_context
+
+from astro_engine.engine.core.Serialization import dumps
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson(request):
+    """True when the client asked for a streamed NDJSON response (?format=ndjson)."""
+    return request.args.get('format') == 'ndjson'
+
+
+def ndjson_response(rows):
+    """Stream an iterable of JSON-serialisable objects as NDJSON."""
+    def generate():
+        for row in rows:
+            yield dumps(row) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,56 @@
+"""
+The ephemeris path is per-thread state inside pyswisseph: a thread that never applied it
+silently falls back to Moshier. Calculations in request threads must read the .se1 files
+and give the same results as the importing thread.
+"""
+import threading
+
+from astro_engine.engine.core import swe
+from astro_engine.engine.core.ChartSnapshot import ChartSnapshot
+from astro_engine.engine.core.SiderealKernel import get_julian_day
+from astro_engine.engine.natalCharts.natal import lahairi_natal
+
+BIRTH_DATA = {
+    "user_name": "Thread probe",
+    "birth_date": "1990-05-15",
+    "birth_time": "14:30:00",
+    "latitude": 28.6139,
+    "longitude": 77.2090,
+    "timezone_offset": 5.5,
+}
+
+
+def probe_and_chart():
+    """Ephemeris status, Sun flags and a natal chart from a freshly built (uncached) snapshot."""
+    # Probe first: it must not depend on an earlier wrapped call having set the thread up.
+    status = swe.ephemeris_status()
+    jd_ut = get_julian_day(BIRTH_DATA["birth_date"], BIRTH_DATA["birth_time"], BIRTH_DATA["timezone_offset"])
+    snapshot = ChartSnapshot(jd_ut, BIRTH_DATA["latitude"], BIRTH_DATA["longitude"], 'lahiri')
+    return {
+        "status": status,
+        "sun_flags": snapshot.calc_ut(swe.SUN)[1],
+        "chart": lahairi_natal(BIRTH_DATA, snapshot=snapshot),
+    }
+
+
+def run_in_new_thread(target):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def test_new_thread_reads_swiss_files():
+    threaded = run_in_new_thread(probe_and_chart)
+    assert threaded["status"]["mode"] == 'swiss', threaded["status"]
+    assert all(flag & swe.FLG_SWIEPH for flag in threaded["status"]["return_flags"].values())
+    assert threaded["sun_flags"] & swe.FLG_SWIEPH
+
+
+def test_new_thread_matches_main_thread():
+    main = probe_and_chart()
+    threaded = run_in_new_thread(probe_and_chart)
+    assert threaded["status"]["return_flags"] == main["status"]["return_flags"]
+    assert threaded["sun_flags"] == main["sun_flags"]
+    assert threaded["chart"] == main["chart"]
@@ -0,0 +1,49 @@
+"""
+KP horary numbers and sub lords against the published KP sub table (249 subs, split at
+sign boundaries, subs of every nakshatra starting from its own star lord).
+"""
+import pytest
+
+from astro_engine.engine.core.KpSubLords import SUB_TABLE, horary_longitude, horary_number, kp_lords
+from astro_engine.engine.kpSystem.charts.CupsalChart import cupsal_assign_nakshatra_and_lords
+
+
+def degrees(sign_index, d, m=0, s=0):
+    return sign_index * 30 + d + m / 60 + s / 3600
+
+
+# (horary number, ascendant longitude, star lord, sub lord) from the KP table.
+HORARY_TABLE = [
+    (1, degrees(0, 0), 'Ketu', 'Ketu'),                    # Aries 0°00'00"
+    (2, degrees(0, 0, 46, 40), 'Ketu', 'Venus'),           # Aries 0°46'40"
+    (22, degrees(0, 29, 13, 20), 'Sun', 'Rahu'),           # Aries 29°13'20", Sun-Rahu sub begins
+    (23, degrees(1, 0), 'Sun', 'Rahu'),                    # Taurus 0°00'00", same sub after the sign cut
+    (249, degrees(11, 27, 53, 20), 'Mercury', 'Saturn'),   # Pisces 27°53'20"
+]
+
+
+def test_table_has_249_subs():
+    assert len(SUB_TABLE) == 249
+
+
+@pytest.mark.parametrize("number, longitude, star, sub", HORARY_TABLE)
+def test_horary_number(number, longitude, star, sub):
+    assert horary_longitude(number) == pytest.approx(longitude, abs=1e-9)
+    assert kp_lords(horary_longitude(number), 2) == [star, sub]
+    assert horary_number(longitude + 1e-9) == number
+
+
+def test_horary_numbers_out_of_range_are_clamped():
+    assert horary_longitude(0) == horary_longitude(1)
+    assert horary_longitude(250) == horary_longitude(249)
+
+
+def test_every_horary_number_starts_its_own_sub():
+    # A longitude exactly on a boundary belongs to the sub that begins there.
+    assert all(horary_number(horary_longitude(n)) == n for n in range(1, 250))
+
+
+def test_cusp_sub_lord_outside_ketu_nakshatra():
+    # Taurus 12°30' lies in Rohini (Moon); its subs run Moon 10°00', Mars 11°06'40",
+    # Rahu 11°53'20", Jupiter 13°53'20", so the cusp sub lord is Rahu.
+    assert cupsal_assign_nakshatra_and_lords(degrees(1, 12, 30)) == ('Rohini', 'Moon', 'Rahu')
@@ -0,0 +1,31 @@
+"""
+The batch nakshatra helpers must agree with the scalar ones, including on and right next
+to nakshatra and pada boundaries, where separately rounded spans used to disagree.
+"""
+import math
+
+from astro_engine.engine.core.Nakshatras import (
+    absolute_pada, absolute_padas, nakshatra_and_pada, nakshatras_and_padas,
+)
+
+
+def near(value):
+    return [math.nextafter(value, -math.inf), value, math.nextafter(value, math.inf)]
+
+
+BOUNDARIES = [k * 40 / 3 for k in range(28)] + [k * 10 / 3 for k in range(109)]
+LONGITUDES = [lon for boundary in BOUNDARIES for lon in near(boundary)]
+LONGITUDES += [0.0, -0.0, -1e-20, 359.9999999, 360.0, 720.5, -13.5]
+
+
+def test_absolute_padas_match_scalar():
+    assert absolute_padas(LONGITUDES) == [absolute_pada(lon) for lon in LONGITUDES]
+
+
+def test_nakshatras_and_padas_match_scalar():
+    indexes, padas = nakshatras_and_padas(LONGITUDES)
+    assert list(zip(indexes, padas)) == [nakshatra_and_pada(lon) for lon in LONGITUDES]
+
+
+def test_boundaries():
+    assert nakshatras_and_padas([40 / 3, 360.0, -1e-20, 359.9999999]) == ([1, 0, 26, 26], [1, 1, 4, 4])
@@ -0,0 +1,78 @@
+"""
+Response cache hooks on a minimal app: hits, ETag revalidation, short TTLs, excluded
+paths, and the byte bound of the memory backend.
+"""
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+from astro_engine.engine.core import ResponseCache
+from astro_engine.engine.core.ResponseCache import MemoryBackend, init_response_cache
+
+BODY = {"birth_date": "1990-05-15", "birth_time": "10:30:00", "latitude": 28.6,
+        "longitude": 77.2, "timezone_offset": 5.5}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(ResponseCache, 'backend', MemoryBackend())
+    monkeypatch.setattr(ResponseCache, 'default_ttl', 0)
+    app = Flask(__name__)
+    init_response_cache(app)
+    app.calls = 0
+
+    def chart():
+        app.calls += 1
+        return jsonify({"calls": app.calls})
+
+    for path in ('/lahiri/natal', '/lahiri/transit', '/lahiri/natal/bulk'):
+        app.add_url_rule(path, path, chart, methods=['POST'])
+    return app.test_client()
+
+
+def test_repeat_request_is_served_from_cache(client):
+    first = client.post('/lahiri/natal', json=BODY)
+    second = client.post('/lahiri/natal', json=BODY)
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json() == {"calls": 1}
+    assert second.headers['ETag'] == first.headers['ETag']
+
+
+def test_matching_etag_gets_not_modified(client):
+    etag = client.post('/lahiri/natal', json=BODY).headers['ETag']
+    response = client.post('/lahiri/natal', json=BODY, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_short_ttl_entries_are_recomputed_after_expiry(client, monkeypatch):
+    assert client.post('/lahiri/transit', json=BODY).get_json() == {"calls": 1}
+    assert client.post('/lahiri/transit', json=BODY).headers['X-Cache'] == 'HIT'
+    later = time.time() + ResponseCache.SHORT_TTL_PATHS['/lahiri/transit'] + 1
+    monkeypatch.setattr(ResponseCache.time, 'time', lambda: later)
+    response = client.post('/lahiri/transit', json=BODY)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json() == {"calls": 2}
+
+
+def test_excluded_paths_are_never_cached(client):
+    first = client.post('/lahiri/natal/bulk', json=BODY)
+    second = client.post('/lahiri/natal/bulk', json=BODY)
+    assert 'X-Cache' not in first.headers and 'ETag' not in first.headers
+    assert second.get_json() == {"calls": 2}
+    assert ResponseCache.backend.stats()['size'] == 0
+
+
+def test_memory_backend_is_bounded_by_bytes():
+    backend = MemoryBackend(size=100, max_bytes=2500)
+    for key in 'abc':
+        backend.set(key, b'x' * 1000, 0)
+    assert backend.get('a') is None
+    assert backend.get('b') is not None and backend.get('c') is not None
+    stats = backend.stats()
+    assert stats['bytes'] == 2000 and stats['evictions'] == 1
+    backend.set('huge', b'x' * 3000, 0)
+    assert backend.get('huge') is None and backend.stats()['bytes'] == 2000
@@ -0,0 +1,21 @@
+"""
+The MessagePack numeric schema converts only the fields it knows: period boundaries
+become Julian Days, echoed input and free text are passed through.
+"""
+from astro_engine.engine.core.Serialization import date_to_jd, numeric_schema
+
+
+def test_period_boundaries_become_julian_days():
+    period = {"planet": "Venus", "start_date": "1990-05-15", "end_date": "2010-05-15 06:30:00"}
+    assert numeric_schema(period) == {
+        "planet": 5, "start_date": date_to_jd("1990-05-15"), "end_date": date_to_jd("2010-05-15 06:30:00"),
+    }
+
+
+def test_echoed_birth_details_are_passed_through():
+    response = {
+        "user_name": "Leo",
+        "birth_details": {"birth_date": "1990-05-15", "birth_time": "10:30:00"},
+        "calculation_time": "2026-10-17T12:00:00",
+    }
+    assert numeric_schema(response) == response